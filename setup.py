@@ -372,6 +372,9 @@ ext_data = dict(
              "depends" : [],
              "sources" : []},
     _smoothers_lowess = {"name" : "statsmodels/nonparametric/_smoothers_lowess.c",
+             "depends" : [],
+             "sources" : []},
+    _exponential_smoothers = {"name" : "statsmodels/tsa/_exponential_smoothers.c",
              "depends" : [],
              "sources" : []}
     )
@@ -443,6 +446,18 @@ statespace_ext_data = dict(
     _kalman_tools = {"name" : "statsmodels/tsa/statespace/_tools.c",
               "filename": "_tools",
               "sources": []},
+    _kalman_batch = {"name" : "statsmodels/tsa/statespace/_batch.c",
+              "filename": "_batch",
+              "include_dirs": ['statsmodels/src'] + npymath_info['include_dirs'],
+              "libraries": npymath_info['libraries'],
+              "library_dirs": npymath_info['library_dirs'],
+              "sources": []},
+    _kalman_derivatives = {"name" : "statsmodels/tsa/statespace/_derivatives.c",
+              "filename": "_derivatives",
+              "include_dirs": ['statsmodels/src'] + npymath_info['include_dirs'],
+              "libraries": npymath_info['libraries'],
+              "library_dirs": npymath_info['library_dirs'],
+              "sources": []},
 )
 try:
     from scipy.linalg import cython_blas
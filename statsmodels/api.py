@@ -1,48 +1,123 @@
-from . import iolib
-from . import datasets
+"""
+The statsmodels public API
+
+Submodules and classes are imported when they are first accessed, so that
+``import statsmodels.api as sm`` only loads the models that are used.
+"""
+import importlib
+import sys
+
 from . import tools
 from .tools.tools import add_constant, categorical
-from . import regression
-from .regression.linear_model import OLS, GLS, WLS, GLSAR
-from .regression.recursive_ls import RecursiveLS
-from .regression.quantile_regression import QuantReg
-from .regression.mixed_linear_model import MixedLM
-from .genmod import api as genmod
-from .genmod.api import GLM, GEE, OrdinalGEE, NominalGEE, families, cov_struct
-from . import robust
-from .robust.robust_linear_model import RLM
-from .discrete.discrete_model import (Poisson, Logit, Probit,
-                                      MNLogit, NegativeBinomial,
-                                      GeneralizedPoisson,
-                                      NegativeBinomialP)
-from .discrete.count_model import (ZeroInflatedPoisson,
-                                   ZeroInflatedGeneralizedPoisson,
-                                   ZeroInflatedNegativeBinomialP)
-from .tsa import api as tsa
-from .duration.survfunc import SurvfuncRight
-from .duration.hazard_regression import PHReg
-from .imputation.mice import MICE, MICEData
-from .nonparametric import api as nonparametric
-from . import distributions
 from .__init__ import test
 from . import version
 from .info import __doc__
-from .graphics.gofplots import qqplot, qqplot_2samples, qqline, ProbPlot
-from .graphics import api as graphics
-from .stats import api as stats
-from .emplike import api as emplike
-from .duration import api as duration
-from .multivariate.pca import PCA
-from .multivariate.manova import MANOVA
-from .multivariate.factor import Factor
-from .multivariate import api as multivariate
-
-from .formula import api as formula
-
-from .iolib.smpickle import load_pickle as load
-
-from .tools.print_version import show_versions
-from .tools.web import webdoc
+
+# name -> (module, attribute), attribute None for the module itself
+_lazy_imports = {
+    'iolib': ('statsmodels.iolib', None),
+    'datasets': ('statsmodels.datasets', None),
+    'regression': ('statsmodels.regression', None),
+    'OLS': ('statsmodels.regression.linear_model', 'OLS'),
+    'GLS': ('statsmodels.regression.linear_model', 'GLS'),
+    'WLS': ('statsmodels.regression.linear_model', 'WLS'),
+    'GLSAR': ('statsmodels.regression.linear_model', 'GLSAR'),
+    'RecursiveLS': ('statsmodels.regression.recursive_ls', 'RecursiveLS'),
+    'RollingOLS': ('statsmodels.regression.rolling', 'RollingOLS'),
+    'RollingWLS': ('statsmodels.regression.rolling', 'RollingWLS'),
+    'QuantReg': ('statsmodels.regression.quantile_regression', 'QuantReg'),
+    'MixedLM': ('statsmodels.regression.mixed_linear_model', 'MixedLM'),
+    'genmod': ('statsmodels.genmod.api', None),
+    'GLM': ('statsmodels.genmod.api', 'GLM'),
+    'GEE': ('statsmodels.genmod.api', 'GEE'),
+    'OrdinalGEE': ('statsmodels.genmod.api', 'OrdinalGEE'),
+    'NominalGEE': ('statsmodels.genmod.api', 'NominalGEE'),
+    'families': ('statsmodels.genmod.api', 'families'),
+    'cov_struct': ('statsmodels.genmod.api', 'cov_struct'),
+    'robust': ('statsmodels.robust', None),
+    'RLM': ('statsmodels.robust.robust_linear_model', 'RLM'),
+    'Poisson': ('statsmodels.discrete.discrete_model', 'Poisson'),
+    'Logit': ('statsmodels.discrete.discrete_model', 'Logit'),
+    'Probit': ('statsmodels.discrete.discrete_model', 'Probit'),
+    'MNLogit': ('statsmodels.discrete.discrete_model', 'MNLogit'),
+    'NegativeBinomial': ('statsmodels.discrete.discrete_model',
+                         'NegativeBinomial'),
+    'GeneralizedPoisson': ('statsmodels.discrete.discrete_model',
+                           'GeneralizedPoisson'),
+    'NegativeBinomialP': ('statsmodels.discrete.discrete_model',
+                          'NegativeBinomialP'),
+    'ZeroInflatedPoisson': ('statsmodels.discrete.count_model',
+                            'ZeroInflatedPoisson'),
+    'ZeroInflatedGeneralizedPoisson': ('statsmodels.discrete.count_model',
+                                       'ZeroInflatedGeneralizedPoisson'),
+    'ZeroInflatedNegativeBinomialP': ('statsmodels.discrete.count_model',
+                                      'ZeroInflatedNegativeBinomialP'),
+    'tsa': ('statsmodels.tsa.api', None),
+    'SurvfuncRight': ('statsmodels.duration.survfunc', 'SurvfuncRight'),
+    'PHReg': ('statsmodels.duration.hazard_regression', 'PHReg'),
+    'MICE': ('statsmodels.imputation.mice', 'MICE'),
+    'MICEData': ('statsmodels.imputation.mice', 'MICEData'),
+    'nonparametric': ('statsmodels.nonparametric.api', None),
+    'distributions': ('statsmodels.distributions', None),
+    'qqplot': ('statsmodels.graphics.gofplots', 'qqplot'),
+    'qqplot_2samples': ('statsmodels.graphics.gofplots', 'qqplot_2samples'),
+    'qqline': ('statsmodels.graphics.gofplots', 'qqline'),
+    'ProbPlot': ('statsmodels.graphics.gofplots', 'ProbPlot'),
+    'graphics': ('statsmodels.graphics.api', None),
+    'stats': ('statsmodels.stats.api', None),
+    'emplike': ('statsmodels.emplike.api', None),
+    'duration': ('statsmodels.duration.api', None),
+    'PCA': ('statsmodels.multivariate.pca', 'PCA'),
+    'MANOVA': ('statsmodels.multivariate.manova', 'MANOVA'),
+    'Factor': ('statsmodels.multivariate.factor', 'Factor'),
+    'multivariate': ('statsmodels.multivariate.api', None),
+    'formula': ('statsmodels.formula.api', None),
+    'load': ('statsmodels.iolib.smpickle', 'load_pickle'),
+    'show_versions': ('statsmodels.tools.print_version', 'show_versions'),
+    'webdoc': ('statsmodels.tools.web', 'webdoc'),
+}
+
+# submodules of the packages above that the eager imports used to load, they
+# are imported together with the package so that dotted access keeps working
+_lazy_submodules = {
+    'iolib': ['foreign', 'openfile', 'smpickle', 'summary', 'summary2',
+              'table', 'tableformatting'],
+    'regression': ['_prediction', '_tools', 'linear_model',
+                   'mixed_linear_model', 'quantile_regression',
+                   'recursive_ls'],
+    'robust': ['norms', 'robust_linear_model', 'scale'],
+}
+
+__all__ = (['tools', 'add_constant', 'categorical', 'test', 'version'] +
+           sorted(_lazy_imports))
+
+
+def _import_lazy(name):
+    module_name, attr = _lazy_imports[name]
+    obj = importlib.import_module(module_name)
+    for submodule in _lazy_submodules.get(name, []):
+        importlib.import_module(module_name + '.' + submodule)
+    if attr is not None:
+        obj = getattr(obj, attr)
+    # cache, later lookups do not go through __getattr__
+    globals()[name] = obj
+    return obj
+
+
+if sys.version_info[:2] >= (3, 7):
+    def __getattr__(name):
+        if name in _lazy_imports:
+            return _import_lazy(name)
+        raise AttributeError("module {!r} has no attribute "
+                             "{!r}".format(__name__, name))
+
+    def __dir__():
+        return sorted(set(globals()) | set(_lazy_imports))
+else:
+    # module level __getattr__ (PEP 562) is not available
+    for _name in _lazy_imports:
+        _import_lazy(_name)
+    del _name
 
 import os
 
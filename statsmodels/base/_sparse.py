@@ -0,0 +1,215 @@
+"""
+Helper functions for models that allow a scipy.sparse design matrix.
+
+The functions take ``exog`` either as a dense ndarray or as a scipy.sparse
+matrix. Dense inputs are handled with the same numpy expressions that the
+models use directly, sparse inputs are never converted to dense arrays of
+size nobs x k_exog.
+"""
+import numpy as np
+from scipy import sparse
+from scipy.sparse import linalg as splinalg
+
+from statsmodels.tools.decorators import cache_readonly
+from statsmodels.tools.tools import _row_chunks
+
+
+def exog_dot(exog, params):
+    """
+    Linear predictor ``dot(exog, params)`` for dense or sparse exog
+    """
+    if sparse.issparse(exog):
+        return exog.dot(params)
+    return np.dot(exog, params)
+
+
+def scale_rows(factor, exog):
+    """
+    Multiply each row of exog by factor, ``factor[:, None] * exog``
+
+    A sparse exog is returned as a sparse CSR matrix.
+    """
+    if sparse.issparse(exog):
+        return sparse.diags(factor).dot(exog).tocsr()
+    return factor[:, None] * exog
+
+
+def weighted_crossprod(exog, factor, dense=True):
+    """
+    Weighted cross product ``dot(exog.T * factor, exog)``
+
+    Parameters
+    ----------
+    exog : ndarray or scipy.sparse matrix
+        Design matrix with shape (nobs, k_exog).
+    factor : ndarray
+        Weights for each observation with shape (nobs,).
+    dense : bool
+        If False and exog is sparse, then the cross product is returned as
+        sparse CSC matrix that can be used in sparse solvers. Otherwise an
+        ndarray is returned.
+
+    Returns
+    -------
+    xtwx : ndarray or scipy.sparse.csc_matrix
+        The (k_exog, k_exog) cross product matrix.
+    """
+    if sparse.issparse(exog):
+        xtwx = exog.T.dot(scale_rows(factor, exog)).tocsc()
+        if dense:
+            return xtwx.toarray()
+        return xtwx
+    return np.dot(exog.T * factor, exog)
+
+
+def bordered(mat, vec, corner):
+    """
+    Symmetric matrix ``[[mat, vec], [vec', corner]]``
+
+    The result is a sparse CSC matrix if mat is sparse, e.g. the hessian of
+    models with an extra parameter, otherwise an ndarray.
+    """
+    if sparse.issparse(mat):
+        vec = np.asarray(vec)[:, None]
+        return sparse.bmat([[mat, vec], [vec.T, corner]], format='csc')
+    k = mat.shape[0]
+    out = np.empty((k + 1, k + 1))
+    out[:-1, :-1] = mat
+    out[-1, :-1] = vec
+    out[:-1, -1] = vec
+    out[-1, -1] = corner
+    return out
+
+
+def _orthogonal_columns(mat):
+    """
+    Indices of columns of a symmetric sparse matrix whose submatrix is
+    diagonal, for example the dummy variables of one grouping in a cross
+    product. The columns are selected greedily in the order of their number
+    of nonzero off-diagonal elements.
+    """
+    mat = sparse.csc_matrix(mat)
+    offdiag = sparse.csc_matrix(mat - sparse.diags(mat.diagonal()))
+    offdiag.eliminate_zeros()
+    indptr, indices = offdiag.indptr, offdiag.indices
+    blocked = np.zeros(mat.shape[0], bool)
+    selected = []
+    for j in np.argsort(np.diff(indptr), kind='mergesort'):
+        if not blocked[j]:
+            selected.append(j)
+            blocked[indices[indptr[j]:indptr[j + 1]]] = True
+    return np.sort(np.array(selected, dtype=int))
+
+
+class SparseInverse(object):
+    """
+    Inverse of a sparse square matrix that is computed when requested
+
+    The matrix is factorized with a sparse LU decomposition on first use.
+    The dense inverse is only computed by `toarray`, `diagonal` does not
+    create a dense (k, k) array.
+
+    Parameters
+    ----------
+    mat : scipy.sparse matrix
+        Nonsingular symmetric matrix with shape (k, k).
+    """
+
+    # largest number of remaining columns for the Schur complement in
+    # `diagonal`
+    max_schur = 4096
+
+    def __init__(self, mat):
+        self.mat = sparse.csc_matrix(mat)
+        self.shape = self.mat.shape
+        self._lu = None
+
+    def __getstate__(self):
+        # SuperLU objects cannot be pickled
+        state = self.__dict__.copy()
+        state['_lu'] = None
+        return state
+
+    def solve(self, rhs):
+        """
+        Solve ``mat x = rhs`` using the sparse LU factorization
+        """
+        if self._lu is None:
+            self._lu = splinalg.splu(self.mat)
+        return self._lu.solve(np.asarray(rhs, dtype=np.float64))
+
+    def diagonal(self):
+        """
+        Diagonal of the inverse
+
+        Columns with a diagonal submatrix, e.g. fixed effects dummies, are
+        eliminated with the Schur complement of the remaining columns. If
+        too many columns remain, then the inverse is solved for in blocks of
+        columns of the identity.
+        """
+        k = self.shape[0]
+        idx = _orthogonal_columns(self.mat)
+        rest = np.setdiff1d(np.arange(k), idx)
+        if len(idx) == 0 or len(rest) > self.max_schur:
+            return self._diagonal_solve()
+
+        mat = self.mat
+        dinv = 1. / mat.diagonal()[idx]
+        # D^{-1} B, with D the diagonal block and B the off-diagonal block
+        dinv_b = sparse.diags(dinv).dot(mat[idx][:, rest]).tocsr()
+        schur = mat[rest][:, rest].toarray() - (
+            mat[rest][:, idx].dot(dinv_b)).toarray()
+        schur_inv = np.linalg.inv(np.atleast_2d(schur))
+
+        diag = np.empty(k)
+        diag[rest] = np.diag(schur_inv)
+        diag[idx] = dinv
+        for rows in _row_chunks(len(idx), len(rest)):
+            db = dinv_b[rows].toarray()
+            diag[idx[rows]] += (db.dot(schur_inv) * db).sum(1)
+        return diag
+
+    def _diagonal_solve(self):
+        k = self.shape[0]
+        diag = np.empty(k)
+        for cols in _row_chunks(k, k):
+            idx = np.arange(k)[cols]
+            rhs = np.zeros((k, len(idx)))
+            rhs[idx, np.arange(len(idx))] = 1
+            diag[cols] = self.solve(rhs)[idx, np.arange(len(idx))]
+        return diag
+
+    def toarray(self):
+        """
+        Dense inverse with shape (k, k)
+        """
+        return self.solve(np.eye(self.shape[0]))
+
+
+class SparseCovResultsMixin(object):
+    """
+    Mixin for results whose normalized_cov_params can be a `SparseInverse`
+
+    The dense inverse is computed when normalized_cov_params is first
+    accessed, `bse` only uses the diagonal of the inverse.
+    """
+
+    @property
+    def normalized_cov_params(self):
+        cov = self._normalized_cov_params
+        if isinstance(cov, SparseInverse):
+            # sparse exog, the dense inverse is computed when requested
+            cov = self._normalized_cov_params = cov.toarray()
+        return cov
+
+    @normalized_cov_params.setter
+    def normalized_cov_params(self, value):
+        self._normalized_cov_params = value
+
+    @cache_readonly
+    def bse(self):
+        cov = self._normalized_cov_params
+        if (isinstance(cov, SparseInverse) and
+                not hasattr(self, 'cov_params_default')):
+            return np.sqrt(cov.diagonal() * self.scale)
+        return super(SparseCovResultsMixin, self).bse
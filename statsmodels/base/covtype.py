@@ -63,12 +63,21 @@ def get_robustcov_results(self, cov_type='HC1', use_t=None, **kwds):
     - 'cluster' and required keyword `groups`, integer group indicator
 
         - `groups` array_like, integer (required) :
-              index of clusters or groups
+              index of clusters or groups.
+              If groups is two dimensional, then the covariance is
+              robust to multiway clustering, one column for each
+              cluster dimension.
         - `use_correction` bool (optional) :
               If True the sandwich covariance is calulated with a small
               sample correction.
               If False the the sandwich covariance is calulated without
               small sample correction.
+        - `chunksize` int (optional) :
+              Number of observations for which the cluster sums of
+              the scores are accumulated at once. The default limits
+              the temporary arrays to about 2**22 elements.
+        - `n_jobs` int (optional) :
+              Number of threads used to accumulate the cluster sums.
         - `df_correction` bool (optional)
               If True (default), then the degrees of freedom for the
               inferential statistics and hypothesis tests, such as
@@ -208,13 +217,19 @@ def get_robustcov_results(self, cov_type='HC1', use_t=None, **kwds):
         res.cov_kwds['groups'] = groups
         use_correction = kwds.get('use_correction', True)
         res.cov_kwds['use_correction'] = use_correction
+        chunksize = kwds.get('chunksize', None)
+        n_jobs = kwds.get('n_jobs', 1)
+        res.cov_kwds['chunksize'] = chunksize
+        res.cov_kwds['n_jobs'] = n_jobs
         if groups.ndim == 1:
             if adjust_df:
                 # need to find number of groups
                 # duplicate work
-                self.n_groups = n_groups = len(np.unique(groups))
-            res.cov_params_default = sw.cov_cluster(self, groups,
-                                             use_correction=use_correction)
+                import pandas as pd
+                self.n_groups = n_groups = len(pd.unique(np.asarray(groups)))
+            res.cov_params_default = sw.cov_cluster(
+                self, groups, use_correction=use_correction,
+                chunksize=chunksize, n_jobs=n_jobs)
 
         elif groups.ndim == 2:
             if hasattr(groups, 'values'):
@@ -223,16 +238,17 @@ def get_robustcov_results(self, cov_type='HC1', use_t=None, **kwds):
             if adjust_df:
                 # need to find number of groups
                 # duplicate work
-                n_groups0 = len(np.unique(groups[:,0]))
-                n_groups1 = len(np.unique(groups[:, 1]))
-                self.n_groups = (n_groups0, n_groups1)
-                n_groups = min(n_groups0, n_groups1) # use for adjust_df
-
-            # Note: sw.cov_cluster_2groups has 3 returns
-            res.cov_params_default = sw.cov_cluster_2groups(self, groups,
-                                         use_correction=use_correction)[0]
+                import pandas as pd
+                self.n_groups = tuple(len(pd.unique(groups[:, i]))
+                                      for i in range(groups.shape[1]))
+                n_groups = min(self.n_groups)  # use for adjust_df
+
+            # two-way or multiway clustering
+            res.cov_params_default = sw.cov_cluster_multiway(
+                self, groups, use_correction=use_correction,
+                chunksize=chunksize, n_jobs=n_jobs)
         else:
-            raise ValueError('only two groups are supported')
+            raise ValueError('groups needs to be 1 or 2 dimensional')
         res.cov_kwds['description'] = ('Standard Errors are robust to' +
                             'cluster correlation ' + '(' + cov_type + ')')
 
@@ -6,6 +6,8 @@ from statsmodels.compat.python import reduce, iteritems, lmap, zip, range
 from statsmodels.compat.numpy import np_matrix_rank
 import numpy as np
 from pandas import DataFrame, Series, isnull
+from scipy import sparse
+from scipy.sparse import linalg as splinalg
 from statsmodels.tools.decorators import (resettable_cache, cache_readonly,
                                           cache_writable)
 import statsmodels.tools.data as data_util
@@ -570,6 +572,123 @@ class PandasData(ModelData):
         else:
             return DataFrame(result, columns=self.ynames)
 
+
+class SparseData(ModelData):
+    """
+    Data handling for a scipy.sparse exog
+
+    exog is converted to a float64 CSR matrix and is never densified.
+    endog and extra arrays are handled as in ModelData.
+    """
+
+    @classmethod
+    def handle_missing(cls, endog, exog, missing, **kwargs):
+        exog = sparse.csr_matrix(exog)
+        nobs = exog.shape[0]
+        # rows with a nan in one of the stored elements of exog
+        exog_nan = np.zeros(nobs, bool)
+        rows = np.repeat(np.arange(nobs), np.diff(exog.indptr))
+        exog_nan[rows[np.isnan(exog.data)]] = True
+        placeholder = np.where(exog_nan, np.nan, 0.)
+        arrays, nan_idx = super(SparseData, cls).handle_missing(
+            endog, placeholder, missing, **kwargs)
+        if len(nan_idx):
+            keep = np.ones(nobs, bool)
+            keep[nan_idx] = False
+            exog = exog[keep]
+        arrays['exog'] = exog
+        return arrays, nan_idx
+
+    def _get_xarr(self, exog):
+        return sparse.csr_matrix(exog, dtype=np.float64)
+
+    def _handle_constant(self, hasconst):
+        if hasconst is not None or self.exog is None:
+            return super(SparseData, self)._handle_constant(hasconst)
+
+        exog = self.exog
+        if not np.isfinite(exog.data).all():
+            raise MissingDataError('exog contains inf or nans')
+        col_max = exog.max(0).toarray().ravel()
+        col_min = exog.min(0).toarray().ravel()
+        const_idx = np.nonzero((col_max == col_min) & (col_max != 0))[0]
+        if const_idx.size:
+            # prefer a column of ones
+            ones = const_idx[col_max[const_idx] == 1]
+            self.const_idx = ones[0] if ones.size else const_idx[0]
+            self.k_constant = 1
+        else:
+            # implicit constant, e.g. a full set of dummy variables,
+            # if a vector of ones is in the column space of exog
+            ones = np.ones(exog.shape[0])
+            r1norm = splinalg.lsqr(exog, ones, atol=1e-10, btol=1e-10)[3]
+            self.k_constant = int(r1norm < 1e-6 * np.sqrt(exog.shape[0]))
+            self.const_idx = None
+
+    def _check_integrity(self):
+        if self.exog is not None:
+            if self.exog.shape[0] != len(self.endog):
+                raise ValueError("endog and exog matrices are different sizes")
+
+    @cache_writable()
+    def xnames(self):
+        if self.exog is None:
+            return None
+        k_exog = self.exog.shape[1]
+        if self.const_idx is None:
+            return ['x%d' % i for i in range(1, k_exog + 1)]
+        xnames = ['x%d' % i for i in range(1, k_exog)]
+        xnames.insert(self.const_idx, 'const')
+        return xnames
+
+
+class RawData(ModelData):
+    """
+    Minimal data handling for ndarray inputs, used with ``data_mode='raw'``
+
+    endog and exog are converted with ``np.asarray`` and used as given. There
+    is no handling of missing values, no check for inf or nans and, unless
+    hasconst is given, only a check for an explicit constant column.
+    """
+
+    def __init__(self, endog, exog=None, missing='none', hasconst=None,
+                 **kwargs):
+        if missing != 'none':
+            raise ValueError("missing has to be 'none' with data_mode='raw'")
+        self.__dict__.update(kwargs)
+        self.orig_endog = endog
+        self.orig_exog = exog
+        self.endog, self.exog = self._convert_endog_exog(endog, exog)
+        self._handle_constant(hasconst)
+        self._check_integrity()
+        self._cache = resettable_cache()
+
+    def _get_yarr(self, endog):
+        endog = np.asarray(endog)
+        if endog.ndim == 2 and endog.shape[1] == 1:
+            endog = endog[:, 0]
+        return endog
+
+    def _get_xarr(self, exog):
+        return np.asarray(exog)
+
+    def _handle_constant(self, hasconst):
+        if hasconst is not None or self.exog is None:
+            return super(RawData, self)._handle_constant(hasconst)
+
+        exog = self.exog
+        const_idx = np.nonzero((exog[0] != 0) & (exog == exog[0]).all(0))[0]
+        if const_idx.size:
+            # prefer a column of ones
+            ones = const_idx[exog[0, const_idx] == 1]
+            self.const_idx = ones[0] if ones.size else const_idx[0]
+            self.k_constant = 1
+        else:
+            # implicit constants are not detected
+            self.const_idx = None
+            self.k_constant = 0
+
+
 def _make_endog_names(endog):
     if endog.ndim == 1 or endog.shape[1] == 1:
         ynames = ['y']
@@ -606,7 +725,9 @@ def handle_data_class_factory(endog, exog):
     """
     Given inputs
     """
-    if data_util._is_using_ndarray_type(endog, exog):
+    if sparse.issparse(exog):
+        klass = SparseData
+    elif data_util._is_using_ndarray_type(endog, exog):
         klass = ModelData
     elif data_util._is_using_pandas(endog, exog):
         klass = PandasData
@@ -621,7 +742,14 @@ def handle_data_class_factory(endog, exog):
     return klass
 
 
-def handle_data(endog, exog, missing='none', hasconst=None, **kwargs):
+def handle_data(endog, exog, missing='none', hasconst=None,
+                data_mode='default', **kwargs):
+    if data_mode == 'raw':
+        return RawData(endog, exog=exog, missing=missing, hasconst=hasconst,
+                       **kwargs)
+    elif data_mode != 'default':
+        raise ValueError("data_mode has to be 'default' or 'raw'")
+
     # deal with lists and tuples up-front
     if isinstance(endog, (list, tuple)):
         endog = np.asarray(endog)
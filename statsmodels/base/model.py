@@ -1,8 +1,9 @@
 from __future__ import print_function
 from statsmodels.compat.python import lzip, range, reduce
 import numpy as np
-from scipy import stats
+from scipy import sparse, stats
 from statsmodels.base.data import handle_data
+from statsmodels.base._sparse import SparseInverse
 from statsmodels.tools.data import _is_using_pandas
 from statsmodels.tools.tools import recipr, nan_dot
 from statsmodels.stats.contrast import (ContrastResults, WaldTestResults,
@@ -39,6 +40,12 @@ _extra_param_doc = """
         a constant is not checked for and k_constant is set to 1 and all
         result statistics are calculated as if a constant is present. If
         False, a constant is not checked for and k_constant is set to 0.
+    data_mode : str
+        'default' or 'raw'. With 'raw', endog and exog are used as ndarrays
+        without handling of missing values or of pandas and patsy metadata.
+        If hasconst is None, only an explicit constant column is detected.
+        Linear regression models return lightweight results. Intended for
+        many fits on small datasets.
 """
 
 
@@ -60,6 +67,7 @@ class Model(object):
     def __init__(self, endog, exog=None, **kwargs):
         missing = kwargs.pop('missing', 'none')
         hasconst = kwargs.pop('hasconst', None)
+        self.data_mode = kwargs.pop('data_mode', 'default')
         self.data = self._handle_data(endog, exog, missing, hasconst,
                                       **kwargs)
         self.k_constant = self.data.k_constant
@@ -74,6 +82,8 @@ class Model(object):
         self._init_keys = list(kwargs.keys())
         if hasconst is not None:
             self._init_keys.append('hasconst')
+        if self.data_mode != 'default':
+            self._init_keys.append('data_mode')
 
     def _get_init_kwds(self):
         """return dictionary with extra keys used in model.__init__
@@ -84,7 +94,8 @@ class Model(object):
         return kwds
 
     def _handle_data(self, endog, exog, missing, hasconst, **kwargs):
-        data = handle_data(endog, exog, missing, hasconst, **kwargs)
+        data = handle_data(endog, exog, missing, hasconst,
+                           data_mode=self.data_mode, **kwargs)
         # kwargs arrays could have changed, easier to just attach here
         for key in kwargs:
             if key in ['design_info', 'formula']:  # leave attached to data
@@ -451,7 +462,11 @@ class LikelihoodModel(Model):
                 return -self.score(params, *args) / nobs
 
             def hess(params, *args):
-                return -self.hessian(params, *args) / nobs
+                hess = -self.hessian(params, *args) / nobs
+                if sparse.issparse(hess):
+                    # scipy optimizers require a dense hessian
+                    hess = hess.toarray()
+                return hess
 
         warn_convergence = kwargs.pop('warn_convergence', True)
         optimizer = Optimizer()
@@ -470,23 +485,31 @@ class LikelihoodModel(Model):
         if cov_params_func:
             Hinv = cov_params_func(self, xopt, retvals)
         elif method == 'newton' and full_output:
-            Hinv = np.linalg.inv(-retvals['Hessian']) / nobs
+            if sparse.issparse(retvals['Hessian']):
+                # sparse exog, the inverse is computed when requested
+                Hinv = SparseInverse(-retvals['Hessian'] * nobs)
+            else:
+                Hinv = np.linalg.inv(-retvals['Hessian']) / nobs
         elif not skip_hessian:
             H = -1 * self.hessian(xopt)
-            invertible = False
-            if np.all(np.isfinite(H)):
-                eigvals, eigvecs = np.linalg.eigh(H)
-                if np.min(eigvals) > 0:
-                    invertible = True
-
-            if invertible:
-                Hinv = eigvecs.dot(np.diag(1.0 / eigvals)).dot(eigvecs.T)
-                Hinv = np.asfortranarray((Hinv + Hinv.T) / 2.0)
+            if sparse.issparse(H):
+                # sparse exog, the inverse is computed when requested
+                Hinv = SparseInverse(H)
             else:
-                from warnings import warn
-                warn('Inverting hessian failed, no bse or cov_params '
-                     'available', HessianInversionWarning)
-                Hinv = None
+                invertible = False
+                if np.all(np.isfinite(H)):
+                    eigvals, eigvecs = np.linalg.eigh(H)
+                    if np.min(eigvals) > 0:
+                        invertible = True
+
+                if invertible:
+                    Hinv = eigvecs.dot(np.diag(1.0 / eigvals)).dot(eigvecs.T)
+                    Hinv = np.asfortranarray((Hinv + Hinv.T) / 2.0)
+                else:
+                    from warnings import warn
+                    warn('Inverting hessian failed, no bse or cov_params '
+                         'available', HessianInversionWarning)
+                    Hinv = None
 
         if 'cov_type' in kwargs:
             cov_kwds = kwargs.get('cov_kwds', {})
@@ -2007,6 +2030,10 @@ class ResultMixin(object):
             standard deviation of parameter estimates over bootstrap
             replications
 
+        See Also
+        --------
+        statsmodels.resampling.bootstrap.bootstrap
+
         Notes
         -----
         This was mainly written to compare estimators of the standard errors of
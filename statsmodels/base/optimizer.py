@@ -5,7 +5,8 @@ to untie these from LikelihoodModel so that they may be re-used generally.
 from __future__ import print_function
 
 import numpy as np
-from scipy import optimize
+from scipy import optimize, sparse
+from scipy.sparse import linalg as splinalg
 
 def _check_method(method, methods):
     if method not in methods:
@@ -269,14 +270,22 @@ def _fit_newton(f, score, start_params, fargs, kwargs, disp=True,
         history = [oldparams, newparams]
     while (iterations < maxiter and np.any(np.abs(newparams -
             oldparams) > tol)):
-        H = np.asarray(hess(newparams))
-        # regularize Hessian, not clear what ridge factor should be
-        # keyword option with absolute default 1e-10, see #1847
-        if not np.all(ridge_factor == 0):
-            H[np.diag_indices(H.shape[0])] += ridge_factor
-        oldparams = newparams
-        newparams = oldparams - np.dot(np.linalg.inv(H),
-                score(oldparams))
+        H = hess(newparams)
+        if sparse.issparse(H):
+            # models with a sparse exog can return a sparse Hessian
+            H = H + sparse.diags(ridge_factor * np.ones(H.shape[0]))
+            oldparams = newparams
+            newparams = oldparams - splinalg.spsolve(H.tocsc(),
+                                                     score(oldparams))
+        else:
+            H = np.asarray(H)
+            # regularize Hessian, not clear what ridge factor should be
+            # keyword option with absolute default 1e-10, see #1847
+            if not np.all(ridge_factor == 0):
+                H[np.diag_indices(H.shape[0])] += ridge_factor
+            oldparams = newparams
+            newparams = oldparams - np.dot(np.linalg.inv(H),
+                    score(oldparams))
         if retall:
             history.append(newparams)
         if callback is not None:
@@ -9,6 +9,7 @@ from statsmodels.regression.linear_model import OLS
 from statsmodels.genmod.generalized_linear_model import GLM
 from statsmodels.genmod import families
 from statsmodels.discrete.discrete_model import Logit
+from statsmodels.tools.sm_exceptions import MissingDataError
 
 #class TestDates(object):
 #    @classmethod
@@ -905,6 +906,76 @@ def test_raise_nonfinite_exog():
     assert_raises(MissingDataError, OLS, y, x)
 
 
+def test_sparse_exog():
+    from scipy import sparse
+    from statsmodels.tools.grouputils import dummy_sparse
+
+    np.random.seed(9876)
+    groups = np.repeat(np.arange(5), 4)
+    y = np.random.randn(20)
+    x = np.random.randn(20)
+    dummies = dummy_sparse(groups)
+
+    # explicit constant
+    exog = sparse.hstack((x[:, None], np.ones((20, 1)), dummies[:, 1:]))
+    data = sm_data.handle_data(y, exog)
+    assert_(isinstance(data, sm_data.SparseData))
+    assert_(sparse.isspmatrix_csr(data.exog))
+    assert_equal(data.k_constant, 1)
+    assert_equal(data.const_idx, 1)
+    assert_equal(data.xnames, ['x1', 'const', 'x2', 'x3', 'x4', 'x5'])
+
+    # implicit constant from a full set of dummies
+    exog = sparse.hstack((x[:, None], dummies), format="csr")
+    data = sm_data.handle_data(y, exog)
+    assert_equal(data.k_constant, 1)
+    assert_(data.const_idx is None)
+    data = sm_data.handle_data(y, exog[:, :-1])
+    assert_equal(data.k_constant, 0)
+
+    # missing values in endog and in the stored elements of exog
+    y[2] = np.nan
+    exog[7, 0] = np.nan
+    assert_raises(MissingDataError, sm_data.handle_data, y, exog)
+    data = sm_data.handle_data(y, exog, missing='drop')
+    assert_equal(data.missing_row_idx, [2, 7])
+    assert_equal(data.exog.shape, (18, 6))
+    assert_equal(data.exog.toarray(), np.delete(exog.toarray(), [2, 7], 0))
+    assert_equal(data.endog, np.delete(y, [2, 7]))
+
+
+def test_raw_data():
+    np.random.seed(9876)
+    y = np.random.randn(20, 1)
+    x = np.column_stack((np.random.randn(20), 2 * np.ones(20), np.ones(20)))
+    data = sm_data.handle_data(y, x, data_mode='raw')
+    assert_(isinstance(data, sm_data.RawData))
+    assert_equal(data.endog.shape, (20,))
+    assert_(data.exog is x)
+    # a column of ones is preferred
+    assert_equal(data.k_constant, 1)
+    assert_equal(data.const_idx, 2)
+    assert_equal(data.xnames, sm_data.handle_data(y, x).xnames)
+    assert_equal(data.wrap_output(y, 'rows'), y)
+
+    # implicit constants are not detected
+    dummies = np.kron(np.eye(2), np.ones((10, 1)))
+    data = sm_data.handle_data(y, np.column_stack((x[:, 0], dummies)),
+                               data_mode='raw')
+    assert_equal(data.k_constant, 0)
+    data = sm_data.handle_data(y, np.column_stack((x[:, 0], dummies)),
+                               hasconst=True, data_mode='raw')
+    assert_equal(data.k_constant, 1)
+
+    # nans are passed through
+    x[3, 0] = np.nan
+    data = sm_data.handle_data(y, x, data_mode='raw')
+    assert_(np.isnan(data.exog[3, 0]))
+    assert_raises(ValueError, sm_data.handle_data, y, x, missing='drop',
+                  data_mode='raw')
+    assert_raises(ValueError, sm_data.handle_data, y, x, data_mode='fast')
+
+
 if __name__ == "__main__":
     import pytest
     pytest.main([__file__, '-vvs', '-x', '--pdb'])
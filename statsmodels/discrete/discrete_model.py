@@ -25,6 +25,7 @@ from statsmodels.compat.scipy import loggamma
 
 import numpy as np
 from pandas import get_dummies
+from scipy import sparse
 
 from scipy.special import gammaln, digamma, polygamma
 from scipy import stats, special
@@ -36,6 +37,9 @@ from statsmodels.tools.decorators import resettable_cache, cache_readonly
 from statsmodels.tools.sm_exceptions import PerfectSeparationError
 from statsmodels.tools.numdiff import approx_fprime_cs
 import statsmodels.base.model as base
+from statsmodels.base._sparse import (exog_dot, scale_rows,
+                                      weighted_crossprod, bordered,
+                                      SparseCovResultsMixin)
 from statsmodels.base.data import handle_data  # for mnlogit
 import statsmodels.regression.linear_model as lm
 import statsmodels.base.wrapper as wrap
@@ -178,9 +182,13 @@ class DiscreteModel(base.LikelihoodModel):
         and should contain any preprocessing that needs to be done for a model.
         """
         # assumes constant
-        self.df_model = float(np_matrix_rank(self.exog) - 1)
-        self.df_resid = (float(self.exog.shape[0] -
-                         np_matrix_rank(self.exog)))
+        if sparse.issparse(self.exog):
+            # assumes full column rank
+            rank = self.exog.shape[1]
+        else:
+            rank = np_matrix_rank(self.exog)
+        self.df_model = float(rank - 1)
+        self.df_resid = float(self.exog.shape[0] - rank)
 
     def cdf(self, X):
         """
@@ -196,7 +204,7 @@ class DiscreteModel(base.LikelihoodModel):
 
     def _check_perfect_pred(self, params, *args):
         endog = self.endog
-        fittedvalues = self.cdf(np.dot(self.exog, params[:self.exog.shape[1]]))
+        fittedvalues = self.cdf(self.exog.dot(params[:self.exog.shape[1]]))
         if (self.raise_on_perfect_prediction and
                 np.allclose(fittedvalues - endog, 0)):
             msg = "Perfect separation detected, results not available"
@@ -444,9 +452,9 @@ class BinaryModel(DiscreteModel):
         if exog is None:
             exog = self.exog
         if not linear:
-            return self.cdf(np.dot(exog, params))
+            return self.cdf(exog_dot(exog, params))
         else:
-            return np.dot(exog, params)
+            return exog_dot(exog, params)
 
     def fit_regularized(self, start_params=None, method='l1',
             maxiter='defined_by_method', full_output=1, disp=1, callback=None,
@@ -740,8 +748,9 @@ class CountModel(DiscreteModel):
         # promote dtype to float64 if needed
         dt = np.promote_types(self.endog.dtype, np.float64)
         self.endog = np.asarray(self.endog, dt)
-        dt = np.promote_types(self.exog.dtype, np.float64)
-        self.exog = np.asarray(self.exog, dt)
+        if not sparse.issparse(self.exog):
+            dt = np.promote_types(self.exog.dtype, np.float64)
+            self.exog = np.asarray(self.exog, dt)
 
 
     def _check_inputs(self, offset, exposure, endog):
@@ -782,7 +791,7 @@ class CountModel(DiscreteModel):
         if offset is None:
             offset = getattr(self, 'offset', 0)
 
-        fitted = np.dot(exog, params[:exog.shape[1]])
+        fitted = exog_dot(exog, params[:exog.shape[1]])
         linpred = fitted + exposure + offset
         if not linear:
             return np.exp(linpred) # not cdf
@@ -979,7 +988,7 @@ class Poisson(CountModel):
         """
         offset = getattr(self, "offset", 0)
         exposure = getattr(self, "exposure", 0)
-        XB = np.dot(self.exog, params) + offset + exposure
+        XB = self.exog.dot(params) + offset + exposure
         endog = self.endog
         return np.sum(-np.exp(XB) +  endog*XB - gammaln(endog+1))
 
@@ -1007,7 +1016,7 @@ class Poisson(CountModel):
         """
         offset = getattr(self, "offset", 0)
         exposure = getattr(self, "exposure", 0)
-        XB = np.dot(self.exog, params) + offset + exposure
+        XB = self.exog.dot(params) + offset + exposure
         endog = self.endog
         #np.sum(stats.poisson.logpmf(endog, np.exp(XB)))
         return -np.exp(XB) +  endog*XB - gammaln(endog+1)
@@ -1157,8 +1166,8 @@ class Poisson(CountModel):
         offset = getattr(self, "offset", 0)
         exposure = getattr(self, "exposure", 0)
         X = self.exog
-        L = np.exp(np.dot(X,params) + offset + exposure)
-        return np.dot(self.endog - L, X)
+        L = np.exp(X.dot(params) + offset + exposure)
+        return X.T.dot(self.endog - L)
 
     def score_obs(self, params):
         """
@@ -1187,8 +1196,8 @@ class Poisson(CountModel):
         offset = getattr(self, "offset", 0)
         exposure = getattr(self, "exposure", 0)
         X = self.exog
-        L = np.exp(np.dot(X,params) + offset + exposure)
-        return (self.endog - L)[:,None] * X
+        L = np.exp(X.dot(params) + offset + exposure)
+        return scale_rows(self.endog - L, X)
 
     def hessian(self, params):
         """
@@ -1201,9 +1210,9 @@ class Poisson(CountModel):
 
         Returns
         -------
-        hess : ndarray, (k_vars, k_vars)
+        hess : ndarray or scipy.sparse matrix, (k_vars, k_vars)
             The Hessian, second derivative of loglikelihood function,
-            evaluated at `params`
+            evaluated at `params`. This is a sparse matrix if exog is sparse.
 
         Notes
         -----
@@ -1217,8 +1226,8 @@ class Poisson(CountModel):
         offset = getattr(self, "offset", 0)
         exposure = getattr(self, "exposure", 0)
         X = self.exog
-        L = np.exp(np.dot(X,params) + exposure + offset)
-        return -np.dot(L*X.T, X)
+        L = np.exp(X.dot(params) + exposure + offset)
+        return -weighted_crossprod(X, L, dense=False)
 
 
 class GeneralizedPoisson(CountModel):
@@ -1618,7 +1627,7 @@ class GeneralizedPoisson(CountModel):
         if offset is None:
             offset = getattr(self, 'offset', 0)
 
-        fitted = np.dot(exog, params[:exog.shape[1]])
+        fitted = exog_dot(exog, params[:exog.shape[1]])
         linpred = fitted + exposure + offset
 
         if which == 'mean':
@@ -1721,7 +1730,7 @@ class Logit(BinaryModel):
         """
         q = 2*self.endog - 1
         X = self.exog
-        return np.sum(np.log(self.cdf(q*np.dot(X,params))))
+        return np.sum(np.log(self.cdf(q*X.dot(params))))
 
     def loglikeobs(self, params):
         """
@@ -1749,7 +1758,7 @@ class Logit(BinaryModel):
         """
         q = 2*self.endog - 1
         X = self.exog
-        return np.log(self.cdf(q*np.dot(X,params)))
+        return np.log(self.cdf(q*X.dot(params)))
 
     def score(self, params):
         """
@@ -1773,8 +1782,8 @@ class Logit(BinaryModel):
 
         y = self.endog
         X = self.exog
-        L = self.cdf(np.dot(X,params))
-        return np.dot(y - L,X)
+        L = self.cdf(X.dot(params))
+        return X.T.dot(y - L)
 
     def score_obs(self, params):
         """
@@ -1801,8 +1810,8 @@ class Logit(BinaryModel):
 
         y = self.endog
         X = self.exog
-        L = self.cdf(np.dot(X, params))
-        return (y - L)[:,None] * X
+        L = self.cdf(X.dot(params))
+        return scale_rows(y - L, X)
 
     def hessian(self, params):
         """
@@ -1815,17 +1824,17 @@ class Logit(BinaryModel):
 
         Returns
         -------
-        hess : ndarray, (k_vars, k_vars)
+        hess : ndarray or scipy.sparse matrix, (k_vars, k_vars)
             The Hessian, second derivative of loglikelihood function,
-            evaluated at `params`
+            evaluated at `params`. This is a sparse matrix if exog is sparse.
 
         Notes
         -----
         .. math:: \\frac{\\partial^{2}\\ln L}{\\partial\\beta\\partial\\beta^{\\prime}}=-\\sum_{i}\\Lambda_{i}\\left(1-\\Lambda_{i}\\right)x_{i}x_{i}^{\\prime}
         """
         X = self.exog
-        L = self.cdf(np.dot(X,params))
-        return -np.dot(L*(1-L)*X.T,X)
+        L = self.cdf(X.dot(params))
+        return -weighted_crossprod(X, L*(1-L), dense=False)
 
     def fit(self, start_params=None, method='newton', maxiter=35,
             full_output=1, disp=1, callback=None, **kwargs):
@@ -2525,10 +2534,9 @@ class NegativeBinomial(CountModel):
 
     def _score_geom(self, params):
         exog = self.exog
-        y = self.endog[:,None]
-        mu = self.predict(params)[:,None]
-        dparams = exog * (y-mu)/(mu+1)
-        return dparams.sum(0)
+        y = self.endog
+        mu = self.predict(params)
+        return exog.T.dot((y-mu)/(mu+1))
 
     def _score_nbin(self, params, Q=0):
         """
@@ -2540,15 +2548,15 @@ class NegativeBinomial(CountModel):
             alpha = params[-1]
         params = params[:-1]
         exog = self.exog
-        y = self.endog[:,None]
-        mu = self.predict(params)[:,None]
+        y = self.endog
+        mu = self.predict(params)
         a1 = 1/alpha * mu**Q
         prob = a1 / (a1 + mu)  # a1 aka "size" in _ll_nbin
         if Q == 1:  # nb1
             # Q == 1 --> a1 = mu / alpha --> prob = 1 / (alpha + 1)
-            dparams = exog * a1 * (np.log(prob) +
-                       special.digamma(y + mu/alpha) -
-                       special.digamma(mu/alpha))
+            dparams = exog.T.dot(a1 * (np.log(prob) +
+                                 special.digamma(y + mu/alpha) -
+                                 special.digamma(mu/alpha)))
             dalpha = ((alpha * (y - mu * np.log(prob) -
                               mu*(special.digamma(y + mu/alpha) -
                               special.digamma(mu/alpha) + 1)) -
@@ -2558,38 +2566,28 @@ class NegativeBinomial(CountModel):
                        (alpha**2*(alpha + 1))).sum()
 
         elif Q == 0:  # nb2
-            dparams = exog*a1 * (y-mu)/(mu+a1)
+            dparams = exog.T.dot(a1 * (y-mu)/(mu+a1))
             da1 = -alpha**-2
             dalpha = (special.digamma(a1+y) - special.digamma(a1) + np.log(a1)
                         - np.log(a1+mu) - (y-mu)/(a1+mu)).sum() * da1
 
         #multiply above by constant outside sum to reduce rounding error
         if self._transparams:
-            return np.r_[dparams.sum(0), dalpha*alpha]
+            return np.r_[dparams, dalpha*alpha]
         else:
-            return np.r_[dparams.sum(0), dalpha]
+            return np.r_[dparams, dalpha]
 
     def _score_nb1(self, params):
         return self._score_nbin(params, Q=1)
 
     def _hessian_geom(self, params):
         exog = self.exog
-        y = self.endog[:,None]
-        mu = self.predict(params)[:,None]
+        y = self.endog
+        mu = self.predict(params)
 
         # for dl/dparams dparams
-        dim = exog.shape[1]
-        hess_arr = np.empty((dim, dim))
         const_arr = mu*(1+y)/(mu+1)**2
-        for i in range(dim):
-            for j in range(dim):
-                if j > i:
-                    continue
-                hess_arr[i,j] = np.sum(-exog[:,i,None] * exog[:,j,None] *
-                                       const_arr, axis=0)
-        tri_idx = np.triu_indices(dim, k=1)
-        hess_arr[tri_idx] = hess_arr.T[tri_idx]
-        return hess_arr
+        return -weighted_crossprod(exog, const_arr, dense=False)
 
 
     def _hessian_nb1(self, params):
@@ -2603,42 +2601,31 @@ class NegativeBinomial(CountModel):
 
         params = params[:-1]
         exog = self.exog
-        y = self.endog[:,None]
-        mu = self.predict(params)[:,None]
+        y = self.endog
+        mu = self.predict(params)
 
         a1 = mu/alpha
         prob = 1 / (1 + alpha)  # equiv: a1 / (a1 + mu)
 
         # for dl/dparams dparams
-        dim = exog.shape[1]
-        hess_arr = np.empty((dim+1,dim+1))
         #const_arr = a1*mu*(a1+y)/(mu+a1)**2
-        # not all of dparams
-        dparams = exog / alpha * (np.log(prob) +
-                              special.digamma(y + a1) -
-                              special.digamma(a1))
+        # not all of dparams, dparams = exog * dparams_factor
+        dparams_factor = 1 / alpha * (np.log(prob) +
+                                      special.digamma(y + a1) -
+                                      special.digamma(a1))
 
-        dmudb = exog*mu
-        xmu_alpha = exog * a1
         trigamma = (special.polygamma(1, a1 + y) -
                     special.polygamma(1, a1))
-        for i in range(dim):
-            for j in range(dim):
-                if j > i:
-                    continue
-                hess_arr[i,j] = np.sum(dparams[:,i,None] * dmudb[:,j,None] +
-                                 xmu_alpha[:,i,None] * xmu_alpha[:,j,None] *
-                                 trigamma, axis=0)
-        tri_idx = np.triu_indices(dim, k=1)
-        hess_arr[tri_idx] = hess_arr.T[tri_idx]
+        # dparams * dmudb + xmu_alpha * xmu_alpha * trigamma with
+        # dmudb = exog * mu and xmu_alpha = exog * a1
+        hess_xx = weighted_crossprod(
+            exog, dparams_factor * mu + a1**2 * trigamma, dense=False)
 
         # for dl/dparams dalpha
         da1 = -alpha**-2
-        dldpda = np.sum(-a1 * dparams + exog * a1 *
-                        (-trigamma*mu/alpha**2 - prob), axis=0)
+        dldpda = exog.T.dot(-a1 * dparams_factor +
+                            a1 * (-trigamma*mu/alpha**2 - prob))
 
-        hess_arr[-1,:-1] = dldpda
-        hess_arr[:-1,-1] = dldpda
 
         # for dl/dalpha dalpha
         digamma_part = (special.digamma(y + a1) -
@@ -2655,9 +2642,8 @@ class NegativeBinomial(CountModel):
                 2*alpha*mu2*trigamma + mu2*trigamma + alpha2*mu2*trigamma +
                 2*alpha*mu*(log_alpha + digamma_part)
                 )/(alpha**4*(alpha2 + 2*alpha + 1)))
-        hess_arr[-1,-1] = dada.sum()
 
-        return hess_arr
+        return bordered(hess_xx, dldpda, dada.sum())
 
     def _hessian_nb2(self, params):
         """
@@ -2671,28 +2657,17 @@ class NegativeBinomial(CountModel):
         params = params[:-1]
 
         exog = self.exog
-        y = self.endog[:,None]
-        mu = self.predict(params)[:,None]
+        y = self.endog
+        mu = self.predict(params)
         prob = a1 / (a1 + mu)
 
         # for dl/dparams dparams
-        dim = exog.shape[1]
-        hess_arr = np.empty((dim+1,dim+1))
         const_arr = a1*mu*(a1+y)/(mu+a1)**2
-        for i in range(dim):
-            for j in range(dim):
-                if j > i:
-                    continue
-                hess_arr[i,j] = np.sum(-exog[:,i,None] * exog[:,j,None] *
-                                       const_arr, axis=0)
-        tri_idx = np.triu_indices(dim, k=1)
-        hess_arr[tri_idx] = hess_arr.T[tri_idx]
+        hess_xx = -weighted_crossprod(exog, const_arr, dense=False)
 
         # for dl/dparams dalpha
         da1 = -alpha**-2
-        dldpda = -np.sum(mu*exog*(y-mu)*a1**2/(mu+a1)**2 , axis=0)
-        hess_arr[-1,:-1] = dldpda
-        hess_arr[:-1,-1] = dldpda
+        dldpda = -exog.T.dot(mu*(y-mu)*a1**2/(mu+a1)**2)
 
         # for dl/dalpha dalpha
         #NOTE: polygamma(1,x) is the trigamma function
@@ -2702,9 +2677,8 @@ class NegativeBinomial(CountModel):
         dada = (da2 * dalpha/da1 + da1**2 * (special.polygamma(1, a1+y) -
                     special.polygamma(1, a1) + 1/a1 - 1/(a1 + mu) +
                     (y - mu)/(mu + a1)**2)).sum()
-        hess_arr[-1,-1] = dada
 
-        return hess_arr
+        return bordered(hess_xx, dldpda, dada)
 
     #TODO: replace this with analytic where is it used?
     def score_obs(self, params):
@@ -3240,7 +3214,7 @@ class NegativeBinomialP(CountModel):
         if offset is None:
             offset = getattr(self, 'offset', 0)
 
-        fitted = np.dot(exog, params[:exog.shape[1]])
+        fitted = exog_dot(exog, params[:exog.shape[1]])
         linpred = fitted + exposure + offset
 
         if which == 'mean':
@@ -3267,7 +3241,7 @@ class NegativeBinomialP(CountModel):
 
 ### Results Class ###
 
-class DiscreteResults(base.LikelihoodModelResults):
+class DiscreteResults(SparseCovResultsMixin, base.LikelihoodModelResults):
     __doc__ = _discrete_results_docs % {"one_line_description" :
         "A results class for the discrete dependent variable models.",
         "extra_attr" : ""}
@@ -3282,6 +3256,10 @@ class DiscreteResults(base.LikelihoodModelResults):
         self._cache = resettable_cache()
         self.nobs = model.exog.shape[0]
         self.__dict__.update(mlefit.__dict__)
+        if 'normalized_cov_params' in self.__dict__:
+            # stored behind a property, it can be a SparseInverse
+            self.normalized_cov_params = self.__dict__.pop(
+                'normalized_cov_params')
 
         if not hasattr(self, 'cov_type'):
             # do this only if super, i.e. mlefit didn't already add cov_type
@@ -3410,7 +3388,7 @@ class DiscreteResults(base.LikelihoodModelResults):
 
     @cache_readonly
     def fittedvalues(self):
-        return np.dot(self.model.exog, self.params[:self.model.exog.shape[1]])
+        return self.model.exog.dot(self.params[:self.model.exog.shape[1]])
 
     @cache_readonly
     def aic(self):
@@ -2399,6 +2399,66 @@ def test_unchanging_degrees_of_freedom():
     assert_equal(res3.df_resid, res1.df_resid)
 
 
+@pytest.mark.parametrize('model_class, kwds', [
+    (Logit, {}),
+    (Poisson, {}),
+    (NegativeBinomial, {'loglike_method': 'nb2'}),
+    (NegativeBinomial, {'loglike_method': 'nb1'}),
+    (NegativeBinomial, {'loglike_method': 'geometric'})])
+def test_sparse_exog(model_class, kwds):
+    from scipy import sparse
+    from statsmodels.base._sparse import SparseInverse
+    from statsmodels.tools.grouputils import dummy_sparse
+    np.random.seed(987689)
+    nobs, n_groups = 600, 30
+    groups = np.random.randint(0, n_groups, size=nobs)
+    x = np.random.randn(nobs, 2)
+    linpred = 0.5 * x[:, 0] + 0.3 * np.random.randn(n_groups)[groups]
+    if model_class is Logit:
+        endog = (np.random.rand(nobs) < 1 / (1 + np.exp(-linpred))) * 1.
+    else:
+        # overdispersed counts, alpha = 0.5
+        endog = np.random.poisson(np.exp(linpred) *
+                                  np.random.gamma(2, 0.5, size=nobs))
+    exog = sparse.hstack((x, dummy_sparse(groups)), format='csr')
+
+    mod = model_class(endog, exog, **kwds)
+    mod_dense = model_class(endog, exog.toarray(), **kwds)
+    assert_(sparse.issparse(mod.exog))
+    assert_equal(mod.df_model, mod_dense.df_model)
+    assert_equal(mod.df_resid, mod_dense.df_resid)
+
+    # newton can step into negative alpha in nb1 and nb2
+    method = 'bfgs' if kwds.get('loglike_method', '').startswith('nb') \
+        else 'newton'
+    res_dense = mod_dense.fit(method=method, maxiter=1000, disp=0)
+    res = mod.fit(method=method, maxiter=1000, disp=0)
+    assert_allclose(res.params, res_dense.params, rtol=1e-6, atol=1e-8)
+    # the inverse hessian is computed lazily, bse uses only its diagonal
+    assert_(isinstance(res._results._normalized_cov_params, SparseInverse))
+    assert_allclose(res.bse, res_dense.bse, rtol=1e-6)
+    assert_(isinstance(res._results._normalized_cov_params, SparseInverse))
+    assert_allclose(res.cov_params(), res_dense.cov_params(), rtol=1e-5,
+                    atol=1e-12)
+    res_hc = mod.fit(method=method, maxiter=1000, disp=0, cov_type='HC0')
+    res_hc_dense = mod_dense.fit(method=method, maxiter=1000, disp=0,
+                                 cov_type='HC0')
+    assert_allclose(res_hc.bse, res_hc_dense.bse, rtol=1e-5)
+    assert_allclose(res.llf, res_dense.llf, rtol=1e-12)
+
+    # fit resets the parameter transformation of NegativeBinomial
+    params = res_dense.params
+    assert_allclose(mod.loglike(params), mod_dense.loglike(params),
+                    rtol=1e-12)
+    assert_allclose(mod.score(params), mod_dense.score(params), atol=1e-8)
+    hessian = mod.hessian(params)
+    assert_(sparse.issparse(hessian))
+    assert_allclose(hessian.toarray(), mod_dense.hessian(params),
+                    rtol=1e-10)
+    assert_allclose(res.fittedvalues, res_dense.fittedvalues, rtol=1e-6,
+                    atol=1e-7)
+
+
 if __name__ == "__main__":
     import pytest
     pytest.main([__file__, '-vvs', '-x', '--pdb'])
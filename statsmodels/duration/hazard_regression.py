@@ -5,6 +5,7 @@ from statsmodels.tools.decorators import cache_readonly
 from scipy.optimize import brent
 from statsmodels.compat.numpy import np_matrix_rank
 from statsmodels.compat.numpy import np_new_unique
+from statsmodels.tools.tools import _row_chunks
 
 """
 Implementation of proportional hazards regression models for duration
@@ -79,6 +80,68 @@ _predict_cov_params_docstring = """
         otherwise optional."""
 
 
+def _risk_set_index(ufailt, time, entry):
+    """
+    Range of the unique failure times at which subjects are at risk
+
+    A subject is in the risk set at the failure times t with
+    entry < t <= time, so that records of the same subject in
+    counting process form, (start, stop] intervals, are never in the
+    same risk set.  Subjects with entry == time are in the risk set only
+    at their own time.
+
+    Returns
+    -------
+    enter_ix : ndarray
+        Index of the last unique failure time in the risk interval
+    exit_ix : ndarray
+        Index of the first unique failure time in the risk interval.
+        The subject is in no risk set if exit_ix > enter_ix.
+    """
+    enter_ix = np.searchsorted(ufailt, time, "right") - 1
+    exit_ix = np.where(entry < time,
+                       np.searchsorted(ufailt, entry, "right"),
+                       np.searchsorted(ufailt, entry))
+    return enter_ix, exit_ix
+
+
+def _risk_set_sums(values, enter_ix, exit_ix, nuft):
+    """
+    Sums of the rows of `values` over the risk set at each failure time
+
+    The sums are reverse cumulative sums of the values of the subjects
+    entering the risk set minus those of the subjects exiting the risk
+    set, so the cost is linear in the number of subjects.
+    """
+    if values.ndim == 2:
+        return np.column_stack([_risk_set_sums(v, enter_ix, exit_ix, nuft)
+                                for v in values.T])
+    enter = np.bincount(enter_ix, weights=values, minlength=nuft)
+    exit = np.bincount(exit_ix, weights=values, minlength=nuft + 1)
+    return (np.cumsum(enter[::-1])[::-1] -
+            np.cumsum(exit[::-1])[::-1][1:nuft + 1])
+
+
+def _interval_sums(values, enter_ix, exit_ix):
+    """
+    Sums of `values` over the failure times at which each subject is at
+    risk, values[exit_ix[j]:enter_ix[j] + 1] for subject j
+    """
+    csum = np.concatenate((np.zeros((1,) + values.shape[1:]),
+                           np.cumsum(values, axis=0)))
+    return csum[enter_ix + 1] - csum[exit_ix]
+
+
+def _weighted_cross(exog, weights):
+    """
+    exog' diag(weights) exog accumulated over chunks of rows
+    """
+    k = exog.shape[1]
+    cross = np.zeros((k, k))
+    for rows in _row_chunks(exog.shape[0], k):
+        cross += np.dot(exog[rows].T * weights[rows], exog[rows])
+    return cross
+
 
 class PHSurvivalTime(object):
 
@@ -105,10 +168,10 @@ class PHSurvivalTime(object):
             observations are in a single stratum.
         entry : array_like
             Entry (left truncation) times.  The observation is not
-            part of the risk set for times before the entry time.  If
-            None, the entry time is treated as being zero, which
-            gives no left truncation.  The entry time must be less
-            than or equal to `time`.
+            part of the risk set for times at or before the entry
+            time.  If None, the entry time is treated as being zero,
+            which gives no left truncation.  The entry time must be
+            less than or equal to `time`.
         offset : array-like
             An optional array of offsets
         """
@@ -139,12 +202,10 @@ class PHSurvivalTime(object):
                              "after event or censoring times")
 
         # Get the row indices for the cases in each stratum
-        stu = np.unique(strata)
-        #sth = {x: [] for x in stu} # needs >=2.7
-        sth = dict([(x, []) for x in stu])
-        for i,k in enumerate(strata):
-            sth[k].append(i)
-        stratum_rows = [np.asarray(sth[k], dtype=np.int32) for k in stu]
+        stu, strata_ix = np.unique(strata, return_inverse=True)
+        order = np.argsort(strata_ix, kind='mergesort')
+        splits = np.cumsum(np.bincount(strata_ix))[:-1]
+        stratum_rows = np.split(order.astype(np.int32), splits)
         stratum_names = stu
 
         # Remove strata with no events
@@ -157,29 +218,17 @@ class PHSurvivalTime(object):
         nstrat = len(stratum_rows)
         self.nstrat = nstrat
 
-        # Remove subjects whose entry time occurs after the last event
-        # in their stratum.
-        for stx,ix in enumerate(stratum_rows):
-            last_failure = max(time[ix][status[ix] == 1])
-
-            # Stata uses < here, R uses <=
-            ii = [i for i,t in enumerate(entry[ix]) if
-                  t <= last_failure]
-            stratum_rows[stx] = stratum_rows[stx][ii]
-
-        # Remove subjects who are censored before the first event in
-        # their stratum.
-        for stx,ix in enumerate(stratum_rows):
-            first_failure = min(time[ix][status[ix] == 1])
-
-            ii = [i for i,t in enumerate(time[ix]) if
-                  t >= first_failure]
-            stratum_rows[stx] = stratum_rows[stx][ii]
-
-        # Order by time within each stratum
-        for stx,ix in enumerate(stratum_rows):
-            ii = np.argsort(time[ix])
-            stratum_rows[stx] = stratum_rows[stx][ii]
+        # Remove subjects that are not in the risk set at any failure
+        # time in their stratum, these are subjects whose entry time
+        # occurs after the last event and subjects who are censored
+        # before the first event.  Order by time within each stratum.
+        self.ufailt = []
+        for stx, ix in enumerate(stratum_rows):
+            uft = np.unique(time[ix][status[ix] == 1])
+            enter_ix, exit_ix = _risk_set_index(uft, time[ix], entry[ix])
+            ix = ix[exit_ix <= enter_ix]
+            stratum_rows[stx] = ix[np.argsort(time[ix], kind='mergesort')]
+            self.ufailt.append(uft)
 
         if offset is not None:
             self.offset_s = []
@@ -205,60 +254,78 @@ class PHSurvivalTime(object):
         self.stratum_rows = stratum_rows
         self.stratum_names = stratum_names
 
-        # Precalculate some indices needed to fit Cox models.
-        # Distinct failure times within a stratum are always taken to
-        # be sorted in ascending order.
+        # Precalculate the indices needed to fit Cox models.  Distinct
+        # failure times within a stratum are always taken to be sorted
+        # in ascending order.
         #
-        # ufailt_ix[stx][k] is a list of indices for subjects who fail
-        # at the k^th sorted unique failure time in stratum stx
+        # risk_enter_ix[stx][j] is the index of the last unique failure
+        # time in stratum stx at which subject j is in the risk set
         #
-        # risk_enter[stx][k] is a list of indices for subjects who
-        # enter the risk set at the k^th sorted unique failure time in
-        # stratum stx
+        # risk_exit_ix[stx][j] is the index of the first unique failure
+        # time in stratum stx at which subject j is in the risk set
         #
-        # risk_exit[stx][k] is a list of indices for subjects who exit
-        # the risk set at the k^th sorted unique failure time in
-        # stratum stx
-        self.ufailt_ix, self.risk_enter, self.risk_exit, self.ufailt =\
-            [], [], [], []
+        # fail_ix[stx] contains the indices of the subjects who fail in
+        # stratum stx, ordered by failure time
+        #
+        # tie_frac[stx][i] is r / m for the subject fail_ix[stx][i] that
+        # is the r^th (counting from zero) of the m subjects who fail at
+        # the same time, this is used by the Efron method
+        self.risk_enter_ix, self.risk_exit_ix = [], []
+        self.fail_ix, self.tie_frac = [], []
 
         for stx in range(self.nstrat):
+            enter_ix, exit_ix = _risk_set_index(self.ufailt[stx],
+                                                self.time_s[stx],
+                                                self.entry_s[stx])
+            fail_ix = np.flatnonzero(self.status_s[stx] == 1)
+            fail_time_ix = enter_ix[fail_ix]
+            first = np.searchsorted(fail_time_ix, fail_time_ix)
+            nfail = np.bincount(fail_time_ix)[fail_time_ix]
+            tie_frac = (np.arange(len(fail_ix)) - first) / nfail
+
+            self.risk_enter_ix.append(enter_ix)
+            self.risk_exit_ix.append(exit_ix)
+            self.fail_ix.append(fail_ix)
+            self.tie_frac.append(tie_frac)
+
+    def _split_index(self, index, nuft):
+        # the positions of the subjects for each unique failure time
+        order = np.argsort(index, kind='mergesort').astype(np.int32)
+        counts = np.bincount(index, minlength=nuft)[:nuft]
+        return np.split(order[:counts.sum()], np.cumsum(counts)[:-1])
 
-            # All failure times
-            ift = np.flatnonzero(self.status_s[stx] == 1)
-            ft = self.time_s[stx][ift]
-
-            # Unique failure times
-            uft = np.unique(ft)
-            nuft = len(uft)
-
-            # Indices of cases that fail at each unique failure time
-            #uft_map = {x:i for i,x in enumerate(uft)} # requires >=2.7
-            uft_map = dict([(x, i) for i,x in enumerate(uft)]) # 2.6
-            uft_ix = [[] for k in range(nuft)]
-            for ix,ti in zip(ift,ft):
-                uft_ix[uft_map[ti]].append(ix)
-
-            # Indices of cases (failed or censored) that enter the
-            # risk set at each unique failure time.
-            risk_enter1 = [[] for k in range(nuft)]
-            for i,t in enumerate(self.time_s[stx]):
-                ix = np.searchsorted(uft, t, "right") - 1
-                if ix >= 0:
-                    risk_enter1[ix].append(i)
-
-            # Indices of cases (failed or censored) that exit the
-            # risk set at each unique failure time.
-            risk_exit1 = [[] for k in range(nuft)]
-            for i,t in enumerate(self.entry_s[stx]):
-                ix = np.searchsorted(uft, t)
-                risk_exit1[ix].append(i)
+    @cache_readonly
+    def ufailt_ix(self):
+        """
+        ufailt_ix[stx][k] is a list of indices for subjects who fail at
+        the k^th sorted unique failure time in stratum stx
+        """
+        ufailt_ix = []
+        for stx, fail_ix in enumerate(self.fail_ix):
+            fail_time_ix = self.risk_enter_ix[stx][fail_ix]
+            uft_ix = self._split_index(fail_time_ix, len(self.ufailt[stx]))
+            ufailt_ix.append([fail_ix[ix] for ix in uft_ix])
+        return ufailt_ix
 
-            self.ufailt.append(uft)
-            self.ufailt_ix.append([np.asarray(x, dtype=np.int32) for x in uft_ix])
-            self.risk_enter.append([np.asarray(x, dtype=np.int32) for x in risk_enter1])
-            self.risk_exit.append([np.asarray(x, dtype=np.int32) for x in risk_exit1])
+    @cache_readonly
+    def risk_enter(self):
+        """
+        risk_enter[stx][k] is a list of indices for subjects who enter
+        the risk set at the k^th sorted unique failure time in stratum
+        stx, when iterating backward through the failure times
+        """
+        return [self._split_index(ix, len(uft))
+                for ix, uft in zip(self.risk_enter_ix, self.ufailt)]
 
+    @cache_readonly
+    def risk_exit(self):
+        """
+        risk_exit[stx][k] is a list of indices for subjects who exit the
+        risk set at the k^th sorted unique failure time in stratum stx,
+        when iterating backward through the failure times
+        """
+        return [self._split_index(ix, len(uft))
+                for ix, uft in zip(self.risk_exit_ix, self.ufailt)]
 
 
 class PHReg(model.LikelihoodModel):
@@ -298,6 +365,13 @@ class PHReg(model.LikelihoodModel):
 
     `endog`, `event`, `strata`, `entry`, and the first dimension
     of `exog` all must have the same length
+
+    Time-varying covariates are handled with data in counting process
+    form, using one record for each interval (`entry`, `endog`] over
+    which the covariates of a subject are constant.  A record is in the
+    risk set at the failure times t with entry < t <= endog.  Standard
+    errors that account for the multiple records of a subject are
+    obtained using the subject labels as `groups` in `fit`.
     """
 
     def __init__(self, endog, exog, status=None, entry=None,
@@ -561,48 +635,96 @@ class PHReg(model.LikelihoodModel):
         else:
             return self.efron_hessian(params)
 
-    def breslow_loglike(self, params):
+    def _partial_likelihood(self, params, ties, deriv=0):
         """
-        Returns the value of the log partial likelihood function
-        evaluated at `params`, using the Breslow method to handle tied
-        times.
+        Returns the log partial likelihood and, if `deriv` is 1 or 2,
+        its gradient and Hessian evaluated at `params`.
+
+        The sums over the risk sets at all unique failure times are
+        reverse cumulative sums over the time-ordered data and the sums
+        of the terms for the failure times are accumulated as weighted
+        sums over the subjects, so that the cost is O(n p^2) for n
+        subjects and p covariates.  The Breslow method is the Efron
+        method with all the tie fractions set to zero.
         """
 
         surv = self.surv
+        efron = (ties == "efron")
+        k_params = len(params)
 
         like = 0.
+        grad = np.zeros(k_params)
+        hess = np.zeros((k_params, k_params))
 
         # Loop over strata
         for stx in range(surv.nstrat):
 
-            uft_ix = surv.ufailt_ix[stx]
             exog_s = surv.exog_s[stx]
-            nuft = len(uft_ix)
+            enter_ix = surv.risk_enter_ix[stx]
+            exit_ix = surv.risk_exit_ix[stx]
+            fail_ix = surv.fail_ix[stx]
+            fail_time_ix = enter_ix[fail_ix]
+            nuft = len(surv.ufailt[stx])
 
             linpred = np.dot(exog_s, params)
             if surv.offset_s is not None:
                 linpred += surv.offset_s[stx]
             linpred -= linpred.max()
             e_linpred = np.exp(linpred)
+            e_linpred_f = e_linpred[fail_ix]
+
+            # Risk set sums and the denominators of all failures
+            xp0 = _risk_set_sums(e_linpred, enter_ix, exit_ix, nuft)
+            c0 = xp0[fail_time_ix]
+            if efron:
+                tie_frac = surv.tie_frac[stx]
+                xp0f = np.bincount(fail_time_ix, weights=e_linpred_f,
+                                   minlength=nuft)
+                c0 = c0 - tie_frac * xp0f[fail_time_ix]
+
+            like += linpred[fail_ix].sum() - np.log(c0).sum()
+            if deriv == 0:
+                continue
+
+            # Sum of the risk set terms at each failure time as a
+            # weighted sum over the subjects at risk
+            exog_f = exog_s[fail_ix, :]
+            wt = np.bincount(fail_time_ix, weights=1 / c0, minlength=nuft)
+            wt = e_linpred * _interval_sums(wt, enter_ix, exit_ix)
+            grad += exog_f.sum(0) - np.dot(wt, exog_s)
+            if efron:
+                wtf = np.bincount(fail_time_ix, weights=tie_frac / c0,
+                                  minlength=nuft)
+                wtf = e_linpred_f * wtf[fail_time_ix]
+                grad += np.dot(wtf, exog_f)
+            if deriv == 1:
+                continue
+
+            xp1 = _risk_set_sums(e_linpred[:, None] * exog_s, enter_ix,
+                                 exit_ix, nuft)
+            mat = xp1[fail_time_ix, :]
+            if efron:
+                xp1f = _risk_set_sums(e_linpred_f[:, None] * exog_f,
+                                      fail_time_ix, fail_time_ix, nuft)
+                mat -= tie_frac[:, None] * xp1f[fail_time_ix, :]
+                hess -= _weighted_cross(exog_f, wtf)
+            mat /= c0[:, None]
+            hess += _weighted_cross(exog_s, wt) - np.dot(mat.T, mat)
+
+        if deriv == 0:
+            return like
+        elif deriv == 1:
+            return like, grad
+        return like, grad, -hess
 
-            xp0 = 0.
-
-            # Iterate backward through the unique failure times.
-            for i in range(nuft)[::-1]:
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_enter[stx][i]
-                xp0 += e_linpred[ix].sum()
-
-                # Account for all cases that fail at this point.
-                ix = uft_ix[i]
-                like += (linpred[ix] - np.log(xp0)).sum()
-
-                # Update for cases leaving the risk set.
-                ix = surv.risk_exit[stx][i]
-                xp0 -= e_linpred[ix].sum()
+    def breslow_loglike(self, params):
+        """
+        Returns the value of the log partial likelihood function
+        evaluated at `params`, using the Breslow method to handle tied
+        times.
+        """
 
-        return like
+        return self._partial_likelihood(params, "breslow")
 
     def efron_loglike(self, params):
         """
@@ -611,46 +733,7 @@ class PHReg(model.LikelihoodModel):
         times.
         """
 
-        surv = self.surv
-
-        like = 0.
-
-        # Loop over strata
-        for stx in range(surv.nstrat):
-
-            # exog and linear predictor for this stratum
-            exog_s = surv.exog_s[stx]
-            linpred = np.dot(exog_s, params)
-            if surv.offset_s is not None:
-                linpred += surv.offset_s[stx]
-            linpred -= linpred.max()
-            e_linpred = np.exp(linpred)
-
-            xp0 = 0.
-
-            # Iterate backward through the unique failure times.
-            uft_ix = surv.ufailt_ix[stx]
-            nuft = len(uft_ix)
-            for i in range(nuft)[::-1]:
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_enter[stx][i]
-                xp0 += e_linpred[ix].sum()
-                xp0f = e_linpred[uft_ix[i]].sum()
-
-                # Account for all cases that fail at this point.
-                ix = uft_ix[i]
-                like += linpred[ix].sum()
-
-                m = len(ix)
-                J = np.arange(m, dtype=np.float64) / m
-                like -= np.log(xp0 - J*xp0f).sum()
-
-                # Update for cases leaving the risk set.
-                ix = surv.risk_exit[stx][i]
-                xp0 -= e_linpred[ix].sum()
-
-        return like
+        return self._partial_likelihood(params, "efron")
 
     def breslow_gradient(self, params):
         """
@@ -658,52 +741,7 @@ class PHReg(model.LikelihoodModel):
         Breslow method to handle tied times.
         """
 
-        surv = self.surv
-
-        grad = 0.
-
-        # Loop over strata
-        for stx in range(surv.nstrat):
-
-            # Indices of subjects in the stratum
-            strat_ix = surv.stratum_rows[stx]
-
-            # Unique failure times in the stratum
-            uft_ix = surv.ufailt_ix[stx]
-            nuft = len(uft_ix)
-
-            # exog and linear predictor for the stratum
-            exog_s = surv.exog_s[stx]
-            linpred = np.dot(exog_s, params)
-            if surv.offset_s is not None:
-                linpred += surv.offset_s[stx]
-            linpred -= linpred.max()
-            e_linpred = np.exp(linpred)
-
-            xp0, xp1 = 0., 0.
-
-            # Iterate backward through the unique failure times.
-            for i in range(nuft)[::-1]:
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_enter[stx][i]
-                if len(ix) > 0:
-                    v = exog_s[ix,:]
-                    xp0 += e_linpred[ix].sum()
-                    xp1 += (e_linpred[ix][:,None] * v).sum(0)
-
-                # Account for all cases that fail at this point.
-                ix = uft_ix[i]
-                grad += (exog_s[ix,:] - xp1 / xp0).sum(0)
-
-                # Update for cases leaving the risk set.
-                ix = surv.risk_exit[stx][i]
-                if len(ix) > 0:
-                    v = exog_s[ix,:]
-                    xp0 -= e_linpred[ix].sum()
-                    xp1 -= (e_linpred[ix][:,None] * v).sum(0)
-
-        return grad
+        return self._partial_likelihood(params, "breslow", deriv=1)[1]
 
     def efron_gradient(self, params):
         """
@@ -711,62 +749,7 @@ class PHReg(model.LikelihoodModel):
         at `params`, using the Efron method to handle tied times.
         """
 
-        surv = self.surv
-
-        grad = 0.
-
-        # Loop over strata
-        for stx in range(surv.nstrat):
-
-            # Indices of cases in the stratum
-            strat_ix = surv.stratum_rows[stx]
-
-            # exog and linear predictor of the stratum
-            exog_s = surv.exog_s[stx]
-            linpred = np.dot(exog_s, params)
-            if surv.offset_s is not None:
-                linpred += surv.offset_s[stx]
-            linpred -= linpred.max()
-            e_linpred = np.exp(linpred)
-
-            xp0, xp1 = 0., 0.
-
-            # Iterate backward through the unique failure times.
-            uft_ix = surv.ufailt_ix[stx]
-            nuft = len(uft_ix)
-            for i in range(nuft)[::-1]:
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_enter[stx][i]
-                if len(ix) > 0:
-                    v = exog_s[ix,:]
-                    xp0 += e_linpred[ix].sum()
-                    xp1 += (e_linpred[ix][:,None] * v).sum(0)
-                ixf = uft_ix[i]
-                if len(ixf) > 0:
-                    v = exog_s[ixf,:]
-                    xp0f = e_linpred[ixf].sum()
-                    xp1f = (e_linpred[ixf][:,None] * v).sum(0)
-
-                    # Consider all cases that fail at this point.
-                    grad += v.sum(0)
-
-                    m = len(ixf)
-                    J = np.arange(m, dtype=np.float64) / m
-                    numer = xp1 - np.outer(J, xp1f)
-                    denom = xp0 - np.outer(J, xp0f)
-                    ratio = numer / denom
-                    rsum = ratio.sum(0)
-                    grad -= rsum
-
-                # Update for cases leaving the risk set.
-                ix = surv.risk_exit[stx][i]
-                if len(ix) > 0:
-                    v = exog_s[ix,:]
-                    xp0 -= e_linpred[ix].sum()
-                    xp1 -= (e_linpred[ix][:,None] * v).sum(0)
-
-        return grad
+        return self._partial_likelihood(params, "efron", deriv=1)[1]
 
     def breslow_hessian(self, params):
         """
@@ -774,51 +757,7 @@ class PHReg(model.LikelihoodModel):
         `params`, using the Breslow method to handle tied times.
         """
 
-        surv = self.surv
-
-        hess = 0.
-
-        # Loop over strata
-        for stx in range(surv.nstrat):
-
-            uft_ix = surv.ufailt_ix[stx]
-            nuft = len(uft_ix)
-
-            exog_s = surv.exog_s[stx]
-
-            linpred = np.dot(exog_s, params)
-            if surv.offset_s is not None:
-                linpred += surv.offset_s[stx]
-            linpred -= linpred.max()
-            e_linpred = np.exp(linpred)
-
-            xp0, xp1, xp2 = 0., 0., 0.
-
-            # Iterate backward through the unique failure times.
-            for i in range(nuft)[::-1]:
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_enter[stx][i]
-                if len(ix) > 0:
-                    xp0 += e_linpred[ix].sum()
-                    v = exog_s[ix,:]
-                    xp1 += (e_linpred[ix][:,None] * v).sum(0)
-                    elx = e_linpred[ix]
-                    xp2 += np.einsum("ij,ik,i->jk", v, v, elx)
-
-                # Account for all cases that fail at this point.
-                m = len(uft_ix[i])
-                hess += m*(xp2 / xp0  - np.outer(xp1, xp1) / xp0**2)
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_exit[stx][i]
-                if len(ix) > 0:
-                    xp0 -= e_linpred[ix].sum()
-                    v = exog_s[ix,:]
-                    xp1 -= (e_linpred[ix][:,None] * v).sum(0)
-                    elx = e_linpred[ix]
-                    xp2 -= np.einsum("ij,ik,i->jk", v, v, elx)
-        return -hess
+        return self._partial_likelihood(params, "breslow", deriv=2)[2]
 
     def efron_hessian(self, params):
         """
@@ -827,64 +766,7 @@ class PHReg(model.LikelihoodModel):
         times.
         """
 
-        surv = self.surv
-
-        hess = 0.
-
-        # Loop over strata
-        for stx in range(surv.nstrat):
-
-            exog_s = surv.exog_s[stx]
-
-            linpred = np.dot(exog_s, params)
-            if surv.offset_s is not None:
-                linpred += surv.offset_s[stx]
-            linpred -= linpred.max()
-            e_linpred = np.exp(linpred)
-
-            xp0, xp1, xp2 = 0., 0., 0.
-
-            # Iterate backward through the unique failure times.
-            uft_ix = surv.ufailt_ix[stx]
-            nuft = len(uft_ix)
-            for i in range(nuft)[::-1]:
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_enter[stx][i]
-                if len(ix) > 0:
-                    xp0 += e_linpred[ix].sum()
-                    v = exog_s[ix,:]
-                    xp1 += (e_linpred[ix][:,None] * v).sum(0)
-                    elx = e_linpred[ix]
-                    xp2 += np.einsum("ij,ik,i->jk", v, v, elx)
-
-                ixf = uft_ix[i]
-                if len(ixf) > 0:
-                    v = exog_s[ixf,:]
-                    xp0f = e_linpred[ixf].sum()
-                    xp1f = (e_linpred[ixf][:,None] * v).sum(0)
-                    elx = e_linpred[ixf]
-                    xp2f = np.einsum("ij,ik,i->jk", v, v, elx)
-
-                # Account for all cases that fail at this point.
-                m = len(uft_ix[i])
-                J = np.arange(m, dtype=np.float64) / m
-                c0 = xp0 - J*xp0f
-                hess += xp2 * np.sum(1 / c0)
-                hess -= xp2f * np.sum(J / c0)
-                mat = (xp1[None, :] - np.outer(J, xp1f)) / c0[:, None]
-                hess -= np.einsum("ij,ik->jk", mat, mat)
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_exit[stx][i]
-                if len(ix) > 0:
-                    xp0 -= e_linpred[ix].sum()
-                    v = exog_s[ix,:]
-                    xp1 -= (e_linpred[ix][:,None] * v).sum(0)
-                    elx = e_linpred[ix]
-                    xp2 -= np.einsum("ij,ik,i->jk", v, v, elx)
-
-        return -hess
+        return self._partial_likelihood(params, "efron", deriv=2)[2]
 
     def robust_covariance(self, params):
         """
@@ -957,65 +839,42 @@ class PHReg(model.LikelihoodModel):
 
         surv = self.surv
 
-        score_resid = np.zeros(self.exog.shape, dtype=np.float64)
-
-        # Use to set undefined values to NaN.
-        mask = np.zeros(self.exog.shape[0], dtype=np.int32)
+        score_resid = np.nan * np.ones(self.exog.shape, dtype=np.float64)
 
         w_avg = self.weighted_covariate_averages(params)
 
         # Loop over strata
         for stx in range(surv.nstrat):
 
-            uft_ix = surv.ufailt_ix[stx]
             exog_s = surv.exog_s[stx]
-            nuft = len(uft_ix)
+            enter_ix = surv.risk_enter_ix[stx]
+            exit_ix = surv.risk_exit_ix[stx]
+            fail_ix = surv.fail_ix[stx]
+            fail_time_ix = enter_ix[fail_ix]
+            nuft = len(surv.ufailt[stx])
             strat_ix = surv.stratum_rows[stx]
 
-            xp0 = 0.
-
             linpred = np.dot(exog_s, params)
             if surv.offset_s is not None:
                 linpred += surv.offset_s[stx]
             linpred -= linpred.max()
             e_linpred = np.exp(linpred)
 
-            at_risk_ix = set([])
-
-            # Iterate backward through the unique failure times.
-            for i in range(nuft)[::-1]:
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_enter[stx][i]
-                at_risk_ix |= set(ix)
-                xp0 += e_linpred[ix].sum()
-
-                atr_ix = list(at_risk_ix)
-                leverage = exog_s[atr_ix, :] - w_avg[stx][i, :]
+            # The increments in the cumulative hazard
+            xp0 = _risk_set_sums(e_linpred, enter_ix, exit_ix, nuft)
+            dchaz = np.bincount(fail_time_ix, minlength=nuft) / xp0
 
-                # Event indicators
-                d = np.zeros(exog_s.shape[0])
-                d[uft_ix[i]] = 1
+            # Sums of the leverages times the martingale residual
+            # pieces over the failure times at which a subject is at
+            # risk
+            resid = exog_s * _interval_sums(dchaz, enter_ix, exit_ix)[:, None]
+            resid -= _interval_sums(w_avg[stx] * dchaz[:, None], enter_ix,
+                                    exit_ix)
+            resid *= -e_linpred[:, None]
+            resid[fail_ix, :] += (exog_s[fail_ix, :] -
+                                  w_avg[stx][fail_time_ix, :])
 
-                # The increment in the cumulative hazard
-                dchaz = len(uft_ix[i]) / xp0
-
-                # Piece of the martingale residual
-                mrp = d[atr_ix] - e_linpred[atr_ix] * dchaz
-
-                # Update the score residuals
-                ii = strat_ix[atr_ix]
-                score_resid[ii,:] += leverage * mrp[:, None]
-                mask[ii] = 1
-
-                # Update for cases leaving the risk set.
-                ix = surv.risk_exit[stx][i]
-                at_risk_ix -= set(ix)
-                xp0 -= e_linpred[ix].sum()
-
-        jj = np.flatnonzero(mask == 0)
-        if len(jj) > 0:
-            score_resid[jj, :] = np.nan
+            score_resid[strat_ix, :] = resid
 
         return score_resid
 
@@ -1045,17 +904,14 @@ class PHReg(model.LikelihoodModel):
         surv = self.surv
 
         averages = []
-        xp0, xp1 = 0., 0.
 
         # Loop over strata
         for stx in range(surv.nstrat):
 
-            uft_ix = surv.ufailt_ix[stx]
             exog_s = surv.exog_s[stx]
-            nuft = len(uft_ix)
-
-            average_s = np.zeros((len(uft_ix), exog_s.shape[1]),
-                                  dtype=np.float64)
+            enter_ix = surv.risk_enter_ix[stx]
+            exit_ix = surv.risk_exit_ix[stx]
+            nuft = len(surv.ufailt[stx])
 
             linpred = np.dot(exog_s, params)
             if surv.offset_s is not None:
@@ -1063,22 +919,10 @@ class PHReg(model.LikelihoodModel):
             linpred -= linpred.max()
             e_linpred = np.exp(linpred)
 
-            # Iterate backward through the unique failure times.
-            for i in range(nuft)[::-1]:
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_enter[stx][i]
-                xp0 += e_linpred[ix].sum()
-                xp1 += np.dot(e_linpred[ix], exog_s[ix, :])
-
-                average_s[i, :] = xp1 / xp0
-
-                # Update for cases leaving the risk set.
-                ix = surv.risk_exit[stx][i]
-                xp0 -= e_linpred[ix].sum()
-                xp1 -= np.dot(e_linpred[ix], exog_s[ix, :])
-
-            averages.append(average_s)
+            xp0 = _risk_set_sums(e_linpred, enter_ix, exit_ix, nuft)
+            xp1 = _risk_set_sums(e_linpred[:, None] * exog_s, enter_ix,
+                                 exit_ix, nuft)
+            averages.append(xp1 / xp0[:, None])
 
         return averages
 
@@ -1113,32 +957,19 @@ class PHReg(model.LikelihoodModel):
         for stx in range(surv.nstrat):
 
             uft = surv.ufailt[stx]
-            uft_ix = surv.ufailt_ix[stx]
             exog_s = surv.exog_s[stx]
-            nuft = len(uft_ix)
+            enter_ix = surv.risk_enter_ix[stx]
+            nuft = len(uft)
 
             linpred = np.dot(exog_s, params)
             if surv.offset_s is not None:
                 linpred += surv.offset_s[stx]
             e_linpred = np.exp(linpred)
 
-            xp0 = 0.
-            h0 = np.zeros(nuft, dtype=np.float64)
-
-            # Iterate backward through the unique failure times.
-            for i in range(nuft)[::-1]:
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_enter[stx][i]
-                xp0 += e_linpred[ix].sum()
-
-                # Account for all cases that fail at this point.
-                ix = uft_ix[i]
-                h0[i] = len(ix) / xp0
-
-                # Update for cases leaving the risk set.
-                ix = surv.risk_exit[stx][i]
-                xp0 -= e_linpred[ix].sum()
+            xp0 = _risk_set_sums(e_linpred, enter_ix,
+                                 surv.risk_exit_ix[stx], nuft)
+            nfail = np.bincount(enter_ix[surv.fail_ix[stx]], minlength=nuft)
+            h0 = nfail / xp0
 
             cumhaz = np.cumsum(h0) - h0
             current_strata_surv = np.exp(-cumhaz)
@@ -417,6 +417,80 @@ class TestPHReg(object):
                 llf_sm = plf(sm_result.params)
                 assert_equal(np.sign(llf_sm - llf_r), 1)
 
+    @pytest.mark.parametrize('ties', ['breslow', 'efron'])
+    def test_partial_likelihood_ties(self, ties):
+        # Compare to a direct evaluation over the risk sets, with many
+        # ties, entry times and strata
+        np.random.seed(4324)
+        n = 300
+        exog = np.random.normal(size=(n, 3))
+        time = np.ceil(10 * np.random.uniform(size=n))
+        status = np.random.randint(0, 2, n)
+        entry = np.floor(time * np.random.uniform(size=n))
+        strata = np.random.randint(0, 3, n)
+        offset = np.random.normal(scale=0.1, size=n)
+        params = np.r_[0.2, -0.1, 0.3]
+
+        mod = PHReg(time, exog, status, entry=entry, strata=strata,
+                    offset=offset, ties=ties)
+
+        linpred = np.dot(exog, params) + offset
+        llf = 0.
+        for s in range(3):
+            for t in np.unique(time[(strata == s) & (status == 1)]):
+                fail = (strata == s) & (status == 1) & (time == t)
+                risk = (strata == s) & (entry < t) & (time >= t)
+                xp0 = np.exp(linpred[risk]).sum()
+                xp0f = np.exp(linpred[fail]).sum()
+                m = fail.sum()
+                frac = np.arange(m) / m if ties == 'efron' else np.zeros(m)
+                llf += linpred[fail].sum() - np.log(xp0 - frac * xp0f).sum()
+        assert_allclose(mod.loglike(params), llf, rtol=1e-10)
+
+        from statsmodels.tools.numdiff import approx_fprime
+        score = approx_fprime(params, mod.loglike, centered=True)
+        assert_allclose(mod.score(params), score, rtol=1e-6)
+        hess = approx_fprime(params, mod.score, centered=True)
+        assert_allclose(mod.hessian(params), hess, rtol=1e-6)
+
+        if ties == 'breslow':
+            # the score residuals use the Breslow hazard increments
+            rslt = mod.fit()
+            score_resid = rslt.score_residuals
+            assert_allclose(score_resid.sum(0), 0, atol=1e-5)
+
+    @pytest.mark.parametrize('ties', ['breslow', 'efron'])
+    def test_counting_process(self, ties):
+        # Splitting the follow-up time of the subjects into intervals
+        # does not change the fit, also if the split points are
+        # failure times
+        np.random.seed(8734)
+        n = 200
+        exog = np.random.normal(size=(n, 2))
+        time = np.ceil(20 * np.random.uniform(size=n))
+        status = np.random.randint(0, 2, n)
+        split = np.floor(time * np.random.uniform(size=n))
+
+        mod1 = PHReg(time, exog, status, ties=ties)
+        rslt1 = mod1.fit()
+
+        ii = np.flatnonzero(split > 0)
+        time2 = np.r_[time, split[ii]]
+        entry2 = np.r_[split, np.zeros(len(ii))]
+        status2 = np.r_[status, np.zeros(len(ii))]
+        exog2 = np.r_[exog, exog[ii]]
+        groups = np.r_[np.arange(n), ii]
+        mod2 = PHReg(time2, exog2, status2, entry=entry2, ties=ties)
+        rslt2 = mod2.fit(groups=groups)
+
+        assert_allclose(rslt2.params, rslt1.params, rtol=1e-6)
+        assert_allclose(mod2.hessian(rslt1.params),
+                        mod1.hessian(rslt1.params), rtol=1e-8)
+
+        # robust standard errors for the records of the same subject
+        rslt1 = mod1.fit(groups=np.arange(n))
+        assert_allclose(rslt2.bse, rslt1.bse, rtol=1e-5)
+
 
 cur_dir = os.path.dirname(os.path.abspath(__file__))
 rdir = os.path.join(cur_dir, 'results')
@@ -172,6 +172,49 @@ class CovStruct(object):
         soln = [spl.cho_solve(vco, x) for x in rhs]
         return soln
 
+    def covariance_matrix_solve_batch(self, expval, index, stdev, rhs):
+        """
+        Solves the matrix equations of `covariance_matrix_solve` for a
+        batch of clusters of equal size.
+
+        Parameters
+        ----------
+        expval: array-like
+           The expected values of endog, with one row per cluster.
+        index: array-like
+           The indices of the clusters in the batch.
+        stdev : array-like
+            The standard deviations of endog, with one row per
+            cluster.
+        rhs : list/tuple of array-like
+            A set of right-hand sides, the leading two dimensions of
+            each match the shape of `expval`.
+
+        Returns
+        -------
+        soln : list/tuple of array-like
+            The solutions to the matrix equations, with the same
+            shapes as `rhs`.
+
+        Notes
+        -----
+        Returns None if the solver fails.
+
+        This is a default implementation that solves the equations
+        for one cluster at a time.  It can be reimplemented in
+        subclasses to operate on all clusters of the batch together.
+        """
+
+        soln = [np.empty(x.shape, dtype=np.float64) for x in rhs]
+        for j, i in enumerate(index):
+            rslt = self.covariance_matrix_solve(
+                expval[j], i, stdev[j], [x[j] for x in rhs])
+            if rslt is None:
+                return None
+            for y, x in zip(soln, rslt):
+                y[j] = x
+        return soln
+
     def summary(self):
         """
         Returns a text summary of the current estimate of the
@@ -180,6 +223,14 @@ class CovStruct(object):
         raise NotImplementedError
 
 
+def _expand_dims(a, x):
+    """
+    Returns `a` with trailing axes added so that it broadcasts with
+    `x` along the leading axes.
+    """
+    return a.reshape(a.shape + (1,) * (x.ndim - a.ndim))
+
+
 class Independence(CovStruct):
     """
     An independence working dependence structure.
@@ -203,9 +254,15 @@ class Independence(CovStruct):
                 rslt.append(x / v[:, None])
         return rslt
 
+    def covariance_matrix_solve_batch(self, expval, index, stdev, rhs):
+        v = stdev ** 2
+        return [x / _expand_dims(v, x) for x in rhs]
+
     update.__doc__ = CovStruct.update.__doc__
     covariance_matrix.__doc__ = CovStruct.covariance_matrix.__doc__
     covariance_matrix_solve.__doc__ = CovStruct.covariance_matrix_solve.__doc__
+    covariance_matrix_solve_batch.__doc__ = (
+        CovStruct.covariance_matrix_solve_batch.__doc__)
 
     def summary(self):
         return ("Observations within a cluster are modeled "
@@ -237,23 +294,42 @@ class Exchangeable(CovStruct):
         has_weights = self.model.weights is not None
         weights_li = self.model.weights
 
-        residsq_sum, scale = 0, 0
-        fsum1, fsum2, n_pairs = 0., 0., 0.
-        for i in range(self.model.num_group):
-            expval, _ = cached_means[i]
+        if self.model.ragged_batch:
+            # Sums over the rows of each cluster
+            expval = cached_means.expval
+            bounds = cached_means.bounds
             stdev = np.sqrt(varfunc(expval))
-            resid = (endog[i] - expval) / stdev
-            f = weights_li[i] if has_weights else 1.
+            resid = (self.model._batch_endog - expval) / stdev
+            f = weights_li[:len(bounds) - 1] if has_weights else 1.
 
-            ssr = np.sum(resid * resid)
-            scale += f * ssr
-            fsum1 += f * len(endog[i])
+            ssr = np.add.reduceat(resid * resid, bounds[:-1])
+            scale = np.sum(f * ssr)
+            ngrp = np.diff(bounds)
+            fsum1 = np.sum(f * ngrp)
 
-            residsq_sum += f * (resid.sum() ** 2 - ssr) / 2
-            ngrp = len(resid)
+            rsum = np.add.reduceat(resid, bounds[:-1])
+            residsq_sum = np.sum(f * (rsum ** 2 - ssr) / 2)
             npr = 0.5 * ngrp * (ngrp - 1)
-            fsum2 += f * npr
-            n_pairs += npr
+            fsum2 = np.sum(f * npr)
+            n_pairs = np.sum(npr)
+        else:
+            residsq_sum, scale = 0, 0
+            fsum1, fsum2, n_pairs = 0., 0., 0.
+            for i in range(self.model.num_group):
+                expval, _ = cached_means[i]
+                stdev = np.sqrt(varfunc(expval))
+                resid = (endog[i] - expval) / stdev
+                f = weights_li[i] if has_weights else 1.
+
+                ssr = np.sum(resid * resid)
+                scale += f * ssr
+                fsum1 += f * len(endog[i])
+
+                residsq_sum += f * (resid.sum() ** 2 - ssr) / 2
+                ngrp = len(resid)
+                npr = 0.5 * ngrp * (ngrp - 1)
+                fsum2 += f * npr
+                n_pairs += npr
 
         ddof = self.model.ddof_scale
         scale /= (fsum1 * (nobs - ddof) / float(nobs))
@@ -289,9 +365,28 @@ class Exchangeable(CovStruct):
 
         return rslt
 
+    def covariance_matrix_solve_batch(self, expval, index, stdev, rhs):
+
+        k = expval.shape[1]
+        c = self.dep_params / (1. - self.dep_params)
+        c /= 1. + self.dep_params * (k - 1)
+
+        rslt = []
+        for x in rhs:
+            sd = _expand_dims(stdev, x)
+            x1 = x / sd
+            y = x1 / (1. - self.dep_params)
+            y -= c * x1.sum(1)[:, None]
+            y /= sd
+            rslt.append(y)
+
+        return rslt
+
     update.__doc__ = CovStruct.update.__doc__
     covariance_matrix.__doc__ = CovStruct.covariance_matrix.__doc__
     covariance_matrix_solve.__doc__ = CovStruct.covariance_matrix_solve.__doc__
+    covariance_matrix_solve_batch.__doc__ = (
+        CovStruct.covariance_matrix_solve_batch.__doc__)
 
     def summary(self):
         return ("The correlation between two observations in the " +
@@ -472,8 +567,34 @@ class Nested(CovStruct):
         vmat /= self.scale
         return vmat, True
 
+    def covariance_matrix_solve_batch(self, expval, index, stdev, rhs):
+
+        # First iteration
+        if self.dep_params is None:
+            v = stdev ** 2
+            return [x / _expand_dims(v, x) for x in rhs]
+
+        ilabel = np.asarray([self.ilabels[i] for i in index])
+        c = np.r_[self.scale, np.cumsum(self.vcomp_coeff)]
+        vmat = c[ilabel]
+        vmat /= self.scale
+        vmat *= stdev[:, :, None] * stdev[:, None, :]
+
+        # Clusters whose covariance matrix needs to be conditioned
+        # are handled one at a time.
+        try:
+            np.linalg.cholesky(vmat)
+        except np.linalg.LinAlgError:
+            return super(Nested, self).covariance_matrix_solve_batch(
+                expval, index, stdev, rhs)
+        self.cov_adjust.extend([0] * len(index))
+
+        return [np.linalg.solve(vmat, x) for x in rhs]
+
     update.__doc__ = CovStruct.update.__doc__
     covariance_matrix.__doc__ = CovStruct.covariance_matrix.__doc__
+    covariance_matrix_solve_batch.__doc__ = (
+        CovStruct.covariance_matrix_solve_batch.__doc__)
 
     def summary(self):
         """
@@ -830,9 +951,49 @@ class Autoregressive(CovStruct):
 
         return soln
 
+    def covariance_matrix_solve_batch(self, expval, index, stdev, rhs):
+        # The same calculations as covariance_matrix_solve, with the
+        # observations of the clusters along axis 1.
+
+        k = expval.shape[1]
+
+        # LHS has 1 column
+        if k == 1:
+            return [x / _expand_dims(stdev, x) ** 2 for x in rhs]
+
+        # LHS has 2 columns
+        if k == 2:
+            soln = []
+            for x in rhs:
+                sd = _expand_dims(stdev, x)
+                x1 = x / sd
+                y = x1 - self.dep_params * x1[:, ::-1]
+                y /= (1. - self.dep_params ** 2)
+                y /= sd
+                soln.append(y)
+            return soln
+
+        # LHS has >= 3 columns
+        c0 = (1. + self.dep_params ** 2) / (1. - self.dep_params ** 2)
+        c1 = 1. / (1. - self.dep_params ** 2)
+        c2 = -self.dep_params / (1. - self.dep_params ** 2)
+        soln = []
+        for x in rhs:
+            y = c0 * x
+            y[:, :-1] += c2 * x[:, 1:]
+            y[:, 1:] += c2 * x[:, :-1]
+            y[:, 0] = c1 * x[:, 0] + c2 * x[:, 1]
+            y[:, -1] = c1 * x[:, -1] + c2 * x[:, -2]
+            y /= _expand_dims(stdev, x)
+            soln.append(y)
+
+        return soln
+
     update.__doc__ = CovStruct.update.__doc__
     covariance_matrix.__doc__ = CovStruct.covariance_matrix.__doc__
     covariance_matrix_solve.__doc__ = CovStruct.covariance_matrix_solve.__doc__
+    covariance_matrix_solve_batch.__doc__ = (
+        CovStruct.covariance_matrix_solve_batch.__doc__)
 
     def summary(self):
 
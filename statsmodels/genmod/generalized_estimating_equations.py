@@ -160,6 +160,29 @@ class ParameterConstraint(object):
         return np.dot(self.lhs0, np.dot(bcov, self.lhs0.T))
 
 
+class _ClusterMeans(object):
+    """
+    The fitted means and linear predictors of all clusters, stored as
+    arrays with the rows sorted by cluster.
+
+    Indexing with a cluster index returns the (expval, lpr) pair of
+    the cluster, as in the list of cached means used when the clusters
+    are processed one at a time.
+    """
+
+    def __init__(self, expval, lpr, bounds):
+        self.expval = expval
+        self.lpr = lpr
+        self.bounds = bounds
+
+    def __len__(self):
+        return len(self.bounds) - 1
+
+    def __getitem__(self, i):
+        i1, i2 = self.bounds[i], self.bounds[i + 1]
+        return self.expval[i1:i2], self.lpr[i1:i2]
+
+
 _gee_init_doc = """
     Marginal regression model fit using Generalized Estimating Equations.
 
@@ -211,6 +234,11 @@ _gee_init_doc = """
         An array of weights to use in the analysis.  The weights must
         be constant within each group.  These correspond to
         probability weights (pweights) in Stata.
+    ragged_batch : bool
+        If True, clusters of equal size are processed together using
+        vectorized linear algebra, rather than one cluster at a time.
+        This is much faster when there are many small clusters, and
+        gives the same estimates.
     %(extra_params)s
 
     See Also
@@ -460,7 +488,8 @@ class GEE(base.Model):
     def __init__(self, endog, exog, groups, time=None, family=None,
                  cov_struct=None, missing='none', offset=None,
                  exposure=None, dep_data=None, constraint=None,
-                 update_dep=True, weights=None, **kwargs):
+                 update_dep=True, weights=None, ragged_batch=False,
+                 **kwargs):
 
         if family is not None:
             if not isinstance(family.link, tuple(family.safe_links)):
@@ -489,7 +518,7 @@ class GEE(base.Model):
                                   **kwargs)
 
         self._init_keys.extend(["update_dep", "constraint", "family",
-                                "cov_struct"])
+                                "cov_struct", "ragged_batch"])
 
         # Handle the family argument
         if family is None:
@@ -585,6 +614,10 @@ class GEE(base.Model):
             self.constraint.exog_fulltrans_li = \
                 self.cluster_list(self.constraint.exog_fulltrans)
 
+        self.ragged_batch = ragged_batch
+        if ragged_batch:
+            self._setup_batch()
+
         self.family = family
 
         self.cov_struct.initialize(self)
@@ -699,6 +732,92 @@ class GEE(base.Model):
             return [np.array(array[self.group_indices[k], :])
                     for k in self.group_labels]
 
+    def _setup_batch(self):
+        """
+        Set up the data used when clusters of equal size are processed
+        together.
+
+        The data are stored with the rows sorted by cluster.  For each
+        distinct cluster size, `_batch_index` contains the indices of
+        the clusters with that size, and `_batch_pos` contains the
+        clusters x size array of their row positions.
+        """
+
+        sizes = np.asarray([len(y) for y in self.endog_li])
+        perm = np.concatenate([self.group_indices[k]
+                               for k in self.group_labels])
+        self._batch_bounds = np.r_[0, np.cumsum(sizes)]
+
+        self._batch_index, self._batch_pos = [], []
+        for size in np.unique(sizes):
+            ix = np.flatnonzero(sizes == size)
+            self._batch_index.append(ix)
+            self._batch_pos.append(self._batch_bounds[ix][:, None] +
+                                   np.arange(size))
+
+        self._batch_endog = self.endog[perm]
+        self._batch_exog = self.exog[perm]
+        self._batch_offset = None
+        if self._offset_exposure is not None:
+            self._batch_offset = self._offset_exposure[perm]
+        self._batch_weights = None
+        if self.weights is not None:
+            self._batch_weights = np.repeat(self.weights_li, sizes)
+        if self.constraint is not None:
+            self._batch_exog_fulltrans = self.constraint.exog_fulltrans[perm]
+
+    def _batch_terms(self):
+        """
+        Returns the terms of the estimating equations, processing the
+        clusters of equal size together.
+
+        Returns
+        -------
+        bmat : array-like
+            The weighted sum over the clusters of D' V^{-1} D.
+        dvinv_resid : array-like
+            Row i contains the weighted value of D' V^{-1} r for
+            cluster i.
+
+        Notes
+        -----
+        Returns None, None if the solver fails.
+        """
+
+        expval_all = self.cached_means.expval
+        lpr_all = self.cached_means.lpr
+        exog = self._batch_exog
+        varfunc = self.family.variance
+        p = exog.shape[1]
+
+        bmat = 0
+        dvinv_resid = np.empty((self.num_group, p))
+        for ix, pos in zip(self._batch_index, self._batch_pos):
+
+            expval = expval_all[pos]
+            resid = self._batch_endog[pos] - expval
+            dmat = self.mean_deriv(exog[pos.ravel()], lpr_all[pos.ravel()])
+            dmat = dmat.reshape(pos.shape + (p,))
+            sdev = np.sqrt(varfunc(expval))
+
+            rslt = self.cov_struct.covariance_matrix_solve_batch(
+                expval, ix, sdev, (dmat, resid))
+            if rslt is None:
+                return None, None
+            vinv_d, vinv_resid = tuple(rslt)
+
+            if self.weights is not None:
+                f = self.weights_li[ix]
+            else:
+                f = np.ones(len(ix))
+
+            bmat += np.dot((f[:, None, None] * dmat).reshape(-1, p).T,
+                           vinv_d.reshape(-1, p))
+            dvinv_resid[ix] = f[:, None] * np.einsum("ijk,ij->ik", dmat,
+                                                     vinv_resid)
+
+        return bmat, dvinv_resid
+
     def estimate_scale(self):
         """
         Returns an estimate of the scale parameter at the current
@@ -714,6 +833,18 @@ class GEE(base.Model):
         nobs = self.nobs
         varfunc = self.family.variance
 
+        if self.ragged_batch:
+            expval = cached_means.expval
+            resid = (self._batch_endog - expval) / np.sqrt(varfunc(expval))
+            if self.weights is not None:
+                scale = np.dot(self._batch_weights, resid ** 2)
+                fsum = self._batch_weights.sum()
+            else:
+                scale = np.sum(resid ** 2)
+                fsum = float(nobs)
+            scale /= (fsum * (nobs - self.ddof_scale) / float(nobs))
+            return scale
+
         scale = 0.
         fsum = 0.
         for i in range(self.num_group):
@@ -802,31 +933,37 @@ class GEE(base.Model):
             incorporate the scale.
         """
 
-        endog = self.endog_li
-        exog = self.exog_li
+        if self.ragged_batch:
+            bmat, dvinv_resid = self._batch_terms()
+            if bmat is None:
+                return None, None
+            score = dvinv_resid.sum(0)
+        else:
+            endog = self.endog_li
+            exog = self.exog_li
 
-        cached_means = self.cached_means
+            cached_means = self.cached_means
 
-        varfunc = self.family.variance
+            varfunc = self.family.variance
 
-        bmat, score = 0, 0
-        for i in range(self.num_group):
+            bmat, score = 0, 0
+            for i in range(self.num_group):
 
-            expval, lpr = cached_means[i]
-            resid = endog[i] - expval
-            dmat = self.mean_deriv(exog[i], lpr)
-            sdev = np.sqrt(varfunc(expval))
+                expval, lpr = cached_means[i]
+                resid = endog[i] - expval
+                dmat = self.mean_deriv(exog[i], lpr)
+                sdev = np.sqrt(varfunc(expval))
 
-            rslt = self.cov_struct.covariance_matrix_solve(expval, i,
-                                                           sdev, (dmat, resid))
-            if rslt is None:
-                return None, None
-            vinv_d, vinv_resid = tuple(rslt)
+                rslt = self.cov_struct.covariance_matrix_solve(
+                    expval, i, sdev, (dmat, resid))
+                if rslt is None:
+                    return None, None
+                vinv_d, vinv_resid = tuple(rslt)
 
-            f = self.weights_li[i] if self.weights is not None else 1.
+                f = self.weights_li[i] if self.weights is not None else 1.
 
-            bmat += f * np.dot(dmat.T, vinv_d)
-            score += f * np.dot(dmat.T, vinv_resid)
+                bmat += f * np.dot(dmat.T, vinv_d)
+                score += f * np.dot(dmat.T, vinv_resid)
 
         update = np.linalg.solve(bmat, score)
 
@@ -849,6 +986,14 @@ class GEE(base.Model):
 
         linkinv = self.family.link.inverse
 
+        if self.ragged_batch:
+            lpr = np.dot(self._batch_exog, mean_params)
+            if self._batch_offset is not None:
+                lpr += self._batch_offset
+            self.cached_means = _ClusterMeans(linkinv(lpr), lpr,
+                                              self._batch_bounds)
+            return
+
         self.cached_means = []
 
         for i in range(self.num_group):
@@ -890,25 +1035,31 @@ class GEE(base.Model):
 
         # Calculate the naive (model-based) and robust (sandwich)
         # covariances.
-        bmat, cmat = 0, 0
-        for i in range(self.num_group):
+        if self.ragged_batch:
+            bmat, dvinv_resid = self._batch_terms()
+            if bmat is None:
+                return None, None, None, None
+            cmat = np.dot(dvinv_resid.T, dvinv_resid)
+        else:
+            bmat, cmat = 0, 0
+            for i in range(self.num_group):
 
-            expval, lpr = cached_means[i]
-            resid = endog[i] - expval
-            dmat = self.mean_deriv(exog[i], lpr)
-            sdev = np.sqrt(varfunc(expval))
+                expval, lpr = cached_means[i]
+                resid = endog[i] - expval
+                dmat = self.mean_deriv(exog[i], lpr)
+                sdev = np.sqrt(varfunc(expval))
 
-            rslt = self.cov_struct.covariance_matrix_solve(
-                expval, i, sdev, (dmat, resid))
-            if rslt is None:
-                return None, None, None, None
-            vinv_d, vinv_resid = tuple(rslt)
+                rslt = self.cov_struct.covariance_matrix_solve(
+                    expval, i, sdev, (dmat, resid))
+                if rslt is None:
+                    return None, None, None, None
+                vinv_d, vinv_resid = tuple(rslt)
 
-            f = self.weights_li[i] if self.weights is not None else 1.
+                f = self.weights_li[i] if self.weights is not None else 1.
 
-            bmat += f * np.dot(dmat.T, vinv_d)
-            dvinv_resid = f * np.dot(dmat.T, vinv_resid)
-            cmat += np.outer(dvinv_resid, dvinv_resid)
+                bmat += f * np.dot(dmat.T, vinv_d)
+                dvinv_resid = f * np.dot(dmat.T, vinv_resid)
+                cmat += np.outer(dvinv_resid, dvinv_resid)
 
         scale = self.estimate_scale()
 
@@ -1231,6 +1382,9 @@ class GEE(base.Model):
         # Get the score vector under the full model.
         save_exog_li = self.exog_li
         self.exog_li = self.constraint.exog_fulltrans_li
+        if self.ragged_batch:
+            save_batch_exog = self._batch_exog
+            self._batch_exog = self._batch_exog_fulltrans
         import copy
         save_cached_means = copy.deepcopy(self.cached_means)
         self.update_cached_means(mean_params0)
@@ -1275,6 +1429,8 @@ class GEE(base.Model):
         bcov = self.constraint.unpack_cov(bcov)
 
         self.exog_li = save_exog_li
+        if self.ragged_batch:
+            self._batch_exog = save_batch_exog
         self.cached_means = save_cached_means
         self.exog = self.constraint.restore_exog()
 
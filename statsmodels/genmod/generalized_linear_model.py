@@ -20,13 +20,19 @@ McCullagh, P. and Nelder, J.A.  1989.  "Generalized Linear Models." 2nd ed.
 from statsmodels.compat.numpy import np_matrix_rank
 
 import numpy as np
+from scipy import sparse
+from scipy.sparse import linalg as splinalg
 from . import families
+from statsmodels.tools.data import _is_using_pandas
 from statsmodels.tools.decorators import cache_readonly, resettable_cache
 
 import statsmodels.base.model as base
 import statsmodels.regression.linear_model as lm
 import statsmodels.base.wrapper as wrap
 import statsmodels.regression._tools as reg_tools
+from statsmodels.base._sparse import (exog_dot, scale_rows,
+                                      weighted_crossprod, SparseInverse,
+                                      SparseCovResultsMixin)
 
 
 from statsmodels.graphics._regressionplots_doc import (
@@ -39,7 +45,8 @@ from . import _prediction as pred
 from statsmodels.genmod._prediction import PredictionResults
 
 from statsmodels.tools.sm_exceptions import (PerfectSeparationError,
-                                             DomainWarning)
+                                             DomainWarning,
+                                             ConvergenceWarning)
 
 __all__ = ['GLM', 'PredictionResults']
 
@@ -61,11 +68,12 @@ class GLM(base.LikelihoodModel):
         1d array of endogenous response variable.  This array can be 1d or 2d.
         Binomial family models accept a 2d array with two columns. If
         supplied, each observation is expected to be [success, failure].
-    exog : array-like
+    exog : array-like or scipy.sparse matrix
         A nobs x k array where `nobs` is the number of observations and `k`
         is the number of regressors. An intercept is not included by default
         and should be added by the user (models specified using a formula
         include an intercept by default). See `statsmodels.tools.add_constant`.
+        A scipy.sparse exog is kept sparse, see Notes.
     family : family class instance
         The default is Gaussian.  To specify the binomial distribution
         family = sm.family.Binomial()
@@ -90,6 +98,11 @@ class GLM(base.LikelihoodModel):
         array of 1's with length equal to the endog.
         WARNING: Using weights is not verified yet for all possible options
         and results, see Notes.
+    absorb : array-like or DataFrame, optional
+        Group labels of fixed effects that are projected out in each IRLS
+        iteration instead of being included as dummy variables in exog, one
+        column for each set of fixed effects. exog must not contain a
+        constant in this case. See Notes.
     %(extra_params)s
 
     Attributes
@@ -203,6 +216,27 @@ class GLM(base.LikelihoodModel):
     Currently, all residuals are not weighted by frequency, although they may
     incorporate ``n_trials`` for ``Binomial`` and ``var_weights``
 
+    If exog is a scipy.sparse matrix, for example dummy variables for many
+    fixed effects created with `statsmodels.tools.grouputils.dummy_sparse`,
+    then exog is not converted to a dense array. `loglike`, `score`,
+    `score_obs` and `hessian` use sparse products, and IRLS solves the
+    weighted normal equations with a sparse LU factorization or with
+    conjugate gradients if ``wls_method='cg'``. exog is assumed to have full
+    column rank in this case. `hessian` and `score_obs` return sparse
+    matrices. The normalized covariance of the parameters is only computed as
+    a dense (k, k) array when it is requested, `bse` uses only the diagonal of
+    the inverse hessian.
+
+    If `absorb` is given, then the working response and exog are demeaned
+    by alternating projections over all sets of fixed effects in each IRLS
+    iteration, which is the same as including dummy variables for the fixed
+    effects, e.g. Poisson regression with high dimensional fixed effects.
+    Only IRLS is available for these models. The estimated fixed effects
+    are included in the fitted values `mu` of the results, but not in
+    `predict` of the model. `df_model` is the rank of exog and `df_resid`
+    is reduced by the number of absorbed parameters `k_absorb`, see
+    `statsmodels.regression.linear_model.OLS`.
+
     +---------------+----------------------------------+
     | Residual Type | Applicable weights               |
     +===============+==================================+
@@ -297,7 +331,7 @@ class GLM(base.LikelihoodModel):
 
     def __init__(self, endog, exog, family=None, offset=None,
                  exposure=None, freq_weights=None, var_weights=None,
-                 missing='none', **kwargs):
+                 missing='none', absorb=None, **kwargs):
 
         if (family is not None) and not isinstance(family.link,
                                                    tuple(family.safe_links)):
@@ -354,6 +388,22 @@ class GLM(base.LikelihoodModel):
 
         self.scaletype = None
 
+        self.absorb_grouping = None
+        if absorb is not None:
+            self.absorb, self.absorb_grouping = lm._absorb_grouping(self,
+                                                                    absorb)
+            self.k_absorb = self.absorb_grouping.absorbed_df()
+            self.df_model = np_matrix_rank(self.exog)
+            self.df_resid = self.wnobs - self.df_model - self.k_absorb
+            self._init_keys.append('absorb')
+            self._data_attr.extend(['absorb', 'absorb_grouping'])
+
+    def _score_exog(self):
+        # with absorbed fixed effects score_obs and hessian are based on
+        # the within transformed exog of the last IRLS iteration, which is
+        # only attached while the results of a fit are created
+        return getattr(self, '_absorbed_exog', self.exog)
+
     def initialize(self):
         """
         Initialize a generalized linear model.
@@ -363,11 +413,17 @@ class GLM(base.LikelihoodModel):
                         'params': [np.inf],
                         'deviance': [np.inf]}
 
-        self.pinv_wexog = np.linalg.pinv(self.exog)
-        self.normalized_cov_params = np.dot(self.pinv_wexog,
-                                            np.transpose(self.pinv_wexog))
+        if sparse.issparse(self.exog):
+            # assumes full column rank, the covariance is computed in fit
+            self.pinv_wexog = None
+            self.normalized_cov_params = None
+            self.df_model = self.exog.shape[1] - 1
+        else:
+            self.pinv_wexog = np.linalg.pinv(self.exog)
+            self.normalized_cov_params = np.dot(self.pinv_wexog,
+                                                np.transpose(self.pinv_wexog))
 
-        self.df_model = np_matrix_rank(self.exog) - 1
+            self.df_model = np_matrix_rank(self.exog) - 1
 
         if (self.freq_weights is not None) and \
            (self.freq_weights.shape[0] == self.endog.shape[0]):
@@ -444,7 +500,7 @@ class GLM(base.LikelihoodModel):
         """
         Evaluate the log-likelihood for a generalized linear model.
         """
-        lin_pred = np.dot(self.exog, params) + self._offset_exposure
+        lin_pred = exog_dot(self.exog, params) + self._offset_exposure
         expval = self.family.link.inverse(lin_pred)
         if scale is None:
             scale = self.estimate_scale(expval)
@@ -468,12 +524,13 @@ class GLM(base.LikelihoodModel):
         -------
         score_obs : ndarray, 2d
             The first derivative of the loglikelihood function evaluated at
-            params for each observation.
+            params for each observation. This is a sparse matrix if exog is
+            sparse.
 
         """
 
         score_factor = self.score_factor(params, scale=scale)
-        return score_factor[:, None] * self.exog
+        return scale_rows(score_factor, self._score_exog())
 
     def score(self, params, scale=None):
         """score, first derivative of the loglikelihood function
@@ -494,6 +551,9 @@ class GLM(base.LikelihoodModel):
             the sum of `score_obs`
 
         """
+        if sparse.issparse(self.exog):
+            score_factor = self.score_factor(params, scale=scale)
+            return self.exog.T.dot(score_factor)
         return self.score_obs(params, scale=scale).sum(0)
 
     def score_factor(self, params, scale=None):
@@ -605,8 +665,9 @@ class GLM(base.LikelihoodModel):
 
         Returns
         -------
-        hessian : ndarray
+        hessian : ndarray or scipy.sparse matrix
             Hessian, i.e. observed information, or expected information matrix.
+            This is a sparse matrix if exog is sparse.
         """
         if observed is None:
             if getattr(self, '_optim_hessian', None) == 'eim':
@@ -615,7 +676,7 @@ class GLM(base.LikelihoodModel):
                 observed = True
 
         factor = self.hessian_factor(params, scale=scale, observed=observed)
-        hess = -np.dot(self.exog.T * factor, self.exog)
+        hess = -weighted_crossprod(self._score_exog(), factor, dense=False)
         return hess
 
     def information(self, params, scale=None):
@@ -691,7 +752,10 @@ class GLM(base.LikelihoodModel):
 
         from scipy import stats
         # TODO check sign, why minus?
-        chi2stat = -score.dot(np.linalg.solve(hessian, score[:, None]))
+        if sparse.issparse(hessian):
+            chi2stat = -score.dot(splinalg.spsolve(hessian.tocsc(), score))
+        else:
+            chi2stat = -score.dot(np.linalg.solve(hessian, score[:, None]))
         pval = stats.chi2.sf(chi2stat, k_constraints)
         # return a stats results instance instead?  Contrast?
         return chi2stat, pval, k_constraints
@@ -855,8 +919,11 @@ class GLM(base.LikelihoodModel):
 
         if exog is None:
             exog = self.exog
+            # estimated fixed effects while the results of a fit with
+            # absorb are created
+            offset = offset + getattr(self, '_absorbed_linpred', 0)
 
-        linpred = np.dot(exog, params) + offset + exposure
+        linpred = exog_dot(exog, params) + offset + exposure
         if linear:
             return linpred
         else:
@@ -992,6 +1059,8 @@ class GLM(base.LikelihoodModel):
             near-singular cases by truncating small singular values based
             on `rcond` of the respective numpy.linalg function. 'qr' is
             only valied for cases that are not singular nor near-singular.
+            If exog is sparse, then 'cg' uses preconditioned conjugate
+            gradients and all other options use a sparse LU solver.
 
         If a scipy optimizer is used, the following additional parameter is
         available:
@@ -1012,6 +1081,10 @@ class GLM(base.LikelihoodModel):
         """
         self.scaletype = scale
 
+        if self.absorb_grouping is not None and method.lower() != "irls":
+            raise ValueError('only IRLS is available if fixed effects are '
+                             'absorbed')
+
         if method.lower() == "irls":
             return self._fit_irls(start_params=start_params, maxiter=maxiter,
                                   tol=tol, scale=scale, cov_type=cov_type,
@@ -1048,6 +1121,10 @@ class GLM(base.LikelihoodModel):
                                        **kwargs)
             start_params = irls_rslt.params
 
+        if sparse.issparse(self.exog):
+            # the covariance is based on the sparse hessian, see below
+            kwargs.setdefault('cov_params_func', lambda *args: None)
+
         rslt = super(GLM, self).fit(start_params=start_params, tol=tol,
                                     maxiter=maxiter, full_output=full_output,
                                     method=method, disp=disp, **kwargs)
@@ -1055,7 +1132,9 @@ class GLM(base.LikelihoodModel):
         mu = self.predict(rslt.params)
         scale = self.estimate_scale(mu)
 
-        if rslt.normalized_cov_params is None:
+        if sparse.issparse(self.exog):
+            cov_p = SparseInverse(-self.hessian(rslt.params) * scale)
+        elif rslt.normalized_cov_params is None:
             cov_p = None
         else:
             cov_p = rslt.normalized_cov_params / scale
@@ -1093,12 +1172,16 @@ class GLM(base.LikelihoodModel):
 
         endog = self.endog
         wlsexog = self.exog
+        # sparse exog uses wls_method also in the iterations
+        irls_method = wls_method if sparse.issparse(wlsexog) else 'lstsq'
+        absorb = self.absorb_grouping
+        absorbed = {}
         if start_params is None:
             start_params = np.zeros(self.exog.shape[1], np.float)
             mu = self.family.starting_mu(self.endog)
             lin_pred = self.family.predict(mu)
         else:
-            lin_pred = np.dot(wlsexog, start_params) + self._offset_exposure
+            lin_pred = exog_dot(wlsexog, start_params) + self._offset_exposure
             mu = self.family.fitted(lin_pred)
         self.scale = self.estimate_scale(mu)
         dev = self.family.deviance(self.endog, mu, self.var_weights,
@@ -1125,11 +1208,22 @@ class GLM(base.LikelihoodModel):
                             self.family.weights(mu))
             wlsendog = (lin_pred + self.family.link.deriv(mu) * (self.endog-mu)
                         - self._offset_exposure)
+            if absorb is not None:
+                # within transformation with the current weights
+                wlsendog_full = wlsendog
+                demeaned, converged_absorb = absorb.demean(
+                    np.column_stack((wlsendog, self.exog)), self.weights)
+                wlsendog, wlsexog = demeaned[:, 0], demeaned[:, 1:]
             wls_results = reg_tools._MinimalWLS(
                     wlsendog,
                     wlsexog,
-                    self.weights).fit(method='lstsq')
-            lin_pred = np.dot(self.exog, wls_results.params)
+                    self.weights).fit(method=irls_method)
+            if absorb is None:
+                lin_pred = exog_dot(self.exog, wls_results.params)
+            else:
+                # residuals of the within regression are the residuals
+                # of the regression that includes the fixed effects
+                lin_pred = wlsendog_full - wls_results.resid
             lin_pred += self._offset_exposure
             mu = self.family.fitted(lin_pred)
             history = self._update_history(wls_results, mu, history)
@@ -1143,16 +1237,39 @@ class GLM(base.LikelihoodModel):
                 break
         self.mu = mu
 
-        if maxiter > 0:  # Only if iterative used
+        if maxiter > 0 and sparse.issparse(wlsexog):
+            wls_model = reg_tools._MinimalWLS(wlsendog, wlsexog, self.weights)
+            wls_results = wls_model.fit(method=wls_method)
+            wls_results.normalized_cov_params = \
+                wls_model.normalized_cov_params()
+        elif maxiter > 0:  # Only if iterative used
             wls_method2 = 'pinv' if wls_method == 'lstsq' else wls_method
             wls_model = lm.WLS(wlsendog, wlsexog, self.weights)
             wls_results = wls_model.fit(method=wls_method2)
 
-        glm_results = GLMResults(self, wls_results.params,
-                                 wls_results.normalized_cov_params,
-                                 self.scale,
-                                 cov_type=cov_type, cov_kwds=cov_kwds,
-                                 use_t=use_t)
+        if maxiter > 0 and absorb is not None:
+            if not converged_absorb:
+                import warnings
+                warnings.warn('Projecting out the absorbed fixed effects '
+                              'did not converge', ConvergenceWarning)
+            absorbed['_absorbed_linpred'] = (
+                wlsendog_full - wlsendog -
+                np.dot(self.exog - wlsexog, wls_results.params))
+            absorbed['_absorbed_exog'] = wlsexog
+
+        # the absorbed design is only attached to the model for the robust
+        # covariance, later calls use the model data again
+        self.__dict__.update(absorbed)
+        try:
+            glm_results = GLMResults(self, wls_results.params,
+                                     wls_results.normalized_cov_params,
+                                     self.scale,
+                                     cov_type=cov_type, cov_kwds=cov_kwds,
+                                     use_t=use_t)
+        finally:
+            for key in absorbed:
+                delattr(self, key)
+        glm_results._absorbed_linpred = absorbed.get('_absorbed_linpred')
 
         glm_results.method = "IRLS"
         glm_results.mle_settings = {}
@@ -1165,6 +1282,200 @@ class GLM(base.LikelihoodModel):
         glm_results.converged = converged
         return GLMResultsWrapper(glm_results)
 
+    def fit_groups(self, groups, maxiter=100, tol=1e-8, scale=None,
+                   **kwargs):
+        """
+        Fit a separate GLM for each group with a batched IRLS
+
+        The IRLS iterations are run for all groups simultaneously. The
+        weighted least squares problems of the groups are stacked into a
+        3-dimensional array and solved with batched linear algebra. Groups
+        that have converged are removed from the following iterations.
+
+        Parameters
+        ----------
+        groups : array-like
+            1-d array of group labels, one for each observation.
+        maxiter : int, optional
+            Maximum number of IRLS iterations. Default is 100.
+        tol : float
+            Convergence tolerance. Default is 1e-8.
+        scale : string or float, optional
+            Scale estimate for each group, see ``fit``.
+        kwargs
+            The IRLS options `atol`, `rtol` and `tol_criterion` are
+            available with the same meaning as in ``fit``.
+
+        Returns
+        -------
+        results : BatchGLMResults
+            Results with array valued statistics with one column, or element,
+            for each group. Full results for a single group are available
+            with ``get_results``.
+
+        Notes
+        -----
+        The estimates are the same as those from calling ``fit`` with IRLS
+        for the subset of each group separately, including offset, exposure
+        and weights of the observations. Only the nonrobust covariance of
+        the parameter estimates is available.
+        """
+        atol = kwargs.get('atol')
+        rtol = kwargs.get('rtol', 0.)
+        tol_criterion = kwargs.get('tol_criterion', 'deviance')
+        atol = tol if atol is None else atol
+        self.scaletype = scale
+
+        groups = np.asarray(groups)
+        if groups.shape != (self.endog.shape[0],):
+            raise ValueError('groups needs to be 1-d with the same length as '
+                             'endog')
+        labels, g_int = np.unique(groups, return_inverse=True)
+        n_groups = len(labels)
+        sizes = np.bincount(g_int, minlength=n_groups)
+        # position of each observation within its group
+        order = np.argsort(g_int, kind='mergesort')
+        pos = np.empty_like(g_int)
+        pos[order] = (np.arange(len(g_int)) -
+                      np.repeat(np.cumsum(sizes) - sizes, sizes))
+
+        family = self.family
+        endog = self.endog
+        exog = self.exog
+        k_exog = exog.shape[1]
+        offset_exposure = self._offset_exposure * np.ones(len(endog))
+
+        def stack(x, idx_groups, mask):
+            # scatter the rows of the observations in mask into an array of
+            # shape (len(idx_groups), max_size, ...) padded with zeros
+            remap = np.empty(n_groups, np.intp)
+            remap[idx_groups] = np.arange(len(idx_groups))
+            x3d = np.zeros((len(idx_groups), sizes[idx_groups].max()) +
+                           x.shape[1:])
+            x3d[remap[g_int[mask]], pos[mask]] = x
+            return x3d
+
+        all_groups = np.arange(n_groups)
+        all_obs = np.ones(len(endog), bool)
+        rank = np.linalg.matrix_rank(stack(exog, all_groups, all_obs))
+        wnobs = np.bincount(g_int, weights=self.freq_weights * np.ones(
+            len(endog)), minlength=n_groups)
+        df_model = rank - 1.
+        df_resid = wnobs - df_model - 1
+
+        def group_sum(x, mask=all_obs):
+            return np.bincount(g_int[mask], weights=x[mask],
+                               minlength=n_groups)
+
+        def estimate_scale(mu, scale_prev):
+            scaletype = self.scaletype
+            if not scaletype:
+                if isinstance(family, (families.Binomial, families.Poisson,
+                                       families.NegativeBinomial)):
+                    return np.ones(n_groups)
+                scaletype = 'x2'
+            if isinstance(scaletype, float):
+                return scaletype * np.ones(n_groups)
+            if isinstance(scaletype, str):
+                if scaletype.lower() == 'x2':
+                    resid = np.power(endog - mu, 2) * self.iweights
+                    return (group_sum(resid / family.variance(mu)) /
+                            df_resid)
+                elif scaletype.lower() == 'dev':
+                    return deviance(mu, scale_prev) / df_resid
+            raise ValueError("Scale %s with type %s not understood" %
+                             (scaletype, type(scaletype)))
+
+        def deviance(mu, scale):
+            resid_dev = family._resid_dev(endog, mu)
+            return group_sum(resid_dev * self.freq_weights *
+                             self.var_weights) / scale
+
+        params = np.zeros((n_groups, k_exog))
+        if type(family).starting_mu is families.Family.starting_mu:
+            # (y + ybar) / 2 with the group means
+            ybar = (np.bincount(g_int, weights=endog, minlength=n_groups) /
+                    np.bincount(g_int, minlength=n_groups))
+            mu = (endog + ybar[g_int]) / 2.
+        elif isinstance(family, families.Binomial):
+            # does not depend on the mean
+            mu = family.starting_mu(endog)
+        else:
+            mu = np.empty(len(endog))
+            order = np.argsort(g_int, kind='mergesort')
+            bounds = np.cumsum(np.bincount(g_int, minlength=n_groups))
+            for idx in np.split(order, bounds[:-1]):
+                mu[idx] = family.starting_mu(endog[idx])
+        lin_pred = family.predict(mu)
+        scale_ = estimate_scale(mu, np.ones(n_groups))
+        dev = deviance(mu, scale_)
+        if np.isnan(dev).any():
+            raise ValueError("The first guess on the deviance function "
+                             "returned a nan.  This could be a boundary "
+                             " problem and should be reported.")
+
+        active = np.ones(n_groups, bool)
+        converged = np.zeros(n_groups, bool)
+        n_iter = np.zeros(n_groups, int)
+        xtwx = np.zeros((n_groups, k_exog, k_exog))
+        weights = np.empty(len(endog))
+        for iteration in range(maxiter):
+            idx_groups = np.nonzero(active)[0]
+            mask = active[g_int]
+            weights[mask] = (self.iweights * self.n_trials *
+                             family.weights(mu))[mask]
+            wlsendog = (lin_pred + family.link.deriv(mu) * (endog - mu) -
+                        offset_exposure)
+            w_half = np.sqrt(weights[mask])
+            wx3d = stack(w_half[:, None] * exog[mask], idx_groups, mask)
+            wz = stack(w_half * wlsendog[mask], idx_groups, mask)
+            xtwx_act = np.einsum('gmk,gml->gkl', wx3d, wx3d)
+            xtwz_act = np.einsum('gmk,gm->gk', wx3d, wz)
+            try:
+                params_new = np.linalg.solve(xtwx_act, xtwz_act)
+            except np.linalg.LinAlgError:
+                params_new = np.einsum('gkl,gl->gk',
+                                       np.linalg.pinv(xtwx_act), xtwz_act)
+            xtwx[idx_groups] = xtwx_act
+            params_old = params[idx_groups]
+            params[idx_groups] = params_new
+            n_iter[idx_groups] += 1
+
+            lin_pred[mask] = ((exog[mask] * params[g_int[mask]]).sum(1) +
+                              offset_exposure[mask])
+            mu[mask] = family.fitted(lin_pred[mask])
+            dev_new = deviance(mu, scale_)
+            scale_[idx_groups] = estimate_scale(mu, scale_)[idx_groups]
+
+            if tol_criterion == 'params':
+                crit = np.abs(params_new - params_old) <= (
+                    atol + rtol * np.abs(params_new))
+                conv_act = crit.all(1)
+            else:
+                conv_act = (np.abs(dev_new - dev) <=
+                            atol + rtol * np.abs(dev_new))[idx_groups]
+            dev[idx_groups] = dev_new[idx_groups]
+            # a group with perfect fit cannot improve further
+            perfect = group_sum(np.abs(mu - endog) > 1e-8, mask)[idx_groups]
+            perfect = perfect == 0
+            converged[idx_groups[conv_act & ~perfect]] = True
+            active[idx_groups[conv_act | perfect]] = False
+            if not active.any():
+                break
+
+        if not converged.all():
+            import warnings
+            warnings.warn('IRLS did not converge for %d of %d groups' %
+                          ((~converged).sum(), n_groups), ConvergenceWarning)
+
+        normalized_cov_params = np.linalg.pinv(xtwx)
+        return BatchGLMResults(self, params.T, normalized_cov_params, scale_,
+                               groups=labels, group_idx=g_int,
+                               df_model=df_model, df_resid=df_resid, mu=mu,
+                               converged=converged, n_iter=n_iter,
+                               fit_kwds=dict(maxiter=maxiter, tol=tol,
+                                             scale=scale, **kwargs))
+
     def fit_regularized(self, method="elastic_net", alpha=0.,
                         start_params=None, refit=False, **kwargs):
         """
@@ -1303,7 +1614,7 @@ class GLM(base.LikelihoodModel):
         return res
 
 
-class GLMResults(base.LikelihoodModelResults):
+class GLMResults(SparseCovResultsMixin, base.LikelihoodModelResults):
     """
     Class to contain GLM results.
 
@@ -1418,13 +1729,15 @@ class GLMResults(base.LikelihoodModelResults):
         self.df_resid = model.df_resid
         self.df_model = model.df_model
         self.pinv_wexog = model.pinv_wexog
+        self._absorbed_linpred = None
         self._cache = resettable_cache()
         # are these intermediate results needed or can we just
         # call the model's attributes?
 
         # for remove data and pickle without large arrays
         self._data_attr.extend(['results_constrained', '_freq_weights',
-                                '_var_weights', '_iweights'])
+                                '_var_weights', '_iweights',
+                                '_absorbed_linpred'])
         self.data_in_cache = getattr(self, 'data_in_cache', [])
         self.data_in_cache.extend(['null', 'mu'])
         self._data_attr_model = getattr(self, '_data_attr_model', [])
@@ -1521,7 +1834,11 @@ class GLMResults(base.LikelihoodModelResults):
 
     @cache_readonly
     def mu(self):
-        return self.model.predict(self.params)
+        if self._absorbed_linpred is None:
+            return self.model.predict(self.params)
+        # add the estimated fixed effects of a fit with absorb
+        linpred = self.model.predict(self.params, linear=True)
+        return self.family.fitted(linpred + self._absorbed_linpred)
 
     @cache_readonly
     def null(self):
@@ -1584,6 +1901,24 @@ class GLMResults(base.LikelihoodModelResults):
                 (self.model.wnobs - self.df_model - 1) *
                 np.log(self.model.wnobs))
 
+    def get_influence(self):
+        """
+        get an instance of Influence with influence and outlier measures
+
+        Returns
+        -------
+        infl : GLMInfluence instance
+            the instance has methods to calculate the main influence and
+            outlier measures, leave-one-observation-out measures are one-step
+            approximations
+
+        See also
+        --------
+        statsmodels.stats.outliers_influence.GLMInfluence
+        """
+        from statsmodels.stats.outliers_influence import GLMInfluence
+        return GLMInfluence(self)
+
     def get_prediction(self, exog=None, exposure=None, offset=None,
                        transform=True, linear=False,
                        row_labels=None):
@@ -1780,6 +2115,166 @@ class GLMResults(base.LikelihoodModelResults):
         return smry
 
 
+class BatchGLMResults(object):
+    """
+    Results for separate GLM fits of several groups of observations
+
+    Parameters
+    ----------
+    model : GLM instance
+        The model containing the observations of all groups.
+    params : ndarray
+        Parameter estimates with shape (k_exog, n_groups).
+    normalized_cov_params : ndarray
+        Normalized covariance of the parameters of each group, with shape
+        (n_groups, k_exog, k_exog).
+    scale : ndarray
+        Scale estimate of each group.
+    **kwds
+        Group information and convergence details, attached as attributes.
+
+    Attributes
+    ----------
+    groups : ndarray
+        Sorted unique group labels, the order of groups in all attributes.
+    params, bse, tvalues, pvalues : ndarray or DataFrame
+        Estimates and inferential statistics, one column for each group.
+    scale, deviance, llf, df_model, df_resid : ndarray or Series
+        Statistics with one element for each group.
+    converged : ndarray of bool
+        Whether the IRLS iterations have converged for the group.
+    n_iter : ndarray of int
+        Number of IRLS iterations for each group.
+
+    Notes
+    -----
+    If the model was created from pandas data, then parameter statistics are
+    returned as DataFrames with the parameter names as index and the group
+    labels as columns, and group statistics as Series indexed by the group
+    labels.
+    """
+
+    def __init__(self, model, params, normalized_cov_params, scale, **kwds):
+        self.model = model
+        self.family = model.family
+        self._params = params
+        self.normalized_cov_params = normalized_cov_params
+        self._scale = scale
+        self.__dict__.update(kwds)
+        self.n_groups = len(self.groups)
+        self._cache = resettable_cache()
+        self._use_pandas = _is_using_pandas(model.data.orig_endog, None)
+
+    def __len__(self):
+        return self.n_groups
+
+    def _wrap(self, arr):
+        if not self._use_pandas:
+            return arr
+        import pandas as pd
+        if arr.ndim == 1:
+            return pd.Series(arr, index=self.groups)
+        return pd.DataFrame(arr, index=self.model.data.param_names,
+                            columns=self.groups)
+
+    def _group_sum(self, x):
+        return np.bincount(self.group_idx, weights=x,
+                           minlength=self.n_groups)
+
+    @property
+    def params(self):
+        return self._wrap(self._params)
+
+    @property
+    def bse(self):
+        return self._wrap(self._bse)
+
+    @property
+    def tvalues(self):
+        return self._wrap(self._params / self._bse)
+
+    @property
+    def pvalues(self):
+        from scipy import stats
+        tvalues = self._params / self._bse
+        return self._wrap(stats.norm.sf(np.abs(tvalues)) * 2)
+
+    @property
+    def scale(self):
+        return self._wrap(self._scale)
+
+    @property
+    def deviance(self):
+        model = self.model
+        resid_dev = self.family._resid_dev(model.endog, self.mu)
+        return self._wrap(self._group_sum(resid_dev * model.freq_weights *
+                                          model.var_weights))
+
+    @property
+    def llf(self):
+        model = self.model
+        family = self.family
+        scale = self._scale
+        if (isinstance(family, families.Gaussian) and
+                isinstance(family.link, families.links.Power) and
+                (family.link.power == 1.)):
+            scale = self._group_sum(np.power(model.endog - self.mu, 2) *
+                                    model.iweights)
+            scale /= self._group_sum(model.freq_weights *
+                                     np.ones(len(model.endog)))
+        llf_obs = family.loglike_obs(model.endog, self.mu,
+                                     var_weights=model.var_weights,
+                                     scale=scale[self.group_idx])
+        return self._wrap(self._group_sum(llf_obs * model.freq_weights))
+
+    @cache_readonly
+    def _bse(self):
+        var = np.diagonal(self.normalized_cov_params, axis1=1, axis2=2)
+        return np.sqrt(var * self._scale[:, None]).T
+
+    def get_results(self, group):
+        """
+        Full results instance for one of the groups
+
+        Parameters
+        ----------
+        group : scalar
+            The label of the group.
+
+        Returns
+        -------
+        results : GLMResults instance
+            Results of ``fit`` for a GLM with the subset of the group. The
+            batched estimates are used as starting values.
+        """
+        import copy
+        model = self.model
+        idx = np.nonzero(self.groups == group)[0]
+        if len(idx) == 0:
+            raise ValueError('group %s not found' % group)
+        idx = idx[0]
+        mask = self.group_idx == idx
+        nobs = len(mask)
+        init_kwds = model._get_init_kwds()
+        for key, val in init_kwds.items():
+            if np.ndim(val) > 0 and np.shape(val)[0] == nobs:
+                init_kwds[key] = np.asarray(val)[mask]
+        init_kwds['family'] = copy.deepcopy(model.family)
+        init_kwds.pop('missing', None)
+        endog = model.data.endog[mask]
+        exog = model.exog[mask]
+        if self._use_pandas:
+            import pandas as pd
+            row_labels = model.data.row_labels[mask]
+            if endog.ndim == 1:
+                endog = pd.Series(endog, index=row_labels,
+                                  name=model.endog_names)
+            exog = pd.DataFrame(exog, index=row_labels,
+                                columns=model.data.param_names)
+        mod = model.__class__(endog, exog, **init_kwds)
+        return mod.fit(start_params=self._params[:, idx], **self.fit_kwds)
+
+
 class GLMResultsWrapper(lm.RegressionResultsWrapper):
     _attrs = {
         'resid_anscombe': 'rows',
@@ -1653,6 +1653,52 @@ def test_missing():
     assert_almost_equal(res.params.values, res2.params.values)
 
 
+def test_ragged_batch():
+    # Processing clusters of equal size together gives the same
+    # results as processing them one at a time.
+    np.random.seed(3424)
+    n_group = 100
+    sizes = np.random.randint(1, 7, n_group)
+    groups = np.repeat(np.arange(n_group), sizes)
+    np.random.shuffle(groups)
+    n = len(groups)
+    exog = np.random.normal(size=(n, 3))
+    exog[:, 0] = 1
+    lin_pred = (exog.dot([0.2, 0.3, -0.2]) +
+                0.5 * np.random.normal(size=n_group)[groups])
+    endog = np.random.poisson(np.exp(lin_pred))
+    dep_data = np.random.randint(0, 2, size=(n, 2))
+    weights = np.random.uniform(1, 2, n_group)[groups]
+    offset = 0.1 * np.random.normal(size=n)
+    constraint = (np.array([[0., 1, 1]]), np.r_[0.])
+
+    for cs in Independence, Exchangeable, Autoregressive, Nested:
+        kwds_list = [{}, {"offset": offset}, {"constraint": constraint}]
+        if cs in (Independence, Exchangeable):
+            kwds_list.append({"weights": weights})
+        for kwds in kwds_list:
+            rslt = []
+            for ragged_batch in False, True:
+                model = GEE(endog, exog, groups, family=Poisson(),
+                            cov_struct=cs(), dep_data=dep_data,
+                            ragged_batch=ragged_batch, **kwds)
+                rslt.append(model.fit(cov_type="bias_reduced"))
+            result1, result2 = rslt
+            assert_allclose(result1.params, result2.params,
+                            rtol=1e-7, atol=1e-10)
+            assert_allclose(result1.cov_robust, result2.cov_robust,
+                            rtol=1e-6, atol=1e-12)
+            assert_allclose(result1.cov_naive, result2.cov_naive,
+                            rtol=1e-6, atol=1e-12)
+            assert_allclose(result1.cov_robust_bc, result2.cov_robust_bc,
+                            rtol=1e-6, atol=1e-12)
+            assert_allclose(result1.scale, result2.scale, rtol=1e-10)
+            dep1 = result1.cov_struct.dep_params
+            if dep1 is not None:
+                assert_allclose(dep1, result2.cov_struct.dep_params,
+                                rtol=1e-6, atol=1e-12)
+
+
 if __name__ == "__main__":
     import pytest
     pytest.main([__file__, '-vvs', '-x', '--pdb'])
@@ -12,6 +12,7 @@ from numpy.testing import (assert_almost_equal, assert_equal, assert_raises,
 from scipy import stats
 import statsmodels.api as sm
 from statsmodels.genmod.generalized_linear_model import GLM
+from statsmodels.base._sparse import SparseInverse
 from statsmodels.tools.tools import add_constant
 from statsmodels.tools.sm_exceptions import PerfectSeparationError
 from statsmodels.discrete import discrete_model as discrete
@@ -2086,6 +2087,227 @@ def test_non_invertible_hessian_fails_summary():
         res.summary()
 
 
+@pytest.mark.parametrize('family', [sm.families.Poisson(),
+                                    sm.families.Binomial(),
+                                    sm.families.Gamma(sm.families.links.log()),
+                                    sm.families.Gaussian()])
+def test_fit_groups(family):
+    np.random.seed(987125)
+    n_groups = 30
+    groups = np.repeat(np.arange(n_groups) * 3,
+                       np.random.randint(40, 80, size=n_groups))
+    np.random.shuffle(groups)
+    nobs = len(groups)
+    exog = add_constant(np.random.randn(nobs, 2))
+    mean = np.exp(exog.dot([0.5, 0.2, -0.3]))
+    if isinstance(family, sm.families.Binomial):
+        endog = (np.random.rand(nobs) < mean / (1 + mean)).astype(float)
+    elif isinstance(family, sm.families.Poisson):
+        endog = np.random.poisson(mean)
+    else:
+        endog = np.random.gamma(2, mean / 2)
+    offset = np.random.uniform(0, 0.5, size=nobs)
+    var_weights = np.random.uniform(0.5, 2, size=nobs)
+
+    mod = GLM(endog, exog, family=family, offset=offset,
+              var_weights=var_weights)
+    res = mod.fit_groups(groups)
+    assert_equal(len(res), n_groups)
+    assert_(res.converged.all())
+    for j in [0, 7, n_groups - 1]:
+        mask = groups == res.groups[j]
+        mod1 = GLM(endog[mask], exog[mask], family=family,
+                   offset=offset[mask], var_weights=var_weights[mask])
+        res1 = mod1.fit()
+        assert_allclose(res.params[:, j], res1.params, rtol=1e-8)
+        assert_allclose(res.bse[:, j], res1.bse, rtol=1e-6)
+        assert_allclose(res.scale[j], res1.scale, rtol=1e-6)
+        assert_allclose(res.deviance[j], res1.deviance, rtol=1e-8)
+        assert_allclose(res.llf[j], res1.llf, rtol=1e-8)
+        assert_allclose(res.df_resid[j], res1.df_resid)
+
+    res1 = res.get_results(res.groups[7])
+    assert_allclose(res1.params, res.params[:, 7], rtol=1e-8)
+
+
+def test_fit_groups_starting_mu():
+    # a family with its own starting values uses the per-group fallback
+    class PoissonStart(sm.families.Poisson):
+        def starting_mu(self, y):
+            return (y + y.mean()) / 2.
+
+    np.random.seed(987125)
+    groups = np.random.randint(0, 200, size=2000)
+    exog = add_constant(np.random.randn(2000, 1))
+    endog = np.random.poisson(np.exp(exog.dot([0.5, 0.2])))
+    res = GLM(endog, exog, family=sm.families.Poisson()).fit_groups(groups)
+    res1 = GLM(endog, exog, family=PoissonStart()).fit_groups(groups)
+    assert_equal(len(res), 200)
+    assert_allclose(res1.params, res.params, rtol=1e-12)
+    assert_equal(res1.n_iter, res.n_iter)
+
+
+def test_fit_groups_pandas():
+    import pandas as pd
+    data = sm.datasets.cpunish.load_pandas()
+    exog = add_constant(data.exog[['INCOME', 'SOUTH']], prepend=False)
+    exog['INCOME'] /= 1000
+    groups = np.arange(len(exog)) % 2
+    mod = GLM(data.endog, exog, family=sm.families.Poisson())
+    res = mod.fit_groups(groups)
+    assert_(isinstance(res.params, pd.DataFrame))
+    assert_equal(list(res.params.index), ['INCOME', 'SOUTH', 'const'])
+    assert_equal(list(res.llf.index), [0, 1])
+    res1 = GLM(data.endog[groups == 1], exog[groups == 1],
+               family=sm.families.Poisson()).fit()
+    assert_allclose(res.params[1], res1.params, rtol=1e-8)
+    assert_allclose(res.get_results(1).bse, res1.bse, rtol=1e-8)
+    assert_raises(ValueError, res.get_results, 2)
+
+
+def _sparse_fe_data(family, seed=5432):
+    from scipy import sparse
+    from statsmodels.tools.grouputils import dummy_sparse
+    np.random.seed(seed)
+    n_groups, nobs = 40, 800
+    groups = np.random.randint(0, n_groups, size=nobs)
+    x = np.random.randn(nobs, 2)
+    linpred = 0.5 * x[:, 0] - 0.2 * x[:, 1] + 0.5 * np.random.randn(
+        n_groups)[groups]
+    if isinstance(family, sm.families.Poisson):
+        endog = np.random.poisson(np.exp(linpred))
+    elif isinstance(family, sm.families.Binomial):
+        endog = (np.random.rand(nobs) < 1 / (1 + np.exp(-linpred))) * 1.
+    else:
+        endog = linpred + np.random.randn(nobs)
+    exog = sparse.hstack((x, dummy_sparse(groups)), format='csr')
+    return endog, exog
+
+
+@pytest.mark.parametrize('family', [sm.families.Poisson(),
+                                    sm.families.Binomial(),
+                                    sm.families.Gaussian()])
+@pytest.mark.parametrize('wls_method', ['lstsq', 'cg'])
+def test_glm_sparse(family, wls_method):
+    from scipy import sparse
+    endog, exog = _sparse_fe_data(family)
+    mod = GLM(endog, exog, family=family)
+    assert_(sparse.issparse(mod.exog))
+    assert_equal(mod.df_model, exog.shape[1] - 1)
+    mod_dense = GLM(endog, exog.toarray(), family=family)
+    res = mod.fit(wls_method=wls_method)
+    res_dense = mod_dense.fit()
+
+    assert_allclose(res.params, res_dense.params, rtol=1e-7, atol=1e-10)
+    assert_allclose(res.bse, res_dense.bse, rtol=1e-7)
+    # bse does not compute the dense inverse
+    assert_(isinstance(res._results._normalized_cov_params, SparseInverse))
+    assert_allclose(res.cov_params(), res_dense.cov_params(), rtol=1e-6,
+                    atol=1e-12)
+    assert_(isinstance(res._results._normalized_cov_params, np.ndarray))
+    assert_allclose(res.llf, res_dense.llf, rtol=1e-10)
+    assert_allclose(res.deviance, res_dense.deviance, rtol=1e-10)
+    assert_allclose(res.scale, res_dense.scale, rtol=1e-8)
+    assert_allclose(res.fittedvalues, res_dense.fittedvalues, rtol=1e-7)
+
+    params = res_dense.params
+    assert_allclose(mod.score(params), mod_dense.score(params), atol=1e-8)
+    hess = mod.hessian(params)
+    assert_(sparse.issparse(hess))
+    assert_allclose(hess.toarray(), mod_dense.hessian(params), rtol=1e-10)
+    assert_allclose(mod.score_obs(params).toarray(),
+                    mod_dense.score_obs(params), rtol=1e-10, atol=1e-14)
+
+    # gradient optimization uses the sparse score and hessian
+    res_nm = mod.fit(method='newton', start_params=params * 0.9)
+    assert_allclose(res_nm.params, res_dense.params, rtol=1e-6, atol=1e-8)
+    assert_allclose(res_nm.bse, res_dense.bse, rtol=1e-5)
+
+
+def test_sparse_inverse():
+    import pickle
+    from scipy import sparse
+    from statsmodels.tools.grouputils import dummy_sparse
+    np.random.seed(9876)
+    nobs = 500
+    firm = np.random.randint(0, 50, size=nobs)
+    year = np.random.randint(0, 6, size=nobs)
+    exog = sparse.hstack((np.random.randn(nobs, 2), dummy_sparse(firm),
+                          dummy_sparse(year)[:, 1:]), format='csr')
+    xtx = exog.T.dot(exog)
+    inv = np.linalg.inv(xtx.toarray())
+
+    sinv = SparseInverse(xtx)
+    assert_allclose(sinv.toarray(), inv, rtol=1e-10, atol=1e-14)
+    assert_allclose(sinv.diagonal(), np.diag(inv), rtol=1e-10)
+    # solve for blocks of columns if many columns remain
+    sinv.max_schur = 0
+    assert_allclose(sinv.diagonal(), np.diag(inv), rtol=1e-10)
+
+    sinv = pickle.loads(pickle.dumps(sinv))
+    assert_allclose(sinv.diagonal(), np.diag(inv), rtol=1e-10)
+
+
+def test_glm_absorb():
+    import pandas as pd
+    np.random.seed(76453)
+    nobs = 800
+    firm = np.random.randint(0, 30, size=nobs)
+    year = np.random.randint(0, 8, size=nobs)
+    exog = np.random.randn(nobs, 2)
+    linpred = (0.3 * exog[:, 0] - 0.2 * exog[:, 1] +
+               0.4 * np.random.randn(30)[firm] + 0.2 * np.random.randn(8)[year])
+    exposure = np.random.uniform(1, 2, size=nobs)
+    endog = np.random.poisson(exposure * np.exp(linpred))
+    dummies = pd.get_dummies(pd.DataFrame({'firm': firm, 'year': year}),
+                             columns=['firm', 'year'])
+    exog_dummy = np.column_stack((exog, np.asarray(dummies)[:, :-1]))
+
+    family = sm.families.Poisson()
+    mod1 = GLM(endog, exog, family=family, exposure=exposure,
+               absorb=np.column_stack((firm, year)))
+    res1 = mod1.fit()
+    res2 = GLM(endog, exog_dummy, family=family, exposure=exposure).fit()
+    assert_equal(mod1.k_absorb, 30 + 8 - 1)
+    assert_equal(res1.df_model, 2)
+    assert_equal(res1.df_resid, res2.df_resid)
+    assert_allclose(res1.params, res2.params[:2], rtol=1e-7)
+    assert_allclose(res1.bse, res2.bse[:2], rtol=1e-7)
+    assert_allclose(res1.llf, res2.llf, rtol=1e-10)
+    assert_allclose(res1.deviance, res2.deviance, rtol=1e-8)
+    assert_allclose(res1.fittedvalues, res2.fittedvalues, rtol=1e-7)
+    assert_allclose(res1.resid_pearson, res2.resid_pearson, rtol=1e-6,
+                    atol=1e-8)
+
+    # the absorbed design of a fit does not leak into later calls
+    assert_(not hasattr(mod1, '_absorbed_exog'))
+    assert_(not hasattr(mod1, '_absorbed_linpred'))
+    mod0 = GLM(endog, exog, family=family, exposure=exposure)
+    assert_allclose(mod1.predict(res1.params), mod0.predict(res1.params))
+    assert_allclose(mod1.score_obs(res1.params), mod0.score_obs(res1.params))
+    res3 = mod1.fit(cov_type='HC0')
+    assert_allclose(res3.params, res1.params, rtol=1e-10)
+    assert_allclose(res3.fittedvalues, res1.fittedvalues, rtol=1e-10)
+    res4 = GLM(endog, exog_dummy, family=family,
+               exposure=exposure).fit(cov_type='HC0')
+    assert_allclose(res3.bse, res4.bse[:2], rtol=1e-6)
+
+    # the working weights are used for the within transformation
+    res1 = GLM(endog, exog, family=family, absorb=firm).fit(
+        cov_type='cluster', cov_kwds={'groups': firm,
+                                      'use_correction': False})
+    res2 = GLM(endog, np.column_stack((exog, np.asarray(dummies)[:, :30])),
+               family=family).fit(cov_type='cluster',
+                                  cov_kwds={'groups': firm,
+                                            'use_correction': False})
+    assert_allclose(res1.params, res2.params[:2], rtol=1e-7)
+    assert_allclose(res1.bse, res2.bse[:2], rtol=1e-6)
+
+    assert_raises(ValueError, mod1.fit, method='bfgs')
+    assert_raises(ValueError, GLM, endog, add_constant(exog), family=family,
+                  absorb=firm)
+
+
 if __name__ == "__main__":
     import pytest
     pytest.main([__file__, '-vvs', '-x', '--pdb'])
@@ -115,11 +115,14 @@ Opening Windows into the Black Box', Journal of Statistical Software,
 2009.
 """
 
+import copy
 import pandas as pd
 import numpy as np
 import patsy
+from patsy.eval import EvalFactor, ast_names
 from statsmodels.base.model import LikelihoodModelResults
 from statsmodels.regression.linear_model import OLS
+from statsmodels.tools.parallel import parallel_func
 from collections import defaultdict
 
 
@@ -190,6 +193,12 @@ class MICEData(object):
 
     `history_callback` can be implemented to have side effects such as
     saving the current imputed data set to disk.
+
+    The design matrices of the imputation models are cached.  After a
+    variable is imputed, only the terms of the imputation formulas
+    that depend on that variable are re-evaluated.  Formulas that use
+    stateful transforms such as `center` are evaluated in full each
+    time.
     """ % {'_mice_data_example_1': _mice_data_example_1,
            '_mice_data_example_2': _mice_data_example_2}
 
@@ -242,6 +251,14 @@ class MICEData(object):
         # Map from variable names to most recent params update.
         self.params = {}
 
+        # Cached design matrices of the imputation models, and a
+        # counter of the changes to each variable.
+        self._design = {}
+        self._data_version = dict((col, 0) for col in self.data.columns)
+
+        # Source of the random draws.
+        self._random_state = np.random
+
         # Set default imputers.
         for vname in data.columns:
             self.set_imputer(vname)
@@ -396,6 +413,95 @@ class MICEData(object):
         ix = self.ix_miss[col]
         if len(ix) > 0:
             self.data[col].iloc[ix] = np.atleast_1d(vals)
+            self._data_version[col] += 1
+
+    def __getstate__(self):
+        # Patsy design information cannot be pickled, the design
+        # matrices are rebuilt when needed.  The global random state
+        # is restored on unpickling.
+        state = self.__dict__.copy()
+        state["_design"] = {}
+        if state["_random_state"] is np.random:
+            state["_random_state"] = None
+        return state
+
+    def __setstate__(self, state):
+        if state["_random_state"] is None:
+            state["_random_state"] = np.random
+        self.__dict__.update(state)
+
+    def _get_design(self, vname):
+        """
+        Return the endog and exog design matrices for imputing a
+        given variable, evaluated on the current data.
+
+        The design information is cached, so that only the terms that
+        depend on variables which have changed since the previous call
+        are re-evaluated.
+        """
+
+        formula = self.conditional_formula[vname]
+        cache = self._design.get(vname)
+        if (cache is None or cache["formula"] != formula or
+                cache["data"] is not self.data):
+            endog, exog = patsy.dmatrices(formula, self.data,
+                                          return_type="matrix")
+            mats = [np.asarray(endog), np.asarray(exog)]
+            infos = [endog.design_info, exog.design_info]
+            terms = [self._term_names(di) for di in infos]
+            if None not in terms:
+                self._design[vname] = {"formula": formula, "data": self.data,
+                                       "version": self._data_version.copy(),
+                                       "mats": mats, "infos": infos,
+                                       "terms": terms}
+            return mats
+
+        version = cache["version"]
+        changed = set(col for col in version
+                      if version[col] != self._data_version[col])
+        if len(changed) == 0:
+            return cache["mats"]
+
+        for mat, di, term_names in zip(cache["mats"], cache["infos"],
+                                       cache["terms"]):
+            terms = [term for term in di.terms
+                     if len(term_names[term] & changed) > 0]
+            if len(terms) == 0:
+                continue
+            di_sub = di.subset(terms)
+            mat_sub = patsy.build_design_matrices([di_sub], self.data)[0]
+            for term in terms:
+                sub_slice = di_sub.term_slices[term]
+                mat[:, di.term_slices[term]] = mat_sub[:, sub_slice]
+
+        cache["version"] = self._data_version.copy()
+        return cache["mats"]
+
+    def _term_names(self, design_info):
+        """
+        Map each term of a design to the variables that it depends
+        on.  Returns None if a factor uses stateful transforms, is not
+        a Python expression or quotes variable names with Q, these
+        designs are not cached.
+        """
+
+        columns = set(self.data.columns)
+        term_names = {}
+        for term in design_info.terms:
+            names = set()
+            for factor in term.factors:
+                if not isinstance(factor, EvalFactor):
+                    return None
+                state = design_info.factor_infos[factor].state
+                if len(state.get("transforms", {})) > 0:
+                    return None
+                code_names = set(ast_names(factor.code))
+                # Q("name") looks up a variable from a string
+                if "Q" in code_names:
+                    return None
+                names |= code_names & columns
+            term_names[term] = names
+        return term_names
 
     def update_all(self, n_iter=1):
         """
@@ -447,18 +553,16 @@ class MICEData(object):
             as required.
         """
 
-        formula = self.conditional_formula[vname]
-        endog, exog = patsy.dmatrices(formula, self.data,
-                                      return_type="dataframe")
+        endog, exog = self._get_design(vname)
 
         # Rows with observed endog
         ixo = self.ix_obs[vname]
-        endog_obs = np.asarray(endog.iloc[ixo])
-        exog_obs = np.asarray(exog.iloc[ixo, :])
+        endog_obs = endog[ixo]
+        exog_obs = exog[ixo, :]
 
         # Rows with missing endog
         ixm = self.ix_miss[vname]
-        exog_miss = np.asarray(exog.iloc[ixm, :])
+        exog_miss = exog[ixm, :]
 
         predict_obs_kwds = {}
         if vname in self.predict_kwds:
@@ -519,12 +623,10 @@ class MICEData(object):
         # Rows with observed endog
         ix = self.ix_obs[vname]
 
-        formula = self.conditional_formula[vname]
-        endog, exog = patsy.dmatrices(formula, self.data,
-                                      return_type="dataframe")
+        endog, exog = self._get_design(vname)
 
-        endog = np.asarray(endog.iloc[ix, 0])
-        exog = np.asarray(exog.iloc[ix, :])
+        endog = endog[ix, 0]
+        exog = exog[ix, :]
 
         init_kwds = self._process_kwds(self.init_kwds[vname], ix)
         fit_kwds = self._process_kwds(self.fit_kwds[vname], ix)
@@ -941,7 +1043,7 @@ class MICEData(object):
         endog, exog, init_kwds, fit_kwds = self.get_fitting_data(vname)
 
         m = len(endog)
-        rix = np.random.randint(0, m, m)
+        rix = self._random_state.randint(0, m, m)
         endog = endog[rix]
         exog = exog[rix, :]
 
@@ -976,7 +1078,8 @@ class MICEData(object):
 
         cov = self.results[vname].cov_params()
         mu = self.results[vname].params
-        self.params[vname] = np.random.multivariate_normal(mean=mu, cov=cov)
+        self.params[vname] = self._random_state.multivariate_normal(
+            mean=mu, cov=cov)
 
     def perturb_params(self, vname):
 
@@ -1074,7 +1177,7 @@ class MICEData(object):
         dxi = np.argsort(dx, 1)[:, 0:k_pmm]
 
         # Choose a column for each row.
-        ir = np.random.randint(0, k_pmm, len(pendog_miss))
+        ir = self._random_state.randint(0, k_pmm, len(pendog_miss))
 
         # Unwind the indices
         jj = np.arange(dxi.shape[0])
@@ -1215,7 +1318,7 @@ to obtain summary:
 
         return result
 
-    def fit(self, n_burnin=10, n_imputations=10):
+    def fit(self, n_burnin=10, n_imputations=10, n_jobs=1):
         """
         Fit a model using MICE.
 
@@ -1225,14 +1328,40 @@ to obtain summary:
             The number of burn-in cycles to skip.
         n_imputations : int
             The number of data sets to impute
+        n_jobs : int
+            The number of jobs to run in parallel, -1 uses all
+            available CPUs.  If greater than one, the imputed data
+            sets are drawn from independent chains, one per job, each
+            with its own burn-in.  Requires joblib.
+
+        Notes
+        -----
+        The random seeds of the parallel chains are drawn from the
+        global numpy random state.  The parallel chains work on copies
+        of `data`, so its imputed values are not updated.
         """
 
-        # Run without fitting the analysis model
-        self.data.update_all(n_burnin)
+        parallel, p_func, n_jobs = parallel_func(_mice_chain, n_jobs,
+                                                 verbose=0)
 
-        for j in range(n_imputations):
-            result = self.next_sample()
-            self.results_list.append(result)
+        if n_jobs == 1:
+            # Run without fitting the analysis model
+            self.data.update_all(n_burnin)
+
+            for j in range(n_imputations):
+                result = self.next_sample()
+                self.results_list.append(result)
+        else:
+            n_chains = min(n_jobs, n_imputations)
+            sizes = [len(x) for x in
+                     np.array_split(np.arange(n_imputations), n_chains)]
+            seeds = np.random.randint(0, 2**31 - 1, size=n_chains)
+            chains = parallel(p_func(self, seed, n_burnin, size)
+                              for seed, size in zip(seeds, sizes))
+            for results_list, history in chains:
+                self.results_list.extend(results_list)
+                self.data.history.extend(history)
+            result = self.results_list[-1]
 
         self.endog_names = result.model.endog_names
         self.exog_names = result.model.exog_names
@@ -1291,6 +1420,30 @@ to obtain summary:
         return results
 
 
+def _mice_chain(mice, seed, n_burnin, n_imputations):
+    """
+    Run an independent imputation chain on a copy of the data of a
+    MICE instance, returning the analysis results and the imputation
+    history of the chain.
+    """
+
+    data = copy.deepcopy(mice.data)
+    data._random_state = np.random.RandomState(seed)
+    data.history = []
+    chain = MICE(mice.model_formula, mice.model_class, data,
+                 n_skip=mice.n_skip, init_kwds=mice.init_kwds,
+                 fit_kwds=dict(mice.fit_kwds))
+
+    data.update_all(n_burnin)
+    results_list = []
+    for j in range(n_imputations):
+        result = chain.next_sample()
+        chain.results_list.append(result)
+        results_list.append(result)
+
+    return results_list, data.history
+
+
 class MICEResults(LikelihoodModelResults):
 
     def __init__(self, model, params, normalized_cov_params):
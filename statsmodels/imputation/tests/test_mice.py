@@ -2,9 +2,10 @@ from statsmodels.compat.testing import skipif
 
 import numpy as np
 import pandas as pd
+import pytest
 from statsmodels.imputation import mice
 import statsmodels.api as sm
-from numpy.testing import assert_equal, assert_allclose, dec
+from numpy.testing import assert_, assert_equal, assert_allclose, dec
 
 try:
     import matplotlib.pyplot as plt  #makes plt available for test functions
@@ -280,6 +281,51 @@ class TestMICEData(object):
             close_or_save(pdf, fig)
 
 
+    def test_design_cache(self):
+
+        import patsy
+        df = gendat()
+        imp_data = mice.MICEData(df)
+        imp_data.set_imputer('x1', 'x2 + np.square(x3) + x4:y')
+        imp_data.set_imputer('x2', 'center(x1) + x3')
+        for k in range(2):
+            imp_data.update_all()
+            for vname in imp_data._cycle_order:
+                endog, exog = imp_data._get_design(vname)
+                fml = imp_data.conditional_formula[vname]
+                endog1, exog1 = patsy.dmatrices(fml, imp_data.data)
+                assert_allclose(endog, endog1)
+                assert_allclose(exog, exog1)
+
+        # Designs with stateful transforms are not cached
+        assert_equal(sorted(imp_data._design),
+                     ['x1', 'x3', 'x4', 'x5', 'y'])
+
+    def test_design_cache_quoted(self):
+
+        import patsy
+
+        class UncachedMICEData(mice.MICEData):
+            def _get_design(self, vname):
+                fml = self.conditional_formula[vname]
+                endog, exog = patsy.dmatrices(fml, self.data,
+                                              return_type="matrix")
+                return np.asarray(endog), np.asarray(exog)
+
+        imps = []
+        for klass in mice.MICEData, UncachedMICEData:
+            df = gendat()
+            np.random.seed(3481)
+            imp_data = klass(df)
+            imp_data.set_imputer('x3', 'Q("x1") + x4 + x5')
+            imp_data.update_all(3)
+            imps.append(imp_data)
+
+        # variables named in Q are not visible to the cache
+        assert_('x3' not in imps[0]._design)
+        assert_('x1' in imps[0]._design)
+        assert_allclose(imps[0].data.values, imps[1].data.values)
+
 
 class TestMICE(object):
 
@@ -332,6 +378,27 @@ class TestMICE(object):
             assert(isinstance(x.family, sm.families.Binomial))
 
 
+    def test_fit_n_jobs(self):
+
+        pytest.importorskip('joblib')
+        df = gendat()
+        rslt = []
+        for k in range(2):
+            np.random.seed(431)
+            imp_data = mice.MICEData(df)
+            mi = mice.MICE("y ~ x1 + x2", sm.OLS, imp_data)
+            rslt.append(mi.fit(2, 6, n_jobs=2))
+            assert_equal(len(mi.results_list), 6)
+
+            # Each chain has its own random state, the first imputation
+            # of the second chain differs from the first chain
+            params = [r.params for r in mi.results_list]
+            assert_(not np.allclose(params[0], params[3]))
+            assert_(not np.allclose(params[0], params[1]))
+
+        assert_allclose(rslt[0].params, rslt[1].params)
+        assert_allclose(rslt[0].bse, rslt[1].bse)
+
     def test_combine(self):
 
         np.random.seed(3897)
@@ -11,6 +11,7 @@ import pandas as pd
 from statsmodels.compat.python import range
 from statsmodels.tools.sm_exceptions import (ValueWarning,
                                              EstimationWarning)
+from statsmodels.tools.tools import _row_chunks
 
 def _norm(x):
     return np.sqrt(np.sum(x * x))
@@ -56,6 +57,12 @@ class PCA(object):
         'nipals' uses the NIPALS algorithm and can be faster than SVD when
         ncomp is small and nvars is large. See notes about additional changes
         when using NIPALS
+        'randomized' uses a randomized SVD to compute only the ncomp leading
+        components, which is much faster than SVD when ncomp is small
+        'incremental' uses an eigenvalue decomposition of the quadratic form
+        accumulated over blocks of rows. When filling missing values with
+        EM, the quadratic form is updated using only the rows with missing
+        values
     tol : float, optional
         Tolerance to use when checking for convergence when using NIPALS
     max_iter : int, optional
@@ -71,6 +78,18 @@ class PCA(object):
         Tolerance to use when checking for convergence of the EM algorithm
     max_em_iter : int
         Maximum iterations for the EM algorithm
+    n_oversample : int, optional
+        Number of additional random directions used when method is
+        'randomized'
+    n_power_iter : int, optional
+        Number of power iterations used when method is 'randomized'.  More
+        iterations improve the accuracy when the eigenvalues decay slowly
+    block_size : int, optional
+        Number of rows in each block when method is 'incremental'.  The
+        default uses blocks of about 2**20 elements
+    seed : {None, int, RandomState}, optional
+        Seed or random state for the random directions when method is
+        'randomized'
 
     Attributes
     ----------
@@ -142,6 +161,10 @@ class PCA(object):
     >>> pc.factors.shape
     (100, 1)
 
+    The leading 3 factors computed using a randomized SVD
+
+    >>> pc = PCA(x, ncomp=3, method='randomized', seed=0)
+
     Notes
     -----
     The default options perform principal component analysis on the
@@ -186,14 +209,26 @@ class PCA(object):
 
     where the number of factors is less than the rank of X
 
+    The randomized SVD follows Halko, Martinsson and Tropp (2011).  The data
+    are multiplied by ncomp + n_oversample random directions, and
+    n_power_iter power iterations refine the estimated range before a small
+    SVD is computed.  Inside the EM algorithm the eigenvectors of the
+    previous iteration are used as the starting directions.  As with NIPALS,
+    only ncomp eigenvalues are computed.
+
     .. [*] J. Bai and S. Ng, "Determining the number of factors in approximate
        factor models," Econometrica, vol. 70, number 1, pp. 191-221, 2002
+    .. [*] N. Halko, P. G. Martinsson and J. A. Tropp, "Finding structure with
+       randomness: Probabilistic algorithms for constructing approximate
+       matrix decompositions," SIAM Review, vol. 53, number 2, pp. 217-288,
+       2011
     """
 
     def __init__(self, data, ncomp=None, standardize=True, demean=True,
                  normalize=True, gls=False, weights=None, method='svd',
                  missing=None, tol=5e-8, max_iter=1000, tol_em=5e-8,
-                 max_em_iter=100, ):
+                 max_em_iter=100, n_oversample=10, n_power_iter=4,
+                 block_size=None, seed=None):
         self._index = None
         self._columns = []
         if isinstance(data, pd.DataFrame):
@@ -210,6 +245,16 @@ class PCA(object):
         self._max_iter = max_iter
         self._max_em_iter = max_em_iter
         self._tol_em = tol_em
+        self._n_oversample = n_oversample
+        self._n_power_iter = n_power_iter
+        self._block_size = block_size
+        if isinstance(seed, np.random.RandomState):
+            self._random_state = seed
+        else:
+            self._random_state = np.random.RandomState(seed)
+        # Quadratic form of the data, kept by the incremental method
+        # during the EM algorithm
+        self._xpx = None
 
         # Prepare data
         self._standardize = standardize
@@ -244,6 +289,10 @@ class PCA(object):
             self._compute_eig = self._compute_using_svd
         elif self._method == 'nipals':
             self._compute_eig = self._compute_using_nipals
+        elif self._method == 'randomized':
+            self._compute_eig = self._compute_using_randomized
+        elif self._method == 'incremental':
+            self._compute_eig = self._compute_using_incremental
         else:
             raise ValueError('method is not known.')
 
@@ -421,7 +470,7 @@ class PCA(object):
     def _compute_using_svd(self):
         """SVD method to compute eigenvalues and eigenvecs"""
         x = self.transformed_data
-        u, s, v = np.linalg.svd(x)
+        u, s, v = np.linalg.svd(x, full_matrices=False)
         self.eigenvals = s ** 2.0
         self.eigenvecs = v.T
 
@@ -463,6 +512,47 @@ class PCA(object):
         self.eigenvals = vals
         self.eigenvecs = vecs
 
+    def _compute_using_randomized(self):
+        """
+        Randomized SVD to compute the leading eigenvalues and eigenvectors
+        """
+        x = self.transformed_data
+        ncomp = self._ncomp
+        size = min(ncomp + self._n_oversample, self._nobs, self._nvar)
+        # Start from the previous eigenvectors in the EM algorithm
+        start = getattr(self, 'eigenvecs', None)
+        if start is not None and start.shape[0] == self._nvar:
+            start = start[:, :size]
+            extra = size - start.shape[1]
+            omega = np.column_stack(
+                (start, self._random_state.standard_normal((self._nvar,
+                                                            extra))))
+        else:
+            omega = self._random_state.standard_normal((self._nvar, size))
+
+        q, _ = np.linalg.qr(x.dot(omega))
+        for _ in range(self._n_power_iter):
+            z, _ = np.linalg.qr(x.T.dot(q))
+            q, _ = np.linalg.qr(x.dot(z))
+
+        u, s, v = np.linalg.svd(q.T.dot(x), full_matrices=False)
+        self.eigenvals = s[:ncomp] ** 2.0
+        self.eigenvecs = v[:ncomp].T
+
+    def _compute_using_incremental(self):
+        """
+        Eigenvalue decomposition of the quadratic form accumulated over
+        blocks of rows
+        """
+        xpx = self._xpx
+        if xpx is None:
+            x = self.transformed_data
+            xpx = np.zeros((self._nvar, self._nvar))
+            for rows in _row_chunks(self._nobs, self._nvar, self._block_size):
+                xpx += x[rows].T.dot(x[rows])
+        self.eigenvals, self.eigenvecs = np.linalg.eigh(xpx)
+        return xpx
+
     def _fill_missing_em(self):
         """
         EM algorithm to fill missing values
@@ -498,20 +588,31 @@ class PCA(object):
         # 6. Compute eigenvalues and fit
         diff = 1.0
         _iter = 0
+        mask_rows, mask_cols = np.nonzero(mask)
+        # Rows with missing values, used to update the quadratic form
+        rows = np.flatnonzero(mask.any(1))
         while diff > self._tol_em and _iter < self._max_em_iter:
             last_projection_masked = projection_masked
             # Set transformed data to compute eigenvalues
             self.transformed_data = data
             # Call correct eig function here
-            self._compute_eig()
+            xpx = self._compute_eig()
             # Call function to compute factors and projection
             self._compute_pca_from_eig()
-            projection = np.asarray(self.project(transform=False, unweight=False))
-            projection_masked = projection[mask]
+            # Projection at the missing values
+            factors = np.asarray(self.factors)[mask_rows, :self._ncomp]
+            coeff = np.asarray(self.coeff)[:self._ncomp, mask_cols]
+            projection_masked = np.sum(factors * coeff.T, 1)
+            if xpx is not None:
+                xpx -= data[rows].T.dot(data[rows])
             data[mask] = projection_masked
+            if xpx is not None:
+                xpx += data[rows].T.dot(data[rows])
+                self._xpx = xpx
             delta = last_projection_masked - projection_masked
             diff = _norm(delta) / _norm(projection_masked)
             _iter += 1
+        self._xpx = None
         # Must copy to avoid overwriting original data since replacing values
         data = self._adjusted_data + 0.0
         projection = np.asarray(self.project())
@@ -105,6 +105,27 @@ class TestPCA(object):
         # Check data for no changes
         assert_equal(self.x, pc_nipals.data)
 
+    def test_randomized_incremental(self):
+        pc_svd = PCA(self.x, method='svd', ncomp=3)
+        pc_rand = PCA(self.x, method='randomized', ncomp=3, seed=0)
+        pc_inc = PCA(self.x, method='incremental', ncomp=3, block_size=30)
+        # randomized SVD is only accurate up to the power iterations
+        for pc, tol in ((pc_rand, 1e-4), (pc_inc, 1e-8)):
+            assert_allclose(np.abs(pc.factors), np.abs(pc_svd.factors),
+                            rtol=tol, atol=tol)
+            assert_allclose(np.abs(pc.coeff), np.abs(pc_svd.coeff),
+                            rtol=tol, atol=tol)
+            assert_allclose(pc.eigenvals[:3], pc_svd.eigenvals[:3])
+            assert_allclose(pc.projection, pc_svd.projection,
+                            rtol=tol, atol=tol)
+            assert_equal(self.x, pc.data)
+        assert_equal(pc_rand.eigenvals.shape, (3,))
+        assert_allclose(pc_inc.eigenvals, pc_svd.eigenvals, atol=DECIMAL_5)
+
+        pc_rand2 = PCA(self.x, method='randomized', ncomp=3,
+                       seed=np.random.RandomState(0))
+        assert_equal(pc_rand.factors, pc_rand2.factors)
+
     def test_options(self):
         pc = PCA(self.x)
         pc_no_norm = PCA(self.x, normalize=False)
@@ -409,3 +430,16 @@ class TestPCA(object):
         pc_df = PCA(x_df, missing='drop-min')
         assert_allclose(pc.coeff, pc_df.coeff)
         assert_allclose(pc.factors, pc_df.factors)
+
+    def test_fill_em_methods(self):
+        x = self.x.copy()
+        x[::5, ::7] = np.nan
+        pc_svd = PCA(x, ncomp=3, missing='fill-em', method='svd')
+        for method in ('randomized', 'incremental'):
+            pc = PCA(x, ncomp=3, missing='fill-em', method=method, seed=1,
+                     block_size=50)
+            assert_allclose(pc.transformed_data, pc_svd.transformed_data,
+                            atol=1e-5)
+            assert_allclose(np.abs(pc.factors), np.abs(pc_svd.factors),
+                            atol=1e-5)
+            assert_allclose(pc.projection, pc_svd.projection, atol=1e-4)
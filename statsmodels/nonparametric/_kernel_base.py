@@ -4,9 +4,10 @@ regression, plus some utilities.
 """
 from statsmodels.compat.python import range, string_types
 import copy
+import itertools
 
 import numpy as np
-from scipy import optimize
+from scipy import optimize, signal
 from scipy.stats.mstats import mquantiles
 
 try:
@@ -244,6 +245,8 @@ class GenericKDE (object):
         self.efficient = defaults.efficient
         self.return_only_bw = defaults.return_only_bw
         self.n_jobs = defaults.n_jobs
+        self.binned = defaults.binned
+        self.gridsize = defaults.gridsize
 
     def _normal_reference(self):
         """
@@ -374,6 +377,16 @@ class EstimatorSettings(object):
         ``n_cores`` the number of available CPU cores.
         See the `joblib documentation
         <https://pythonhosted.org/joblib/parallel.html>`_ for more details.
+    binned : bool, optional
+        If True, `KDEMultivariate` with only continuous variables (at most
+        4) uses linear binning of the data on a regular grid and FFT
+        convolution for `pdf` and for the cross-validation bandwidth
+        selection. The cost of an evaluation of the cross-validation
+        criterion does not depend on the number of observations. Default is
+        False.
+    gridsize : int or array_like, optional
+        Number of grid points per variable for the binned estimation. The
+        default is 2048, 256, 64 and 32 for 1 to 4 variables.
 
     Examples
     --------
@@ -382,7 +395,8 @@ class EstimatorSettings(object):
 
     """
     def __init__(self, efficient=False, randomize=False, n_res=25, n_sub=50,
-                 return_median=True, return_only_bw=False, n_jobs=-1):
+                 return_median=True, return_only_bw=False, n_jobs=-1,
+                 binned=False, gridsize=None):
         self.efficient = efficient
         self.randomize = randomize
         self.n_res = n_res
@@ -390,6 +404,8 @@ class EstimatorSettings(object):
         self.return_median = return_median
         self.return_only_bw = return_only_bw  # TODO: remove this?
         self.n_jobs = n_jobs
+        self.binned = binned
+        self.gridsize = gridsize
 
 
 class LeaveOneOut(object):
@@ -515,3 +531,90 @@ def gpke(bw, data, data_predict, var_type, ckertype='gaussian',
         return dens.sum(axis=0)
     else:
         return dens
+
+
+# default number of grid points per variable for binned estimation
+_default_gridsize = {1: 2048, 2: 256, 3: 64, 4: 32}
+
+
+def _linbin_nd(data, a, b, gridsize):
+    """
+    Linear binning of multivariate data on a regular grid
+
+    Each observation is split among the 2**k_vars surrounding grid points
+    with weights given by the linear interpolation weights, see Wand (1994).
+    The data have to lie within the grid bounds `a` and `b`.
+
+    Returns
+    -------
+    counts : ndarray
+        Binned counts with shape `gridsize`, they sum to nobs.
+    delta : ndarray
+        Grid spacing for each variable.
+    """
+    nobs, k_vars = data.shape
+    gridsize = np.asarray(gridsize, dtype=np.intp)
+    delta = (b - a) / (gridsize - 1)
+    pos = (data - a) / delta
+    lower = np.clip(np.floor(pos).astype(np.intp), 0, gridsize - 2)
+    rem = pos - lower
+    strides = np.cumprod(np.r_[gridsize[1:], 1][::-1])[::-1]
+    counts = np.zeros(gridsize.prod())
+    for corner in itertools.product((0, 1), repeat=k_vars):
+        corner = np.array(corner)
+        weights = np.where(corner, rem, 1 - rem).prod(1)
+        idx = (lower + corner).dot(strides)
+        counts += np.bincount(idx, weights=weights, minlength=counts.size)
+    return counts.reshape(gridsize), delta
+
+
+def _binned_self_kernel(data, a, delta, gridsize, bw,
+                        kernel=kernels.gaussian):
+    """
+    Kernel of each observation with itself after binning and interpolation
+
+    With linear binning and multilinear interpolation on the same grid the
+    contribution of an observation to the interpolated kernel sum at its own
+    location is not ``K(0)`` but a weighted average of the kernel at zero and
+    at one grid step. This is the term that has to be removed to get exact
+    leave-one-out sums of the binned estimator. The result is not divided by
+    the product of bandwidths.
+    """
+    gridsize = np.asarray(gridsize, dtype=np.intp)
+    pos = (data - a) / delta
+    lower = np.clip(np.floor(pos).astype(np.intp), 0, gridsize - 2)
+    rem = pos - lower
+    k0 = kernel(bw, 0., 0.)
+    k1 = kernel(bw, delta, 0.)
+    return (((1 - rem)**2 + rem**2) * k0 + 2 * rem * (1 - rem) * k1).prod(1)
+
+
+def _kernel_sums_binned(counts, delta, bw, kernel=kernels.gaussian,
+                        trunc=6.):
+    """
+    Sums of the product kernel over the binned data at all grid points
+
+    The product kernel is separable, so the convolution is done with a 1-D
+    FFT convolution for each variable. The kernel is truncated at `trunc`
+    bandwidths. The result is not divided by the product of bandwidths.
+    """
+    out = counts
+    for axis in range(counts.ndim):
+        n_lags = int(np.ceil(trunc * bw[axis] / delta[axis]))
+        n_lags = min(n_lags, counts.shape[axis] - 1)
+        offsets = np.arange(-n_lags, n_lags + 1) * delta[axis]
+        kern = kernel(bw[axis], offsets, 0.)
+        shape = [1] * counts.ndim
+        shape[axis] = len(kern)
+        out = signal.fftconvolve(out, kern.reshape(shape), mode='same')
+    return out
+
+
+def _interp_grid(values, a, b, points):
+    """Multilinear interpolation of values on a regular grid, 0 outside"""
+    from scipy.interpolate import RegularGridInterpolator
+    axes = [np.linspace(a[i], b[i], values.shape[i])
+            for i in range(values.ndim)]
+    interp = RegularGridInterpolator(axes, values, bounds_error=False,
+                                     fill_value=0.)
+    return interp(points)
@@ -35,7 +35,8 @@ import numpy as np
 
 from . import kernels
 from ._kernel_base import GenericKDE, EstimatorSettings, gpke, \
-    LeaveOneOut, _adjust_shape
+    LeaveOneOut, _adjust_shape, _default_gridsize, _linbin_nd, \
+    _kernel_sums_binned, _interp_grid, _binned_self_kernel
 
 
 __all__ = ['KDEMultivariate', 'KDEMultivariateConditional', 'EstimatorSettings']
@@ -75,7 +76,11 @@ class KDEMultivariate(GenericKDE):
             - cv_ls: cross validation least squares
 
     defaults: EstimatorSettings instance, optional
-        The default values for (efficient) bandwidth estimation.
+        The default values for (efficient) bandwidth estimation. With
+        ``EstimatorSettings(binned=True)`` the data are binned on a grid,
+        which makes `pdf` and the cross-validation bandwidth selection fast
+        for large samples. This is only available for up to 4 continuous
+        variables.
 
     Attributes
     ----------
@@ -86,6 +91,18 @@ class KDEMultivariate(GenericKDE):
     --------
     KDEMultivariateConditional
 
+    Notes
+    -----
+    The binned estimates use the Gaussian kernel on linearly binned data and
+    FFT convolution, see Wand (1994). Their accuracy depends on the number
+    of grid points relative to the bandwidth. `pdf` interpolates the
+    estimate on the grid linearly.
+
+    References
+    ----------
+    Wand, M. P. (1994). Fast computation of multivariate kernel estimators.
+    Journal of Computational and Graphical Statistics 3, 433-445.
+
     Examples
     --------
     >>> import statsmodels.api as sm
@@ -112,11 +129,40 @@ class KDEMultivariate(GenericKDE):
                              "than the number of variables.")
 
         self._set_defaults(defaults)
+        if self.binned:
+            self._check_binned()
         if not self.efficient:
             self.bw = self._compute_bw(bw)
         else:
             self.bw = self._compute_efficient(bw)
 
+    def _check_binned(self):
+        if self.var_type != 'c' * self.k_vars or self.k_vars > 4:
+            raise ValueError("binned estimation requires at most 4 "
+                             "continuous variables")
+        gridsize = self.gridsize
+        if gridsize is None:
+            gridsize = _default_gridsize[self.k_vars]
+        gridsize = np.broadcast_to(np.asarray(gridsize, dtype=int),
+                                   (self.k_vars,)).copy()
+        if (gridsize < 2).any():
+            raise ValueError("gridsize must be at least 2")
+        self.gridsize = gridsize
+
+    def _bins(self, pad=0.):
+        """Binned data on a grid that extends `pad` beyond the data"""
+        lower = self.data.min(0) - pad
+        upper = self.data.max(0) + pad
+        upper = np.where(upper > lower, upper, lower + 1.)
+        counts, delta = _linbin_nd(self.data, lower, upper, self.gridsize)
+        return counts, delta, lower, upper
+
+    def _cv_bins(self):
+        # the binned data used by the cross-validation criteria
+        if not hasattr(self, '_cv_bins_cache'):
+            self._cv_bins_cache = self._bins()
+        return self._cv_bins_cache
+
     def __repr__(self):
         """Provide something sane to print."""
         rpr = "KDE instance\n"
@@ -152,7 +198,21 @@ class KDEMultivariate(GenericKDE):
 
         .. math:: K_{h}(X_{i},X_{j}) =
             \prod_{s=1}^{q}h_{s}^{-1}k\left(\frac{X_{is}-X_{js}}{h_{s}}\right)
+
+        With binned estimation the kernel sums are computed on the grid and
+        interpolated at the observations.
         """
+        if self.binned:
+            bw = np.abs(bw)
+            counts, delta, lower, upper = self._cv_bins()
+            ksum = _kernel_sums_binned(counts, delta, bw)
+            ksum = _interp_grid(ksum, lower, upper, self.data)
+            # remove the kernel of the observation itself
+            ksum -= _binned_self_kernel(self.data, lower, delta,
+                                        self.gridsize, bw)
+            f_i = np.maximum(ksum / bw.prod(), np.finfo(float).tiny)
+            return -np.sum(func(f_i))
+
         LOO = LeaveOneOut(self.data)
         L = 0
         for i, X_not_i in enumerate(LOO):
@@ -189,6 +249,14 @@ class KDEMultivariate(GenericKDE):
         else:
             data_predict = _adjust_shape(data_predict, self.k_vars)
 
+        if self.binned:
+            bw = self.bw
+            counts, delta, lower, upper = self._bins(pad=4 * bw)
+            dens = _kernel_sums_binned(counts, delta, bw, trunc=4.)
+            dens /= self.nobs * bw.prod()
+            return np.squeeze(_interp_grid(dens, lower, upper,
+                                           data_predict))
+
         pdf_est = []
         for i in range(np.shape(data_predict)[0]):
             pdf_est.append(gpke(self.bw, data=self.data,
@@ -281,6 +349,9 @@ class KDEMultivariate(GenericKDE):
         .. [2] Racine, J., Li, Q. "Nonparametric Estimation of Distributions
                 with Categorical and Continuous Data." Working Paper. (2000)
         """
+        if self.binned:
+            return self._imse_binned(bw)
+
         #F = 0
         #for i in range(self.nobs):
         #    k_bar_sum = gpke(bw, data=-self.data,
@@ -334,6 +405,23 @@ class KDEMultivariate(GenericKDE):
         # CV objective function, eq. (2.4) of Ref. [3]
         return (F / nobs**2 - 2 * L / (nobs * (nobs - 1)))
 
+    def _imse_binned(self, bw):
+        """Binned least squares cross-validation criterion"""
+        bw = np.abs(bw)
+        nobs = self.nobs
+        counts, delta, lower, _ = self._cv_bins()
+        bw_prod = bw.prod()
+        k_bar = _kernel_sums_binned(counts, delta, bw,
+                                    kernel=kernels.gaussian_convolution)
+        F = (counts * k_bar).sum() / bw_prod
+        k_sum = _kernel_sums_binned(counts, delta, bw)
+        # remove the kernels of the observations with themselves
+        L = (counts * k_sum).sum()
+        L -= _binned_self_kernel(self.data, lower, delta, self.gridsize,
+                                 bw).sum()
+        L /= bw_prod
+        return (F / nobs**2 - 2 * L / (nobs * (nobs - 1)))
+
     def _get_class_vars_type(self):
         """Helper method to be able to pass needed vars to _compute_subset."""
         class_type = 'KDEMultivariate'
@@ -261,6 +261,63 @@ class TestKDEMultivariate(KDETestBase):
                                                           n_sub=100))
         npt.assert_equal(dens.bw, bw_user)
 
+    @pytest.mark.parametrize('bw', ['cv_ls', 'cv_ml'])
+    def test_binned_cv(self, bw):
+        nobs = 300
+        np.random.seed(12345)
+        C1 = np.random.normal(size=(nobs, ))
+        C2 = np.random.normal(2, 1, size=(nobs, ))
+        dens = nparam.KDEMultivariate(data=[C1, C2], var_type='cc', bw=bw)
+        settings = nparam.EstimatorSettings(binned=True)
+        dens_b = nparam.KDEMultivariate(data=[C1, C2], var_type='cc', bw=bw,
+                                        defaults=settings)
+        assert_allclose(dens_b.bw, dens.bw, rtol=0.05)
+        assert_allclose(dens_b.imse(dens.bw), dens.imse(dens.bw), rtol=1e-3)
+        assert_allclose(dens_b.loo_likelihood(dens.bw, np.log),
+                        dens.loo_likelihood(dens.bw, np.log), rtol=1e-3)
+
+    @pytest.mark.parametrize('k_vars', [1, 2, 3])
+    def test_binned_pdf(self, k_vars):
+        np.random.seed(12345)
+        data = np.random.normal(size=(200, k_vars))
+        data_predict = np.random.normal(scale=0.7, size=(20, k_vars))
+        var_type = 'c' * k_vars
+        dens = nparam.KDEMultivariate(data, var_type=var_type,
+                                      bw='normal_reference')
+        settings = nparam.EstimatorSettings(binned=True, gridsize=100)
+        dens_b = nparam.KDEMultivariate(data, var_type=var_type, bw=dens.bw,
+                                        defaults=settings)
+        pdf = dens.pdf(data_predict)
+        assert_allclose(dens_b.pdf(data_predict), pdf, rtol=0.01,
+                        atol=0.002 * pdf.max())
+        # zero far outside of the data
+        assert_equal(dens_b.pdf(np.full(k_vars, 100.)), 0)
+
+    def test_binned_raises(self):
+        data = np.random.normal(size=(20, 2))
+        data[:, 1] = data[:, 1] > 0
+        settings = nparam.EstimatorSettings(binned=True)
+        with pytest.raises(ValueError):
+            nparam.KDEMultivariate(data, var_type='cu', defaults=settings)
+        with pytest.raises(ValueError):
+            nparam.KDEMultivariate(np.random.normal(size=(20, 5)),
+                                   var_type='ccccc', defaults=settings)
+
+    def test_linbin_nd(self):
+        from statsmodels.nonparametric._kernel_base import _linbin_nd
+        np.random.seed(12345)
+        data = np.random.uniform(size=(100, 2))
+        a, b = np.zeros(2), np.ones(2)
+        counts, delta = _linbin_nd(data, a, b, [11, 6])
+        assert_equal(counts.shape, (11, 6))
+        assert_allclose(delta, [0.1, 0.2])
+        assert_allclose(counts.sum(), 100)
+        # linear binning preserves the means
+        grid = np.meshgrid(np.linspace(0, 1, 11), np.linspace(0, 1, 6),
+                           indexing='ij')
+        means = [(counts * g).sum() / 100 for g in grid]
+        assert_allclose(means, data.mean(0))
+
 
 class TestKDEMultivariateConditional(KDETestBase):
     @pytest.mark.slow
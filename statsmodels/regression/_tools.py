@@ -1,5 +1,12 @@
 from collections import namedtuple
+import warnings
+
 import numpy as np
+from scipy import sparse
+from scipy.sparse import linalg as splinalg
+
+from statsmodels.base._sparse import scale_rows, SparseInverse
+from statsmodels.tools.sm_exceptions import ConvergenceWarning
 from statsmodels.tools.tools import Bunch
 
 _MinimalWLSModel = namedtuple('_MinimalWLSModel', ['weights'])
@@ -25,6 +32,9 @@ class _MinimalWLS(object):
 
     Notes
     -----
+    exog can be a scipy.sparse matrix. In this case the weighted normal
+    equations are solved with sparse linear algebra, see `fit`.
+
     Need resid, scale, fittedvalues, model.weights!
         history['scale'].append(tmp_results.scale)
         if conv == 'dev':
@@ -46,7 +56,7 @@ class _MinimalWLS(object):
         if np.isscalar(weights):
             self.wexog = w_half * exog
         else:
-            self.wexog = w_half[:, None] * exog
+            self.wexog = scale_rows(w_half, exog)
 
     def fit(self, method='pinv'):
         """
@@ -62,6 +72,11 @@ class _MinimalWLS(object):
               * "qr" uses the QR factorization.
               * "lstsq" uses the least squares implementation in numpy.linalg
 
+            If exog is sparse, then the normal equations are solved either
+            with a sparse LU factorization, "spsolve", which is also used
+            for "pinv", "qr" and "lstsq", or with Jacobi preconditioned
+            conjugate gradients, "cg".
+
         Returns
         -------
         results : namedtuple
@@ -82,7 +97,9 @@ class _MinimalWLS(object):
         --------
         statsmodels.regression.linear_model.WLS
         """
-        if method == 'pinv':
+        if sparse.issparse(self.wexog):
+            params = self._fit_sparse(method)
+        elif method == 'pinv':
             pinv_wexog = np.linalg.pinv(self.wexog)
             params = pinv_wexog.dot(self.wendog)
         elif method == 'qr':
@@ -100,3 +117,36 @@ class _MinimalWLS(object):
 
         return Bunch(params=params, fittedvalues=fitted_values, resid=resid,
                      model=self, scale=scale)
+
+    def _fit_sparse(self, method, tol=1e-10):
+        xtx = self.wexog.T.dot(self.wexog).tocsc()
+        xty = self.wexog.T.dot(self.wendog)
+        if method != 'cg':
+            return splinalg.spsolve(xtx, xty)
+
+        diag = xtx.diagonal()
+        diag[diag == 0] = 1
+        precond = sparse.diags(1. / diag)
+        try:
+            params, info = splinalg.cg(xtx, xty, rtol=tol, atol=0,
+                                       M=precond)
+        except TypeError:
+            # scipy < 1.12 uses tol instead of rtol
+            params, info = splinalg.cg(xtx, xty, tol=tol, atol=0,
+                                       M=precond)
+        if info != 0:
+            warnings.warn("conjugate gradient did not converge",
+                          ConvergenceWarning)
+        return params
+
+    def normalized_cov_params(self):
+        """
+        Inverse of the cross product of the weighted exog
+
+        For a sparse exog a SparseInverse instance is returned. The dense
+        (k, k) inverse is then only computed when it is requested.
+        """
+        if sparse.issparse(self.wexog):
+            return SparseInverse(self.wexog.T.dot(self.wexog))
+        pinv_wexog = np.linalg.pinv(self.wexog)
+        return np.dot(pinv_wexog, pinv_wexog.T)
@@ -41,7 +41,10 @@ from scipy import stats
 from scipy import optimize
 
 from statsmodels.compat.numpy import np_matrix_rank
-from statsmodels.tools.tools import add_constant, chain_dot, pinv_extended
+from statsmodels.tools.data import _is_using_pandas
+from statsmodels.tools.tools import (add_constant, chain_dot, pinv_extended,
+                                     _cov_factor, _hat_matrix_diag,
+                                     _row_chunks)
 from statsmodels.tools.decorators import (resettable_cache,
                                           cache_readonly,
                                           cache_writable)
@@ -49,7 +52,9 @@ import statsmodels.base.model as base
 import statsmodels.base.wrapper as wrap
 from statsmodels.emplike.elregress import _ELRegOpts
 import warnings
-from statsmodels.tools.sm_exceptions import InvalidTestWarning
+from statsmodels.tools.sm_exceptions import (InvalidTestWarning,
+                                             ConvergenceWarning,
+                                             MissingDataError)
 
 # need import in module instead of lazily to copy `__doc__`
 from statsmodels.regression._prediction import PredictionResults
@@ -169,16 +174,111 @@ def _get_sigma(sigma, nobs):
     return sigma, cholsigmainv
 
 
+_absorb_param_doc = """
+    absorb : array-like or DataFrame, optional
+        Group labels of fixed effects that are projected out instead of
+        being included as dummy variables in exog, one column for each set
+        of fixed effects. exog must not contain a constant in this case.
+        See Notes."""
+
+_absorb_notes_doc = """
+    If `absorb` is given, then endog and exog are replaced by their
+    (weighted) within transformation which removes the means of all sets of
+    fixed effects by alternating projections. The parameters are the same
+    as in a regression with dummy variables for all fixed effects, and
+    `df_resid` is reduced by the number of absorbed parameters, `k_absorb`.
+    One redundant parameter is subtracted for each connected component of
+    the first two sets of fixed effects and one for each additional set.
+    `fittedvalues` and `rsquared` refer to the transformed data, while
+    `resid` are the residuals of the full model. Cluster robust standard
+    errors use the within transformed exog, the small sample correction
+    does not include the absorbed parameters. This is appropriate if the
+    fixed effects are nested within the clusters."""
+
+
+def _absorb_grouping(model, absorb):
+    """
+    Grouping of fixed effects that are absorbed by a model
+
+    Rows that the model dropped because of missing values are also dropped
+    from absorb.
+
+    Returns
+    -------
+    absorb : ndarray
+        Group labels aligned with the model data, (nobs, k_absorb_sets).
+    grouping : Grouping instance
+        Grouping with one index level for each set of fixed effects.
+    """
+    import pandas as pd
+    from statsmodels.tools.grouputils import Grouping
+
+    if model.k_constant:
+        raise ValueError('exog cannot include a constant if fixed effects '
+                         'are absorbed')
+    if isinstance(absorb, pd.Series):
+        absorb = absorb.to_frame()
+    if isinstance(absorb, pd.DataFrame):
+        names = [str(name) for name in absorb.columns]
+        arrays = [np.asarray(absorb[col]) for col in absorb.columns]
+    else:
+        absorb = np.asarray(absorb)
+        if absorb.ndim == 1:
+            absorb = absorb[:, None]
+        names = ['absorb%d' % i for i in range(absorb.shape[1])]
+        arrays = list(absorb.T)
+
+    nobs = model.endog.shape[0]
+    missing_row_idx = getattr(model.data, 'missing_row_idx', None)
+    if len(arrays[0]) != nobs and missing_row_idx is not None:
+        keep = np.ones(len(arrays[0]), bool)
+        keep[missing_row_idx] = False
+        arrays = [arr[keep] for arr in arrays]
+    if len(arrays[0]) != nobs:
+        raise ValueError('absorb does not have the same number of rows as '
+                         'endog')
+
+    index = pd.MultiIndex.from_arrays(arrays, names=names)
+    grouping = Grouping(index)
+    if any((np.asarray(codes) < 0).any() for codes in grouping.labels):
+        raise MissingDataError('absorb contains missing values')
+    return np.column_stack(arrays), grouping
+
+
 class RegressionModel(base.LikelihoodModel):
     """
     Base class for linear regression models. Should not be directly called.
 
     Intended for subclassing.
     """
+    # number of absorbed fixed effects parameters
+    k_absorb = 0
+
     def __init__(self, endog, exog, **kwargs):
         super(RegressionModel, self).__init__(endog, exog, **kwargs)
         self._data_attr.extend(['pinv_wexog', 'wendog', 'wexog', 'weights'])
 
+    def _setup_absorb(self, absorb):
+        """
+        Replace endog and exog by the within transformation of the fixed
+        effects in absorb.
+        """
+        self.absorb, self.absorb_grouping = _absorb_grouping(self, absorb)
+        weights = getattr(self, 'weights', None)
+        if weights is not None:
+            weights = np.broadcast_to(weights, self.endog.shape[:1])
+        self.endog, converged_endog = self.absorb_grouping.demean(
+            self.endog, weights)
+        self.exog, converged_exog = self.absorb_grouping.demean(
+            self.exog, weights)
+        if not (converged_endog and converged_exog):
+            warnings.warn('Projecting out the absorbed fixed effects did '
+                          'not converge', ConvergenceWarning)
+        self.k_absorb = self.absorb_grouping.absorbed_df()
+        self._init_keys.append('absorb')
+        self._data_attr.extend(['absorb', 'absorb_grouping'])
+        self.initialize()
+
     def initialize(self):
         self.wexog = self.whiten(self.exog)
         self.wendog = self.whiten(self.endog)
@@ -215,7 +315,7 @@ class RegressionModel(base.LikelihoodModel):
         if self._df_resid is None:
             if self.rank is None:
                 self.rank = np_matrix_rank(self.exog)
-            self._df_resid = self.nobs - self.rank
+            self._df_resid = self.nobs - self.rank - self.k_absorb
         return self._df_resid
 
     @df_resid.setter
@@ -266,18 +366,7 @@ class RegressionModel(base.LikelihoodModel):
         to solve the least squares minimization.
         """
         if method == "pinv":
-            if not (hasattr(self, 'pinv_wexog') and
-                    hasattr(self, 'normalized_cov_params') and
-                    hasattr(self, 'rank')):
-
-                self.pinv_wexog, singular_values = pinv_extended(self.wexog)
-                self.normalized_cov_params = np.dot(
-                    self.pinv_wexog, np.transpose(self.pinv_wexog))
-
-                # Cache these singular values for use later.
-                self.wexog_singular_values = singular_values
-                self.rank = np_matrix_rank(np.diag(singular_values))
-
+            self._setup_pinv()
             beta = np.dot(self.pinv_wexog, self.wendog)
 
         elif method == "qr":
@@ -302,7 +391,13 @@ class RegressionModel(base.LikelihoodModel):
         if self._df_model is None:
             self._df_model = float(self.rank - self.k_constant)
         if self._df_resid is None:
-            self.df_resid = self.nobs - self.rank
+            self.df_resid = self.nobs - self.rank - self.k_absorb
+
+        if self.data_mode == 'raw':
+            if cov_type != 'nonrobust':
+                raise ValueError("only cov_type='nonrobust' is available "
+                                 "with data_mode='raw'")
+            return RawRegressionResults(self, beta)
 
         if isinstance(self, OLS):
             lfit = OLSResults(
@@ -317,6 +412,26 @@ class RegressionModel(base.LikelihoodModel):
                 **kwargs)
         return RegressionResultsWrapper(lfit)
 
+    def _setup_pinv(self):
+        """compute and cache the pseudoinverse of wexog if not available"""
+        if not (hasattr(self, 'pinv_wexog') and
+                hasattr(self, 'normalized_cov_params') and
+                hasattr(self, 'rank')):
+
+            self.pinv_wexog, singular_values = pinv_extended(self.wexog)
+            self.normalized_cov_params = np.dot(
+                self.pinv_wexog, np.transpose(self.pinv_wexog))
+
+            # Cache these singular values for use later.
+            self.wexog_singular_values = singular_values
+            # same tolerance as np_matrix_rank(np.diag(singular_values))
+            if singular_values.size:
+                tol = (singular_values.max() * len(singular_values) *
+                       np.finfo(singular_values.dtype).eps)
+                self.rank = int((singular_values > tol).sum())
+            else:
+                self.rank = 0
+
     def predict(self, params, exog=None):
         """
         Return linear predicted values from a design matrix.
@@ -608,7 +723,7 @@ class WLS(RegressionModel):
     weights : array-like, optional
         1d array of weights.  If you supply 1/W then the variables are
         pre- multiplied by 1/sqrt(W).  If no weights are supplied the
-        default value is 1 and WLS results are the same as OLS.
+        default value is 1 and WLS results are the same as OLS.%(absorb)s
     %(extra_params)s
 
     Attributes
@@ -641,11 +756,13 @@ class WLS(RegressionModel):
     If the weights are a function of the data, then the post estimation
     statistics such as fvalue and mse_model might not be correct, as the
     package does not yet support no-constant regression.
+%(absorb_notes)s
     """ % {'params': base._model_params_doc,
-           'extra_params': base._missing_param_doc + base._extra_param_doc}
+           'extra_params': base._missing_param_doc + base._extra_param_doc,
+           'absorb': _absorb_param_doc, 'absorb_notes': _absorb_notes_doc}
 
     def __init__(self, endog, exog, weights=1., missing='none', hasconst=None,
-                 **kwargs):
+                 absorb=None, **kwargs):
         weights = np.array(weights)
         if weights.shape == ():
             if (missing == 'drop' and 'missing_idx' in kwargs and
@@ -667,6 +784,8 @@ class WLS(RegressionModel):
         weights = weights / np.sum(weights) * nobs
         if weights.size != nobs and weights.shape[0] != nobs:
             raise ValueError('Weights must be scalar or same length as design')
+        if absorb is not None:
+            self._setup_absorb(absorb)
 
     def whiten(self, X):
         """
@@ -689,6 +808,48 @@ class WLS(RegressionModel):
         elif X.ndim == 2:
             return np.sqrt(self.weights)[:, None]*X
 
+    def fit_many(self):
+        """
+        Fit the regression separately for each column of a 2-d endog
+
+        The pseudoinverse of the design is computed only once and the
+        estimates for all response columns are computed with matrix
+        operations.
+
+        Returns
+        -------
+        results : BatchRegressionResults
+            Results instance with array-valued statistics that have one
+            column, or element, for each response variable. Full results
+            for a single response are available with ``get_results``.
+
+        See Also
+        --------
+        BatchRegressionResults
+
+        Notes
+        -----
+        This is equivalent to calling ``fit()`` for each column of endog
+        separately with the same design matrix and weights. Only the
+        nonrobust covariance of the parameter estimates is available.
+
+        Examples
+        --------
+        >>> res = sm.OLS(endog_2d, exog).fit_many()
+        >>> res.params.shape
+        (k_exog, k_endog)
+        >>> res_0 = res.get_results(0)
+        """
+        if self.wendog.ndim != 2:
+            raise ValueError('fit_many requires a 2-dimensional endog')
+        self._setup_pinv()
+        params = np.dot(self.pinv_wexog, self.wendog)
+        if self._df_model is None:
+            self._df_model = float(self.rank - self.k_constant)
+        if self._df_resid is None:
+            self.df_resid = self.nobs - self.rank - self.k_absorb
+        return BatchRegressionResults(self, params)
+
     def loglike(self, params):
         """
         Returns the value of the gaussian log-likelihood function at params.
@@ -771,7 +932,7 @@ class OLS(WLS):
     __doc__ = """
     A simple ordinary least squares model.
 
-    %(params)s
+    %(params)s%(absorb)s
     %(extra_params)s
 
     Attributes
@@ -807,8 +968,10 @@ class OLS(WLS):
     Notes
     -----
     No constant is added by the model unless you are using formulas.
+%(absorb_notes)s
     """ % {'params': base._model_params_doc,
-           'extra_params': base._missing_param_doc + base._extra_param_doc}
+           'extra_params': base._missing_param_doc + base._extra_param_doc,
+           'absorb': _absorb_param_doc, 'absorb_notes': _absorb_notes_doc}
 
     # TODO: change example to use datasets.  This was the point of datasets!
     def __init__(self, endog, exog=None, missing='none', hasconst=None,
@@ -1632,10 +1795,24 @@ class RegressionResults(base.LikelihoodModelResults):
         eigvals = self.eigenvals
         return np.sqrt(eigvals[0]/eigvals[-1])
 
+    @cache_readonly
+    def _wexog_hat_matrix_diag(self):
+        # leverage of the whitened exog, computed in chunks of rows
+        factor = _cov_factor(self.normalized_cov_params,
+                             getattr(self.model, 'exog_R', None))
+        return _hat_matrix_diag(self.model.wexog, factor)
+
     # TODO: make these properties reset bse
     def _HCCM(self, scale):
-        H = np.dot(self.model.pinv_wexog,
-                   scale[:, None] * self.model.pinv_wexog.T)
+        # pinv(wexog) diag(scale) pinv(wexog)', with wexog' diag(scale) wexog
+        # accumulated over chunks of rows
+        wexog = self.model.wexog
+        k = wexog.shape[1]
+        meat = np.zeros((k, k))
+        for rows in _row_chunks(wexog.shape[0], k):
+            meat += np.dot(wexog[rows].T * scale[rows], wexog[rows])
+        cov = self.normalized_cov_params
+        H = chain_dot(cov, meat, cov)
         return H
 
     @cache_readonly
@@ -1664,10 +1841,7 @@ class RegressionResults(base.LikelihoodModelResults):
         See statsmodels.RegressionResults
         """
 
-        # probably could be optimized
-        h = np.diag(chain_dot(self.model.wexog,
-                              self.normalized_cov_params,
-                              self.model.wexog.T))
+        h = self._wexog_hat_matrix_diag
         self.het_scale = self.wresid**2/(1-h)
         cov_HC2 = self._HCCM(self.het_scale)
         return cov_HC2
@@ -1677,8 +1851,7 @@ class RegressionResults(base.LikelihoodModelResults):
         """
         See statsmodels.RegressionResults
         """
-        h = np.diag(chain_dot(
-            self.model.wexog, self.normalized_cov_params, self.model.wexog.T))
+        h = self._wexog_hat_matrix_diag
         self.het_scale = (self.wresid / (1 - h))**2
         cov_HC3 = self._HCCM(self.het_scale)
         return cov_HC3
@@ -2054,12 +2227,21 @@ class RegressionResults(base.LikelihoodModelResults):
         - 'cluster' and required keyword `groups`, integer group indicator
 
             - `groups` array_like, integer (required) :
-                  index of clusters or groups
+                  index of clusters or groups.
+                  If groups is two dimensional, then the covariance is
+                  robust to multiway clustering, one column for each
+                  cluster dimension.
             - `use_correction` bool (optional) :
                   If True the sandwich covariance is calculated with a small
                   sample correction.
                   If False the sandwich covariance is calculated without
                   small sample correction.
+            - `chunksize` int (optional) :
+                  Number of observations for which the cluster sums of
+                  the scores are accumulated at once. The default limits
+                  the temporary arrays to about 2**22 elements.
+            - `n_jobs` int (optional) :
+                  Number of threads used to accumulate the cluster sums.
             - `df_correction` bool (optional)
                   If True (default), then the degrees of freedom for the
                   inferential statistics and hypothesis tests, such as
@@ -2202,13 +2384,20 @@ class RegressionResults(base.LikelihoodModelResults):
             res.cov_kwds['groups'] = groups
             use_correction = kwds.get('use_correction', True)
             res.cov_kwds['use_correction'] = use_correction
+            chunksize = kwds.get('chunksize', None)
+            n_jobs = kwds.get('n_jobs', 1)
+            res.cov_kwds['chunksize'] = chunksize
+            res.cov_kwds['n_jobs'] = n_jobs
             if groups.ndim == 1:
                 if adjust_df:
                     # need to find number of groups
                     # duplicate work
-                    self.n_groups = n_groups = len(np.unique(groups))
+                    import pandas as pd
+                    n_groups = len(pd.unique(np.asarray(groups)))
+                    self.n_groups = n_groups
                 res.cov_params_default = sw.cov_cluster(
-                    self, groups, use_correction=use_correction)
+                    self, groups, use_correction=use_correction,
+                    chunksize=chunksize, n_jobs=n_jobs)
 
             elif groups.ndim == 2:
                 if hasattr(groups, 'values'):
@@ -2217,16 +2406,17 @@ class RegressionResults(base.LikelihoodModelResults):
                 if adjust_df:
                     # need to find number of groups
                     # duplicate work
-                    n_groups0 = len(np.unique(groups[:, 0]))
-                    n_groups1 = len(np.unique(groups[:, 1]))
-                    self.n_groups = (n_groups0, n_groups1)
-                    n_groups = min(n_groups0, n_groups1)  # use for adjust_df
-
-                # Note: sw.cov_cluster_2groups has 3 returns
-                res.cov_params_default = sw.cov_cluster_2groups(
-                    self, groups, use_correction=use_correction)[0]
+                    import pandas as pd
+                    self.n_groups = tuple(len(pd.unique(groups[:, i]))
+                                          for i in range(groups.shape[1]))
+                    n_groups = min(self.n_groups)  # use for adjust_df
+
+                # two-way or multiway clustering
+                res.cov_params_default = sw.cov_cluster_multiway(
+                    self, groups, use_correction=use_correction,
+                    chunksize=chunksize, n_jobs=n_jobs)
             else:
-                raise ValueError('only two groups are supported')
+                raise ValueError('groups needs to be 1 or 2 dimensional')
             res.cov_kwds['description'] = (
                 'Standard Errors are robust to' +
                 'cluster correlation ' + '(' + cov_type + ')')
@@ -2784,6 +2974,322 @@ class OLSResults(RegressionResults):
         return (lowerl, upperl)
 
 
+class BatchRegressionResults(object):
+    """
+    Results for several regressions that share the design matrix
+
+    Parameters
+    ----------
+    model : WLS or OLS instance
+        The model with a 2-d endog, where each column is a separate response.
+    params : ndarray
+        Parameter estimates with shape (k_exog, k_endog).
+
+    Attributes
+    ----------
+    params : ndarray or DataFrame
+        Parameter estimates, one column for each response variable.
+    bse : ndarray or DataFrame
+        Standard errors of the parameter estimates.
+    tvalues : ndarray or DataFrame
+        t-statistics of the parameter estimates.
+    pvalues : ndarray or DataFrame
+        Two-sided p-values of the t-statistics.
+    ssr : ndarray or Series
+        Sum of squared (whitened) residuals for each response.
+    scale : ndarray or Series
+        Residual variance estimate, ``ssr / df_resid``.
+    rsquared, rsquared_adj : ndarray or Series
+        Coefficients of determination, see `RegressionResults`.
+    fvalue, f_pvalue : ndarray or Series
+        F-statistic that all slope coefficients are zero and its p-value.
+    llf : ndarray or Series
+        Gaussian log-likelihood at the estimates.
+
+    Notes
+    -----
+    If the model was created from pandas data, then the array valued
+    attributes are returned as DataFrames with the parameter names as index
+    and the response names as columns, or as Series indexed by the response
+    names. Residuals with shape (nobs, k_endog) are only computed when
+    ``resid`` is accessed.
+    """
+
+    def __init__(self, model, params):
+        self.model = model
+        self._params = params
+        self._cache = resettable_cache()
+        self.normalized_cov_params = model.normalized_cov_params
+        self.nobs = model.nobs
+        self.df_model = model.df_model
+        self.df_resid = model.df_resid
+        self.k_constant = model.k_constant
+        self.k_endog = params.shape[1]
+        self._use_pandas = _is_using_pandas(model.data.orig_endog, None)
+
+    def __len__(self):
+        return self.k_endog
+
+    def _wrap(self, arr):
+        if not self._use_pandas:
+            return arr
+        import pandas as pd
+        data = self.model.data
+        if arr.ndim == 1:
+            return pd.Series(arr, index=data.ynames)
+        return pd.DataFrame(arr, index=data.param_names, columns=data.ynames)
+
+    @property
+    def params(self):
+        return self._wrap(self._params)
+
+    @property
+    def bse(self):
+        return self._wrap(self._bse)
+
+    @property
+    def tvalues(self):
+        return self._wrap(self._params / self._bse)
+
+    @property
+    def pvalues(self):
+        tvalues = self._params / self._bse
+        return self._wrap(stats.t.sf(np.abs(tvalues), self.df_resid) * 2)
+
+    @property
+    def ssr(self):
+        return self._wrap(self._ssr)
+
+    @property
+    def scale(self):
+        return self._wrap(self._ssr / self.df_resid)
+
+    @property
+    def rsquared(self):
+        return self._wrap(self._rsquared)
+
+    @property
+    def rsquared_adj(self):
+        rsquared_adj = 1 - (np.divide(self.nobs - self.k_constant,
+                                      self.df_resid) * (1 - self._rsquared))
+        return self._wrap(rsquared_adj)
+
+    @property
+    def fvalue(self):
+        return self._wrap(self._fvalue)
+
+    @property
+    def f_pvalue(self):
+        f_pvalue = stats.f.sf(self._fvalue, self.df_model, self.df_resid)
+        return self._wrap(f_pvalue)
+
+    @property
+    def llf(self):
+        nobs2 = self.nobs / 2.
+        llf = -np.log(self._ssr) * nobs2
+        llf -= (1 + np.log(np.pi / nobs2)) * nobs2
+        llf += 0.5 * np.sum(np.log(self.model.weights))
+        return self._wrap(llf)
+
+    @property
+    def resid(self):
+        model = self.model
+        resid = model.endog - np.dot(model.exog, self._params)
+        if self._use_pandas:
+            import pandas as pd
+            return pd.DataFrame(resid, index=model.data.row_labels,
+                                columns=model.data.ynames)
+        return resid
+
+    @cache_readonly
+    def _bse(self):
+        scale = self._ssr / self.df_resid
+        return np.sqrt(np.outer(np.diag(self.normalized_cov_params), scale))
+
+    @cache_readonly
+    def _ssr(self):
+        wresid = self.model.wendog - np.dot(self.model.wexog, self._params)
+        return (wresid**2).sum(0)
+
+    @cache_readonly
+    def _tss(self):
+        model = self.model
+        if self.k_constant:
+            weights = model.weights * np.ones(model.endog.shape[0])
+            mean = np.dot(weights, model.endog) / weights.sum()
+            return np.dot(weights, (model.endog - mean)**2)
+        else:
+            return (model.wendog**2).sum(0)
+
+    @cache_readonly
+    def _rsquared(self):
+        return 1 - self._ssr / self._tss
+
+    @cache_readonly
+    def _fvalue(self):
+        ess = self._tss - self._ssr
+        return (ess / self.df_model) / (self._ssr / self.df_resid)
+
+    def get_results(self, idx):
+        """
+        Full results instance for one of the response variables
+
+        Parameters
+        ----------
+        idx : int or str
+            Column index or name of the response variable.
+
+        Returns
+        -------
+        results : RegressionResults instance
+            Results as returned by ``fit()`` for the model with the single
+            response. The pseudoinverse of the design matrix is shared and
+            not recomputed.
+        """
+        model = self.model
+        data = model.data
+        if not isinstance(idx, (int, np.integer)):
+            idx = list(data.ynames).index(idx)
+        endog = model.endog[:, idx]
+        exog = model.exog
+        if self._use_pandas:
+            import pandas as pd
+            endog = pd.Series(endog, index=data.row_labels,
+                              name=data.ynames[idx])
+            exog = pd.DataFrame(exog, index=data.row_labels,
+                                columns=data.param_names)
+        init_kwds = model._get_init_kwds()
+        init_kwds.pop('missing', None)
+        mod = model.__class__(endog, exog, **init_kwds)
+        for attr in ['pinv_wexog', 'normalized_cov_params',
+                     'wexog_singular_values', 'rank']:
+            setattr(mod, attr, getattr(model, attr))
+        return mod.fit()
+
+
+class RawRegressionResults(object):
+    """
+    Lightweight results of a linear regression fit with ``data_mode='raw'``
+
+    Parameters
+    ----------
+    model : RegressionModel instance
+        The model created with ``data_mode='raw'``.
+    params : ndarray
+        Parameter estimates.
+
+    Attributes
+    ----------
+    params : ndarray
+        Parameter estimates.
+    bse : ndarray
+        Standard errors of the parameter estimates.
+    tvalues, pvalues : ndarray
+        t-statistics of the parameter estimates and their two-sided p-values.
+    fittedvalues, resid, wresid : ndarray
+        Predicted values, residuals and whitened residuals.
+    ssr : float
+        Sum of squared whitened residuals.
+    scale : float
+        Residual variance estimate, ``ssr / df_resid``.
+    rsquared : float
+        Coefficient of determination, see `RegressionResults`.
+    llf : float
+        Log-likelihood at the estimates.
+
+    Notes
+    -----
+    All statistics are plain ndarrays or floats and are computed when they
+    are first accessed. Only the nonrobust covariance of the parameter
+    estimates is available. ``get_results`` returns the full results.
+    """
+
+    def __init__(self, model, params):
+        self.model = model
+        self.params = params
+        self._cache = resettable_cache()
+        self.normalized_cov_params = model.normalized_cov_params
+        self.nobs = model.nobs
+        self.df_model = model.df_model
+        self.df_resid = model.df_resid
+        self.k_constant = model.k_constant
+
+    def cov_params(self):
+        """
+        Covariance of the parameter estimates, ``scale`` times
+        ``normalized_cov_params``
+        """
+        return self.normalized_cov_params * self.scale
+
+    @cache_readonly
+    def fittedvalues(self):
+        return np.dot(self.model.exog, self.params)
+
+    @cache_readonly
+    def resid(self):
+        return self.model.endog - self.fittedvalues
+
+    @cache_readonly
+    def wresid(self):
+        return self.model.wendog - np.dot(self.model.wexog, self.params)
+
+    @cache_readonly
+    def ssr(self):
+        wresid = self.wresid
+        return np.dot(wresid, wresid)
+
+    @cache_readonly
+    def scale(self):
+        return self.ssr / self.df_resid
+
+    @cache_readonly
+    def bse(self):
+        return np.sqrt(np.diag(self.normalized_cov_params) * self.scale)
+
+    @cache_readonly
+    def tvalues(self):
+        return self.params / self.bse
+
+    @cache_readonly
+    def pvalues(self):
+        return stats.t.sf(np.abs(self.tvalues), self.df_resid) * 2
+
+    @cache_readonly
+    def rsquared(self):
+        model = self.model
+        if self.k_constant:
+            weights = getattr(model, 'weights', None)
+            if weights is not None:
+                mean = np.average(model.endog, weights=weights)
+                tss = np.sum(weights * (model.endog - mean)**2)
+            else:
+                centered = model.wendog - model.wendog.mean()
+                tss = np.dot(centered, centered)
+        else:
+            tss = np.dot(model.wendog, model.wendog)
+        return 1 - self.ssr / tss
+
+    @cache_readonly
+    def llf(self):
+        return self.model.loglike(self.params)
+
+    def get_results(self):
+        """
+        Full results instance
+
+        Returns
+        -------
+        results : RegressionResults instance
+            Results as returned by ``fit()`` with the default data handling.
+            The arrays of the model are not copied.
+        """
+        model = self.model
+        klass = OLSResults if isinstance(model, OLS) else RegressionResults
+        results = klass(model, self.params,
+                        normalized_cov_params=self.normalized_cov_params)
+        return RegressionResultsWrapper(results)
+
+
 class RegressionResultsWrapper(wrap.ResultsWrapper):
 
     _attrs = {
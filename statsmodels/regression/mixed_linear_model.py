@@ -141,6 +141,23 @@ difficult and unnecessary to calculate the Hessian of the profiled log
 likelihood function, so that calculation is not implemented here.
 Therefore, optimization methods requiring the Hessian matrix such as
 the Newton-Raphson algorithm cannot be used for model fitting.
+
+With `sparse_re=True` the random effects design matrices of all groups
+are combined into a single sparse matrix Z, and the log-likelihood is
+computed from the sparse factorization of I + L' Z' Z L, where L is a
+square root of the random effects covariance matrix, as in lme4:
+
+DM Bates, M Maechler, BM Bolker, SC Walker (2015).  "Fitting linear
+mixed-effects models using lme4".  Journal of Statistical Software.
+Volume 67, Issue 1.
+
+The cost of evaluating the likelihood does not depend on the number of
+observations once the cross products of the design matrices are
+computed, and there are no loops over the groups.  This is suited to
+models with many nested groups and to crossed random effects, which are
+specified as variance components of a model with a single group.  The
+derivatives with respect to the covariance parameters are computed
+numerically.
 """
 
 import numpy as np
@@ -149,6 +166,8 @@ from statsmodels.tools.decorators import cache_readonly
 from statsmodels.tools import data as data_tools
 from scipy.stats.distributions import norm
 from scipy import sparse
+from scipy.sparse import linalg as splinalg
+from scipy.linalg import cho_factor, cho_solve
 import pandas as pd
 import patsy
 from statsmodels.compat.collections import OrderedDict
@@ -158,6 +177,8 @@ import warnings
 from statsmodels.tools.sm_exceptions import ConvergenceWarning
 from statsmodels.base._penalties import Penalty
 from statsmodels.compat.numpy import np_matrix_rank
+from statsmodels.tools.numdiff import approx_fprime, approx_hess3
+from statsmodels.tools.tools import _cov_factor
 
 
 def _dot(x, y):
@@ -505,6 +526,30 @@ def _smw_logdet(s, A, AtA, BI, di, B_logdet):
     return B_logdet + ld + ld1
 
 
+def _spd_factor(mat):
+    """
+    Returns the log determinant of the sparse symmetric positive
+    definite matrix `mat` and a function that solves mat * x = rhs.
+
+    Small or dense matrices are factored with a dense Cholesky
+    decomposition, others with a sparse LU decomposition that keeps the
+    symmetry.
+    """
+
+    p = mat.shape[0]
+    if p == 0:
+        return 0., lambda rhs: rhs
+    if p <= 1000 or mat.nnz > 0.05 * p**2:
+        chol = cho_factor(mat.toarray(), lower=True)
+        logdet = 2 * np.sum(np.log(np.diag(chol[0])))
+        return logdet, lambda rhs: cho_solve(chol, rhs)
+    lu = splinalg.splu(sparse.csc_matrix(mat), permc_spec="MMD_AT_PLUS_A",
+                       diag_pivot_thresh=0.,
+                       options=dict(SymmetricMode=True))
+    logdet = np.sum(np.log(np.abs(lu.U.diagonal())))
+    return logdet, lu.solve
+
+
 class MixedLM(base.LikelihoodModel):
     """
     An object specifying a linear mixed effects model.  Use the `fit`
@@ -534,6 +579,9 @@ class MixedLM(base.LikelihoodModel):
         lower triangle of the random effects covariance matrix.
     missing : string
         The approach to missing data handling
+    sparse_re : bool
+        If True, the likelihood is computed using a sparse random
+        effects design matrix for all groups jointly, see Notes.
 
     Notes
     -----
@@ -554,6 +602,17 @@ class MixedLM(base.LikelihoodModel):
     the covariance structure are set (using the `free` argument to
     `fit`) that cannot be expressed in terms of the Cholesky factor L.
 
+    `sparse_re` should be used for large data sets with many groups,
+    or with crossed random effects.  Crossed random effects are
+    specified as variance components in a model with a single group,
+    preferably using sparse matrices in `exog_vc`.  The likelihood is
+    evaluated without looping over the groups, using a sparse LU
+    factorization of the penalized system in the random effects.  The
+    score and the Hessian with respect to the covariance parameters are
+    computed by numerical differentiation.  The predicted random effects
+    and the fitted values of the results use the same sparse design
+    matrix.
+
     Examples
     --------
     A basic mixed model with fixed effects for the columns of
@@ -589,11 +648,24 @@ class MixedLM(base.LikelihoodModel):
     >>> vc['2'] = {k : exog_re.loc[g[k], 1] for k in g}
     >>> model = sm.MixedLM(endog, exog, groups, vcomp=vc)
     >>> result = model.fit()
+
+    Crossed random intercepts for the integer codes ``user`` and
+    ``item``, using sparse indicator matrices in a single group:
+
+    >>> from scipy import sparse
+    >>> rows = np.arange(len(endog))
+    >>> vc = {'user': {0: sparse.csr_matrix((np.ones_like(rows),
+    ...                                      (rows, user)))},
+    ...       'item': {0: sparse.csr_matrix((np.ones_like(rows),
+    ...                                      (rows, item)))}}
+    >>> model = sm.MixedLM(endog, exog, np.zeros(len(endog)),
+    ...                    exog_vc=vc, sparse_re=True)
+    >>> result = model.fit()
     """
 
     def __init__(self, endog, exog, groups, exog_re=None,
                  exog_vc=None, use_sqrt=True, missing='none',
-                 **kwargs):
+                 sparse_re=False, **kwargs):
 
         _allowed_kwargs = ["missing_idx", "design_info", "formula"]
         for x in kwargs.keys():
@@ -602,6 +674,7 @@ class MixedLM(base.LikelihoodModel):
                     "argument %s not permitted for MixedLM initialization" % x)
 
         self.use_sqrt = use_sqrt
+        self.sparse_re = sparse_re
 
         # Some defaults
         self.reml = True
@@ -630,7 +703,7 @@ class MixedLM(base.LikelihoodModel):
                                       exog_re=exog_re, missing=missing,
                                       **kwargs)
 
-        self._init_keys.extend(["use_sqrt", "exog_vc"])
+        self._init_keys.extend(["use_sqrt", "exog_vc", "sparse_re"])
 
         # Number of fixed effects parameters
         self.k_fe = exog.shape[1]
@@ -1160,6 +1233,9 @@ class MixedLM(base.LikelihoodModel):
         if self.k_fe == 0:
             return np.array([])
 
+        if self.sparse_re:
+            return self._sparse_terms(cov_re, vcomp)[0]
+
         if self.k_re == 0:
             cov_re_inv = np.empty((0, 0))
         else:
@@ -1303,6 +1379,191 @@ class MixedLM(base.LikelihoodModel):
 
         return ex
 
+    def _setup_sparse(self):
+        """
+        Precompute the sparse random effects design matrix for all
+        groups and its cross products with the data.
+        """
+
+        if hasattr(self, "_sp_ztz"):
+            return
+
+        group_ix = np.empty(self.nobs, dtype=np.intp)
+        for k, group in enumerate(self.group_labels):
+            group_ix[self.row_indices[group]] = k
+
+        # The columns for the standard random effects of the groups,
+        # followed by the columns for the variance components.
+        rows, cols, vals = [], [], []
+        if self.k_re > 0:
+            rows.append(np.repeat(np.arange(self.nobs), self.k_re))
+            cols.append((group_ix[:, None] * self.k_re +
+                         np.arange(self.k_re)).ravel())
+            vals.append(self.exog_re.ravel())
+        ncol = self.n_groups * self.k_re
+
+        # vc_ix[j] is the variance component of the j^th column
+        vc_ix = [np.zeros(0, dtype=np.intp)]
+        for group in self.group_labels:
+            row_ix = np.asarray(self.row_indices[group])
+            for j, k in enumerate(self._vc_names):
+                if group not in self.exog_vc[k]:
+                    continue
+                mat = self.exog_vc[k][group]
+                if not sparse.issparse(mat):
+                    mat = np.asarray(mat)
+                mat = sparse.coo_matrix(mat)
+                rows.append(row_ix[mat.row])
+                cols.append(ncol + mat.col)
+                vals.append(mat.data)
+                vc_ix.append(j * np.ones(mat.shape[1], dtype=np.intp))
+                ncol += mat.shape[1]
+
+        exog_re = sparse.csc_matrix(
+            (np.concatenate(vals),
+             (np.concatenate(rows), np.concatenate(cols))),
+            shape=(self.nobs, ncol))
+        endex = np.column_stack((self.exog, self.endog))
+
+        vc_ix = np.concatenate(vc_ix)
+        ztz = exog_re.T.dot(exog_re).tocsc()
+
+        # The random effects of the largest term with a diagonal block
+        # in Z'Z, for example the levels of a random intercept, are
+        # eliminated directly before the remaining system is factored.
+        n_re = self.n_groups * self.k_re
+        terms = [n_re + np.flatnonzero(vc_ix == j)
+                 for j in range(self.k_vc)]
+        if self.k_re == 1:
+            terms.append(np.arange(n_re))
+        elim = np.zeros(0, dtype=np.intp)
+        for ix in terms:
+            block = ztz[ix, :][:, ix]
+            if (len(ix) > len(elim) and
+                    block.nnz == np.count_nonzero(block.diagonal())):
+                elim = ix
+        rest = np.setdiff1d(np.arange(ncol), elim)
+
+        self._sp_exog_re = exog_re
+        self._sp_vc_ix = vc_ix
+        self._sp_elim, self._sp_rest = elim, rest
+        self._sp_ztz = ztz
+        self._sp_ztz_dd = ztz.diagonal()[elim]
+        self._sp_ztz_rd = ztz[rest, :][:, elim].tocsr()
+        self._sp_ztz_rr = ztz[rest, :][:, rest].tocsc()
+        self._sp_zta = exog_re.T.dot(endex)
+        self._sp_ata = np.dot(endex.T, endex)
+
+    def _sparse_cov_factor(self, cov_re, vcomp):
+        """
+        The factor L of the covariance matrix G = L L' of all random
+        effects, in the column order of the sparse design matrix.
+        """
+
+        blocks = []
+        if self.k_re > 0:
+            blocks.append(sparse.kron(sparse.eye(self.n_groups),
+                                      _cov_factor(cov_re)))
+        if len(self._sp_vc_ix) > 0:
+            vc_sd = np.sqrt(np.clip(vcomp, 0, np.inf))
+            blocks.append(sparse.diags(vc_sd[self._sp_vc_ix]))
+        return sparse.block_diag(blocks, format="csc")
+
+    def _sparse_random_effects(self, fe_params, cov_re, vcomp):
+        """
+        The conditional means G Z' V^{-1} resid of all random effects
+        in the column order of the sparse design matrix Z, for the
+        covariances in the profile parameterization.
+        """
+
+        zvr = self._sparse_terms(cov_re, vcomp, fe_params,
+                                 calc_zv=True)[4]
+        lam = self._sparse_cov_factor(cov_re, vcomp)
+        return lam.dot(lam.T.dot(zvr))
+
+    def _sparse_terms(self, cov_re, vcomp, fe_params=None, calc_zv=False):
+        """
+        Terms of the log-likelihood using the sparse random effects
+        design matrix Z for all groups.
+
+        Parameters
+        ----------
+        cov_re : ndarray
+            The random effects covariance matrix in the profile
+            parameterization.
+        vcomp : ndarray
+            The variance components in the profile parameterization.
+        fe_params : ndarray
+            The fixed effects parameters.  If None, the GLS estimates
+            are used.
+        calc_zv : bool
+            If True, Z' V^{-1} resid and Z' V^{-1} exog are also
+            returned.
+
+        Returns
+        -------
+        fe_params : ndarray
+            The fixed effects parameters.
+        logdet : float
+            The log determinant of the marginal covariance V.
+        qf : float
+            resid' V^{-1} resid
+        xvx : ndarray
+            exog' V^{-1} exog
+
+        Notes
+        -----
+        With G = L L' the covariance matrix of the random effects,
+        V = I + Z G Z' and the log determinant of V is the log
+        determinant of I + L' Z' Z L, which is factorized with a sparse
+        LU decomposition.  V^{-1} is obtained from the same factor using
+        the Sherman-Morrison-Woodbury identity.
+        """
+
+        self._setup_sparse()
+        k_fe = self.k_fe
+        ztz = self._sp_ztz
+        lam = self._sparse_cov_factor(cov_re, vcomp)
+
+        # The blocks of I + L' Z' Z L for the eliminated random effects
+        # (a diagonal matrix), and for the remaining random effects
+        elim, rest = self._sp_elim, self._sp_rest
+        lam_d = lam.diagonal()[elim]
+        lam_r = lam[rest, :][:, rest]
+        mat_d = 1 + lam_d**2 * self._sp_ztz_dd
+        mat_rd = lam_r.T.dot(self._sp_ztz_rd).dot(sparse.diags(lam_d))
+        mat_r = (lam_r.T.dot(self._sp_ztz_rr).dot(lam_r) +
+                 sparse.eye(len(rest)))
+
+        # The Schur complement of the diagonal block
+        schur = mat_r - mat_rd.dot(sparse.diags(1 / mat_d)).dot(mat_rd.T)
+        logdet, solve = _spd_factor(schur)
+        logdet += np.sum(np.log(mat_d))
+
+        # [exog, endog]' V^{-1} [exog, endog]
+        lzta = lam.T.dot(self._sp_zta)
+        sol = np.empty_like(lzta)
+        sol_d = lzta[elim] / mat_d[:, None]
+        sol[rest] = solve(lzta[rest] - mat_rd.dot(sol_d))
+        sol[elim] = sol_d - mat_rd.T.dot(sol[rest]) / mat_d[:, None]
+        ava = self._sp_ata - np.dot(lzta.T, sol)
+        xvx = ava[0:k_fe, 0:k_fe]
+        xvy = ava[0:k_fe, k_fe]
+        if fe_params is None:
+            if k_fe > 0:
+                fe_params = np.linalg.solve(xvx, xvy)
+            else:
+                fe_params = np.array([])
+        qf = (ava[k_fe, k_fe] - 2 * np.dot(fe_params, xvy) +
+              np.dot(fe_params, np.dot(xvx, fe_params)))
+
+        if not calc_zv:
+            return fe_params, logdet, qf, xvx
+
+        zva = self._sp_zta - ztz.dot(lam.dot(sol))
+        zvr = zva[:, k_fe] - np.dot(zva[:, 0:k_fe], fe_params)
+        return fe_params, logdet, qf, xvx, zvr, zva[:, 0:k_fe]
+
     def loglike(self, params, profile_fe=True):
         """
         Evaluate the (profile) log-likelihood of the linear mixed
@@ -1338,7 +1599,10 @@ class MixedLM(base.LikelihoodModel):
         vcomp = params.vcomp
 
         # Move to the profile set
-        if profile_fe:
+        if self.sparse_re:
+            fe_params, logdet, qf, xvx = self._sparse_terms(
+                cov_re, vcomp, None if profile_fe else params.fe_params)
+        elif profile_fe:
             fe_params = self.get_fe_params(cov_re, vcomp)
         else:
             fe_params = params.fe_params
@@ -1353,10 +1617,6 @@ class MixedLM(base.LikelihoodModel):
             cov_re_inv = np.zeros((0, 0))
             cov_re_logdet = 0
 
-        # The residuals
-        expval = np.dot(self.exog, fe_params)
-        resid_all = self.endog - expval
-
         likeval = 0.
 
         # Handle the covariance penalty
@@ -1367,6 +1627,14 @@ class MixedLM(base.LikelihoodModel):
         if (self.fe_pen is not None):
             likeval -= self.fe_pen.func(fe_params)
 
+        if self.sparse_re:
+            likeval -= logdet / 2.
+            return likeval + self._loglike_profile_scale(qf, xvx)
+
+        # The residuals
+        expval = np.dot(self.exog, fe_params)
+        resid_all = self.endog - expval
+
         xvx, qf = 0., 0.
         for k, group in enumerate(self.group_labels):
 
@@ -1409,6 +1677,30 @@ class MixedLM(base.LikelihoodModel):
 
         return likeval
 
+    def _loglike_profile_scale(self, qf, xvx):
+        """
+        The terms of the log-likelihood that are profiled over the
+        scale, given resid' V^{-1} resid and exog' V^{-1} exog.  Used
+        with the sparse random effects design.
+        """
+
+        likeval = 0.
+        if self.reml:
+            likeval -= (self.n_totobs - self.k_fe) * np.log(qf) / 2.
+            _, ld = np.linalg.slogdet(xvx)
+            likeval -= ld / 2.
+            likeval -= (self.n_totobs - self.k_fe) * np.log(2 * np.pi) / 2.
+            likeval += ((self.n_totobs - self.k_fe) *
+                        np.log(self.n_totobs - self.k_fe) / 2.)
+            likeval -= (self.n_totobs - self.k_fe) / 2.
+        else:
+            likeval -= self.n_totobs * np.log(qf) / 2.
+            likeval -= self.n_totobs * np.log(2 * np.pi) / 2.
+            likeval += self.n_totobs * np.log(self.n_totobs) / 2.
+            likeval -= self.n_totobs / 2.
+
+        return likeval
+
     def _gen_dV_dPar(self, ex_r, solver, group, max_ix=None):
         """
         A generator that yields the element-wise derivative of the
@@ -1467,6 +1759,9 @@ class MixedLM(base.LikelihoodModel):
                 params, self.k_fe, self.k_re, self.use_sqrt,
                 has_fe=False)
 
+        if self.sparse_re:
+            return self._score_sparse(params, profile_fe)
+
         if profile_fe:
             params.fe_params = self.get_fe_params(params.cov_re, params.vcomp)
 
@@ -1487,6 +1782,31 @@ class MixedLM(base.LikelihoodModel):
         else:
             return np.concatenate((score_fe, score_re, score_vc))
 
+    def _score_sparse(self, params, profile_fe):
+        """
+        The score of the profile log-likelihood by numerical
+        differentiation, used with the sparse random effects design.
+        """
+
+        has_fe = not profile_fe
+        k_fe = self.k_fe if has_fe else 0
+
+        def loglike(packed):
+            pa = MixedLMParams.from_packed(packed, self.k_fe, self.k_re,
+                                           self.use_sqrt, has_fe=has_fe)
+            return self.loglike(pa, profile_fe=profile_fe)
+
+        packed = params.get_packed(use_sqrt=self.use_sqrt, has_fe=has_fe)
+        score = approx_fprime(packed, loglike, centered=True)
+
+        if self._freepat is not None:
+            pat = self._freepat
+            mask = np.concatenate((pat.fe_params[0:k_fe],
+                                   pat.cov_re[pat._ix], pat.vcomp))
+            score *= mask
+
+        return score
+
     def score_full(self, params, calc_fe):
         """
         Returns the score with respect to untransformed parameters.
@@ -1714,6 +2034,9 @@ class MixedLM(base.LikelihoodModel):
                                                use_sqrt=self.use_sqrt,
                                                has_fe=True)
 
+        if self.sparse_re:
+            return self._hessian_sparse(params)
+
         fe_params = params.fe_params
         vcomp = params.vcomp
         cov_re = params.cov_re
@@ -1848,6 +2171,63 @@ class MixedLM(base.LikelihoodModel):
 
         return hess
 
+    def _hessian_sparse(self, params):
+        """
+        The Hessian using the sparse random effects design.
+
+        The blocks for the fixed effects parameters are computed
+        analytically, the block for the covariance parameters by
+        numerical differentiation of the log-likelihood.
+        """
+
+        fe_params = params.fe_params
+        k_fe, k_re, k_re2 = self.k_fe, self.k_re, self.k_re2
+        fac = self.n_totobs
+        if self.reml:
+            fac -= k_fe
+
+        _, _, rvir, xtvix, zvr, zvx = self._sparse_terms(
+            params.cov_re, params.vcomp, fe_params, calc_zv=True)
+
+        # exog' V^{-1} dV/dQ_jj V^{-1} resid for the covariance
+        # parameters Q_jj, the columns of Z for the random effects of
+        # variable j are j, j + k_re, j + 2*k_re, ...
+        m = k_re2 + self.k_vc
+        hess_fere = np.zeros((m, k_fe))
+        n_re = self.n_groups * k_re
+        jj = 0
+        for j1 in range(k_re):
+            for j2 in range(j1 + 1):
+                ix1 = slice(j1, n_re, k_re)
+                ix2 = slice(j2, n_re, k_re)
+                hess_fere[jj] = np.dot(zvx[ix1].T, zvr[ix2])
+                if j1 != j2:
+                    hess_fere[jj] += np.dot(zvx[ix2].T, zvr[ix1])
+                jj += 1
+        vc_ix = self._sp_vc_ix
+        for j in range(self.k_vc):
+            ix = n_re + np.flatnonzero(vc_ix == j)
+            hess_fere[k_re2 + j] = np.dot(zvx[ix].T, zvr[ix])
+        hess_fere *= -fac / rvir
+
+        def loglike(packed):
+            pa = MixedLMParams.from_packed(packed, k_fe, k_re,
+                                           use_sqrt=False, has_fe=False)
+            _, logdet, qf, xvx = self._sparse_terms(pa.cov_re, pa.vcomp,
+                                                    fe_params)
+            return -logdet / 2. + self._loglike_profile_scale(qf, xvx)
+
+        packed = params.get_packed(use_sqrt=False, has_fe=False)
+        hess_re = approx_hess3(packed, loglike)
+
+        hess = np.zeros((k_fe + m, k_fe + m))
+        hess[0:k_fe, 0:k_fe] = -fac * xtvix / rvir
+        hess[0:k_fe, k_fe:] = hess_fere.T
+        hess[k_fe:, 0:k_fe] = hess_fere
+        hess[k_fe:, k_fe:] = hess_re
+
+        return hess
+
     def get_scale(self, fe_params, cov_re, vcomp):
         """
         Returns the estimated error variance based on given estimates
@@ -1868,6 +2248,23 @@ class MixedLM(base.LikelihoodModel):
             The estimated error variance.
         """
 
+        if self.sparse_re:
+            qf = self._sparse_terms(cov_re, vcomp, fe_params)[2]
+        else:
+            qf = self._qf_groups(fe_params, cov_re, vcomp)
+
+        if self.reml:
+            qf /= (self.n_totobs - self.k_fe)
+        else:
+            qf /= self.n_totobs
+
+        return qf
+
+    def _qf_groups(self, fe_params, cov_re, vcomp):
+        """
+        resid' V^{-1} resid summed over the groups
+        """
+
         try:
             cov_re_inv = np.linalg.inv(cov_re)
         except np.linalg.LinAlgError:
@@ -1892,11 +2289,6 @@ class MixedLM(base.LikelihoodModel):
             mat = solver(resid)
             qf += np.dot(resid, mat)
 
-        if self.reml:
-            qf /= (self.n_totobs - self.k_fe)
-        else:
-            qf /= self.n_totobs
-
         return qf
 
     def fit(self, start_params=None, reml=True, niter_sa=0,
@@ -2132,6 +2524,8 @@ class MixedLMResults(base.LikelihoodModelResults, base.ResultMixin):
         fixed effects and the predicted random effects.
         """
         fit = np.dot(self.model.exog, self.fe_params)
+        if self.model.sparse_re:
+            return fit + self.model._sp_exog_re.dot(self._sparse_ranef)
         re = self.random_effects
         for group_ix, group in enumerate(self.model.group_labels):
             ix = self.model.row_indices[group]
@@ -2195,6 +2589,15 @@ class MixedLMResults(base.LikelihoodModelResults, base.ResultMixin):
                 names.extend(na)
         return names
 
+    @cache_readonly
+    def _sparse_ranef(self):
+        """
+        The conditional means of all random effects in the column
+        order of the sparse random effects design matrix.
+        """
+        return self.model._sparse_random_effects(
+            self.fe_params, self.cov_re_unscaled, self.vcomp / self.scale)
+
     @cache_readonly
     def random_effects(self):
         """
@@ -2206,6 +2609,25 @@ class MixedLMResults(base.LikelihoodModelResults, base.ResultMixin):
             A dictionary mapping the distinct `group` values to the
             means of the random effects for the group.
         """
+        k_re = self.k_re
+        ranef_dict = {}
+        if self.model.sparse_re:
+            # The columns of the sparse design are the random effects of
+            # all groups, followed by the variance components of all
+            # groups.
+            ranef = self._sparse_ranef
+            pos = self.model.n_groups * k_re
+            for group_ix, group in enumerate(self.model.group_labels):
+                re = [ranef[group_ix * k_re:(group_ix + 1) * k_re]]
+                for c in self.model._vc_names:
+                    if group in self.model.exog_vc[c]:
+                        ncol = self.model.exog_vc[c][group].shape[1]
+                        re.append(ranef[pos:pos + ncol])
+                        pos += ncol
+                ranef_dict[group] = pd.Series(
+                    np.concatenate(re), index=self._expand_re_names(group))
+            return ranef_dict
+
         try:
             cov_re_inv = np.linalg.inv(self.cov_re)
         except np.linalg.LinAlgError:
@@ -2213,9 +2635,7 @@ class MixedLMResults(base.LikelihoodModelResults, base.ResultMixin):
                              "singular covariance structure.")
 
         vcomp = self.vcomp
-        k_re = self.k_re
 
-        ranef_dict = {}
         for group_ix, group in enumerate(self.model.group_labels):
 
             endog = self.model.endog_li[group_ix]
@@ -0,0 +1,544 @@
+"""
+Rolling and expanding window least squares
+
+All windows are estimated in one vectorized pass. The moment matrices
+X'X, X'y and y'y of a window are obtained from those of the previous window
+by adding the outer products of the observation entering the window and
+subtracting those of the observation leaving it, which are O(k**2) updates
+computed with cumulative sums. The cumulative sums are restarted every
+`reset` windows to bound the accumulation of rounding errors. The data are
+shifted by a reference row in each block of windows, so that the moment
+sums stay small for data with large levels.
+
+License: BSD-3
+"""
+from __future__ import division
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from statsmodels.base.data import handle_data
+from statsmodels.tools.data import _is_using_pandas
+from statsmodels.tools.decorators import resettable_cache, cache_readonly
+from statsmodels.tools.sm_exceptions import MissingDataError
+
+__all__ = ['RollingWLS', 'RollingOLS', 'RollingRegressionResults']
+
+
+def _window_sums(terms, offset, starts, ends, carry=None):
+    """
+    Sums of `terms` over the observations starts[t]:ends[t] of each window
+
+    Row j of `terms` belongs to observation offset + j. If `carry` is given,
+    it is the sum over the observations before `offset`, which continues
+    expanding windows from the previous block.
+    """
+    csum = np.cumsum(terms, axis=0)
+    sums = csum[ends - 1 - offset]
+    if carry is not None:
+        return sums + carry
+    lower = starts - offset
+    drop = lower > 0
+    sums[drop] -= csum[lower[drop] - 1]
+    return sums
+
+
+class RollingWLS(object):
+    """
+    Rolling window weighted least squares
+
+    Parameters
+    ----------
+    endog : array_like
+        1-d response variable.
+    exog : array_like
+        2-d array of explanatory variables. A constant is not added.
+    window : int
+        Length of the rolling window. The estimates at observation t use the
+        observations t - window + 1 to t. Required unless `expanding` is
+        True.
+    weights : array_like, optional
+        1-d weights as in `WLS`. If None, all weights are one.
+    min_nobs : int, optional
+        Minimum number of non-missing observations in a window. The default
+        is the number of explanatory variables.
+    missing : str
+        'drop' ignores observations with missing values in a window, 'skip'
+        sets the estimates of all windows that contain a missing value to
+        nan and 'raise' raises an error if there are missing values.
+    expanding : bool
+        If True, the windows start at the first observation and windows
+        shorter than `window` are estimated if they contain at least
+        `min_nobs` observations.
+    hasconst : None or bool
+        Indicates whether exog includes a user-supplied constant. If None,
+        a constant column is detected from the non-missing observations.
+
+    See Also
+    --------
+    statsmodels.regression.linear_model.WLS
+    statsmodels.regression.recursive_ls.RecursiveLS
+
+    Notes
+    -----
+    The estimates for a window are identical to ``WLS(endog, exog,
+    weights=weights).fit()`` on the observations in the window, up to the
+    rounding errors of the updating formulas. The moment matrices are
+    computed for the data shifted by the mean of the observations in each
+    block of `reset` windows. If exog has a constant column, then this is an
+    exact reparametrization of the model. Otherwise a column for the level
+    is added to the shifted data and the moments of the original data, the
+    residual sum of squares and the robust covariances are recovered from
+    the shifted moments. This avoids the cancellation of large moments when
+    the regressors have a large level relative to their variation in a
+    window. A smaller `reset` in ``fit`` improves the accuracy at the cost
+    of more computation.
+
+    Examples
+    --------
+    >>> mod = RollingOLS(endog, exog, window=60)
+    >>> res = mod.fit()
+    >>> res.params.tail()
+    >>> res = mod.fit(cov_type='HC0')
+    """
+
+    def __init__(self, endog, exog, window=None, weights=None,
+                 min_nobs=None, missing='drop', expanding=False,
+                 hasconst=None):
+        if missing not in ('drop', 'skip', 'raise'):
+            raise ValueError("missing has to be 'drop', 'skip' or 'raise'")
+        self.data = handle_data(endog, exog, missing='none', hasconst=False)
+        self.endog = y = np.asarray(self.data.endog, dtype=np.float64)
+        self.exog = x = np.asarray(self.data.exog, dtype=np.float64)
+        if y.ndim != 1:
+            raise ValueError('endog needs to be 1-dimensional')
+        self.nobs, self.k_exog = x.shape
+        self.weighted = weights is not None
+        if weights is None:
+            weights = np.ones(self.nobs)
+        weights = np.asarray(weights, dtype=np.float64) * np.ones(self.nobs)
+        if weights.shape != (self.nobs,):
+            raise ValueError('weights must be scalar or have the same '
+                             'length as endog')
+        self.weights = weights
+
+        if window is None:
+            if not expanding:
+                raise ValueError('window is required unless expanding is '
+                                 'True')
+            window = self.nobs
+        window = int(window)
+        if window < 1:
+            raise ValueError('window must be a positive integer')
+        self.window = window
+        self.expanding = expanding
+        self.min_nobs = self.k_exog if min_nobs is None else int(min_nobs)
+        if self.min_nobs < 1 or self.min_nobs > window:
+            raise ValueError('min_nobs must be between 1 and window')
+        self.missing = missing
+
+        valid = (np.isfinite(y) & np.isfinite(x).all(1) &
+                 np.isfinite(weights))
+        if missing == 'raise' and not valid.all():
+            raise MissingDataError('endog, exog or weights contain inf or '
+                                   'nans')
+        self._valid = valid
+
+        # constant detection and names from the non-missing observations
+        valid_data = handle_data(y[valid], x[valid], hasconst=hasconst)
+        self.k_constant = valid_data.k_constant
+        # column of a nonzero constant, used to shift the data in fit
+        self._const_idx = None
+        if self.k_constant and valid.any():
+            xv = x[valid]
+            const = np.nonzero((xv == xv[0]).all(0) & (xv[0] != 0))[0]
+            if const.size:
+                self._const_idx = const[0]
+                self._const_value = xv[0, const[0]]
+        if _is_using_pandas(endog, exog):
+            self.exog_names = self.data.xnames
+        else:
+            self.exog_names = valid_data.xnames
+        self.endog_names = self.data.ynames
+
+    def _window_bounds(self, t0, t1):
+        ends = np.arange(t0 + 1, t1 + 1)
+        if self.expanding:
+            starts = np.zeros_like(ends)
+        else:
+            starts = np.maximum(ends - self.window, 0)
+        return starts, ends
+
+    def _reference_row(self, rows):
+        """
+        Mean of the non-missing observations of [exog, endog] in rows with
+        zero for the constant column, the shift of the data in `fit`
+        """
+        valid = self._valid[rows]
+        ref = np.zeros(self.k_exog + 1)
+        if valid.any():
+            ref[:-1] = self.exog[rows][valid].mean(0)
+            ref[-1] = self.endog[rows][valid].mean()
+        if self._const_idx is not None:
+            ref[self._const_idx] = 0
+        return ref
+
+    def fit(self, cov_type='nonrobust', params_only=False, reset=None,
+            use_t=None):
+        """
+        Estimate the regression for all windows
+
+        Parameters
+        ----------
+        cov_type : str
+            'nonrobust', 'HC0' or 'HC1'. The heteroscedasticity robust
+            covariances need moment sums of order four, which are O(k**4)
+            per observation.
+        params_only : bool
+            If True, only the parameters are computed, which is faster.
+        reset : int, optional
+            Number of windows after which the moment sums are recomputed
+            from the observations. The default is ``max(10 * window,
+            1000)``. It also bounds the memory used for the intermediate
+            arrays.
+        use_t : bool, optional
+            Whether to use the t distribution for the p-values. The default
+            is True for 'nonrobust' and False otherwise, as in `WLS`.
+
+        Returns
+        -------
+        results : RollingRegressionResults
+        """
+        if cov_type not in ('nonrobust', 'HC0', 'HC1'):
+            raise ValueError("cov_type has to be 'nonrobust', 'HC0' or "
+                             "'HC1'")
+        if reset is None:
+            reset = max(10 * self.window, 1000)
+        reset = int(reset)
+        if reset < 1:
+            raise ValueError('reset must be a positive integer')
+        robust = cov_type != 'nonrobust' and not params_only
+
+        nobs, k = self.nobs, self.k_exog
+        valid = self._valid
+        # the data are shifted by a reference row r = [r_X, r_y]. With a
+        # constant, y = X b + e is estimated as y - r_y = (X - r_X) b* + e
+        # with b = b* except for the constant, b_c = b*_c - (r_X' b* - r_y)
+        # / c. Without a constant, the moments are computed for the shifted
+        # data with a leading column of ones a = [1, x - r_X, y - r_y],
+        # [x, y] = A a, and the moments of [x, y] are A (sum a a') A'
+        const_idx = self._const_idx
+        level = const_idx is None
+        # number of columns of the shifted data, the last one is endog
+        p = k + 2 if level else k + 1
+        if robust:
+            zz_i, zz_j = np.triu_indices(p)
+            zz_scale = np.where(zz_i == zz_j, 1., 2.)
+            xx_i, xx_j = np.triu_indices(p - 1)
+        sw = np.sqrt(np.where(valid, self.weights, 0))
+        exog = np.where(valid[:, None], self.exog, 0)
+        endog = np.where(valid, self.endog, 0)
+        shift = np.zeros(k + 1)
+        if self.expanding:
+            # the cumulative sums continue over the blocks
+            shift = self._reference_row(slice(None))
+
+        params = np.full((nobs, k), np.nan)
+        cov_params = np.full((nobs, k, k), np.nan)
+        window_nobs = np.zeros(nobs)
+        n_missing = np.zeros(nobs)
+        ssr = np.full(nobs, np.nan)
+        tss = np.full(nobs, np.nan)
+
+        carry = None
+        for t0 in range(0, nobs, reset):
+            t1 = min(t0 + reset, nobs)
+            starts, ends = self._window_bounds(t0, t1)
+            first = t0 if carry is not None else starts[0]
+            rows = slice(first, t1)
+            if not self.expanding:
+                shift = self._reference_row(rows)
+            # invalid observations have zero weight
+            x = (exog[rows] - shift[:k]) * sw[rows, None]
+            if level:
+                x = np.column_stack((sw[rows], x))
+            wendog = (endog[rows] - shift[k]) * sw[rows]
+            yx = np.column_stack((x, wendog))
+            # moments of the augmented whitened data [X, y] and counts
+            terms = [np.einsum('ti,tj->tij', yx, yx).reshape(len(x), -1),
+                     valid[rows][:, None].astype(np.float64),
+                     np.column_stack((sw[rows]**2, sw[rows] * wendog))]
+            if robust:
+                # products of the distinct elements of the symmetric outer
+                # products yx yx' and x x'
+                zz = yx[:, zz_i] * yx[:, zz_j]
+                xx = x[:, xx_i] * x[:, xx_j]
+                terms.append((zz[:, :, None] * xx[:, None, :]).reshape(
+                    len(x), -1))
+            terms = np.column_stack(terms)
+            sums = _window_sums(terms, first, starts, ends, carry)
+            if self.expanding:
+                carry = sums[-1]
+
+            shifted = sums[:, :p * p].reshape(-1, p, p)
+            if level:
+                # [x, y] = A a
+                amat = np.eye(k + 1, p, 1)
+                amat[:, 0] = shift
+                moments = np.matmul(np.matmul(amat, shifted), amat.T)
+            else:
+                moments = shifted
+            xpx = moments[:, :k, :k]
+            xpy = moments[:, :k, k]
+            ypy = moments[:, k, k]
+            count = sums[:, p * p]
+            sum_w, sum_wy = sums[:, p * p + 1], sums[:, p * p + 2]
+            block = slice(t0, t1)
+            window_nobs[block] = count
+            n_missing[block] = (ends - starts) - count
+
+            try:
+                xpx_inv = np.linalg.inv(xpx)
+            except np.linalg.LinAlgError:
+                xpx_inv = np.linalg.pinv(xpx)
+            beta = np.matmul(xpx_inv, xpy[:, :, None])[:, :, 0]
+            params[block] = beta
+            if not level:
+                params[block, const_idx] -= (beta.dot(shift[:k]) -
+                                             shift[k]) / self._const_value
+            if params_only:
+                continue
+
+            # the residuals are e_i = [x_i, y_i] . [-b, 1] = a_i . coef
+            coef = np.column_stack((-beta, np.ones(len(beta))))
+            if level:
+                coef = coef.dot(amat)
+            ssr[block] = np.maximum(np.einsum('ti,tij,tj->t', coef, shifted,
+                                              coef), 0)
+            if self.k_constant:
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    tss[block] = (shifted[:, -1, -1] -
+                                  sum_wy**2 / sum_w)
+            else:
+                tss[block] = ypy
+            if robust:
+                # sum of e_i**2 x_i x_i'
+                coef2 = coef[:, zz_i] * coef[:, zz_j] * zz_scale
+                m4 = sums[:, p * p + 3:].reshape(-1, len(zz_i), len(xx_i))
+                meat_tri = np.matmul(coef2[:, None, :], m4)[:, 0]
+                meat = np.empty((len(beta), p - 1, p - 1))
+                meat[:, xx_i, xx_j] = meat_tri
+                meat[:, xx_j, xx_i] = meat_tri
+                # the residuals of an exact fit are zero, the expansion of
+                # the meat in the moments only leaves rounding noise
+                meat[count <= k] = 0
+                if level:
+                    amat_x = amat[:k, :-1]
+                    meat = np.matmul(np.matmul(amat_x, meat), amat_x.T)
+                cov = np.matmul(np.matmul(xpx_inv, meat), xpx_inv)
+            else:
+                cov = xpx_inv
+            if not level:
+                # T cov T' with T = I - e_c r_X' / c
+                ref = shift[:k] / self._const_value
+                a = np.matmul(cov, ref)
+                cov = cov.copy()
+                cov[:, const_idx, :] -= a
+                cov[:, :, const_idx] -= a
+                cov[:, const_idx, const_idx] += a.dot(ref)
+            cov_params[block] = cov
+
+        df_resid = window_nobs - k
+        if not params_only and not robust:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                cov_params *= (ssr / df_resid)[:, None, None]
+        elif cov_type == 'HC1' and not params_only:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                cov_params *= (window_nobs / df_resid)[:, None, None]
+
+        # windows without an estimate
+        invalid = window_nobs < self.min_nobs
+        if not self.expanding:
+            invalid[:self.window - 1] = True
+        if self.missing == 'skip':
+            invalid |= n_missing > 0
+        for arr in (params, cov_params, ssr, tss):
+            arr[invalid] = np.nan
+
+        if use_t is None:
+            use_t = cov_type == 'nonrobust'
+        return RollingRegressionResults(self, params, cov_params, ssr, tss,
+                                        window_nobs, cov_type, use_t,
+                                        params_only)
+
+
+class RollingOLS(RollingWLS):
+    __doc__ = RollingWLS.__doc__.replace(
+        'Rolling window weighted least squares',
+        'Rolling window ordinary least squares').replace(
+        """    weights : array_like, optional
+        1-d weights as in `WLS`. If None, all weights are one.
+""", '')
+
+    def __init__(self, endog, exog, window=None, min_nobs=None,
+                 missing='drop', expanding=False, hasconst=None):
+        super(RollingOLS, self).__init__(endog, exog, window=window,
+                                         weights=None, min_nobs=min_nobs,
+                                         missing=missing,
+                                         expanding=expanding,
+                                         hasconst=hasconst)
+
+
+class RollingRegressionResults(object):
+    """
+    Results of a rolling window regression
+
+    The row t of each attribute belongs to the window that ends with
+    observation t. Windows without an estimate are nan.
+
+    Attributes
+    ----------
+    params : ndarray or DataFrame
+        Parameter estimates, shape (nobs, k_exog).
+    bse : ndarray or DataFrame
+        Standard errors of the parameter estimates.
+    tvalues, pvalues : ndarray or DataFrame
+        t-statistics of the parameter estimates and their two-sided
+        p-values, based on the t or the normal distribution depending on
+        `use_t`.
+    nobs : ndarray or Series
+        Number of non-missing observations in each window.
+    df_resid : ndarray or Series
+        Residual degrees of freedom, ``nobs - k_exog``.
+    ssr : ndarray or Series
+        Sum of squared whitened residuals.
+    scale : ndarray or Series
+        Residual variance estimate, ``ssr / df_resid``.
+    rsquared, rsquared_adj : ndarray or Series
+        Coefficients of determination, see `RegressionResults`.
+
+    Notes
+    -----
+    If the model was created from pandas data, then the attributes are
+    DataFrames or Series with the index of the data.
+    """
+
+    def __init__(self, model, params, cov_params, ssr, tss, nobs, cov_type,
+                 use_t, params_only):
+        self.model = model
+        self._params = params
+        self._cov_params = cov_params
+        self._ssr = ssr
+        self._tss = tss
+        self._nobs = nobs
+        self.cov_type = cov_type
+        self.use_t = use_t
+        self.k_constant = model.k_constant
+        self._params_only = params_only
+        self._use_pandas = _is_using_pandas(model.data.orig_endog,
+                                            model.data.orig_exog)
+        self._cache = resettable_cache()
+
+    def _wrap(self, arr):
+        if not self._use_pandas:
+            return arr
+        index = self.model.data.row_labels
+        if arr.ndim == 1:
+            return pd.Series(arr, index=index)
+        return pd.DataFrame(arr, index=index, columns=self.model.exog_names)
+
+    def _check_cov(self):
+        if self._params_only:
+            raise ValueError('only the parameters are available, fit with '
+                             'params_only=False')
+
+    @property
+    def params(self):
+        return self._wrap(self._params)
+
+    def cov_params(self):
+        """
+        Covariance of the parameter estimates of each window
+
+        Returns
+        -------
+        cov : ndarray or DataFrame
+            Array with shape (nobs, k_exog, k_exog). If the model was
+            created from pandas data, then a DataFrame with shape
+            (nobs * k_exog, k_exog) with a MultiIndex of the data index
+            and the exog names.
+        """
+        self._check_cov()
+        if not self._use_pandas:
+            return self._cov_params
+        names = self.model.exog_names
+        index = pd.MultiIndex.from_product([self.model.data.row_labels,
+                                            names])
+        k = len(names)
+        return pd.DataFrame(self._cov_params.reshape(-1, k), index=index,
+                            columns=names)
+
+    @property
+    def bse(self):
+        return self._wrap(self._bse)
+
+    @cache_readonly
+    def _bse(self):
+        self._check_cov()
+        return np.sqrt(np.diagonal(self._cov_params, axis1=1, axis2=2))
+
+    @property
+    def tvalues(self):
+        return self._wrap(self._params / self._bse)
+
+    @property
+    def pvalues(self):
+        tvalues = self._params / self._bse
+        with np.errstate(invalid='ignore'):
+            if self.use_t:
+                pvalues = stats.t.sf(np.abs(tvalues),
+                                     self._df_resid[:, None]) * 2
+            else:
+                pvalues = stats.norm.sf(np.abs(tvalues)) * 2
+        return self._wrap(pvalues)
+
+    @property
+    def nobs(self):
+        return self._wrap(self._nobs)
+
+    @cache_readonly
+    def _df_resid(self):
+        return self._nobs - self.model.k_exog
+
+    @property
+    def df_resid(self):
+        return self._wrap(self._df_resid)
+
+    @property
+    def ssr(self):
+        self._check_cov()
+        return self._wrap(self._ssr)
+
+    @property
+    def scale(self):
+        self._check_cov()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self._wrap(self._ssr / self._df_resid)
+
+    @cache_readonly
+    def _rsquared(self):
+        self._check_cov()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return 1 - self._ssr / self._tss
+
+    @property
+    def rsquared(self):
+        return self._wrap(self._rsquared)
+
+    @property
+    def rsquared_adj(self):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsquared_adj = 1 - ((self._nobs - self.k_constant) /
+                                self._df_resid * (1 - self._rsquared))
+        return self._wrap(rsquared_adj)
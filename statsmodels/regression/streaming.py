@@ -0,0 +1,639 @@
+"""
+Out-of-core least squares estimation from chunks of data
+
+The estimator in this module never holds the full data set in memory. It
+keeps the upper triangular factor R of the QR decomposition of the
+(whitened) design matrix augmented by the (whitened) response, which is
+updated chunk by chunk. Memory requirements are O(k**2) in the number of
+regressors and do not depend on the number of observations.
+
+Heteroscedasticity and cluster robust covariance matrices require the
+residuals and are computed in a second pass over the data.
+
+License: BSD-3
+"""
+from __future__ import division
+
+import numpy as np
+import pandas as pd
+
+from statsmodels.compat.numpy import np_matrix_rank
+from statsmodels.regression.linear_model import RegressionResults
+from statsmodels.tools.decorators import cache_readonly, cache_writable
+from statsmodels.tools.tools import Bunch
+
+__all__ = ['StreamingOLS', 'StreamingRegressionResults']
+
+
+def _as_2d(x):
+    x = np.asarray(x, dtype=np.float64)
+    if x.ndim == 1:
+        x = x[:, None]
+    return x
+
+
+def _split_chunk(chunk):
+    """split a chunk tuple into endog, exog, weights, groups"""
+    chunk = tuple(chunk)
+    if len(chunk) < 2 or len(chunk) > 4:
+        raise ValueError('chunks need to be tuples of the form (endog, exog)'
+                         ', (endog, exog, weights) or '
+                         '(endog, exog, weights, groups)')
+    chunk = chunk + (None,) * (4 - len(chunk))
+    return chunk
+
+
+class _ClusterSums(object):
+    """Accumulate sums of score contributions by cluster over chunks
+
+    Cluster labels are mapped to consecutive integers with an expanding
+    pandas Index, the per-cluster sums are kept in an array of shape
+    (n_groups, k_params) that grows as new labels arrive.
+    """
+
+    def __init__(self, k_params):
+        self.k_params = k_params
+        self.labels = pd.Index([])
+        self.sums = np.zeros((0, k_params))
+
+    def update(self, xu, groups):
+        uniq, group_int = np.unique(groups, return_inverse=True)
+        idx = self.labels.get_indexer(uniq)
+        is_new = idx == -1
+        if is_new.any():
+            n_old = len(self.labels)
+            self.labels = self.labels.append(pd.Index(uniq[is_new]))
+            idx[is_new] = np.arange(n_old, len(self.labels))
+            self.sums = np.concatenate(
+                (self.sums, np.zeros((is_new.sum(), self.k_params))))
+        chunk_sums = np.column_stack(
+            [np.bincount(group_int, weights=xu[:, col], minlength=len(uniq))
+             for col in range(self.k_params)])
+        self.sums[idx] += chunk_sums
+
+    @property
+    def n_groups(self):
+        return len(self.labels)
+
+    def outer(self):
+        return np.dot(self.sums.T, self.sums)
+
+
+class StreamingOLS(object):
+    """
+    Ordinary or weighted least squares estimated from chunks of data
+
+    The data are passed in chunks with ``update`` or as an iterable of chunks
+    with ``from_chunks``. Only the triangular factor of a QR decomposition of
+    the augmented design ``[exog, endog]`` and a few sums of the response are
+    kept in memory.
+
+    Parameters
+    ----------
+    hasconst : None or bool
+        Indicates whether the design includes a user-supplied constant. If
+        None, then a column that is constant and non-zero in all chunks is
+        treated as constant.
+    exog_names : list of str, optional
+        Names of the explanatory variables. If None, the column names of the
+        first chunk are used if it is a DataFrame, otherwise generic names.
+    endog_names : str, optional
+        Name of the response variable.
+
+    Attributes
+    ----------
+    nobs : float
+        Number of observations accumulated so far.
+    k_exog : int
+        Number of explanatory variables, determined by the first chunk.
+
+    See Also
+    --------
+    statsmodels.regression.linear_model.OLS
+    statsmodels.regression.linear_model.WLS
+
+    Notes
+    -----
+    Chunks are combined by applying a QR decomposition to the stacked
+    current triangular factor and the new whitened chunk, which is more
+    accurate than accumulating the cross-product matrix ``X'X``.
+
+    If weights are given in ``update``, then the estimator corresponds to
+    `WLS` with those weights, otherwise to `OLS`. Weights have to be given
+    either for all chunks or for none of them.
+
+    Examples
+    --------
+    >>> mod = StreamingOLS()
+    >>> for endog, exog in chunks:
+    ...     mod.update(endog, exog)
+    >>> res = mod.fit()
+
+    Robust standard errors need a second pass over the data
+
+    >>> res = StreamingOLS.from_chunks(chunks, cov_type='HC1')
+    """
+
+    def __init__(self, hasconst=None, exog_names=None, endog_names=None):
+        self.hasconst = hasconst
+        self._exog_names = exog_names
+        self._endog_names = endog_names
+        self.k_exog = None
+        self.nobs = 0.
+        self.weighted = None
+        self._r_aug = None
+        self._col_min = None
+        self._col_max = None
+        self._sum_weights = 0.
+        self._sum_wendog = 0.
+        self._sum_logweights = 0.
+
+    @classmethod
+    def from_chunks(cls, chunks, cov_type='nonrobust', cov_kwds=None,
+                    use_t=None, **kwargs):
+        """
+        Create and fit the model from an iterable of chunks
+
+        Parameters
+        ----------
+        chunks : iterable or callable
+            Sequence of tuples ``(endog, exog)`` or ``(endog, exog, weights)``
+            or ``(endog, exog, weights, groups)``. If a robust ``cov_type``
+            is requested, then the data need to be read twice and `chunks`
+            needs to be either a sequence that can be iterated over more
+            than once or a callable that returns a new iterator of chunks
+            each time it is called.
+        cov_type : str
+            Covariance type, see ``fit``.
+        cov_kwds : dict, optional
+            Options for the covariance, see ``fit``.
+        use_t : bool, optional
+            Whether to use the t distribution for inference.
+        kwargs
+            Additional keywords are used to create the instance.
+
+        Returns
+        -------
+        results : StreamingRegressionResults
+        """
+        mod = cls(**kwargs)
+        data = chunks() if callable(chunks) else chunks
+        for chunk in data:
+            endog, exog, weights, _ = _split_chunk(chunk)
+            mod.update(endog, exog, weights=weights)
+        return mod.fit(cov_type=cov_type, cov_kwds=cov_kwds, use_t=use_t,
+                       chunks=chunks)
+
+    def update(self, endog, exog, weights=None):
+        """
+        Add a chunk of observations to the estimator
+
+        Parameters
+        ----------
+        endog : array_like
+            1-d response for the observations in this chunk.
+        exog : array_like
+            2-d array of explanatory variables for this chunk.
+        weights : array_like, optional
+            1-d weights for WLS.
+
+        Returns
+        -------
+        self : StreamingOLS
+        """
+        if self.k_exog is None:
+            if self._exog_names is None and hasattr(exog, 'columns'):
+                self._exog_names = [str(c) for c in exog.columns]
+            if self._endog_names is None and hasattr(endog, 'name'):
+                self._endog_names = endog.name
+            self.weighted = weights is not None
+
+        exog = _as_2d(exog)
+        endog = np.asarray(endog, dtype=np.float64).squeeze()
+        if endog.ndim == 0:
+            endog = endog[None]
+        if endog.ndim != 1:
+            raise ValueError('endog needs to be 1-dimensional')
+        nobs, k_exog = exog.shape
+        if endog.shape[0] != nobs:
+            raise ValueError('endog and exog have different numbers of '
+                             'observations')
+        if (weights is not None) != self.weighted:
+            raise ValueError('weights need to be given either for all chunks '
+                             'or for none')
+
+        if self.k_exog is None:
+            self.k_exog = k_exog
+            self._r_aug = np.zeros((0, k_exog + 1))
+            self._col_min = np.full(k_exog, np.inf)
+            self._col_max = np.full(k_exog, -np.inf)
+        elif k_exog != self.k_exog:
+            raise ValueError('all chunks need to have %d columns in exog'
+                             % self.k_exog)
+        if nobs == 0:
+            return self
+
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.float64) * np.ones(nobs)
+            sw = np.sqrt(weights)
+            aug = np.column_stack((exog * sw[:, None], endog * sw))
+            self._sum_weights += weights.sum()
+            self._sum_wendog += np.dot(weights, endog)
+            self._sum_logweights += np.log(weights).sum()
+        else:
+            aug = np.column_stack((exog, endog))
+            self._sum_weights += nobs
+            self._sum_wendog += endog.sum()
+
+        r_aug = np.linalg.qr(np.vstack((self._r_aug, aug)), mode='r')
+        self._r_aug = r_aug
+        self._col_min = np.minimum(self._col_min, exog.min(0))
+        self._col_max = np.maximum(self._col_max, exog.max(0))
+        self.nobs += nobs
+        return self
+
+    def _check_data(self):
+        if self.k_exog is None or self.nobs == 0:
+            raise ValueError('no data has been added, use `update` first')
+
+    @property
+    def _r_full(self):
+        """augmented R factor padded to square shape"""
+        r_aug = self._r_aug
+        k1 = self.k_exog + 1
+        if r_aug.shape[0] < k1:
+            r_aug = np.vstack((r_aug, np.zeros((k1 - r_aug.shape[0], k1))))
+        return r_aug
+
+    def _finalize_data(self):
+        # lightweight stand-in for ModelData, only names and constant
+        is_const = (self._col_min == self._col_max) & (self._col_max != 0)
+        const_idx = np.nonzero(is_const)[0]
+        if self.hasconst is not None:
+            self.k_constant = int(self.hasconst)
+        else:
+            self.k_constant = int(len(const_idx) > 0)
+        const_idx = const_idx[0] if len(const_idx) == 1 else None
+        self.data = Bunch(k_constant=self.k_constant, const_idx=const_idx)
+
+        exog_names = self._exog_names
+        if exog_names is None:
+            exog_names = ['x%d' % i for i in range(1, self.k_exog + 1)]
+            if self.k_constant and const_idx is not None:
+                exog_names[const_idx] = 'const'
+        self.exog_names = self.data.param_names = self.data.xnames = \
+            list(exog_names)
+        self.endog_names = self.data.ynames = (
+            self._endog_names if self._endog_names is not None else 'y')
+
+    def loglike(self, params):
+        """
+        Gaussian log-likelihood, concentrated over the scale
+
+        Parameters
+        ----------
+        params : array_like
+            The parameter estimates.
+
+        Returns
+        -------
+        llf : float
+            The value of the log-likelihood function.
+        """
+        ssr = self._ssr(params)
+        nobs2 = self.nobs / 2.
+        llf = -np.log(ssr) * nobs2
+        llf -= (1 + np.log(np.pi / nobs2)) * nobs2
+        llf += 0.5 * self._sum_logweights
+        return llf
+
+    def _ssr(self, params):
+        r_full = self._r_full
+        k = self.k_exog
+        resid_r = r_full[:, k] - np.dot(r_full[:, :k], params)
+        return np.dot(resid_r, resid_r)
+
+    def fit(self, cov_type='nonrobust', cov_kwds=None, use_t=None,
+            chunks=None):
+        """
+        Compute the least squares estimates from the accumulated data
+
+        Parameters
+        ----------
+        cov_type : str
+            'nonrobust', 'fixed scale', 'HC0', 'HC1', 'HC2', 'HC3' or
+            'cluster'. All but 'nonrobust' and 'fixed scale' need a second
+            pass over the data in `chunks`.
+        cov_kwds : dict, optional
+            For 'fixed scale' the optional keyword 'scale'. For 'cluster' the
+            optional keywords 'use_correction' and 'df_correction' with the
+            same meaning as in ``RegressionResults.get_robustcov_results``.
+            Cluster labels are not given in `cov_kwds` but as the fourth
+            element of each chunk. Cluster labels can be 1-d or 2-d with two
+            columns for two-way clustering.
+        use_t : bool, optional
+            Whether to use the t distribution for inference. The default is
+            True for 'nonrobust' and False otherwise.
+        chunks : iterable or callable, optional
+            The data for the second pass, see ``from_chunks``. This must
+            contain the same observations as were used in ``update``.
+
+        Returns
+        -------
+        results : StreamingRegressionResults
+        """
+        self._check_data()
+        self._finalize_data()
+        k = self.k_exog
+        r_full = self._r_full
+        r_exog = r_full[:k, :k]
+        r_endog = r_full[:k, k]
+        pinv_r = np.linalg.pinv(r_exog)
+        params = np.dot(pinv_r, r_endog)
+        self.normalized_cov_params = np.dot(pinv_r, pinv_r.T)
+        self.wexog_singular_values = np.linalg.svd(r_exog, compute_uv=False)
+        self.rank = np_matrix_rank(r_exog)
+        self.df_model = float(self.rank - self.k_constant)
+        self.df_resid = self.nobs - self.rank
+
+        res = StreamingRegressionResults(
+            self, params, normalized_cov_params=self.normalized_cov_params,
+            use_t=use_t)
+        if cov_type != 'nonrobust':
+            if cov_kwds is None:
+                cov_kwds = {}
+            res._set_robustcov(cov_type, chunks, use_t=use_t, **cov_kwds)
+        return res
+
+
+class StreamingRegressionResults(RegressionResults):
+    """
+    Results of a least squares fit from chunked data
+
+    This has the same statistics as `RegressionResults` except for those
+    that require observation level arrays, like residuals, fitted values and
+    influence measures, which are not available.
+
+    See Also
+    --------
+    statsmodels.regression.linear_model.RegressionResults
+    """
+
+    def __init__(self, model, params, normalized_cov_params=None,
+                 use_t=None):
+        super(StreamingRegressionResults, self).__init__(
+            model, params, normalized_cov_params=normalized_cov_params,
+            use_t=use_t)
+
+    @cache_readonly
+    def nobs(self):
+        return float(self.model.nobs)
+
+    def _not_available(self, name):
+        raise NotImplementedError('%s is not available for models estimated '
+                                  'from chunked data' % name)
+
+    @property
+    def resid(self):
+        self._not_available('resid')
+
+    @property
+    def wresid(self):
+        self._not_available('wresid')
+
+    @property
+    def fittedvalues(self):
+        self._not_available('fittedvalues')
+
+    @cache_writable()
+    def scale(self):
+        return self.ssr / self.df_resid
+
+    @cache_readonly
+    def ssr(self):
+        return self.model._ssr(self.params)
+
+    @cache_readonly
+    def centered_tss(self):
+        model = self.model
+        return self.uncentered_tss - (model._sum_wendog**2 /
+                                      model._sum_weights)
+
+    @cache_readonly
+    def uncentered_tss(self):
+        # last column of R for the augmented design has norm ||y||
+        endog_r = self.model._r_full[:, -1]
+        return np.dot(endog_r, endog_r)
+
+    def get_robustcov_results(self, cov_type='HC1', use_t=None, **kwds):
+        """
+        Create new results instance with robust covariance as default
+
+        Parameters
+        ----------
+        cov_type : str
+            'fixed scale', 'HC0', 'HC1', 'HC2', 'HC3' or 'cluster'.
+        use_t : bool, optional
+            Whether to use the t distribution for inference.
+        kwds
+            The keyword `chunks` with the data for the second pass over the
+            observations is required unless cov_type is 'fixed scale'. Other
+            keywords are the same as `cov_kwds` in ``StreamingOLS.fit``.
+
+        Returns
+        -------
+        results : StreamingRegressionResults
+        """
+        chunks = kwds.pop('chunks', None)
+        res = self.__class__(self.model, self.params,
+                             normalized_cov_params=self.normalized_cov_params,
+                             use_t=use_t)
+        res._set_robustcov(cov_type, chunks, use_t=use_t, **kwds)
+        return res
+
+    def _set_robustcov(self, cov_type, chunks, use_t=None, **kwds):
+        """compute robust covariance in a second pass and set attributes"""
+        if use_t is None:
+            use_t = False
+        self.use_t = use_t
+        self.cov_type = cov_type
+        self.cov_kwds = {'use_t': use_t}
+        self._cache.pop('bse', None)
+        self._cache.pop('fvalue', None)
+        self._cache.pop('f_pvalue', None)
+
+        if cov_type in ['fixed scale', 'fixed_scale']:
+            scale = kwds.get('scale', 1.)
+            self.cov_kwds['scale'] = scale
+            self.cov_kwds['description'] = ('Standard Errors are based on '
+                                            'fixed scale')
+            self.cov_params_default = scale * self.normalized_cov_params
+            return
+
+        cov_upper = cov_type.upper()
+        if cov_upper not in ('HC0', 'HC1', 'HC2', 'HC3', 'CLUSTER'):
+            raise ValueError('cov_type %s is not available for models '
+                             'estimated from chunked data' % cov_type)
+        if chunks is None:
+            raise ValueError('robust covariances need a second pass over the '
+                             'data, `chunks` is required')
+        if cov_upper.startswith('HC') and kwds:
+            raise ValueError('heteroscedasticity robust covariance does not '
+                             'use keywords')
+
+        sums = self._score_pass(chunks, cluster=(cov_upper == 'CLUSTER'))
+        nobs = self.nobs
+        k_params = len(self.params)
+        xxi = self.normalized_cov_params
+
+        if cov_upper.startswith('HC'):
+            if cov_upper == 'HC1':
+                meat = sums['meat_HC0'] * nobs / self.df_resid
+            else:
+                meat = sums['meat_' + cov_upper]
+            self.cov_params_default = xxi.dot(meat).dot(xxi)
+            self.cov_kwds['description'] = (
+                'Standard Errors are heteroscedasticity robust (%s)'
+                % cov_type)
+            return
+
+        use_correction = kwds.get('use_correction', True)
+        df_correction = kwds.get('df_correction', None)
+        self.cov_kwds['use_correction'] = use_correction
+        self.cov_kwds['adjust_df'] = adjust_df = df_correction is not False
+
+        def cov_from_sums(clu):
+            cov = xxi.dot(clu.outer()).dot(xxi)
+            if use_correction:
+                n_groups = clu.n_groups
+                cov *= (n_groups / (n_groups - 1.) *
+                        ((nobs - 1.) / float(nobs - k_params)))
+            return cov
+
+        clusters = sums['clusters']
+        if len(clusters) == 1:
+            cov = cov_from_sums(clusters[0])
+            self.n_groups = n_groups = clusters[0].n_groups
+        else:
+            cov = (cov_from_sums(clusters[0]) + cov_from_sums(clusters[1]) -
+                   cov_from_sums(clusters[2]))
+            self.n_groups = (clusters[0].n_groups, clusters[1].n_groups)
+            n_groups = min(self.n_groups)
+        self.cov_params_default = cov
+        self.cov_kwds['description'] = ('Standard Errors are robust to '
+                                        'cluster correlation (%s)' % cov_type)
+        if adjust_df:
+            self.df_resid_inference = n_groups - 1
+
+    def _score_pass(self, chunks, cluster=False):
+        """second pass over the data to accumulate score outer products"""
+        params = self.params
+        xxi = self.normalized_cov_params
+        k_params = len(params)
+        meat = dict((key, np.zeros((k_params, k_params)))
+                    for key in ['meat_HC0', 'meat_HC2', 'meat_HC3'])
+        clusters = None
+        nobs = 0
+        data = chunks() if callable(chunks) else chunks
+        for chunk in data:
+            endog, exog, weights, groups = _split_chunk(chunk)
+            exog = _as_2d(exog)
+            endog = np.asarray(endog, dtype=np.float64).reshape(-1)
+            if weights is not None:
+                weights = (np.asarray(weights, dtype=np.float64) *
+                           np.ones(len(endog)))
+                sw = np.sqrt(weights)
+                exog = exog * sw[:, None]
+                endog = endog * sw
+            wresid = endog - np.dot(exog, params)
+            xu = exog * wresid[:, None]
+            nobs += len(wresid)
+            if cluster:
+                if groups is None:
+                    raise ValueError('cluster robust covariance needs '
+                                     'groups as fourth element of chunks')
+                groups = np.asarray(groups)
+                if groups.ndim == 1 or groups.shape[1] == 1:
+                    groups = [groups.reshape(-1)]
+                elif groups.shape[1] == 2:
+                    g_int = pd.MultiIndex.from_arrays(
+                        [groups[:, 0], groups[:, 1]]).values
+                    groups = [groups[:, 0], groups[:, 1], g_int]
+                else:
+                    raise ValueError('only two groups are supported')
+                if clusters is None:
+                    clusters = [_ClusterSums(k_params) for _ in groups]
+                for clu, g in zip(clusters, groups):
+                    clu.update(xu, g)
+            else:
+                hat = (np.dot(exog, xxi) * exog).sum(1)
+                meat['meat_HC0'] += np.dot(xu.T, xu)
+                xu_ = xu / np.sqrt(1 - hat)[:, None]
+                meat['meat_HC2'] += np.dot(xu_.T, xu_)
+                xu_ = xu / (1 - hat)[:, None]
+                meat['meat_HC3'] += np.dot(xu_.T, xu_)
+
+        if nobs != self.nobs:
+            raise ValueError('the second pass over the data has %d '
+                             'observations, but the model has %d'
+                             % (nobs, self.nobs))
+        meat['clusters'] = clusters
+        return meat
+
+    def summary(self, yname=None, xname=None, title=None, alpha=.05):
+        """Summarize the Regression Results
+
+        Residual diagnostics are not included because residuals are not
+        available for models estimated from chunked data.
+
+        Parameters
+        -----------
+        yname : string, optional
+            Default is `y`
+        xname : list of strings, optional
+            Default is `var_##` for ## in p the number of regressors
+        title : string, optional
+            Title for the top table. If not None, then this replaces the
+            default title
+        alpha : float
+            significance level for the confidence intervals
+
+        Returns
+        -------
+        smry : Summary instance
+            this holds the summary tables and text, which can be printed or
+            converted to various output formats.
+        """
+        top_left = [('Dep. Variable:', None),
+                    ('Model:', None),
+                    ('Method:', ['Least Squares']),
+                    ('Date:', None),
+                    ('Time:', None),
+                    ('No. Observations:', None),
+                    ('Df Residuals:', None),
+                    ('Df Model:', None),
+                    ('Covariance Type:', [self.cov_type]),
+                    ]
+
+        top_right = [('R-squared:', ["%#8.3f" % self.rsquared]),
+                     ('Adj. R-squared:', ["%#8.3f" % self.rsquared_adj]),
+                     ('F-statistic:', ["%#8.4g" % self.fvalue]),
+                     ('Prob (F-statistic):', ["%#6.3g" % self.f_pvalue]),
+                     ('Log-Likelihood:', None),
+                     ('AIC:', ["%#8.4g" % self.aic]),
+                     ('BIC:', ["%#8.4g" % self.bic]),
+                     ('Cond. No.', ["%#8.3g" % self.condition_number]),
+                     ]
+
+        if title is None:
+            title = self.model.__class__.__name__ + ' ' + "Regression Results"
+
+        from statsmodels.iolib.summary import Summary
+        smry = Summary()
+        smry.add_table_2cols(self, gleft=top_left, gright=top_right,
+                             yname=yname, xname=xname, title=title)
+        smry.add_table_params(self, yname=yname, xname=xname, alpha=alpha,
+                              use_t=self.use_t)
+        smry.add_extra_txt(["Warnings:",
+                            "[1] " + self.cov_kwds['description']])
+        return smry
@@ -362,6 +362,99 @@ class TestMixedLM(object):
         assert_allclose(result.params, result2.params)
         assert_allclose(result.bse, result2.bse)
 
+    def test_sparse_re(self):
+
+        np.random.seed(3)
+        ngroup, gsize = 30, 8
+        n = ngroup * gsize
+        groups = np.repeat(np.arange(ngroup), gsize)
+        x = np.random.normal(size=(n, 2))
+        exog = np.column_stack((np.ones(n), x))
+        exog_re = np.column_stack((np.ones(n), x[:, 0]))
+        re = np.random.normal(size=(ngroup, 2)) * [1, 0.5]
+        sub = np.random.randint(0, 3, n)
+        exog_vc = {"sub": {}}
+        for g in range(ngroup):
+            ii = np.flatnonzero(groups == g)
+            exog_vc["sub"][g] = (sub[ii, None] == np.arange(3)).astype(float)
+        endog = (exog.sum(1) + (exog_re * re[groups]).sum(1) +
+                 np.random.normal(size=n))
+
+        for reml in True, False:
+            model1 = MixedLM(endog, exog, groups, exog_re=exog_re,
+                             exog_vc=exog_vc)
+            model2 = MixedLM(endog, exog, groups, exog_re=exog_re,
+                             exog_vc=exog_vc, sparse_re=True)
+            result1 = model1.fit(reml=reml)
+            result2 = model2.fit(reml=reml)
+
+            params = MixedLMParams.from_components(
+                np.r_[1., 0.5, 0.2], np.r_[1.2, 0.3, 0.3, 0.5].reshape(2, 2),
+                vcomp=np.r_[0.7])
+            assert_allclose(model1.loglike(params), model2.loglike(params),
+                            rtol=1e-10)
+            assert_allclose(model1.loglike(params, profile_fe=False),
+                            model2.loglike(params, profile_fe=False),
+                            rtol=1e-10)
+            assert_allclose(result1.params, result2.params, rtol=1e-5)
+            assert_allclose(result1.bse, result2.bse, rtol=1e-4)
+            assert_allclose(result1.llf, result2.llf, rtol=1e-8)
+            for g in range(ngroup):
+                re1 = result1.random_effects[g]
+                re2 = result2.random_effects[g]
+                assert_equal(list(re1.index), list(re2.index))
+                assert_allclose(re1, re2, rtol=1e-4, atol=1e-6)
+            assert_allclose(result1.fittedvalues, result2.fittedvalues,
+                            rtol=1e-5)
+            assert_allclose(result1.resid, result2.resid, rtol=1e-4,
+                            atol=1e-6)
+
+    def test_sparse_re_crossed(self):
+
+        # Crossed random effects as variance components of a single group,
+        # given as sparse indicator matrices
+        from scipy import sparse
+        np.random.seed(4)
+        n, nrow, ncol = 400, 30, 20
+        row = np.random.randint(0, nrow, n)
+        col = np.random.randint(0, ncol, n)
+        x = np.random.normal(size=n)
+        endog = (1 + x + np.random.normal(size=nrow)[row] +
+                 0.7 * np.random.normal(size=ncol)[col] +
+                 np.random.normal(size=n))
+        exog = np.column_stack((np.ones(n), x))
+        ii = np.arange(n)
+        zrow = sparse.csr_matrix((np.ones(n), (ii, row)), shape=(n, nrow))
+        zcol = sparse.csr_matrix((np.ones(n), (ii, col)), shape=(n, ncol))
+        groups = np.zeros(n)
+
+        model1 = MixedLM(endog, exog, groups,
+                         exog_vc={"row": {0: zrow.toarray()},
+                                  "col": {0: zcol.toarray()}})
+        model2 = MixedLM(endog, exog, groups,
+                         exog_vc={"row": {0: zrow}, "col": {0: zcol}},
+                         sparse_re=True)
+        result1 = model1.fit()
+        result2 = model2.fit()
+        assert_allclose(result1.params, result2.params, rtol=1e-5)
+        assert_allclose(result1.bse, result2.bse, rtol=1e-4)
+        assert_allclose(result1.llf, result2.llf, rtol=1e-8)
+
+        # The predicted random effects use the sparse design
+        re1 = result1.random_effects[0]
+        re2 = result2.random_effects[0]
+        assert_equal(len(re2), nrow + ncol)
+        assert_equal(list(re1.index), list(re2.index))
+        assert_allclose(re1, re2, rtol=1e-4, atol=1e-6)
+        assert_allclose(result1.fittedvalues, result2.fittedvalues,
+                        rtol=1e-5)
+        assert_allclose(result1.resid, result2.resid, rtol=1e-4, atol=1e-6)
+        assert_allclose(result2.fittedvalues,
+                        np.dot(exog, result2.fe_params) +
+                        zcol.dot(re2["col[1]":"col[%d]" % ncol]) +
+                        zrow.dot(re2["row[1]":"row[%d]" % nrow]),
+                        rtol=1e-12)
+
     def test_dietox(self):
         # dietox data from geepack using random intercepts
         #
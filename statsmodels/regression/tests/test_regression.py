@@ -11,8 +11,10 @@ from numpy.testing import (assert_almost_equal, assert_approx_equal, assert_,
 from scipy.linalg import toeplitz
 from statsmodels.tools.tools import add_constant, categorical
 from statsmodels.compat.numpy import np_matrix_rank
-from statsmodels.regression.linear_model import OLS, WLS, GLS, yule_walker
+from statsmodels.regression.linear_model import (OLS, WLS, GLS, yule_walker,
+                                                 RawRegressionResults)
 from statsmodels.datasets import longley
+from statsmodels.tools.sm_exceptions import MissingDataError
 from scipy.stats import t as student_t
 
 DECIMAL_4 = 4
@@ -1247,6 +1249,169 @@ def test_regularized_options():
     assert_allclose(result1.params, result2.params)
 
 
+class TestFitMany(object):
+
+    @classmethod
+    def setup_class(cls):
+        np.random.seed(12345)
+        nobs, k_endog = 50, 4
+        exog = add_constant(np.random.randn(nobs, 2))
+        endog = np.dot(exog, np.random.randn(3, k_endog))
+        endog += np.random.randn(nobs, k_endog)
+        cls.weights = np.random.uniform(0.5, 2, size=nobs)
+        cls.endog = pandas.DataFrame(endog, columns=['a', 'b', 'c', 'd'])
+        cls.exog = pandas.DataFrame(exog, columns=['const', 'x1', 'x2'])
+
+    def check_many(self, res, results):
+        for j, res1 in enumerate(results):
+            for attr in ['params', 'bse', 'tvalues', 'pvalues']:
+                assert_allclose(np.asarray(getattr(res, attr))[:, j],
+                                getattr(res1, attr), rtol=1e-10)
+            for attr in ['ssr', 'scale', 'rsquared', 'rsquared_adj',
+                         'fvalue', 'f_pvalue', 'llf']:
+                assert_allclose(np.asarray(getattr(res, attr))[j],
+                                getattr(res1, attr), rtol=1e-10)
+            assert_allclose(np.asarray(res.resid)[:, j], res1.resid,
+                            rtol=1e-10)
+
+    def test_ols(self):
+        res = OLS(self.endog.values, self.exog.values).fit_many()
+        assert_equal(len(res), 4)
+        results = [OLS(self.endog.values[:, j], self.exog.values).fit()
+                   for j in range(4)]
+        self.check_many(res, results)
+        res0 = res.get_results(2)
+        assert_allclose(res0.params, results[2].params, rtol=1e-10)
+        assert_allclose(res0.rsquared, results[2].rsquared, rtol=1e-10)
+
+    def test_wls_pandas(self):
+        mod = WLS(self.endog, self.exog, weights=self.weights)
+        res = mod.fit_many()
+        results = [WLS(self.endog[col], self.exog,
+                       weights=self.weights).fit()
+                   for col in self.endog.columns]
+        self.check_many(res, results)
+        assert_equal(list(res.params.index), ['const', 'x1', 'x2'])
+        assert_equal(list(res.rsquared.index), ['a', 'b', 'c', 'd'])
+        res0 = res.get_results('d')
+        assert_equal(res0.model.endog_names, 'd')
+        assert_allclose(res0.params, results[3].params, rtol=1e-10)
+        assert_allclose(res0.bse, results[3].bse, rtol=1e-10)
+
+    def test_raises(self):
+        mod = OLS(self.endog['a'], self.exog)
+        assert_raises(ValueError, mod.fit_many)
+
+
+def test_raw_data_mode():
+    np.random.seed(12345)
+    exog = add_constant(np.random.randn(20, 2))
+    endog = np.dot(exog, [1., .5, -.5]) + np.random.randn(20)
+    weights = np.random.uniform(0.5, 2, size=20)
+    for mod, mod_raw in [
+            (OLS(endog, exog), OLS(endog, exog, data_mode='raw')),
+            (WLS(endog, exog, weights=weights),
+             WLS(endog, exog, weights=weights, data_mode='raw'))]:
+        res = mod.fit()
+        res_raw = mod_raw.fit()
+        assert_(isinstance(res_raw, RawRegressionResults))
+        assert_equal(mod_raw.k_constant, 1)
+        for attr in ['params', 'bse', 'tvalues', 'pvalues', 'resid',
+                     'wresid', 'fittedvalues', 'ssr', 'scale', 'rsquared',
+                     'llf', 'df_model', 'df_resid']:
+            assert_allclose(getattr(res_raw, attr), getattr(res, attr),
+                            rtol=1e-12)
+        assert_allclose(res_raw.cov_params(), res.cov_params(), rtol=1e-12)
+        res_full = res_raw.get_results()
+        assert_allclose(res_full.rsquared_adj, res.rsquared_adj, rtol=1e-12)
+        assert_allclose(res_full.fvalue, res.fvalue, rtol=1e-12)
+        assert_equal(res_full.model.data.param_names, ['const', 'x1', 'x2'])
+
+    # the mode is kept when the model is recreated
+    assert_equal(mod_raw._get_init_kwds()['data_mode'], 'raw')
+    assert_raises(ValueError, OLS(endog, exog, data_mode='raw').fit,
+                  cov_type='HC1')
+
+
+class TestAbsorb(object):
+
+    @classmethod
+    def setup_class(cls):
+        np.random.seed(123987)
+        nobs = 600
+        firm = np.random.randint(0, 40, size=nobs)
+        year = np.random.randint(0, 12, size=nobs)
+        exog = np.random.randn(nobs, 2) + 0.05 * firm[:, None]
+        endog = (exog.dot([1., -0.5]) + np.random.randn(40)[firm] +
+                 np.random.randn(12)[year] + np.random.randn(nobs))
+        cls.endog, cls.exog, cls.firm, cls.year = endog, exog, firm, year
+        cls.weights = np.random.uniform(0.5, 2, size=nobs)
+        dummies = pandas.get_dummies(pandas.DataFrame({'firm': firm,
+                                                       'year': year}),
+                                     columns=['firm', 'year'])
+        cls.dummies = np.asarray(dummies, dtype=float)
+
+    def test_ols_two_way(self):
+        exog_dummy = np.column_stack((self.exog, self.dummies[:, :-1]))
+        res1 = OLS(self.endog, self.exog,
+                   absorb=np.column_stack((self.firm, self.year))).fit()
+        res2 = OLS(self.endog, exog_dummy).fit()
+        assert_equal(res1.model.k_absorb, 40 + 12 - 1)
+        assert_equal(res1.df_resid, res2.df_resid)
+        assert_allclose(res1.params, res2.params[:2], rtol=1e-8)
+        assert_allclose(res1.bse, res2.bse[:2], rtol=1e-8)
+        assert_allclose(res1.resid, res2.resid, atol=1e-8)
+        assert_allclose(res1.scale, res2.scale, rtol=1e-8)
+
+        res1 = OLS(self.endog, self.exog,
+                   absorb=np.column_stack((self.firm, self.year))).fit(
+                       cov_type='HC1')
+        res2 = OLS(self.endog, exog_dummy).fit(cov_type='HC1')
+        assert_allclose(res1.bse, res2.bse[:2], rtol=1e-6)
+
+    def test_wls_cluster(self):
+        # firm fixed effects are nested in the firm clusters
+        exog_dummy = np.column_stack((self.exog, self.dummies[:, :40]))
+        cov_kwds = {'groups': self.firm, 'use_correction': False}
+        res1 = WLS(self.endog, self.exog, weights=self.weights,
+                   absorb=self.firm).fit(cov_type='cluster',
+                                         cov_kwds=cov_kwds)
+        res2 = WLS(self.endog, exog_dummy, weights=self.weights).fit(
+            cov_type='cluster', cov_kwds=cov_kwds)
+        assert_allclose(res1.params, res2.params[:2], rtol=1e-10)
+        assert_allclose(res1.bse, res2.bse[:2], rtol=1e-10)
+        assert_equal(res1.df_resid_inference, 39)
+
+        res1 = WLS(self.endog, self.exog, weights=self.weights,
+                   absorb=self.firm).fit()
+        res2 = WLS(self.endog, exog_dummy, weights=self.weights).fit()
+        assert_allclose(res1.bse, res2.bse[:2], rtol=1e-10)
+        assert_allclose(res1.llf, res2.llf, rtol=1e-10)
+
+    def test_pandas_missing(self):
+        endog = pandas.Series(self.endog, name='y')
+        endog.iloc[3] = np.nan
+        exog = pandas.DataFrame(self.exog, columns=['a', 'b'])
+        absorb = pandas.DataFrame({'firm': self.firm, 'year': self.year})
+        res1 = OLS(endog, exog, absorb=absorb, missing='drop').fit()
+        assert_equal(res1.model.exog_names, ['a', 'b'])
+        assert_equal(res1.nobs, len(endog) - 1)
+        res2 = OLS(endog.drop(3), exog.drop(3), absorb=absorb.drop(3)).fit()
+        assert_equal(res1.params.index.tolist(), ['a', 'b'])
+        assert_allclose(res1.params, res2.params, rtol=1e-10)
+        assert_allclose(res1.bse, res2.bse, rtol=1e-10)
+
+    def test_raises(self):
+        assert_raises(ValueError, OLS, self.endog, add_constant(self.exog),
+                      absorb=self.firm)
+        assert_raises(ValueError, OLS, self.endog, self.exog,
+                      absorb=self.firm[:-1])
+        absorb = self.firm.astype(float)
+        absorb[5] = np.nan
+        assert_raises(MissingDataError, OLS, self.endog, self.exog,
+                      absorb=absorb)
+
+
 if __name__ == "__main__":
     import pytest
     pytest.main([__file__, '-vvs', '-x', '--pdb'])
@@ -409,11 +409,20 @@ class TestOLSRobustCluster2Input(CheckOLSRobustCluster, CheckOLSRobustNewMixin):
         self.rtolh = 1e-10
 
     def test_too_many_groups(self):
-        long_groups = self.groups.reshape(-1, 1)
-        groups3 = np.hstack((long_groups, long_groups, long_groups))
+        groups3 = np.tile(self.groups[:, None, None], (1, 2, 2))
         assert_raises(ValueError, self.res1.get_robustcov_results,'cluster',
                       groups=groups3, use_correction=True, use_t=True)
 
+    def test_3way_same_groups(self):
+        # multiway clustering with identical cluster dimensions reduces to
+        # one-way clustering
+        long_groups = self.groups.reshape(-1, 1)
+        groups3 = np.hstack((long_groups, long_groups, long_groups))
+        res = self.res1.get_robustcov_results('cluster', groups=groups3,
+                                              use_correction=True, use_t=True)
+        assert_allclose(res.cov_params(), self.cov_robust, rtol=1e-10)
+        assert_equal(res.df_resid_inference, self.res1.df_resid_inference)
+
     def test_2way_dataframe(self):
         import pandas as pd
         long_groups = self.groups.reshape(-1, 1)
@@ -0,0 +1,191 @@
+"""
+Tests for rolling and expanding window least squares
+"""
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_allclose, assert_equal
+import pytest
+
+from statsmodels.regression.linear_model import OLS, WLS
+from statsmodels.regression.rolling import RollingOLS, RollingWLS
+from statsmodels.tools.sm_exceptions import MissingDataError
+from statsmodels.tools.tools import add_constant
+
+
+def _make_data(nobs=250, seed=34512):
+    np.random.seed(seed)
+    exog = add_constant(np.random.randn(nobs, 2))
+    endog = (exog.sum(1) + np.random.randn(nobs) * (1 + np.abs(exog[:, 1])))
+    weights = np.random.uniform(0.5, 2, size=nobs)
+    return endog, exog, weights
+
+
+def check_window(res, t, endog, exog, weights, start, cov_type):
+    keep = np.isfinite(endog[start:t + 1])
+    keep &= np.isfinite(exog[start:t + 1]).all(1)
+    res1 = WLS(endog[start:t + 1][keep], exog[start:t + 1][keep],
+               weights=weights[start:t + 1][keep]).fit(cov_type=cov_type)
+    assert_allclose(res.params[t], res1.params, rtol=1e-9)
+    assert_allclose(res.bse[t], res1.bse, rtol=1e-8)
+    assert_allclose(res.tvalues[t], res1.tvalues, rtol=1e-8)
+    assert_allclose(res.pvalues[t], res1.pvalues, rtol=1e-7)
+    assert_allclose(res.cov_params()[t], res1.cov_params(), rtol=1e-8)
+    assert_equal(res.nobs[t], res1.nobs)
+    assert_equal(res.df_resid[t], res1.df_resid)
+    for attr in ['ssr', 'scale', 'rsquared', 'rsquared_adj']:
+        assert_allclose(getattr(res, attr)[t], getattr(res1, attr),
+                        rtol=1e-8, err_msg=attr)
+
+
+@pytest.mark.parametrize('cov_type', ['nonrobust', 'HC0', 'HC1'])
+@pytest.mark.parametrize('expanding', [False, True])
+def test_wls(cov_type, expanding):
+    endog, exog, weights = _make_data()
+    window = 50
+    mod = RollingWLS(endog, exog, window=window, weights=weights,
+                     expanding=expanding)
+    # a small reset to use several blocks
+    res = mod.fit(cov_type=cov_type, reset=31)
+    for t in [3, 49, 50, 120, 249]:
+        start = 0 if expanding else max(t - window + 1, 0)
+        if t < window - 1 and not expanding:
+            assert np.isnan(res.params[t]).all()
+            continue
+        check_window(res, t, endog, exog, weights, start, cov_type)
+    assert np.isnan(res.params[:2]).all()
+
+    res2 = mod.fit(cov_type=cov_type)
+    assert_allclose(res2.params, res.params, rtol=1e-10)
+    assert_allclose(res2.bse, res.bse, rtol=1e-10)
+
+
+def test_ols():
+    endog, exog, _ = _make_data()
+    res = RollingOLS(endog, exog, window=30).fit()
+    res1 = OLS(endog[-30:], exog[-30:]).fit()
+    assert_allclose(res.params[-1], res1.params, rtol=1e-9)
+    assert_allclose(res.bse[-1], res1.bse, rtol=1e-8)
+    assert_allclose(res.rsquared[-1], res1.rsquared, rtol=1e-8)
+
+    res2 = RollingWLS(endog, exog, window=30).fit()
+    assert_allclose(res2.params, res.params, equal_nan=True)
+
+    res3 = RollingOLS(endog, exog, window=30).fit(params_only=True)
+    assert_allclose(res3.params, res.params, equal_nan=True)
+    with pytest.raises(ValueError):
+        res3.bse
+
+    # without constant the uncentered tss is used
+    res = RollingOLS(endog, exog[:, 1:], window=30).fit()
+    res1 = OLS(endog[-30:], exog[-30:, 1:]).fit()
+    assert_allclose(res.rsquared[-1], res1.rsquared, rtol=1e-8)
+
+
+@pytest.mark.parametrize('cov_type', ['nonrobust', 'HC0'])
+@pytest.mark.parametrize('expanding', [False, True])
+def test_large_level(cov_type, expanding):
+    # regressor with a level that is large relative to its variation in a
+    # window, the uncentered moments cancel without shifting the data
+    np.random.seed(93751)
+    nobs = 2000
+    exog = add_constant(1e4 + np.cumsum(np.random.randn(nobs)) * 0.1)
+    endog = 5 + 2 * exog[:, 1] + np.random.randn(nobs)
+    window = 250
+    mod = RollingOLS(endog, exog, window=window, expanding=expanding)
+    res = mod.fit(cov_type=cov_type)
+    # the robust meat is computed from fourth moments
+    rtol = 1e-8 if cov_type == 'nonrobust' else 1e-6
+    for t in [249, 250, 1013, 1999]:
+        start = 0 if expanding else t - window + 1
+        res1 = OLS(endog[start:t + 1], exog[start:t + 1]).fit(
+            cov_type=cov_type)
+        assert_allclose(res.params[t], res1.params, rtol=1e-9)
+        assert_allclose(res.bse[t], res1.bse, rtol=rtol)
+        assert_allclose(res.cov_params()[t], res1.cov_params(), rtol=rtol)
+        for attr in ['ssr', 'rsquared']:
+            assert_allclose(getattr(res, attr)[t], getattr(res1, attr),
+                            rtol=1e-8, err_msg=attr)
+
+
+@pytest.mark.parametrize('cov_type', ['nonrobust', 'HC0'])
+@pytest.mark.parametrize('expanding', [False, True])
+def test_large_level_no_constant(cov_type, expanding):
+    # without a constant the shift is not a reparametrization of the model,
+    # ssr and the robust meat are recovered from the shifted moments
+    np.random.seed(28113)
+    nobs = 3000
+    exog = 1e4 + np.cumsum(np.random.randn(nobs, 2), 0) * 0.1
+    endog = 2 * exog[:, 0] - exog[:, 1] + np.random.randn(nobs)
+    window = 250
+    mod = RollingOLS(endog, exog, window=window, expanding=expanding)
+    assert_equal(mod.k_constant, 0)
+    res = mod.fit(cov_type=cov_type)
+    # X'X is badly conditioned, which limits the accuracy of OLS as well
+    rtol = 1e-6 if cov_type == 'nonrobust' else 1e-4
+    for t in [249, 250, 1013, 2999]:
+        start = 0 if expanding else t - window + 1
+        res1 = OLS(endog[start:t + 1], exog[start:t + 1]).fit(
+            cov_type=cov_type)
+        assert_allclose(res.params[t], res1.params, rtol=1e-6)
+        assert_allclose(res.bse[t], res1.bse, rtol=rtol)
+        for attr in ['ssr', 'rsquared']:
+            assert_allclose(getattr(res, attr)[t], getattr(res1, attr),
+                            rtol=1e-6, err_msg=attr)
+
+
+def test_missing():
+    endog, exog, weights = _make_data()
+    endog[60] = np.nan
+    exog[100, 1] = np.nan
+    window = 40
+
+    res = RollingWLS(endog, exog, window=window, weights=weights).fit()
+    for t in [59, 60, 80, 100, 139, 140]:
+        check_window(res, t, endog, exog, weights, t - window + 1,
+                     'nonrobust')
+    assert_equal(res.nobs[[59, 60, 99, 100, 140]], [40, 39, 39, 39, 40])
+
+    res = RollingWLS(endog, exog, window=window, weights=weights,
+                     missing='skip').fit()
+    assert np.isnan(res.params[60:140]).all()
+    assert np.isfinite(res.params[[59, 140]]).all()
+
+    # too few observations
+    res = RollingOLS(endog, exog, window=window, min_nobs=40).fit()
+    assert np.isnan(res.params[60:140]).all()
+
+    with pytest.raises(MissingDataError):
+        RollingOLS(endog, exog, window=window, missing='raise')
+
+
+def test_pandas():
+    endog, exog, _ = _make_data()
+    index = pd.date_range('2000-01-01', periods=len(endog), freq='D')
+    endog = pd.Series(endog, index=index, name='y')
+    exog = pd.DataFrame(exog, index=index, columns=['const', 'a', 'b'])
+    res = RollingOLS(endog, exog, window=60).fit()
+    assert isinstance(res.params, pd.DataFrame)
+    assert_equal(list(res.params.columns), ['const', 'a', 'b'])
+    assert res.params.index.equals(index)
+    assert isinstance(res.rsquared, pd.Series)
+    assert res.rsquared.index.equals(index)
+    res1 = OLS(endog[-60:], exog[-60:]).fit()
+    assert_allclose(res.params.iloc[-1], res1.params, rtol=1e-9)
+    assert_allclose(res.bse.iloc[-1], res1.bse, rtol=1e-8)
+    cov = res.cov_params()
+    assert isinstance(cov, pd.DataFrame)
+    assert_equal(list(cov.columns), ['const', 'a', 'b'])
+    assert_allclose(cov.loc[index[-1]], res1.cov_params(), rtol=1e-8)
+    assert_equal(list(cov.loc[index[-1]].index), ['const', 'a', 'b'])
+
+
+def test_raises():
+    endog, exog, _ = _make_data()
+    with pytest.raises(ValueError):
+        RollingOLS(endog, exog)
+    with pytest.raises(ValueError):
+        RollingOLS(endog, exog, window=2)
+    with pytest.raises(ValueError):
+        RollingOLS(endog, exog, window=20, missing='none')
+    with pytest.raises(ValueError):
+        RollingOLS(endog, exog, window=20).fit(cov_type='HC3')
@@ -0,0 +1,190 @@
+"""
+Tests for least squares estimated from chunked data
+"""
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_allclose, assert_equal
+import pytest
+
+from statsmodels.regression.linear_model import OLS, WLS
+from statsmodels.regression.streaming import StreamingOLS
+from statsmodels.tools.tools import add_constant
+
+
+def _make_data(nobs=503, seed=987125):
+    np.random.seed(seed)
+    exog = add_constant(np.random.randn(nobs, 3))
+    groups = np.random.randint(0, 25, size=nobs)
+    groups2 = np.random.randint(0, 7, size=nobs)
+    endog = (exog.sum(1) + np.random.randn(nobs) * (1 + exog[:, 1]**2) +
+             np.random.randn(25)[groups])
+    weights = np.random.uniform(0.5, 2, size=nobs)
+    return endog, exog, weights, np.column_stack((groups, groups2))
+
+
+def _chunks(endog, exog, weights=None, groups=None, size=100):
+    out = []
+    for start in range(0, len(endog), size):
+        sl = slice(start, start + size)
+        w = None if weights is None else weights[sl]
+        g = None if groups is None else groups[sl]
+        out.append((endog[sl], exog[sl], w, g))
+    return out
+
+
+class CheckStreaming(object):
+
+    def test_params(self):
+        res1, res2 = self.res1, self.res2
+        assert_allclose(res1.params, res2.params, rtol=1e-10)
+        assert_allclose(res1.bse, res2.bse, rtol=1e-10)
+        assert_allclose(res1.tvalues, res2.tvalues, rtol=1e-10)
+        assert_allclose(res1.pvalues, res2.pvalues, rtol=1e-8)
+
+    def test_stats(self):
+        res1, res2 = self.res1, self.res2
+        assert_equal(res1.nobs, res2.nobs)
+        assert_equal(res1.df_model, res2.df_model)
+        assert_equal(res1.df_resid, res2.df_resid)
+        for attr in ['ssr', 'scale', 'centered_tss', 'uncentered_tss',
+                     'rsquared', 'rsquared_adj', 'fvalue', 'f_pvalue', 'llf',
+                     'aic', 'bic', 'condition_number']:
+            assert_allclose(getattr(res1, attr), getattr(res2, attr),
+                            rtol=1e-10, err_msg=attr)
+
+    def test_inference(self):
+        res1, res2 = self.res1, self.res2
+        assert_allclose(res1.conf_int(), np.asarray(res2.conf_int()),
+                        rtol=1e-10)
+        r_matrix = np.eye(4)[1:]
+        assert_allclose(res1.f_test(r_matrix).fvalue,
+                        res2.f_test(r_matrix).fvalue, rtol=1e-10)
+
+    def test_summary(self):
+        self.res1.summary()
+
+
+class TestStreamingOLS(CheckStreaming):
+
+    @classmethod
+    def setup_class(cls):
+        endog, exog, _, _ = _make_data()
+        mod = StreamingOLS()
+        for y, x, _, _ in _chunks(endog, exog):
+            mod.update(y, x)
+        cls.res1 = mod.fit()
+        cls.res2 = OLS(endog, exog).fit()
+
+
+class TestStreamingWLS(CheckStreaming):
+
+    @classmethod
+    def setup_class(cls):
+        endog, exog, weights, _ = _make_data()
+        chunks = [c[:3] for c in _chunks(endog, exog, weights, size=37)]
+        cls.res1 = StreamingOLS.from_chunks(chunks)
+        cls.res2 = WLS(endog, exog, weights=weights).fit()
+
+
+class TestStreamingHC1(CheckStreaming):
+
+    @classmethod
+    def setup_class(cls):
+        endog, exog, _, _ = _make_data()
+        chunks = [c[:2] for c in _chunks(endog, exog)]
+        cls.res1 = StreamingOLS.from_chunks(chunks, cov_type='HC1')
+        cls.res2 = OLS(endog, exog).fit(cov_type='HC1')
+
+
+class TestStreamingWLSHC3(CheckStreaming):
+
+    @classmethod
+    def setup_class(cls):
+        endog, exog, weights, _ = _make_data()
+        chunks = [c[:3] for c in _chunks(endog, exog, weights)]
+        cls.res1 = StreamingOLS.from_chunks(lambda: iter(chunks),
+                                            cov_type='HC3')
+        cls.res2 = WLS(endog, exog, weights=weights).fit(cov_type='HC3')
+
+
+class TestStreamingCluster(CheckStreaming):
+
+    @classmethod
+    def setup_class(cls):
+        endog, exog, _, groups = _make_data()
+        chunks = _chunks(endog, exog, groups=groups[:, 0], size=64)
+        cls.res1 = StreamingOLS.from_chunks(chunks, cov_type='cluster')
+        cls.res2 = OLS(endog, exog).fit(cov_type='cluster',
+                                        cov_kwds={'groups': groups[:, 0]})
+
+    def test_df(self):
+        assert_equal(self.res1.n_groups, 25)
+        assert_equal(self.res1.df_resid_inference,
+                     self.res2.df_resid_inference)
+
+
+class TestStreamingClusterScalarWeights(CheckStreaming):
+
+    @classmethod
+    def setup_class(cls):
+        # one scalar weight for each chunk
+        endog, exog, _, groups = _make_data()
+        chunks = _chunks(endog, exog, groups=groups[:, 0], size=64)
+        chunks = [(y, x, 1. + i % 3, g)
+                  for i, (y, x, _, g) in enumerate(chunks)]
+        weights = np.concatenate([w * np.ones(len(y))
+                                  for y, _, w, _ in chunks])
+        cls.res1 = StreamingOLS.from_chunks(chunks, cov_type='cluster')
+        cls.res2 = WLS(endog, exog, weights=weights).fit(
+            cov_type='cluster', cov_kwds={'groups': groups[:, 0]})
+
+
+class TestStreamingCluster2(CheckStreaming):
+
+    @classmethod
+    def setup_class(cls):
+        endog, exog, _, groups = _make_data()
+        chunks = _chunks(endog, exog, groups=groups, size=64)
+        mod = StreamingOLS()
+        for y, x, _, _ in chunks:
+            mod.update(y, x)
+        res = mod.fit()
+        cls.res1 = res.get_robustcov_results('cluster', chunks=chunks)
+        cls.res2 = OLS(endog, exog).fit(cov_type='cluster',
+                                        cov_kwds={'groups': groups})
+
+
+def test_names_pandas():
+    endog, exog, _, _ = _make_data()
+    exog = pd.DataFrame(exog, columns=['const', 'a', 'b', 'c'])
+    endog = pd.Series(endog, name='y_var')
+    mod = StreamingOLS()
+    for start in range(0, len(endog), 200):
+        mod.update(endog[start:start + 200], exog[start:start + 200])
+    res = mod.fit()
+    assert_equal(res.model.exog_names, ['const', 'a', 'b', 'c'])
+    assert_equal(res.model.endog_names, 'y_var')
+    assert_equal(res.k_constant, 1)
+    res.t_test('a = b')
+
+
+def test_errors():
+    endog, exog, weights, _ = _make_data()
+    mod = StreamingOLS()
+    assert_raises_value = pytest.raises(ValueError)
+    with assert_raises_value:
+        mod.fit()
+    mod.update(endog[:10], exog[:10])
+    with pytest.raises(ValueError):
+        mod.update(endog[10:20], exog[10:20, :2])
+    with pytest.raises(ValueError):
+        mod.update(endog[10:20], exog[10:20], weights=weights[10:20])
+    res = mod.fit()
+    with pytest.raises(NotImplementedError):
+        res.resid
+    # robust covariance needs the data again
+    with pytest.raises(ValueError):
+        res.get_robustcov_results('HC0')
+    # and the same number of observations
+    with pytest.raises(ValueError):
+        res.get_robustcov_results('HC0', chunks=[(endog, exog)])
@@ -0,0 +1,360 @@
+"""
+Bootstrap of the parameter estimates of regression models
+
+The replications are drawn in blocks. Each block has its own random seed
+drawn from the seed of the bootstrap, so that the results do not depend on
+the number of jobs that are used.
+
+Linear regression models are refit exactly with the pseudoinverse of the
+whitened design matrix, which is computed only once. Wild bootstrap for
+other likelihood models uses one Newton step from the estimate, the score
+bootstrap of Kline and Santos (2012). All other cases refit the model for
+each replication, optionally in parallel with joblib.
+
+References
+----------
+Davidson, R. and E. Flachaire (2008). The wild bootstrap, tamed at last.
+Journal of Econometrics 146, 162-169.
+
+Kline, P. and A. Santos (2012). A score based approach to wild bootstrap
+inference. Journal of Econometric Methods 1, 23-41.
+
+License: BSD-3
+"""
+from __future__ import division
+
+import numpy as np
+from scipy import stats
+
+from statsmodels.compat.python import getargspec
+from statsmodels.tools.decorators import cache_readonly
+from statsmodels.tools.sm_exceptions import PerfectSeparationError
+from statsmodels.tools.parallel import parallel_func
+
+__all__ = ['bootstrap', 'BootstrapResults']
+
+_methods = ['pairs', 'residual', 'wild', 'cluster']
+
+# Mammen's two point distribution with mean 0 and variance 1
+_sqrt5 = np.sqrt(5)
+_mammen_values = (-(_sqrt5 - 1) / 2, (_sqrt5 + 1) / 2)
+_mammen_prob = (_sqrt5 + 1) / (2 * _sqrt5)
+
+
+def _block_size(nobs):
+    # replications per block, the draws of a block are held in memory
+    return int(np.clip(2**21 // max(nobs, 1), 1, 100))
+
+
+def _draw_weights(rs, size, weights):
+    if weights == 'rademacher':
+        return 2. * rs.randint(2, size=size) - 1
+    else:
+        return np.where(rs.uniform(size=size) < _mammen_prob,
+                        *_mammen_values)
+
+
+def _draw_block(seed, nrep, method, nobs, group_idx, n_groups, weights):
+    """
+    Draws of one block of replications
+
+    pairs and cluster return the count of each observation in the
+    resample, residual returns the indices of the resampled residuals and
+    wild the multipliers of the residuals.
+    """
+    rs = np.random.RandomState(seed)
+    draws = np.empty((nrep, nobs))
+    for i in range(nrep):
+        if method == 'pairs':
+            idx = rs.randint(nobs, size=nobs)
+            draws[i] = np.bincount(idx, minlength=nobs)
+        elif method == 'cluster':
+            idx = rs.randint(n_groups, size=n_groups)
+            draws[i] = np.bincount(idx, minlength=n_groups)[group_idx]
+        elif method == 'residual':
+            draws[i] = rs.randint(nobs, size=nobs)
+        elif group_idx is not None:
+            draws[i] = _draw_weights(rs, n_groups, weights)[group_idx]
+        else:
+            draws[i] = _draw_weights(rs, nobs, weights)
+    return draws
+
+
+def _linear_block(results, seed, nrep, method, group_idx, n_groups,
+                  weights):
+    """Exact refits of a linear regression model for one block"""
+    model = results.model
+    params = np.asarray(results.params)
+    draws = _draw_block(seed, nrep, method, model.wexog.shape[0], group_idx,
+                        n_groups, weights)
+    if method in ('residual', 'wild'):
+        wresid = np.asarray(results.wresid)
+        if method == 'residual':
+            wresid = wresid - wresid.mean()
+            resid_star = wresid[draws.astype(np.intp)]
+        else:
+            resid_star = wresid * draws
+        # params of wfittedvalues + resid_star
+        return params + resid_star.dot(model.pinv_wexog.T)
+
+    wexog = model.wexog
+    wendog = model.wendog
+    bparams = np.empty((nrep, len(params)))
+    for i in range(nrep):
+        xc = wexog.T * draws[i]
+        bparams[i] = np.linalg.pinv(xc.dot(wexog)).dot(xc.dot(wendog))
+    return bparams
+
+
+def _score_block(score_obs, hinv, seed, nrep, group_idx, n_groups, weights,
+                 params):
+    """One step wild score bootstrap for one block"""
+    draws = _draw_block(seed, nrep, 'wild', score_obs.shape[0], group_idx,
+                        n_groups, weights)
+    return params + draws.dot(score_obs).dot(hinv.T)
+
+
+def _resample_model(model, counts):
+    """Model for the observations repeated by counts"""
+    nobs = model.endog.shape[0]
+    idx = np.repeat(np.arange(nobs), counts.astype(np.intp))
+    init_kwds = model._get_init_kwds()
+    for key, val in init_kwds.items():
+        if np.ndim(val) > 0 and np.shape(val)[0] == nobs:
+            init_kwds[key] = np.asarray(val)[idx]
+    init_kwds['missing'] = 'none'
+    init_kwds['data_mode'] = 'raw'
+    init_kwds['hasconst'] = model.k_constant > 0
+    return model.__class__(model.endog[idx], model.exog[idx], **init_kwds)
+
+
+def _refit_block(model, params, seed, nrep, method, group_idx, n_groups,
+                 fit_kwds):
+    """Refits of a general model for one block"""
+    draws = _draw_block(seed, nrep, method, model.endog.shape[0], group_idx,
+                        n_groups, None)
+    bparams = np.empty((nrep, len(params)))
+    for i in range(nrep):
+        try:
+            mod = _resample_model(model, draws[i])
+            bparams[i] = mod.fit(start_params=params, **fit_kwds).params
+        except (np.linalg.LinAlgError, PerfectSeparationError, ValueError):
+            bparams[i] = np.nan
+    return bparams
+
+
+def bootstrap(results, nrep=999, method='pairs', groups=None,
+              weights='rademacher', seed=None, n_jobs=1, fit_kwds=None):
+    """
+    Bootstrap distribution of the parameter estimates
+
+    Parameters
+    ----------
+    results : Results instance
+        Results of the estimated model, for example of OLS, WLS, GLM or
+        Logit.
+    nrep : int
+        Number of bootstrap replications.
+    method : {'pairs', 'residual', 'wild', 'cluster'}
+        Resampling scheme.
+
+        * 'pairs' resamples the observations with replacement.
+        * 'residual' adds the centered residuals, resampled with replacement,
+          to the fitted values. This is only available for linear
+          regression models.
+        * 'wild' multiplies the residuals by random weights with mean zero
+          and variance one. If `groups` is given, the same weight is used
+          for all observations of a group. For models that are not linear
+          regression models the score bootstrap is used, see Notes.
+        * 'cluster' resamples the groups with replacement.
+    groups : array_like, optional
+        Group labels of the observations, required for 'cluster' and
+        optional for 'wild'.
+    weights : {'rademacher', 'mammen'}
+        Distribution of the weights of the wild bootstrap.
+    seed : {None, int, RandomState}
+        Seed of the random number generator.
+    n_jobs : int
+        Number of jobs used to refit models in parallel. Parallel execution
+        requires joblib. The results do not depend on `n_jobs`.
+    fit_kwds : dict, optional
+        Keyword arguments for the ``fit`` method of the model when it is
+        refit. The estimated params are used as start_params.
+
+    Returns
+    -------
+    BootstrapResults
+
+    Notes
+    -----
+    Linear regression models, i.e. OLS, WLS and GLS, are refit exactly
+    without creating new model instances. The residual and wild bootstrap
+    use the whitened residuals.
+
+    For other models the wild bootstrap draws
+
+    ``params + inv(-H) sum_i w_i s_i``
+
+    where s_i is the score of observation i and H the hessian at the
+    estimate, which is one Newton step for the wild bootstrap objective.
+    The pairs and cluster bootstrap refit the model for each replication.
+    Replications for which the estimation fails, for example because of
+    perfect separation in a Logit model, are nan and counted in
+    ``nfailed``.
+    """
+    from statsmodels.regression.linear_model import RegressionModel
+
+    method = method.lower()
+    if method not in _methods:
+        raise ValueError('method must be one of %s' % ', '.join(_methods))
+    weights = weights.lower()
+    if weights not in ('rademacher', 'mammen'):
+        raise ValueError("weights must be 'rademacher' or 'mammen'")
+    model = results.model
+    is_linear = isinstance(model, RegressionModel)
+    if method == 'residual' and not is_linear:
+        raise ValueError('the residual bootstrap requires a linear '
+                         'regression model')
+
+    group_idx = None
+    n_groups = 0
+    if method == 'cluster' and groups is None:
+        raise ValueError('groups are required for the cluster bootstrap')
+    if groups is not None and method in ('wild', 'cluster'):
+        groups = np.asarray(groups)
+        if groups.shape[0] != model.endog.shape[0]:
+            raise ValueError('groups must have the same length as endog')
+        _, group_idx = np.unique(groups, return_inverse=True)
+        n_groups = group_idx.max() + 1
+
+    if isinstance(seed, np.random.RandomState):
+        rs = seed
+    else:
+        rs = np.random.RandomState(seed)
+    nobs = model.endog.shape[0]
+    size = _block_size(nobs)
+    sizes = [size] * (nrep // size)
+    if nrep % size:
+        sizes.append(nrep % size)
+    seeds = rs.randint(0, 2**31 - 1, size=len(sizes))
+    params = np.asarray(results.params)
+
+    if is_linear:
+        blocks = [_linear_block(results, s, n, method, group_idx, n_groups,
+                                weights)
+                  for s, n in zip(seeds, sizes)]
+    elif method == 'wild':
+        score_obs = model.score_obs(params)
+        hinv = np.linalg.pinv(-model.hessian(params))
+        blocks = [_score_block(score_obs, hinv, s, n, group_idx, n_groups,
+                               weights, params)
+                  for s, n in zip(seeds, sizes)]
+    else:
+        fit_kwds = {} if fit_kwds is None else dict(fit_kwds)
+        if 'disp' in getargspec(model.fit).args:
+            fit_kwds.setdefault('disp', 0)
+        parallel, p_func, n_jobs = parallel_func(_refit_block, n_jobs,
+                                                 verbose=0)
+        if n_jobs == 1:
+            parallel, p_func = list, _refit_block
+        blocks = parallel(p_func(model, params, s, n, method, group_idx,
+                                 n_groups, fit_kwds)
+                          for s, n in zip(seeds, sizes))
+
+    bparams = np.concatenate(blocks, axis=0)
+    return BootstrapResults(results, bparams, method)
+
+
+class BootstrapResults(object):
+    """
+    Bootstrap distribution of the parameter estimates
+
+    Parameters
+    ----------
+    results : Results instance
+        Results of the estimated model.
+    bootstrap_params : ndarray
+        Parameter estimates of the replications, nrep x k_params.
+    method : str
+        Resampling scheme.
+
+    Attributes
+    ----------
+    params : ndarray
+        Parameter estimates of the original sample.
+    bootstrap_params : ndarray
+        Parameter estimates of the replications.
+    nrep : int
+        Number of replications.
+    nfailed : int
+        Number of replications for which the estimation failed.
+    """
+
+    def __init__(self, results, bootstrap_params, method):
+        self._results = results
+        self.params = np.asarray(results.params)
+        self.bootstrap_params = bootstrap_params
+        self.method = method
+        self.nrep = bootstrap_params.shape[0]
+        self.nfailed = int(np.isnan(bootstrap_params).any(1).sum())
+        self._use_pandas = hasattr(results.params, 'index')
+
+    def _wrap(self, values, columns=None):
+        if not self._use_pandas:
+            return values
+        import pandas as pd
+        index = self._results.params.index
+        if values.ndim == 1:
+            return pd.Series(values, index=index)
+        if columns is None:
+            columns = index
+        return pd.DataFrame(values, index=index, columns=columns)
+
+    @cache_readonly
+    def _valid_params(self):
+        bparams = self.bootstrap_params
+        return bparams[~np.isnan(bparams).any(1)]
+
+    @cache_readonly
+    def bse(self):
+        """Bootstrap standard errors of the parameter estimates"""
+        return self._wrap(self._valid_params.std(0, ddof=1))
+
+    def cov_params(self):
+        """Bootstrap covariance of the parameter estimates"""
+        cov = np.cov(self._valid_params, rowvar=False, ddof=1)
+        return self._wrap(np.atleast_2d(cov))
+
+    def conf_int(self, alpha=0.05, method='percentile'):
+        """
+        Bootstrap confidence intervals of the parameters
+
+        Parameters
+        ----------
+        alpha : float
+            The confidence level is 1 - alpha.
+        method : {'percentile', 'basic', 'normal'}
+            'percentile' uses the quantiles of the bootstrap distribution,
+            'basic' reflects them around the estimate and 'normal' uses the
+            normal distribution with the bootstrap standard errors.
+
+        Returns
+        -------
+        conf_int : ndarray
+            k_params x 2 array with the lower and upper bounds.
+        """
+        q = 100 * np.array([alpha / 2, 1 - alpha / 2])
+        if method == 'percentile':
+            ci = np.percentile(self._valid_params, q, axis=0).T
+        elif method == 'basic':
+            quantiles = np.percentile(self._valid_params, q, axis=0).T
+            ci = 2 * self.params[:, None] - quantiles[:, ::-1]
+        elif method == 'normal':
+            bse = np.asarray(self.bse)
+            crit = stats.norm.isf(alpha / 2)
+            ci = np.column_stack((self.params - crit * bse,
+                                  self.params + crit * bse))
+        else:
+            raise ValueError("method must be 'percentile', 'basic' or "
+                             "'normal'")
+        return self._wrap(ci, columns=[0, 1])
@@ -0,0 +1,141 @@
+"""
+Tests for the bootstrap of parameter estimates
+"""
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_allclose, assert_equal
+import pytest
+
+from statsmodels.discrete.discrete_model import Logit
+from statsmodels.genmod.generalized_linear_model import GLM
+from statsmodels.genmod import families
+from statsmodels.regression.linear_model import OLS, WLS
+from statsmodels.resampling.bootstrap import bootstrap, _draw_block
+from statsmodels.tools.tools import add_constant
+
+
+def _make_data(nobs=300, seed=987125):
+    np.random.seed(seed)
+    exog = add_constant(np.random.randn(nobs, 2))
+    endog = exog.sum(1) + np.random.randn(nobs) * (1 + np.abs(exog[:, 1]))
+    prob = 1 / (1 + np.exp(-exog.sum(1)))
+    endog_bin = (np.random.rand(nobs) < prob).astype(np.float64)
+    groups = np.repeat(np.arange(nobs // 5), 5)
+    return endog, endog_bin, exog, groups
+
+
+@pytest.mark.parametrize('method', ['pairs', 'residual', 'wild', 'cluster'])
+def test_linear_refit(method):
+    # the vectorized refits are the estimates of the resampled data
+    endog, _, exog, groups = _make_data()
+    weights = np.random.uniform(0.5, 2, size=len(endog))
+    res = WLS(endog, exog, weights=weights).fit()
+    bres = bootstrap(res, nrep=5, method=method, groups=groups, seed=5)
+    seed = np.random.RandomState(5).randint(0, 2**31 - 1, size=1)[0]
+    group_idx = groups if method in ('wild', 'cluster') else None
+    draws = _draw_block(seed, 5, method, len(endog), group_idx,
+                        groups.max() + 1, 'rademacher')
+    for i in range(5):
+        if method in ('pairs', 'cluster'):
+            idx = np.repeat(np.arange(len(endog)), draws[i].astype(int))
+            res1 = WLS(endog[idx], exog[idx], weights=weights[idx]).fit()
+        else:
+            resid = res.resid
+            if method == 'residual':
+                wresid = res.wresid - res.wresid.mean()
+                resid = wresid[draws[i].astype(int)] / np.sqrt(weights)
+            else:
+                resid = resid * draws[i]
+            res1 = WLS(res.fittedvalues + resid, exog, weights=weights).fit()
+        assert_allclose(bres.bootstrap_params[i], res1.params, rtol=1e-10)
+
+
+def test_linear_bse():
+    endog, _, exog, groups = _make_data(nobs=1000)
+    res = OLS(endog, exog).fit()
+    bres = bootstrap(res, nrep=999, method='residual', seed=1)
+    assert_allclose(bres.bse, res.bse, rtol=0.1)
+    res_hc = res.get_robustcov_results('HC0')
+    for method in ['pairs', 'wild']:
+        bres = bootstrap(res, nrep=999, method=method, seed=1)
+        assert_allclose(bres.bse, res_hc.bse, rtol=0.1)
+    bres = bootstrap(res, nrep=999, method='wild', weights='mammen', seed=1)
+    assert_allclose(bres.bse, res_hc.bse, rtol=0.1)
+
+
+@pytest.mark.parametrize('model', ['logit', 'glm'])
+def test_likelihood_models(model):
+    _, endog, exog, groups = _make_data()
+    if model == 'logit':
+        res = Logit(endog, exog).fit(disp=0)
+    else:
+        res = GLM(endog, exog, family=families.Binomial()).fit()
+
+    bres = bootstrap(res, nrep=3, method='pairs', seed=3)
+    seed = np.random.RandomState(3).randint(0, 2**31 - 1, size=1)[0]
+    draws = _draw_block(seed, 3, 'pairs', len(endog), None, 0, None)
+    idx = np.repeat(np.arange(len(endog)), draws[0].astype(int))
+    res1 = res.model.__class__(endog[idx], exog[idx],
+                               **res.model._get_init_kwds()).fit()
+    assert_allclose(bres.bootstrap_params[0], res1.params, rtol=1e-6)
+
+    bres = bootstrap(res, nrep=200, method='cluster', groups=groups, seed=3)
+    assert_equal(bres.bootstrap_params.shape, (200, 3))
+    assert_equal(bres.nfailed, 0)
+
+    bres = bootstrap(res, nrep=999, method='wild', seed=3)
+    cov = res.cov_params()
+    hinv = np.linalg.inv(-res.model.hessian(res.params))
+    score_obs = res.model.score_obs(res.params)
+    cov_robust = hinv.dot(score_obs.T.dot(score_obs)).dot(hinv)
+    assert_allclose(bres.bse, np.sqrt(np.diag(cov_robust)), rtol=0.1)
+    assert_allclose(bres.bse, np.sqrt(np.diag(cov)), rtol=0.15)
+
+    with pytest.raises(ValueError):
+        bootstrap(res, method='residual')
+
+
+def test_reproducible():
+    _, endog, exog, _ = _make_data()
+    res = Logit(endog, exog).fit(disp=0)
+    bres1 = bootstrap(res, nrep=20, seed=12)
+    bres2 = bootstrap(res, nrep=20, seed=np.random.RandomState(12))
+    assert_equal(bres1.bootstrap_params, bres2.bootstrap_params)
+    bres3 = bootstrap(res, nrep=20, seed=13)
+    assert np.any(bres1.bootstrap_params != bres3.bootstrap_params)
+
+
+def test_results():
+    endog, _, exog, groups = _make_data()
+    exog = pd.DataFrame(exog, columns=['const', 'a', 'b'])
+    res = OLS(endog, exog).fit()
+    bres = bootstrap(res, nrep=500, method='cluster', groups=groups, seed=0)
+    assert isinstance(bres.bse, pd.Series)
+    assert_equal(list(bres.bse.index), ['const', 'a', 'b'])
+    assert_allclose(bres.cov_params().values,
+                    np.cov(bres.bootstrap_params.T))
+    assert_allclose(np.sqrt(np.diag(bres.cov_params())), bres.bse)
+
+    params = bres.params
+    ci = bres.conf_int(alpha=0.1)
+    assert_allclose(ci.values,
+                    np.percentile(bres.bootstrap_params, [5, 95], axis=0).T)
+    ci_basic = bres.conf_int(alpha=0.1, method='basic')
+    assert_allclose(ci_basic.values, 2 * params[:, None] - ci.values[:, ::-1])
+    ci_normal = np.asarray(bres.conf_int(method='normal'))
+    assert_allclose(ci_normal.mean(1), params)
+    with pytest.raises(ValueError):
+        bres.conf_int(method='bca')
+
+
+def test_raises():
+    endog, _, exog, groups = _make_data()
+    res = OLS(endog, exog).fit()
+    with pytest.raises(ValueError):
+        bootstrap(res, method='jackknife')
+    with pytest.raises(ValueError):
+        bootstrap(res, method='cluster')
+    with pytest.raises(ValueError):
+        bootstrap(res, method='wild', weights='normal')
+    with pytest.raises(ValueError):
+        bootstrap(res, method='cluster', groups=groups[:-1])
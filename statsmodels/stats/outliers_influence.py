@@ -13,7 +13,8 @@ import numpy as np
 from statsmodels.regression.linear_model import OLS
 from statsmodels.tools.decorators import cache_readonly
 from statsmodels.stats.multitest import multipletests
-from statsmodels.tools.tools import maybe_unwrap_results
+from statsmodels.tools.tools import (maybe_unwrap_results, _cov_factor,
+                                     _hat_matrix_diag, _row_chunks)
 
 # outliers test convenience wrapper
 
@@ -192,17 +193,18 @@ class OLSInfluence(object):
 
     Notes
     -----
-    One part of the results can be calculated without any auxiliary regression
-    (some of which have the `_internal` postfix in the name. Other statistics
-    require leave-one-observation-out (LOOO) auxiliary regression, and will be
-    slower (mainly results with `_external` postfix in the name).
-    The auxiliary LOOO regression only the required results are stored.
-
-    Using the LOO measures is currently only recommended if the data set
-    is not too large. One possible approach for LOOO measures would be to
-    identify possible problem observations with the _internal measures, and
-    then run the leave-one-observation-out only with observations that are
-    possible outliers. (However, this is not yet available in an automized way.)
+    One part of the results can be calculated directly from the original
+    regression (some of which have the `_internal` postfix in the name. Other
+    statistics are based on the leave-one-observation-out (LOOO) regressions
+    (mainly results with `_external` postfix in the name).
+
+    The LOOO regressions are not estimated. Their parameters, error variance
+    and the determinant of their covariance are computed in closed form from
+    the diagonal of the hat matrix, the residuals and normalized_cov_params
+    of the original regression. The diagonal of the hat matrix is computed
+    in chunks of rows from a k x k factor of normalized_cov_params, the R
+    factor if the model was fit with method='qr'. Apart from the returned
+    arrays, memory does not grow with the number of observations.
 
     This should be extended to general least squares.
 
@@ -228,11 +230,12 @@ class OLSInfluence(object):
     def hat_matrix_diag(self):
         '''(cached attribute) diagonal of the hat_matrix for OLS
 
-        Notes
-        -----
-        temporarily calculated here, this should go to model class
+        computed in chunks of rows, without the nobs x nobs hat matrix
         '''
-        return (self.exog * self.results.model.pinv_wexog.T).sum(1)
+        model = self.results.model
+        factor = _cov_factor(self.results.normalized_cov_params,
+                             getattr(model, 'exog_R', None))
+        return _hat_matrix_diag(self.exog, factor)
 
     @cache_readonly
     def resid_press(self):
@@ -283,8 +286,6 @@ class OLSInfluence(object):
         '''(cached attribute) studentized residuals using LOOO variance
 
         this uses sigma from leave-one-out estimates
-
-        requires leave one out loop for observations
         '''
         sigma_looo = np.sqrt(self.sigma2_not_obsi)
         return self.get_resid_studentized_external(sigma=sigma_looo)
@@ -343,7 +344,7 @@ class OLSInfluence(object):
         '''(cached attribute) dffits measure for influence of an observation
 
         based on resid_studentized_external,
-        uses results from leave-one-observation-out loop
+        uses results from leave-one-observation-out regressions
 
         It is recommended that observations with dffits large than a
         threshold of 2 sqrt{k / n} where k is the number of parameters, should
@@ -371,38 +372,57 @@ class OLSInfluence(object):
     def dfbetas(self):
         '''(cached attribute) dfbetas
 
-        uses results from leave-one-observation-out loop
+        uses results from leave-one-observation-out regressions
         '''
-        dfbetas = self.results.params - self.params_not_obsi#[None,:]
-        dfbetas /= np.sqrt(self.sigma2_not_obsi[:,None])
-        dfbetas /=  np.sqrt(np.diag(self.results.normalized_cov_params))
+        cov = self.results.normalized_cov_params
+        _, press = self._resid_press_factor
+        # params - params_not_obsi
+        dfbetas = self.exog.dot(cov)
+        dfbetas *= (press / np.sqrt(self.sigma2_not_obsi))[:, None]
+        dfbetas /= np.sqrt(np.diag(cov))
         return dfbetas
 
+    @cache_readonly
+    def _resid_press_factor(self):
+        # resid / (1 - h), i.e. the PRESS residuals for OLS
+        resid = np.asarray(self.results.resid)
+        return resid, resid / (1 - self.hat_matrix_diag)
+
     @cache_readonly
     def sigma2_not_obsi(self):
         '''(cached attribute) error variance for all LOOO regressions
 
         This is 'mse_resid' from each auxiliary regression.
 
-        uses results from leave-one-observation-out loop
+        uses the closed form ::
+
+           (ssr - resid_i**2 / (1 - h_i)) / (df_resid - 1)
         '''
-        return np.asarray(self._res_looo['mse_resid'])
+        resid, press = self._resid_press_factor
+        ssr_not_obsi = np.dot(resid, resid) - resid * press
+        return ssr_not_obsi / (self.results.df_resid - 1)
 
     @cache_readonly
     def params_not_obsi(self):
         '''(cached attribute) parameter estimates for all LOOO regressions
 
-        uses results from leave-one-observation-out loop
+        uses the closed form ::
+
+           params - inv(exog'exog) x_i * resid_i / (1 - h_i)
         '''
-        return np.asarray(self._res_looo['params'])
+        _, press = self._resid_press_factor
+        cov = self.results.normalized_cov_params
+        return self.results.params - self.exog.dot(cov) * press[:, None]
 
     @cache_readonly
     def det_cov_params_not_obsi(self):
         '''(cached attribute) determinant of cov_params of all LOOO regressions
 
-        uses results from leave-one-observation-out loop
+        uses the closed form based on the matrix determinant lemma ::
+
+           det(cov_params) * (sigma2_not_obsi / mse_resid)**k / (1 - h_i)
         '''
-        return np.asarray(self._res_looo['det_cov_params'])
+        return self.cov_ratio * np.linalg.det(self.results.cov_params())
 
     @cache_readonly
     def cooks_distance(self):
@@ -428,14 +448,13 @@ class OLSInfluence(object):
         '''(cached attribute) covariance ratio between LOOO and original
 
         This uses determinant of the estimate of the parameter covariance
-        from leave-one-out estimates.
-        requires leave one out loop for observations
+        from leave-one-out estimates ::
+
+           (sigma2_not_obsi / mse_resid)**k / (1 - h_i)
 
         '''
-        #don't use inplace division / because then we change original
-        cov_ratio = (self.det_cov_params_not_obsi
-                            / np.linalg.det(self.results.cov_params()))
-        return cov_ratio
+        sigma2_ratio = self.sigma2_not_obsi / self.results.mse_resid
+        return sigma2_ratio**self.k_vars / (1 - self.hat_matrix_diag)
 
     @cache_readonly
     def resid_var(self):
@@ -542,37 +561,6 @@ class OLSInfluence(object):
 
         return res_loo
 
-    @cache_readonly
-    def _res_looo(self):
-        '''collect required results from the LOOO loop
-
-        all results will be attached.
-        currently only 'params', 'mse_resid', 'det_cov_params' are stored
-
-        regresses endog on exog dropping one observation at a time
-
-        this uses a nobs loop, only attributes of the OLS instance are stored.
-        '''
-        from statsmodels.sandbox.tools.cross_val import LeaveOneOut
-        get_det_cov_params = lambda res: np.linalg.det(res.cov_params())
-
-        endog = self.endog
-        exog = self.exog
-
-        params = np.zeros(exog.shape, dtype=np.float)
-        mse_resid = np.zeros(endog.shape, dtype=np.float)
-        det_cov_params = np.zeros(endog.shape, dtype=np.float)
-
-        cv_iter = LeaveOneOut(self.nobs)
-        for inidx, outidx in cv_iter:
-            res_i = self.model_class(endog[inidx], exog[inidx]).fit()
-            params[outidx] = res_i.params
-            mse_resid[outidx] = res_i.mse_resid
-            det_cov_params[outidx] = get_det_cov_params(res_i)
-
-        return dict(params=params, mse_resid=mse_resid,
-                       det_cov_params=det_cov_params)
-
     def summary_frame(self):
         """
         Creates a DataFrame with all available influence results.
@@ -606,21 +594,21 @@ class OLSInfluence(object):
         row_labels = data.row_labels
         beta_labels = ['dfb_' + i for i in data.xnames]
 
-        # grab the results
-        summary_data = DataFrame(dict(
-                            cooks_d = self.cooks_distance[0],
-                            standard_resid = self.resid_studentized_internal,
-                            hat_diag = self.hat_matrix_diag,
-                            dffits_internal = self.dffits_internal[0],
-                            student_resid = self.resid_studentized_external,
-                            dffits = self.dffits[0],
-                                        ),
-                            index = row_labels)
-        #NOTE: if we don't give columns, order of above will be arbitrary
-        dfbeta = DataFrame(self.dfbetas, columns=beta_labels,
-                            index=row_labels)
-
-        return dfbeta.join(summary_data)
+        # grab the results, a single array avoids copies for large nobs
+        columns = [('cooks_d', self.cooks_distance[0]),
+                   ('standard_resid', self.resid_studentized_internal),
+                   ('hat_diag', self.hat_matrix_diag),
+                   ('dffits_internal', self.dffits_internal[0]),
+                   ('student_resid', self.resid_studentized_external),
+                   ('dffits', self.dffits[0])]
+        k_vars = len(beta_labels)
+        values = np.empty((self.nobs, k_vars + len(columns)))
+        values[:, :k_vars] = self.dfbetas
+        for i, (_, col) in enumerate(columns):
+            values[:, k_vars + i] = col
+        labels = beta_labels + [name for name, _ in columns]
+
+        return DataFrame(values, columns=labels, index=row_labels)
 
     def summary_table(self, float_fmt="%6.3f"):
         '''create a summary table with all influence and outlier measures
@@ -678,6 +666,170 @@ class OLSInfluence(object):
                            html_fmt=fmt_html)
 
 
+class GLMInfluence(object):
+    '''class to calculate influence measures for GLM results
+
+    Parameters
+    ----------
+    results : GLMResults instance
+
+    Notes
+    -----
+    The measures are based on the weighted least squares problem of the last
+    IRLS iteration, with weights w evaluated at the estimated mean. The
+    leverage is the diagonal of the hat matrix of sqrt(w) * exog.
+
+    The leave-one-observation-out parameters are the one-step approximation
+    of Pregibon (1981), one IRLS step from the estimate without the
+    observation, and are not refit. Cook's distance and dfbetas use the
+    scale of the original estimate.
+
+    All measures are computed from inv(X'WX), where X'WX is accumulated
+    over chunks of rows. Apart from the returned arrays, memory does not
+    grow with the number of observations.
+
+    References
+    ----------
+    Pregibon, D. (1981). Logistic regression diagnostics. The Annals of
+    Statistics 9, 705-724.
+
+    Williams, D. A. (1987). Generalized linear model diagnostics using the
+    deviance and single case deletions. Applied Statistics 36, 181-191.
+    '''
+
+    def __init__(self, results):
+        self.results = maybe_unwrap_results(results)
+        model = self.results.model
+        self.nobs, self.k_vars = model.exog.shape
+        self.endog = model.endog
+        self.exog = model.exog
+        self.scale = self.results.scale
+
+    @cache_readonly
+    def _weights(self):
+        model = self.results.model
+        mu = self.results.mu
+        return model.iweights * model.n_trials * model.family.weights(mu)
+
+    @cache_readonly
+    def _cov(self):
+        # inv(X'WX) and its factor
+        exog = self.exog
+        weights = self._weights
+        xtwx = np.zeros((self.k_vars, self.k_vars))
+        for rows in _row_chunks(self.nobs, self.k_vars):
+            xtwx += np.dot(exog[rows].T * weights[rows], exog[rows])
+        cov = np.linalg.pinv(xtwx)
+        return cov, _cov_factor(cov)
+
+    @cache_readonly
+    def _resid_scaled(self):
+        # residuals of the weighted IRLS problem, sqrt(w) * working residual
+        model = self.results.model
+        mu = self.results.mu
+        resid_working = (model.endog - mu) * model.family.link.deriv(mu)
+        return np.sqrt(self._weights) * resid_working
+
+    @cache_readonly
+    def hat_matrix_diag(self):
+        '''(cached attribute) diagonal of the hat matrix of the IRLS problem
+        '''
+        _, factor = self._cov
+        return _hat_matrix_diag(self.exog, factor, weights=self._weights)
+
+    @cache_readonly
+    def resid_studentized_internal(self):
+        '''(cached attribute) studentized Pearson residuals
+
+        resid_pearson / sqrt(scale * (1 - hii))
+        '''
+        hii = self.hat_matrix_diag
+        return self._resid_scaled / np.sqrt(self.scale * (1 - hii))
+
+    @cache_readonly
+    def params_not_obsi(self):
+        '''(cached attribute) one-step parameter estimates without obs i
+
+        The one-step approximation is ::
+
+           params - inv(X'WX) x_i w_i resid_working_i / (1 - h_i)
+        '''
+        cov, _ = self._cov
+        factor = np.sqrt(self._weights) * self._resid_scaled
+        factor /= 1 - self.hat_matrix_diag
+        return self.results.params - self.exog.dot(cov) * factor[:, None]
+
+    @cache_readonly
+    def dfbetas(self):
+        '''(cached attribute) dfbetas
+
+        change in the parameters from the one-step leave-one-observation-out
+        estimates scaled by the standard errors of the original estimate
+        '''
+        cov, _ = self._cov
+        bse = np.sqrt(self.scale * np.diag(cov))
+        return (self.results.params - self.params_not_obsi) / bse
+
+    @cache_readonly
+    def cooks_distance(self):
+        '''(cached attribute) Cooks distance
+
+        one-step approximation ::
+
+           resid_studentized_internal**2 / k * h / (1 - h)
+
+        Returns the distance and the p-value of the F distribution
+        '''
+        hii = self.hat_matrix_diag
+        cooks_d2 = self.resid_studentized_internal**2 / self.k_vars
+        cooks_d2 *= hii / (1 - hii)
+
+        from scipy import stats
+        pvals = stats.f.sf(cooks_d2, self.k_vars, self.results.df_resid)
+
+        return cooks_d2, pvals
+
+    @cache_readonly
+    def dffits_internal(self):
+        '''(cached attribute) dffits measure for influence of an observation
+
+        based on resid_studentized_internal
+        '''
+        hii = self.hat_matrix_diag
+        dffits_ = self.resid_studentized_internal * np.sqrt(hii / (1 - hii))
+        dffits_threshold = 2 * np.sqrt(self.k_vars * 1. / self.nobs)
+        return dffits_, dffits_threshold
+
+    def summary_frame(self):
+        """
+        Creates a DataFrame with all available influence results.
+
+        Returns
+        -------
+        frame : DataFrame
+            A DataFrame with the dfbetas and cooks_d, standard_resid,
+            hat_diag and dffits_internal.
+        """
+        from pandas import DataFrame
+
+        data = self.results.model.data
+        row_labels = data.row_labels
+        beta_labels = ['dfb_' + i for i in data.xnames]
+
+        columns = [('cooks_d', self.cooks_distance[0]),
+                   ('standard_resid', self.resid_studentized_internal),
+                   ('hat_diag', self.hat_matrix_diag),
+                   ('dffits_internal', self.dffits_internal[0])]
+        k_vars = len(beta_labels)
+        values = np.empty((self.nobs, k_vars + len(columns)))
+        values[:, :k_vars] = self.dfbetas
+        for i, (_, col) in enumerate(columns):
+            values[:, k_vars + i] = col
+        labels = beta_labels + [name for name, _ in columns]
+
+        return DataFrame(values, columns=labels, index=row_labels)
+
+
 def summary_table(res, alpha=0.05):
     """
     Generate summary table of outlier and influence similar to SAS
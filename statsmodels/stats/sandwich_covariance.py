@@ -101,15 +101,20 @@ for inference with clustered errors,” The Review of Economics and
 Statistics 90, no. 3 (2008): 414–427.
 
 """
+from itertools import combinations
+from multiprocessing.pool import ThreadPool
+
 from statsmodels.compat.python import range
 import pandas as pd
 import numpy as np
+from scipy import sparse
 
-from statsmodels.tools.grouputils import Group
 from statsmodels.stats.moment_helpers import se_cov
+from statsmodels.tools.tools import (_cov_factor, _hat_matrix_diag,
+                                     _row_chunks)
 
-__all__ = ['cov_cluster', 'cov_cluster_2groups', 'cov_hac', 'cov_nw_panel',
-           'cov_white_simple',
+__all__ = ['cov_cluster', 'cov_cluster_2groups', 'cov_cluster_multiway',
+           'cov_hac', 'cov_nw_panel', 'cov_white_simple',
            'cov_hc0', 'cov_hc1', 'cov_hc2', 'cov_hc3',
            'se_cov', 'weights_bartlett', 'weights_uniform']
 
@@ -167,8 +172,13 @@ def _HCCM(results, scale):
     where pinv(x) = (X'X)^(-1) X
     and scale is (nobs,)
     '''
-    H = np.dot(results.model.pinv_wexog,
-        scale[:,None]*results.model.pinv_wexog.T)
+    wexog = results.model.wexog
+    k = wexog.shape[1]
+    meat = np.zeros((k, k))
+    for rows in _row_chunks(wexog.shape[0], k):
+        meat += np.dot(wexog[rows].T * scale[rows], wexog[rows])
+    cov = results.normalized_cov_params
+    H = np.dot(cov, np.dot(meat, cov))
     return H
 
 def cov_hc0(results):
@@ -195,10 +205,8 @@ def cov_hc2(results):
     See statsmodels.RegressionResults
     """
 
-    # probably could be optimized
-    h = np.diag(np.dot(results.model.exog,
-                          np.dot(results.normalized_cov_params,
-                          results.model.exog.T)))
+    h = _hat_matrix_diag(results.model.exog,
+                         _cov_factor(results.normalized_cov_params))
     het_scale = results.resid**2/(1-h)
     cov_hc2_ = _HCCM(results, het_scale)
     return cov_hc2_
@@ -208,10 +216,8 @@ def cov_hc3(results):
     See statsmodels.RegressionResults
     """
 
-    # above probably could be optimized to only calc the diag
-    h = np.diag(np.dot(results.model.exog,
-                          np.dot(results.normalized_cov_params,
-                          results.model.exog.T)))
+    h = _hat_matrix_diag(results.model.exog,
+                         _cov_factor(results.normalized_cov_params))
     het_scale=(results.resid/(1-h))**2
     cov_hc3_ = _HCCM(results, het_scale)
     return cov_hc3_
@@ -240,7 +246,10 @@ def _get_sandwich_arrays(results, cov_type=''):
             hessian_inv = np.linalg.inv(results.model.hessian(results.params))
         elif hasattr(results.model, 'score_obs'):
             xu = results.model.score_obs(results.params)
-            hessian_inv = np.linalg.inv(results.model.hessian(results.params))
+            hessian = results.model.hessian(results.params)
+            if sparse.issparse(hessian):
+                hessian = hessian.toarray()
+            hessian_inv = np.linalg.inv(hessian)
         else:
             xu = results.model.wexog * results.wresid[:, None]
 
@@ -261,6 +270,34 @@ def _get_sandwich_arrays(results, cov_type=''):
     return xu, hessian_inv
 
 
+def _get_sandwich_factors(results):
+    """Helper function to get the factors of the scores from results
+
+    This is the same as `_get_sandwich_arrays` with cov_type 'clu', except
+    that for linear regression models the product of wexog and wresid is not
+    formed. The scores are then given by ``x * u[:, None]``.
+
+    Returns
+    -------
+    x : ndarray or sparse matrix
+        Either the scores or wexog.
+    u : ndarray or None
+        Whitened residuals, or None if x already contains the scores.
+    hessian_inv : ndarray
+        The inverse hessian or normalized_cov_params.
+    """
+    if hasattr(results, 'model'):
+        if hasattr(results, '_results'):
+            results = results._results
+        model = results.model
+        if not (hasattr(model, 'jac') or hasattr(model, 'score_obs')):
+            return (model.wexog, np.asarray(results.wresid),
+                    np.asarray(results.normalized_cov_params))
+
+    xu, hessian_inv = _get_sandwich_arrays(results, cov_type='clu')
+    return xu, None, hessian_inv
+
+
 def _HCCM1(results, scale):
     '''
     sandwich with pinv(x) * scale * pinv(x).T
@@ -423,6 +460,9 @@ def S_white_simple(x):
     this is just dot(X.T, X)
 
     '''
+    if sparse.issparse(x):
+        # scores of models with a sparse exog
+        return x.T.dot(x).toarray()
     if x.ndim == 1:
         x = x[:,None]
 
@@ -518,7 +558,177 @@ def cov_crosssection_0(results, group):
     cov = _HCCM1(results, scale)
     return cov
 
-def cov_cluster(results, group, use_correction=True):
+def _chunk_slices(nobs, chunksize):
+    """slices for consecutive chunks of rows"""
+    return [slice(i, min(i + chunksize, nobs))
+            for i in range(0, nobs, chunksize)]
+
+
+def _get_chunksize(nobs, k_vars, chunksize=None, n_jobs=1):
+    """default number of rows per chunk
+
+    The default limits the temporary score arrays to about 2**22 elements
+    and provides at least one chunk for each thread.
+    """
+    if chunksize is None:
+        chunksize = max(2**22 // max(k_vars, 1), 1)
+        if n_jobs > 1:
+            chunksize = min(chunksize, -(-nobs // n_jobs))
+    return max(int(chunksize), 1)
+
+
+def _group_codes(group):
+    """integer codes in range(n_groups) and the number of groups"""
+    codes, uniques = pd.factorize(np.asarray(group).ravel())
+    if (codes < 0).any():
+        raise ValueError('groups cannot contain missing values')
+    return codes, len(uniques)
+
+
+def _combine_codes(codes_list):
+    """integer codes of the intersection of several groupings"""
+    codes, n_groups = codes_list[0]
+    for codes1, n_groups1 in codes_list[1:]:
+        codes, n_groups = _group_codes(codes * np.int64(n_groups1) + codes1)
+    return codes, n_groups
+
+
+def _cluster_sums_chunk(x, u, codes_list, sl, sums):
+    """add the score sums within clusters of one chunk of observations
+
+    The work is proportional to the number of observations in the chunk and
+    does not depend on the number of groups.
+    """
+    xu = x[sl]
+    if sparse.issparse(xu):
+        xu = xu.toarray()
+    if u is not None:
+        xu = xu * u[sl, None]
+    nobs_chunk = xu.shape[0]
+    for (codes, n_groups), s in zip(codes_list, sums):
+        codes = codes[sl]
+        low, high = codes.min(), codes.max()
+        if high - low < nobs_chunk:
+            # range of the codes in the chunk, e.g. sorted groups
+            rows = slice(low, high + 1)
+            local = codes - low
+        else:
+            rows, local = np.unique(codes, return_inverse=True)
+        for j in range(xu.shape[1]):
+            s[rows, j] += np.bincount(local, weights=xu[:, j])
+
+
+def cluster_score_sums(x, codes_list, u=None, chunksize=None, n_jobs=1):
+    """sum scores within clusters for several groupings in a single pass
+
+    The scores of each chunk of observations are added to the sums of the
+    groups that occur in the chunk. Chunks can be processed in several
+    threads, each of which accumulates into its own array of sums.
+
+    Parameters
+    ----------
+    x : ndarray or sparse matrix, (nobs, k_vars)
+        score contributions, or explanatory variables if u is given
+    codes_list : list of tuples
+        Each tuple contains an integer array of group codes in
+        range(n_groups) and n_groups.
+    u : None or ndarray, (nobs,)
+        If not None, then the scores are ``x * u[:, None]``. They are only
+        computed for one chunk of observations at a time.
+    chunksize : None or int
+        Number of observations that are processed at once. The default
+        limits the temporary arrays to about 2**22 elements.
+    n_jobs : int
+        Number of threads used to process the chunks. If -1, then the number
+        of CPUs is used.
+
+    Returns
+    -------
+    sums : list of ndarrays
+        The (n_groups, k_vars) cluster sums of the scores for each grouping
+        in `codes_list`.
+    """
+    nobs, k_vars = x.shape
+    if n_jobs == -1:
+        import multiprocessing
+        n_jobs = multiprocessing.cpu_count()
+    chunksize = _get_chunksize(nobs, k_vars, chunksize, n_jobs)
+    slices = _chunk_slices(nobs, chunksize)
+
+    def func(slices):
+        sums = [np.zeros((n_groups, k_vars)) for _, n_groups in codes_list]
+        for sl in slices:
+            _cluster_sums_chunk(x, u, codes_list, sl, sums)
+        return sums
+
+    if n_jobs > 1 and len(slices) > 1:
+        n_threads = min(n_jobs, len(slices))
+        pool = ThreadPool(n_threads)
+        try:
+            thread_sums = pool.map(func, [slices[i::n_threads]
+                                          for i in range(n_threads)])
+        finally:
+            pool.close()
+            pool.join()
+        sums = thread_sums[0]
+        for sums_thread in thread_sums[1:]:
+            for s, s_thread in zip(sums, sums_thread):
+                s += s_thread
+    else:
+        sums = func(slices)
+    return sums
+
+
+def _groups_list(groups):
+    """split groups into a list of 1-dim group indicators"""
+    if isinstance(groups, (list, tuple)):
+        return [np.asarray(g) for g in groups]
+    if isinstance(groups, pd.DataFrame):
+        return [np.asarray(groups[col]) for col in groups.columns]
+    groups = np.asarray(groups)
+    if groups.ndim == 1:
+        return [groups]
+    if groups.ndim != 2:
+        raise ValueError('groups needs to be 1 or 2 dimensional')
+    return [groups[:, i] for i in range(groups.shape[1])]
+
+
+def _cov_cluster_subsets(results, groups, use_correction=True,
+                         chunksize=None, n_jobs=1):
+    """cluster robust covariance for all intersections of the groupings
+
+    Returns a dictionary that maps tuples of grouping indices to the cluster
+    robust covariance for the clusters formed by the intersection of those
+    groupings, and a list with the number of groups for each grouping.
+    """
+    x, u, hessian_inv = _get_sandwich_factors(results)
+    nobs, k_params = x.shape
+    groups = _groups_list(groups)
+    for g in groups:
+        if len(g) != nobs:
+            raise ValueError('groups and scores need to have the same '
+                             'number of observations')
+    codes = [_group_codes(g) for g in groups]
+    subsets = [subset for r in range(1, len(codes) + 1)
+               for subset in combinations(range(len(codes)), r)]
+    codes_list = [_combine_codes([codes[i] for i in subset])
+                  for subset in subsets]
+    sums = cluster_score_sums(x, codes_list, u=u, chunksize=chunksize,
+                              n_jobs=n_jobs)
+
+    covs = {}
+    for subset, (_, n_groups), s in zip(subsets, codes_list, sums):
+        scale = np.dot(s.T, s)
+        cov_c = _HCCM2(hessian_inv, scale)
+        if use_correction:
+            cov_c *= (n_groups / (n_groups - 1.) *
+                      ((nobs - 1.) / float(nobs - k_params)))
+        covs[subset] = cov_c
+    return covs, [n_groups for _, n_groups in codes]
+
+
+def cov_cluster(results, group, use_correction=True, chunksize=None,
+                n_jobs=1):
     '''cluster robust covariance matrix
 
     Calculates sandwich covariance matrix for a single cluster, i.e. grouped
@@ -531,6 +741,12 @@ def cov_cluster(results, group, use_correction=True):
        TODO: this should use wexog instead
     use_correction : bool
        If true (default), then the small sample correction factor is used.
+    chunksize : None or int
+        Number of observations for which the scores are computed and summed
+        at once. The default limits the temporary arrays to about 2**22
+        elements.
+    n_jobs : int
+        Number of threads used to process the chunks of observations.
 
     Returns
     -------
@@ -541,29 +757,19 @@ def cov_cluster(results, group, use_correction=True):
     -----
     same result as Stata in UCLA example and same as Peterson
 
-    '''
-    #TODO: currently used version of groupsums requires 2d resid
-    xu, hessian_inv = _get_sandwich_arrays(results, cov_type='clu')
-
-    if not hasattr(group, 'dtype') or group.dtype != np.dtype('int'):
-        clusters, group = np.unique(group, return_inverse=True)
-    else:
-        clusters = np.unique(group)
-
-    scale = S_crosssection(xu, group)
-
-    nobs, k_params = xu.shape
-    n_groups = len(clusters) #replace with stored group attributes if available
+    The cluster sums of the scores are accumulated in a single pass over
+    chunks of the data, see `cluster_score_sums`. For linear regression
+    models the scores are only formed for one chunk at a time.
 
-    cov_c = _HCCM2(hessian_inv, scale)
-
-    if use_correction:
-        cov_c *= (n_groups / (n_groups - 1.) *
-                  ((nobs-1.) / float(nobs - k_params)))
+    '''
+    covs, _ = _cov_cluster_subsets(results, [group],
+                                   use_correction=use_correction,
+                                   chunksize=chunksize, n_jobs=n_jobs)
+    return covs[(0,)]
 
-    return cov_c
 
-def cov_cluster_2groups(results, group, group2=None, use_correction=True):
+def cov_cluster_2groups(results, group, group2=None, use_correction=True,
+                        chunksize=None, n_jobs=1):
     '''cluster robust covariance matrix for two groups/clusters
 
     Parameters
@@ -573,6 +779,11 @@ def cov_cluster_2groups(results, group, group2=None, use_correction=True):
        TODO: this should use wexog instead
     use_correction : bool
        If true (default), then the small sample correction factor is used.
+    chunksize : None or int
+        Number of observations for which the scores are computed and summed
+        at once.
+    n_jobs : int
+        Number of threads used to process the chunks of observations.
 
     Returns
     -------
@@ -601,18 +812,14 @@ def cov_cluster_2groups(results, group, group2=None, use_correction=True):
     else:
         group0 = group
         group1 = group2
-        group = (group0, group1)
-
-
-    cov0 = cov_cluster(results, group0, use_correction=use_correction)
-    #[0] because we get still also returns bse
-    cov1 = cov_cluster(results, group1, use_correction=use_correction)
 
-    group_intersection = Group(group)
+    covs, _ = _cov_cluster_subsets(results, [group0, group1],
+                                   use_correction=use_correction,
+                                   chunksize=chunksize, n_jobs=n_jobs)
+    cov0 = covs[(0,)]
+    cov1 = covs[(1,)]
     #cov of cluster formed by intersection of two groups
-    cov01 = cov_cluster(results,
-                        group_intersection.group_int,
-                        use_correction=use_correction)
+    cov01 = covs[(0, 1)]
 
     #robust cov matrix for union of groups
     cov_both = cov0 + cov1 - cov01
@@ -621,6 +828,54 @@ def cov_cluster_2groups(results, group, group2=None, use_correction=True):
     return cov_both, cov0, cov1
 
 
+def cov_cluster_multiway(results, groups, use_correction=True,
+                         chunksize=None, n_jobs=1):
+    '''cluster robust covariance matrix for several groups/clusters
+
+    Parameters
+    ----------
+    results : result instance
+       result of a regression, uses results.model.exog and results.resid
+    groups : array_like
+        Two dimensional array or DataFrame with one column for each cluster
+        dimension, or a list of one dimensional group indicators.
+    use_correction : bool
+       If true (default), then the small sample correction factor is used
+       for each of the cluster robust covariance matrices that are combined.
+    chunksize : None or int
+        Number of observations for which the scores are computed and summed
+        at once.
+    n_jobs : int
+        Number of threads used to process the chunks of observations.
+
+    Returns
+    -------
+    cov : ndarray, (k_vars, k_vars)
+        cluster robust covariance matrix for parameter estimates
+
+    Notes
+    -----
+    The covariance is the sum over all non-empty subsets of the cluster
+    dimensions of the one-way cluster robust covariance for the
+    intersection of the clusters in the subset, with alternating signs,
+    see [4]. With two cluster dimensions this is the same as
+    `cov_cluster_2groups`.
+
+    The cluster sums for all intersections are accumulated in a single pass
+    over chunks of the scores.
+    '''
+    covs, _ = _cov_cluster_subsets(results, groups,
+                                   use_correction=use_correction,
+                                   chunksize=chunksize, n_jobs=n_jobs)
+    cov = 0
+    for subset, cov_s in covs.items():
+        if len(subset) % 2 == 1:
+            cov = cov + cov_s
+        else:
+            cov = cov - cov_s
+    return cov
+
+
 def cov_white_simple(results, use_correction=True):
     '''
     heteroscedasticity robust covariance matrix (White)
@@ -715,38 +970,52 @@ cov_hac = cov_hac_simple   #alias for users
 #I think this is pure within group HAC: apply HAC to each group member
 #separately
 
+def _lagged_index(lag, groupidx):
+    '''row index of the observations that have a lag within their group'''
+    groupidx = np.asarray(groupidx, dtype=np.int64).reshape(-1, 2)
+    start = groupidx[:, 0] + lag
+    end = groupidx[:, 1]
+    mask = start < end  # group is longer than lag
+    start, end = start[mask], end[mask]
+    lengths = end - start
+    offsets = np.cumsum(lengths) - lengths
+    return (np.arange(lengths.sum()) +
+            np.repeat(start - offsets, lengths))
+
+
 def lagged_groups(x, lag, groupidx):
     '''
     assumes sorted by time, groupidx is tuple of start and end values
-    not optimized, just to get a working version, loop over groups
     '''
-    out0 = []
-    out_lagged = []
-    for l,u in groupidx:
-        if l+lag < u: #group is longer than lag
-            out0.append(x[l+lag:u])
-            out_lagged.append(x[l:u-lag])
-
-    if out0 == []:
+    idx = _lagged_index(lag, groupidx)
+    if len(idx) == 0:
         raise ValueError('all groups are empty taking lags')
-    #return out0, out_lagged
-    return np.vstack(out0), np.vstack(out_lagged)
+    return x[idx], x[idx - lag]
 
 
 
-def S_nw_panel(xw, weights, groupidx):
+def S_nw_panel(xw, weights, groupidx, chunksize=None):
     '''inner covariance matrix for HAC for panel data
 
     no denominator nobs used
 
     no reference for this, just accounting for time indices
+
+    The lagged cross products are accumulated over chunks of observations
+    so that the lagged arrays are never copied in full.
     '''
     nlags = len(weights)-1
+    chunksize = _get_chunksize(xw.shape[0], xw.shape[1], chunksize)
 
     S = weights[0] * np.dot(xw.T, xw)  #weights just for completeness
     for lag in range(1, nlags+1):
-        xw0, xwlag = lagged_groups(xw, lag, groupidx)
-        s = np.dot(xw0.T, xwlag)
+        idx = _lagged_index(lag, groupidx)
+        if len(idx) == 0:
+            raise ValueError('all groups are empty taking lags')
+        s = 0
+        for sl in _chunk_slices(len(idx), chunksize):
+            idx_chunk = idx[sl]
+            s = s + np.dot(xw[idx_chunk].T, xw[idx_chunk - lag])
         S += weights[lag] * (s + s.T)
     return S
 
@@ -822,6 +822,95 @@ def test_influence_wrapped():
     assert_almost_equal(infl.cov_ratio, infl_r2[:,4], decimal=14)
 
 
+def test_influence_closed_form():
+    # leave-one-observation-out measures against explicit refits
+    np.random.seed(9876)
+    nobs = 50
+    exog = add_constant(np.random.randn(nobs, 2))
+    endog = exog.sum(1) + np.random.randn(nobs)
+    res = OLS(endog, exog).fit()
+    infl = res.get_influence()
+
+    params = np.empty((nobs, 3))
+    mse_resid = np.empty(nobs)
+    det_cov = np.empty(nobs)
+    for i in range(nobs):
+        mask = np.arange(nobs) != i
+        res_i = OLS(endog[mask], exog[mask]).fit()
+        params[i] = res_i.params
+        mse_resid[i] = res_i.mse_resid
+        det_cov[i] = np.linalg.det(res_i.cov_params())
+
+    assert_allclose(infl.params_not_obsi, params, rtol=1e-10)
+    assert_allclose(infl.sigma2_not_obsi, mse_resid, rtol=1e-10)
+    assert_allclose(infl.det_cov_params_not_obsi, det_cov, rtol=1e-10)
+    assert_allclose(infl.cov_ratio,
+                    det_cov / np.linalg.det(res.cov_params()), rtol=1e-10)
+
+
+def test_influence_qr():
+    # same results without pinv_wexog
+    np.random.seed(9876)
+    nobs = 50
+    exog = add_constant(np.random.randn(nobs, 2))
+    endog = exog.sum(1) + np.random.randn(nobs)
+    res = OLS(endog, exog).fit()
+    res_qr = OLS(endog, exog).fit(method='qr')
+    assert_(not hasattr(res_qr.model, 'pinv_wexog'))
+    frame = res.get_influence().summary_frame()
+    frame_qr = res_qr.get_influence().summary_frame()
+    assert_allclose(frame_qr.values, frame.values, rtol=1e-8)
+    for cov_type in ['HC0', 'HC2', 'HC3']:
+        assert_allclose(res_qr.get_robustcov_results(cov_type).bse,
+                        res.get_robustcov_results(cov_type).bse, rtol=1e-8)
+    hat = np.diag(exog.dot(np.linalg.pinv(exog)))
+    assert_allclose(res_qr.get_influence().hat_matrix_diag, hat, rtol=1e-10)
+
+
+def test_glm_influence():
+    from statsmodels.genmod.generalized_linear_model import GLM
+    from statsmodels.genmod import families
+
+    np.random.seed(9876)
+    nobs = 100
+    exog = add_constant(np.random.randn(nobs, 2))
+    endog = exog.sum(1) + np.random.randn(nobs)
+
+    # Gaussian GLM is identical to OLS
+    infl = GLM(endog, exog).fit().get_influence()
+    infl_ols = OLS(endog, exog).fit().get_influence()
+    for attr in ['hat_matrix_diag', 'resid_studentized_internal',
+                 'params_not_obsi']:
+        assert_allclose(getattr(infl, attr), getattr(infl_ols, attr),
+                        rtol=1e-10, atol=1e-12)
+    assert_allclose(infl.cooks_distance[0], infl_ols.cooks_distance[0],
+                    rtol=1e-10)
+    assert_allclose(infl.dffits_internal[0], infl_ols.dffits_internal[0],
+                    rtol=1e-10)
+
+    # one-step approximation for Poisson
+    endog = np.random.poisson(np.exp(0.3 * exog.sum(1)))
+    model = GLM(endog, exog, family=families.Poisson())
+    res = model.fit()
+    infl = res.get_influence()
+    params = np.array([GLM(np.delete(endog, i), np.delete(exog, i, 0),
+                           family=families.Poisson()).fit().params
+                       for i in range(nobs)])
+    change = params - res.params
+    change1 = infl.params_not_obsi - res.params
+    assert_allclose(change1, change, atol=0.1 * np.abs(change).max())
+
+    # leverage of a Poisson GLM
+    w = res.mu
+    xw = exog * np.sqrt(w)[:, None]
+    hat = (xw.dot(np.linalg.inv(xw.T.dot(xw))) * xw).sum(1)
+    assert_allclose(infl.hat_matrix_diag, hat, rtol=1e-10)
+    assert_allclose(infl.dfbetas, -change1 / res.bse, rtol=1e-8)
+
+    frame = infl.summary_frame()
+    assert_equal(frame.shape, (nobs, 7))
+
+
 def test_influence_dtype():
     # see #2148  bug when endog is integer
     y = np.ones(20)
@@ -10,7 +10,8 @@ Created on Sat Dec 17 08:39:16 2011
 Author: Josef Perktold
 """
 import numpy as np
-from numpy.testing import assert_almost_equal
+from numpy.testing import (assert_almost_equal, assert_allclose,
+                           assert_equal)
 
 from statsmodels.regression.linear_model import OLS, GLSAR
 from statsmodels.tools.tools import add_constant
@@ -89,6 +90,98 @@ def test_hac_simple():
     cov4 = sw.cov_hac_simple(res_olsg, nlags=4, use_correction=False)
     assert_almost_equal(cov3, cov4, decimal=14)
 
+
+def test_cov_cluster_multiway():
+    np.random.seed(987125)
+    nobs = 1000
+    groups = np.column_stack((np.random.randint(0, 40, size=nobs),
+                              np.random.randint(0, 15, size=nobs),
+                              np.random.randint(0, 5, size=nobs)))
+    exog = add_constant(np.random.randn(nobs, 2))
+    endog = (exog.sum(1) + np.random.randn(40)[groups[:, 0]] +
+             np.random.randn(15)[groups[:, 1]] + np.random.randn(nobs))
+    res = OLS(endog, exog).fit()
+
+    # chunked and threaded version agrees with a single chunk
+    cov_1 = sw.cov_cluster(res, groups[:, 0])
+    for chunksize, n_jobs in [(None, 1), (64, 1), (64, 4), (999, -1)]:
+        cov = sw.cov_cluster(res, groups[:, 0], chunksize=chunksize,
+                             n_jobs=n_jobs)
+        assert_allclose(cov, cov_1, rtol=1e-12)
+
+    # string labels and scores from a tuple of jac and hessian_inv
+    labels = np.array(['a%d' % g for g in groups[:, 0]], dtype=object)
+    assert_allclose(sw.cov_cluster(res, labels), cov_1, rtol=1e-12)
+    xu = res.model.wexog * res.wresid[:, None]
+    cov = sw.cov_cluster((xu, res.normalized_cov_params), groups[:, 0])
+    assert_allclose(cov, cov_1, rtol=1e-12)
+
+    # three-way clustering by inclusion-exclusion of intersections
+    def intersect(*cols):
+        return np.unique(groups[:, list(cols)], axis=0,
+                         return_inverse=True)[1]
+
+    c = lambda g: sw.cov_cluster(res, g)
+    cov_3 = (c(groups[:, 0]) + c(groups[:, 1]) + c(groups[:, 2]) -
+             c(intersect(0, 1)) - c(intersect(0, 2)) - c(intersect(1, 2)) +
+             c(intersect(0, 1, 2)))
+    cov = sw.cov_cluster_multiway(res, groups, chunksize=100, n_jobs=2)
+    assert_allclose(cov, cov_3, rtol=1e-12)
+
+    cov_2 = sw.cov_cluster_2groups(res, groups[:, :2])[0]
+    assert_allclose(sw.cov_cluster_multiway(res, groups[:, :2]), cov_2,
+                    rtol=1e-12)
+
+    res3 = OLS(endog, exog).fit(cov_type='cluster',
+                                cov_kwds={'groups': groups, 'n_jobs': 2})
+    assert_allclose(res3.cov_params(), cov_3, rtol=1e-12)
+    assert_equal(res3.n_groups, (40, 15, 5))
+    assert_equal(res3.df_resid_inference, 4)
+
+
+def test_cluster_score_sums_chunk_work(monkeypatch):
+    # the work for a chunk is proportional to its length, not to the number
+    # of groups, the temporary group sums of a chunk are at most chunksize
+    np.random.seed(987125)
+    nobs, n_groups, chunksize = 2000, 100000, 64
+    x = np.random.randn(nobs, 2)
+    codes = sw._group_codes(np.random.randint(0, n_groups, size=nobs))
+    sums_1 = np.zeros((codes[1], 2))
+    np.add.at(sums_1, codes[0], x)
+
+    bincount = np.bincount
+    lengths = []
+
+    def bincount_record(*args, **kwds):
+        out = bincount(*args, **kwds)
+        lengths.append(len(out))
+        return out
+
+    monkeypatch.setattr(np, 'bincount', bincount_record)
+    for n_jobs in [1, 3]:
+        sums = sw.cluster_score_sums(x, [codes], chunksize=chunksize,
+                                     n_jobs=n_jobs)[0]
+        assert_allclose(sums, sums_1, rtol=1e-12)
+    assert len(lengths) > 0
+    assert max(lengths) <= chunksize
+
+
+def test_s_nw_panel_chunked():
+    np.random.seed(987125)
+    x = np.random.randn(200, 3)
+    groupidx = [(0, 3), (3, 60), (60, 61), (61, 200)]
+    weights = sw.weights_bartlett(4)
+    # reference with explicit loop over groups
+    s_ref = weights[0] * np.dot(x.T, x)
+    for lag in range(1, 5):
+        s = sum(np.dot(x[lo + lag:up].T, x[lo:up - lag])
+                for lo, up in groupidx if lo + lag < up)
+        s_ref += weights[lag] * (s + s.T)
+    for chunksize in [None, 7]:
+        s = sw.S_nw_panel(x, weights, groupidx, chunksize=chunksize)
+        assert_allclose(s, s_ref, rtol=1e-12)
+
+
 if __name__ == '__main__':
     import pytest
     pytest.main([__file__, '-vvs', '-x', '--pdb'])
@@ -176,7 +176,7 @@ def dummy_sparse(groups):
 
     indptr = np.arange(len(groups)+1)
     data = np.ones(len(groups), dtype=np.int8)
-    indi = sparse.csr_matrix((data, g, indptr))
+    indi = sparse.csr_matrix((data, groups, indptr))
 
     return indi
 
@@ -366,7 +366,9 @@ class Grouping(object):
     @property
     def labels(self):
         # this was index_int, but that's not a very good name...
-        if hasattr(self.index, 'labels'):
+        if hasattr(self.index, 'codes'):
+            return self.index.codes
+        elif hasattr(self.index, 'labels'):
             return self.index.labels
         else:  # pandas version issue here
             # Compat code for the labels -> codes change in pandas 0.15
@@ -410,6 +412,88 @@ class Grouping(object):
         else:
             self.slices = [self.index.get_loc(x) for x in groups]
 
+    def demean(self, x, weights=None, maxiter=1000, tol=1e-10):
+        """
+        Remove the group means of all index levels from x
+
+        The means of several grouping variables are removed by alternating
+        projections, i.e. by repeatedly subtracting the (weighted) group
+        means of each level in turn until the changes are below `tol`.
+        For a single level this is the usual within transformation.
+
+        Parameters
+        ----------
+        x : ndarray, 1d (nobs,) or 2d (nobs, k)
+            Data that is demeaned, each column separately.
+        weights : ndarray, 1d (nobs,), optional
+            Weights for the group means.
+        maxiter : int
+            Maximum number of sweeps over all levels.
+        tol : float
+            Convergence tolerance for the maximum absolute change in a
+            sweep, relative to the scale of the column.
+
+        Returns
+        -------
+        x_demeaned : ndarray
+            x with the group means projected out, same shape as x.
+        converged : bool
+            False if maxiter was reached before convergence.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        is_1d = x.ndim == 1
+        resid = np.array(x[:, None] if is_1d else x, copy=True)
+        if weights is None:
+            weights = np.ones(self.nobs)
+        codes = [np.asarray(c) for c in self.labels]
+        wsums = [np.bincount(c, weights=weights) for c in codes]
+        scale = np.maximum(np.abs(resid).max(0), 1e-300)
+
+        n_sweeps = 1 if len(codes) == 1 else maxiter
+        converged = len(codes) == 1
+        active = np.arange(resid.shape[1])
+        for _ in range(n_sweeps):
+            change = np.zeros(len(active))
+            for c, wsum in zip(codes, wsums):
+                for i, j in enumerate(active):
+                    means = np.bincount(c, weights=weights * resid[:, j])
+                    means = means[c] / wsum[c]
+                    resid[:, j] -= means
+                    change[i] = max(change[i], np.abs(means).max())
+            active = active[change > tol * scale[active]]
+            if active.size == 0:
+                converged = True
+                break
+
+        if is_1d:
+            resid = resid[:, 0]
+        return resid, converged
+
+    def absorbed_df(self):
+        """
+        Number of parameters of the fixed effects for all index levels
+
+        One redundant parameter is subtracted for each connected component
+        of the first two levels. For additional levels one parameter is
+        subtracted for each level, this is exact if all levels are
+        connected.
+        """
+        from scipy import sparse
+        from scipy.sparse.csgraph import connected_components
+
+        codes = [np.unique(c, return_inverse=True)[1] for c in self.labels]
+        n_levels = [c.max() + 1 for c in codes]
+        df = sum(n_levels)
+        if len(codes) == 1:
+            return df
+        # bipartite graph of the levels of the first two grouping variables
+        n0, n1 = n_levels[:2]
+        graph = sparse.coo_matrix((np.ones(self.nobs), (codes[0], codes[1])),
+                                  shape=(n0, n1))
+        graph = sparse.bmat([[None, graph], [graph.T, None]])
+        n_components = connected_components(graph, directed=False)[0]
+        return df - n_components - (len(codes) - 2)
+
     def count_categories(self, level=0):
         """
         Sets the attribute counts to equal the bincount of the (integer-valued)
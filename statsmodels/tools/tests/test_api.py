@@ -0,0 +1,60 @@
+"""
+Tests for the lazy imports of statsmodels.api
+"""
+import subprocess
+import sys
+
+import pytest
+from numpy.testing import assert_equal
+
+import statsmodels.api as sm
+from statsmodels.regression.linear_model import OLS
+
+
+PY37 = sys.version_info[:2] >= (3, 7)
+
+
+def test_attributes():
+    assert sm.OLS is OLS
+    assert_equal(sm.load.__name__, 'load_pickle')
+    assert_equal(sm.tsa.__name__, 'statsmodels.tsa.api')
+    assert_equal(sm.formula.__name__, 'statsmodels.formula.api')
+    for name in sm.__all__:
+        assert getattr(sm, name) is not None
+        assert name in dir(sm)
+    with pytest.raises(AttributeError):
+        sm.not_an_attribute
+
+
+@pytest.mark.skipif(not PY37, reason='requires module __getattr__')
+def test_import_is_lazy():
+    # run in a new interpreter, the test process has imported everything
+    code = """
+import sys
+import statsmodels.api as sm
+heavy = ['statsmodels.regression', 'statsmodels.tsa', 'statsmodels.genmod',
+         'statsmodels.discrete', 'statsmodels.graphics', 'statsmodels.formula',
+         'patsy']
+print([mod for mod in heavy if mod in sys.modules])
+sm.OLS
+print('statsmodels.regression.linear_model' in sys.modules)
+"""
+    out = subprocess.check_output([sys.executable, '-W', 'ignore', '-c',
+                                   code])
+    loaded, ols = out.decode().strip().splitlines()
+    assert_equal(loaded, '[]')
+    assert_equal(ols, 'True')
+
+
+def test_package_submodules():
+    # run in a new interpreter, dotted access to submodules that the eager
+    # imports of statsmodels.api used to load
+    code = """
+import statsmodels.api as sm
+print(sm.robust.robust_linear_model.RLM.__name__)
+print(sm.iolib.summary2.Summary.__name__)
+print(sm.regression.mixed_linear_model.MixedLMParams.__name__)
+"""
+    out = subprocess.check_output([sys.executable, '-W', 'ignore', '-c',
+                                   code])
+    assert_equal(out.decode().split(), ['RLM', 'Summary', 'MixedLMParams'])
@@ -248,3 +248,37 @@ def test_init_api():
     grouping = Grouping(list_groups)
     np.testing.assert_array_equal(grouping.group_names,
                                   ['group0', 'group1', 'group2'])
+
+
+def test_demean_absorbed_df():
+    np.random.seed(45321)
+    nobs = 300
+    g0 = np.random.randint(0, 12, size=nobs)
+    g1 = np.random.randint(0, 5, size=nobs)
+    x = np.random.randn(nobs, 2)
+    grouping = Grouping(pd.MultiIndex.from_arrays([g0, g1]))
+
+    # residuals of a regression on both sets of dummies
+    dummies = np.column_stack((g0[:, None] == np.arange(12),
+                               g1[:, None] == np.arange(5))).astype(float)
+    resid = x - dummies.dot(np.linalg.lstsq(dummies, x, rcond=None)[0])
+    x_demeaned, converged = grouping.demean(x)
+    assert converged
+    np.testing.assert_allclose(x_demeaned, resid, atol=1e-8)
+    x_demeaned, converged = grouping.demean(x[:, 0])
+    np.testing.assert_allclose(x_demeaned, resid[:, 0], atol=1e-8)
+    assert grouping.absorbed_df() == np.linalg.matrix_rank(dummies)
+
+    # weighted means with a single grouping variable
+    weights = np.random.uniform(0.5, 2, size=nobs)
+    grouping = Grouping(pd.Index(g0))
+    x_demeaned, converged = grouping.demean(x, weights)
+    means = np.bincount(g0, weights * x[:, 1]) / np.bincount(g0, weights)
+    np.testing.assert_allclose(x_demeaned[:, 1], x[:, 1] - means[g0])
+    assert grouping.absorbed_df() == 12
+
+    # two disconnected components lose two parameters
+    g0 = np.repeat(np.arange(4), 10)
+    g1 = np.tile(np.arange(2), 20) + 2 * (g0 >= 2)
+    grouping = Grouping(pd.MultiIndex.from_arrays([g0, g1]))
+    assert grouping.absorbed_df() == 4 + 4 - 2
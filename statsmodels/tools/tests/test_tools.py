@@ -5,7 +5,8 @@ from statsmodels.compat.python import lrange, range
 import numpy as np
 from numpy.random import standard_normal
 from numpy.testing import (assert_equal, assert_array_equal,
-                           assert_almost_equal, assert_string_equal)
+                           assert_almost_equal, assert_string_equal,
+                           assert_allclose)
 import pandas as pd
 from pandas.util.testing import assert_frame_equal, assert_series_equal
 import pytest
@@ -126,6 +127,26 @@ class TestTools(object):
         assert_almost_equal(np_inv, sm_inv)
         assert_almost_equal(np_sing_vals, sing_vals)
 
+    def test_hat_matrix_diag(self):
+        X = standard_normal((40, 10))
+        hat = np.diag(X.dot(np.linalg.pinv(X)))
+        cov = np.linalg.inv(X.T.dot(X))
+        for factor in [tools._cov_factor(cov),
+                       tools._cov_factor(cov, np.linalg.qr(X)[1])]:
+            assert_allclose(factor.dot(factor.T), cov, rtol=1e-10)
+            assert_allclose(tools._hat_matrix_diag(X, factor, chunksize=7),
+                            hat, rtol=1e-10)
+        w = np.arange(1., 41)
+        hat_w = tools._hat_matrix_diag(X, factor, weights=w)
+        assert_allclose(hat_w, w * hat, rtol=1e-10)
+
+        # singular
+        X[:, 5] = X[:, 1] + X[:, 3]
+        hat = np.diag(X.dot(np.linalg.pinv(X)))
+        factor = tools._cov_factor(np.linalg.pinv(X.T.dot(X)))
+        assert_allclose(tools._hat_matrix_diag(X, factor, chunksize=7),
+                        hat, rtol=1e-8)
+
     def test_fullrank(self):
         import warnings
         with warnings.catch_warnings():
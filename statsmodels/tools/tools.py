@@ -340,18 +340,72 @@ def pinv_extended(X, rcond=1e-15):
     X = np.asarray(X)
     X = X.conjugate()
     u, s, vt = np.linalg.svd(X, 0)
-    s_orig = np.copy(s)
-    m = u.shape[0]
-    n = vt.shape[1]
     cutoff = rcond * np.maximum.reduce(s)
-    for i in range(min(n, m)):
-        if s[i] > cutoff:
-            s[i] = 1./s[i]
-        else:
-            s[i] = 0.
-    res = np.dot(np.transpose(vt), np.multiply(s[:, np.core.newaxis],
-                                               np.transpose(u)))
-    return res, s_orig
+    large = s > cutoff
+    s_inv = np.zeros(s.shape, s.dtype)
+    s_inv[large] = 1. / s[large]
+    res = np.dot(vt.T, s_inv[:, None] * u.T)
+    return res, s
+
+
+def _row_chunks(nobs, ncols, chunksize=None):
+    """
+    Slices of consecutive rows, by default with about 2**20 elements each
+    """
+    if chunksize is None:
+        chunksize = max(2**20 // max(ncols, 1), 1)
+    for start in range(0, nobs, chunksize):
+        yield slice(start, min(start + chunksize, nobs))
+
+
+def _cov_factor(normalized_cov_params, exog_R=None):
+    """
+    Square root F of normalized_cov_params with F F' = normalized_cov_params
+
+    If the R factor of the QR decomposition of exog is given, then F is
+    inv(R). Otherwise the Cholesky factor is used, or the eigenvalue
+    decomposition if normalized_cov_params is singular.
+    """
+    if exog_R is not None:
+        return L.inv(exog_R)
+    try:
+        return L.cholesky(normalized_cov_params)
+    except L.LinAlgError:
+        evals, evecs = L.eigh(normalized_cov_params)
+        return evecs * np.sqrt(np.clip(evals, 0, np.inf))
+
+
+def _hat_matrix_diag(exog, factor, weights=None, chunksize=None):
+    """
+    Diagonal of the hat matrix computed in chunks of rows
+
+    Parameters
+    ----------
+    exog : ndarray
+        nobs x k design matrix.
+    factor : ndarray
+        k x k factor of the normalized covariance of the parameters, see
+        `_cov_factor`.
+    weights : ndarray, optional
+        Weights of the observations, the hat matrix is the one of
+        sqrt(weights) * exog.
+    chunksize : int, optional
+        Number of rows per chunk.
+
+    Returns
+    -------
+    hat : ndarray
+        Leverage of the observations, ``w_i x_i' F F' x_i``. Only chunks of
+        rows are held in memory, not an nobs x nobs matrix.
+    """
+    nobs = exog.shape[0]
+    hat = np.empty(nobs)
+    for rows in _row_chunks(nobs, exog.shape[1], chunksize):
+        xf = np.dot(exog[rows], factor)
+        hat[rows] = (xf * xf).sum(1)
+    if weights is not None:
+        hat *= weights
+    return hat
 
 
 def recipr(x):
@@ -0,0 +1,297 @@
+#cython: boundscheck=False
+#cython: wraparound=False
+#cython: cdivision=True
+"""
+Holt-Winters exponential smoothing recursions
+
+The minimization functions of `statsmodels.tsa.holtwinters` for the
+supported combinations of trend and seasonal components, together with
+batched versions that evaluate the sum of squared errors for many parameter
+vectors of many series in a single call.
+
+License: Simplified-BSD
+"""
+import numpy as np
+cimport numpy as np
+from libc.math cimport pow
+
+np.import_array()
+
+# Component types
+cdef enum:
+    NONE = 0
+    ADD = 1
+    MUL = 2
+
+COMPONENTS = {None: NONE, 'add': ADD, 'mul': MUL}
+
+
+cdef double _sse(double[:] p, double[:] y, double[:] l, double[:] b,
+                 double[:] s, Py_ssize_t m, Py_ssize_t n, int trend,
+                 int seasonal, double max_seen):
+    """
+    Sum of squared one-step errors of a Holt-Winters model
+
+    `p` holds alpha, beta, gamma, l0, b0, phi and the m initial seasons, `l`,
+    `b` and `s` are work arrays with at least n, n and n + m - 1 elements.
+    """
+    cdef:
+        Py_ssize_t i
+        double alpha = p[0], beta = p[1], gamma = p[2], phi = p[5]
+        double alphac = 1 - alpha, betac = 1 - beta, gammac = 1 - gamma
+        double trended, damped, fitted, err, sse = 0
+
+    if trend == NONE:
+        if seasonal != NONE:
+            if alpha == 0.0 or gamma > 1 - alpha:
+                return max_seen
+    elif seasonal == NONE:
+        if alpha == 0.0 or beta > alpha:
+            return max_seen
+    elif alpha * beta == 0.0 or beta > alpha or gamma > 1 - alpha:
+        return max_seen
+
+    l[0] = p[3]
+    b[0] = p[4]
+    if seasonal != NONE:
+        for i in range(m):
+            s[i] = p[6 + i]
+
+    for i in range(n):
+        if i > 0:
+            # trended level and damped slope of the previous period
+            if trend == ADD:
+                damped = phi * b[i - 1]
+                trended = l[i - 1] + damped
+            elif trend == MUL:
+                damped = pow(b[i - 1], phi)
+                trended = l[i - 1] * damped
+            else:
+                trended = l[i - 1]
+
+            if seasonal == MUL:
+                l[i] = alpha * y[i - 1] / s[i - 1] + alphac * trended
+            elif seasonal == ADD:
+                l[i] = alpha * y[i - 1] - alpha * s[i - 1] + alphac * trended
+            else:
+                l[i] = alpha * y[i - 1] + alphac * trended
+
+            if trend == ADD:
+                b[i] = beta * (l[i] - l[i - 1]) + betac * damped
+            elif trend == MUL:
+                b[i] = beta * (l[i] / l[i - 1]) + betac * damped
+
+            if seasonal == MUL:
+                s[i + m - 1] = gamma * y[i - 1] / trended + gammac * s[i - 1]
+            elif seasonal == ADD:
+                s[i + m - 1] = (gamma * y[i - 1] - gamma * trended +
+                                gammac * s[i - 1])
+
+        if trend == ADD:
+            fitted = l[i] + phi * b[i]
+        elif trend == MUL:
+            if seasonal == ADD:
+                fitted = l[i] * phi * b[i]
+            else:
+                fitted = l[i] * pow(b[i], phi)
+        else:
+            fitted = l[i]
+        if seasonal == MUL:
+            fitted = fitted * s[i]
+        elif seasonal == ADD:
+            fitted = fitted + s[i]
+        err = fitted - y[i]
+        sse = sse + err * err
+    return sse
+
+
+cdef inline double _minimization(double[:] x, np.uint8_t[:] xi, double[:] p,
+                                 double[:] y, double[:] l, double[:] b,
+                                 double[:] s, Py_ssize_t m, Py_ssize_t n,
+                                 double max_seen, int trend, int seasonal):
+    cdef Py_ssize_t i, j = 0
+    for i in range(xi.shape[0]):
+        if xi[i]:
+            p[i] = x[j]
+            j += 1
+    return _sse(p, y, l, b, s, m, n, trend, seasonal, max_seen)
+
+
+def holt__(double[:] x, np.uint8_t[:] xi, double[:] p, double[:] y,
+           double[:] l, double[:] b, double[:] s, Py_ssize_t m, Py_ssize_t n,
+           double max_seen):
+    """
+    Simple Exponential Smoothing
+    Minimization Function
+    (,)
+    """
+    return _minimization(x, xi, p, y, l, b, s, m, n, max_seen, NONE, NONE)
+
+
+def holt_mul_dam(double[:] x, np.uint8_t[:] xi, double[:] p, double[:] y,
+                 double[:] l, double[:] b, double[:] s, Py_ssize_t m,
+                 Py_ssize_t n, double max_seen):
+    """
+    Multiplicative and Multiplicative Damped
+    Minimization Function
+    (M,) & (Md,)
+    """
+    return _minimization(x, xi, p, y, l, b, s, m, n, max_seen, MUL, NONE)
+
+
+def holt_add_dam(double[:] x, np.uint8_t[:] xi, double[:] p, double[:] y,
+                 double[:] l, double[:] b, double[:] s, Py_ssize_t m,
+                 Py_ssize_t n, double max_seen):
+    """
+    Additive and Additive Damped
+    Minimization Function
+    (A,) & (Ad,)
+    """
+    return _minimization(x, xi, p, y, l, b, s, m, n, max_seen, ADD, NONE)
+
+
+def holt_win__mul(double[:] x, np.uint8_t[:] xi, double[:] p, double[:] y,
+                  double[:] l, double[:] b, double[:] s, Py_ssize_t m,
+                  Py_ssize_t n, double max_seen):
+    """
+    Multiplicative Seasonal
+    Minimization Function
+    (,M)
+    """
+    return _minimization(x, xi, p, y, l, b, s, m, n, max_seen, NONE, MUL)
+
+
+def holt_win__add(double[:] x, np.uint8_t[:] xi, double[:] p, double[:] y,
+                  double[:] l, double[:] b, double[:] s, Py_ssize_t m,
+                  Py_ssize_t n, double max_seen):
+    """
+    Additive Seasonal
+    Minimization Function
+    (,A)
+    """
+    return _minimization(x, xi, p, y, l, b, s, m, n, max_seen, NONE, ADD)
+
+
+def holt_win_add_mul_dam(double[:] x, np.uint8_t[:] xi, double[:] p,
+                         double[:] y, double[:] l, double[:] b, double[:] s,
+                         Py_ssize_t m, Py_ssize_t n, double max_seen):
+    """
+    Additive and Additive Damped with Multiplicative Seasonal
+    Minimization Function
+    (A,M) & (Ad,M)
+    """
+    return _minimization(x, xi, p, y, l, b, s, m, n, max_seen, ADD, MUL)
+
+
+def holt_win_mul_mul_dam(double[:] x, np.uint8_t[:] xi, double[:] p,
+                         double[:] y, double[:] l, double[:] b, double[:] s,
+                         Py_ssize_t m, Py_ssize_t n, double max_seen):
+    """
+    Multiplicative and Multiplicative Damped with Multiplicative Seasonal
+    Minimization Function
+    (M,M) & (Md,M)
+    """
+    return _minimization(x, xi, p, y, l, b, s, m, n, max_seen, MUL, MUL)
+
+
+def holt_win_add_add_dam(double[:] x, np.uint8_t[:] xi, double[:] p,
+                         double[:] y, double[:] l, double[:] b, double[:] s,
+                         Py_ssize_t m, Py_ssize_t n, double max_seen):
+    """
+    Additive and Additive Damped with Additive Seasonal
+    Minimization Function
+    (A,A) & (Ad,A)
+    """
+    return _minimization(x, xi, p, y, l, b, s, m, n, max_seen, ADD, ADD)
+
+
+def holt_win_mul_add_dam(double[:] x, np.uint8_t[:] xi, double[:] p,
+                         double[:] y, double[:] l, double[:] b, double[:] s,
+                         Py_ssize_t m, Py_ssize_t n, double max_seen):
+    """
+    Multiplicative and Multiplicative Damped with Additive Seasonal
+    Minimization Function
+    (M,A) & (M,Ad)
+    """
+    return _minimization(x, xi, p, y, l, b, s, m, n, max_seen, MUL, ADD)
+
+
+def sse_batch(double[:, :] params, np.int64_t[:] index, double[:, :] y,
+              Py_ssize_t m, int trend, int seasonal, double[:] max_seen,
+              double[:] out):
+    """
+    Sum of squared errors for a batch of parameter vectors
+
+    Parameters
+    ----------
+    params : ndarray
+        Parameter vectors (alpha, beta, gamma, l0, b0, phi, s0, ..., s_m-1)
+        with shape (k, 6 + m).
+    index : ndarray of int64
+        The series of each parameter vector, shape (k,).
+    y : ndarray
+        The series, shape (n_series, nobs).
+    m : int
+        Number of seasons, 0 if there is no seasonal component.
+    trend, seasonal : int
+        Component types as in `COMPONENTS`.
+    max_seen : ndarray
+        The value returned for invalid parameters of each series, shape
+        (n_series,).
+    out : ndarray
+        Output array for the sum of squared errors, shape (k,).
+    """
+    cdef:
+        Py_ssize_t i, n = y.shape[1]
+        double[:] l = np.zeros(n)
+        double[:] b = np.zeros(n)
+        double[:] s = np.zeros(n + m)
+
+    for i in range(params.shape[0]):
+        out[i] = _sse(params[i], y[index[i]], l, b, s, m, n, trend,
+                      seasonal, max_seen[index[i]])
+
+
+def brute_batch(double[:, :] params, np.int64_t[:] txi, double[:, :] grid,
+                double[:, :] y, Py_ssize_t m, int trend, int seasonal,
+                double[:] max_seen, np.int64_t[:] argmin, double[:] fmin):
+    """
+    Grid search over a subset of the parameters of each series
+
+    Parameters
+    ----------
+    params : ndarray
+        Parameter vectors of each series, shape (n_series, 6 + m). The
+        entries in `txi` are overwritten by the grid points.
+    txi : ndarray of int64
+        Positions of the searched parameters.
+    grid : ndarray
+        Grid points, shape (n_points, len(txi)).
+    y : ndarray
+        The series, shape (n_series, nobs).
+    m, trend, seasonal, max_seen
+        See `sse_batch`.
+    argmin : ndarray of int64
+        Output array for the index of the first grid point with the
+        smallest sum of squared errors of each series.
+    fmin : ndarray
+        Output array for the smallest sum of squared errors.
+    """
+    cdef:
+        Py_ssize_t i, j, k, n = y.shape[1]
+        double value
+        double[:] l = np.zeros(n)
+        double[:] b = np.zeros(n)
+        double[:] s = np.zeros(n + m)
+
+    for i in range(params.shape[0]):
+        fmin[i] = np.inf
+        argmin[i] = 0
+        for j in range(grid.shape[0]):
+            for k in range(txi.shape[0]):
+                params[i, txi[k]] = grid[j, k]
+            value = _sse(params[i], y[i], l, b, s, m, n, trend, seasonal,
+                         max_seen[i])
+            if value < fmin[i]:
+                fmin[i] = value
+                argmin[i] = j
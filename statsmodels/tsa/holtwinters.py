@@ -13,9 +13,11 @@ Author: Terence L van Zyl
 
 """
 import numpy as np
+import pandas as pd
 
 from statsmodels.base.model import Results
 from statsmodels.base.wrapper import populate_wrapper, union_dicts, ResultsWrapper
+from statsmodels.tools.decorators import cache_readonly
 from statsmodels.tsa.base.tsa_model import TimeSeriesModel
 
 from scipy.optimize import basinhopping, brute, minimize
@@ -27,205 +29,23 @@ except ImportError:
         return np.exp(np.log1p(lmbda * x) / lmbda) if lmbda != 0 else np.exp(x)
 from scipy.stats import boxcox
 
-
-def _holt_init(x, xi, p, y, l, b):
-    """Initialization for the Holt Models"""
-    p[xi] = x
-    alpha, beta, _, l0, b0, phi = p[:6]
-    alphac = 1 - alpha
-    betac = 1 - beta
-    y_alpha = alpha * y
-    l[:] = 0
-    b[:] = 0
-    l[0] = l0
-    b[0] = b0
-    return alpha, beta, phi, alphac, betac, y_alpha
-
-
-def _holt__(x, xi, p, y, l, b, s, m, n, max_seen):
-    """
-    Simple Exponential Smoothing
-    Minimization Function
-    (,)
-    """
-    alpha, beta, phi, alphac, betac, y_alpha = _holt_init(x, xi, p, y, l, b)
-    for i in range(1, n):
-        l[i] = (y_alpha[i - 1]) + (alphac * (l[i - 1]))
-    return sqeuclidean(l, y)
-
-
-def _holt_mul_dam(x, xi, p, y, l, b, s, m, n, max_seen):
-    """
-    Multiplicative and Multiplicative Damped 
-    Minimization Function
-    (M,) & (Md,)
-    """
-    alpha, beta, phi, alphac, betac, y_alpha = _holt_init(x, xi, p, y, l, b)
-    if alpha == 0.0:
-        return max_seen
-    if beta > alpha:
-        return max_seen
-    for i in range(1, n):
-        l[i] = (y_alpha[i - 1]) + (alphac * (l[i - 1] * b[i - 1]**phi))
-        b[i] = (beta * (l[i] / l[i - 1])) + (betac * b[i - 1]**phi)
-    return sqeuclidean(l * b**phi, y)
-
-
-def _holt_add_dam(x, xi, p, y, l, b, s, m, n, max_seen):
-    """
-    Additive and Additive Damped 
-    Minimization Function
-    (A,) & (Ad,)
-    """
-    alpha, beta, phi, alphac, betac, y_alpha = _holt_init(x, xi, p, y, l, b)
-    if alpha == 0.0:
-        return max_seen
-    if beta > alpha:
-        return max_seen
-    for i in range(1, n):
-        l[i] = (y_alpha[i - 1]) + (alphac * (l[i - 1] + phi * b[i - 1]))
-        b[i] = (beta * (l[i] - l[i - 1])) + (betac * phi * b[i - 1])
-    return sqeuclidean(l + phi * b, y)
-
-
-def _holt_win_init(x, xi, p, y, l, b, s, m):
-    """Initialization for the Holt Winters Seasonal Models"""
-    p[xi] = x
-    alpha, beta, gamma, l0, b0, phi = p[:6]
-    s0 = p[6:]
-    alphac = 1 - alpha
-    betac = 1 - beta
-    gammac = 1 - gamma
-    y_alpha = alpha * y
-    y_gamma = gamma * y
-    l[:] = 0
-    b[:] = 0
-    s[:] = 0
-    l[0] = l0
-    b[0] = b0
-    s[:m] = s0
-    return alpha, beta, gamma, phi, alphac, betac, gammac, y_alpha, y_gamma
-
-
-def _holt_win__mul(x, xi, p, y, l, b, s, m, n, max_seen):
-    """
-    Multiplicative Seasonal 
-    Minimization Function
-    (,M)
-    """
-    alpha, beta, gamma, phi, alphac, betac, gammac, y_alpha, y_gamma = _holt_win_init(
-        x, xi, p, y, l, b, s, m)
-    if alpha == 0.0:
-        return max_seen
-    if gamma > 1 - alpha:
-        return max_seen
-    for i in range(1, n):
-        l[i] = (y_alpha[i - 1] / s[i - 1]) + (alphac * (l[i - 1]))
-        s[i + m - 1] = (y_gamma[i - 1] / (l[i - 1])) + (gammac * s[i - 1])
-    return sqeuclidean(l * s[:-(m - 1)], y)
-
-
-def _holt_win__add(x, xi, p, y, l, b, s, m, n, max_seen):
-    """
-    Additive Seasonal 
-    Minimization Function
-    (,A)
-    """
-    alpha, beta, gamma, phi, alphac, betac, gammac, y_alpha, y_gamma = _holt_win_init(
-        x, xi, p, y, l, b, s, m)
-    if alpha == 0.0:
-        return max_seen
-    if gamma > 1 - alpha:
-        return max_seen
-    for i in range(1, n):
-        l[i] = (y_alpha[i - 1]) - (alpha * s[i - 1]) + (alphac * (l[i - 1]))
-        s[i + m - 1] = y_gamma[i - 1] - \
-            (gamma * (l[i - 1])) + (gammac * s[i - 1])
-    return sqeuclidean(l + s[:-(m - 1)], y)
-
-
-def _holt_win_add_mul_dam(x, xi, p, y, l, b, s, m, n, max_seen):
-    """
-    Additive and Additive Damped with Multiplicative Seasonal 
-    Minimization Function
-    (A,M) & (Ad,M)
-    """
-    alpha, beta, gamma, phi, alphac, betac, gammac, y_alpha, y_gamma = _holt_win_init(
-        x, xi, p, y, l, b, s, m)
-    if alpha * beta == 0.0:
-        return max_seen
-    if beta > alpha or gamma > 1 - alpha:
-        return max_seen
-    for i in range(1, n):
-        l[i] = (y_alpha[i - 1] / s[i - 1]) + \
-            (alphac * (l[i - 1] + phi * b[i - 1]))
-        b[i] = (beta * (l[i] - l[i - 1])) + (betac * phi * b[i - 1])
-        s[i + m - 1] = (y_gamma[i - 1] / (l[i - 1] + phi *
-                                          b[i - 1])) + (gammac * s[i - 1])
-    return sqeuclidean((l + phi * b) * s[:-(m - 1)], y)
-
-
-def _holt_win_mul_mul_dam(x, xi, p, y, l, b, s, m, n, max_seen):
-    """
-    Multiplicative and Multiplicative Damped with Multiplicative Seasonal 
-    Minimization Function
-    (M,M) & (Md,M)
-    """
-    alpha, beta, gamma, phi, alphac, betac, gammac, y_alpha, y_gamma = _holt_win_init(
-        x, xi, p, y, l, b, s, m)
-    if alpha * beta == 0.0:
-        return max_seen
-    if beta > alpha or gamma > 1 - alpha:
-        return max_seen
-    for i in range(1, n):
-        l[i] = (y_alpha[i - 1] / s[i - 1]) + \
-            (alphac * (l[i - 1] * b[i - 1]**phi))
-        b[i] = (beta * (l[i] / l[i - 1])) + (betac * b[i - 1]**phi)
-        s[i + m - 1] = (y_gamma[i - 1] / (l[i - 1] *
-                                          b[i - 1]**phi)) + (gammac * s[i - 1])
-    return sqeuclidean((l * b**phi) * s[:-(m - 1)], y)
-
-
-def _holt_win_add_add_dam(x, xi, p, y, l, b, s, m, n, max_seen):
-    """
-    Additive and Additive Damped with Additive Seasonal 
-    Minimization Function
-    (A,A) & (Ad,A)
-    """
-    alpha, beta, gamma, phi, alphac, betac, gammac, y_alpha, y_gamma = _holt_win_init(
-        x, xi, p, y, l, b, s, m)
-    if alpha * beta == 0.0:
-        return max_seen
-    if beta > alpha or gamma > 1 - alpha:
-        return max_seen
-    for i in range(1, n):
-        l[i] = (y_alpha[i - 1]) - (alpha * s[i - 1]) + \
-            (alphac * (l[i - 1] + phi * b[i - 1]))
-        b[i] = (beta * (l[i] - l[i - 1])) + (betac * phi * b[i - 1])
-        s[i + m - 1] = y_gamma[i - 1] - \
-            (gamma * (l[i - 1] + phi * b[i - 1])) + (gammac * s[i - 1])
-    return sqeuclidean((l + phi * b) + s[:-(m - 1)], y)
-
-
-def _holt_win_mul_add_dam(x, xi, p, y, l, b, s, m, n, max_seen):
-    """
-    Multiplicative and Multiplicative Damped with Additive Seasonal 
-    Minimization Function
-    (M,A) & (M,Ad)
-    """
-    alpha, beta, gamma, phi, alphac, betac, gammac, y_alpha, y_gamma = _holt_win_init(
-        x, xi, p, y, l, b, s, m)
-    if alpha * beta == 0.0:
-        return max_seen
-    if beta > alpha or gamma > 1 - alpha:
-        return max_seen
-    for i in range(1, n):
-        l[i] = (y_alpha[i - 1]) - (alpha * s[i - 1]) + \
-            (alphac * (l[i - 1] * b[i - 1]**phi))
-        b[i] = (beta * (l[i] / l[i - 1])) + (betac * b[i - 1]**phi)
-        s[i + m - 1] = y_gamma[i - 1] - \
-            (gamma * (l[i - 1] * b[i - 1]**phi)) + (gammac * s[i - 1])
-    return sqeuclidean((l * phi * b) + s[:-(m - 1)], y)
+from statsmodels.tsa import _exponential_smoothers
+from statsmodels.tsa._exponential_smoothers import (
+    holt__, holt_add_dam, holt_mul_dam, holt_win__add, holt_win__mul,
+    holt_win_add_add_dam, holt_win_add_mul_dam, holt_win_mul_add_dam,
+    holt_win_mul_mul_dam)
+from statsmodels.tsa.tsatools import _stack_series
+
+# Minimization functions by (seasonal, trend)
+_MINIMIZATION_FUNCS = {('mul', 'add'): holt_win_add_mul_dam,
+                       ('mul', 'mul'): holt_win_mul_mul_dam,
+                       ('mul', None): holt_win__mul,
+                       ('add', 'add'): holt_win_add_add_dam,
+                       ('add', 'mul'): holt_win_mul_add_dam,
+                       ('add', None): holt_win__add,
+                       (None, 'add'): holt_add_dam,
+                       (None, 'mul'): holt_mul_dam,
+                       (None, None): holt__}
 
 
 class HoltWintersResults(Results):
@@ -535,20 +355,13 @@ class ExponentialSmoothing(TimeSeriesModel):
             init_gamma = None
             init_phi = phi if phi is not None else 0.99
             # Selection of functions to optimize for approporate parameters
-            func_dict = {('mul', 'add'): _holt_win_add_mul_dam,
-                         ('mul', 'mul'): _holt_win_mul_mul_dam,
-                         ('mul', None): _holt_win__mul,
-                         ('add', 'add'): _holt_win_add_add_dam,
-                         ('add', 'mul'): _holt_win_mul_add_dam,
-                         ('add', None): _holt_win__add,
-                         (None, 'add'): _holt_add_dam,
-                         (None, 'mul'): _holt_mul_dam,
-                         (None, None): _holt__}
+            func_dict = _MINIMIZATION_FUNCS
             if seasoning:
                 init_gamma = gamma if gamma is not None else 0.05 * \
                     (1 - init_alpha)
-                xi = np.array([alpha is None, beta is None, gamma is None,
-                               True, trending, phi is None and damped] + [True] * m)
+                xi = np.array([alpha is None, trending and beta is None,
+                               gamma is None, True, trending,
+                               phi is None and damped] + [True] * m)
                 func = func_dict[(seasonal, trend)]
             elif trending:
                 xi = np.array([alpha is None, beta is None, False,
@@ -567,7 +380,11 @@ class ExponentialSmoothing(TimeSeriesModel):
                 [True, True, True, False, False, True] + [False] * m)
             bounds = np.array([(0.0, 1.0), (0.0, 1.0), (0.0, 1.0),
                                (0.0, None), (0.0, None), (0.0, 1.0)] + [(None, None), ] * m)
-            res = brute(func, bounds[txi], (txi, p, y, l, b, s, m, self.nobs, max_seen),
+            # the compiled minimization functions take the masks as uint8
+            y = np.asarray(y, dtype=np.double)
+            xi_u8 = xi.astype(np.uint8)
+            res = brute(func, bounds[txi], (txi.astype(np.uint8), p, y, l, b, s, m,
+                                            self.nobs, max_seen),
                         Ns=20, full_output=True, finish=None)
             (p[txi], max_seen, grid, Jout) = res
             [alpha, beta, gamma, l0, b0, phi] = p[:6]
@@ -578,12 +395,12 @@ class ExponentialSmoothing(TimeSeriesModel):
                 # solution to parameters, maybe hop around to try escape the local
                 # minimum we may be in.
                 res = basinhopping(func, p[xi], minimizer_kwargs={'args': (
-                    xi, p, y, l, b, s, m, self.nobs, max_seen), 'bounds': bounds[xi]}, stepsize=0.01)
+                    xi_u8, p, y, l, b, s, m, self.nobs, max_seen), 'bounds': bounds[xi]}, stepsize=0.01)
             else:
                 # Take a deeper look in the local minimum we are in to find the best
                 # solution to parameters
                 res = minimize(func, p[xi], args=(
-                    xi, p, y, l, b, s, m, self.nobs, max_seen), bounds=bounds[xi])                
+                    xi_u8, p, y, l, b, s, m, self.nobs, max_seen), bounds=bounds[xi])                
             p[xi] = res.x            
             [alpha, beta, gamma, l0, b0, phi] = p[:6]
             s0 = p[6:]
@@ -595,6 +412,42 @@ class ExponentialSmoothing(TimeSeriesModel):
         hwfit._results.mle_retvals = opt
         return hwfit
 
+    @classmethod
+    def fit_batch(cls, endogs, trend=None, damped=False, seasonal=None,
+                  seasonal_periods=None, **kwargs):
+        """
+        fit Holt Winter's Exponential Smoothing separately to many series
+
+        Parameters
+        ----------
+        endogs : list, dict, DataFrame or 2-dim ndarray
+            The observed time series, all of the same length. A list or dict
+            of one dimensional series, or a DataFrame or array with one column
+            for each series.
+        trend, damped, seasonal, seasonal_periods
+            The model specification, see `ExponentialSmoothing`.
+        **kwargs
+            Keyword arguments for `BatchExponentialSmoothing.fit`, for example
+            `smoothing_level` or `optimized`.
+
+        Returns
+        -------
+        results : BatchHoltWintersResults class
+            See statsmodels.tsa.holtwinters.BatchHoltWintersResults
+
+        Notes
+        -----
+        The parameters of each series are the same as when fitting each
+        series separately with `fit`, but the grid search for the starting
+        values and the smoothing of the series are vectorized over the
+        series. The Box-Cox transformation, the bias removal and
+        basinhopping are not supported.
+        """
+        mod = BatchExponentialSmoothing(endogs, trend=trend, damped=damped,
+                                        seasonal=seasonal,
+                                        seasonal_periods=seasonal_periods)
+        return mod.fit(**kwargs)
+
     def _predict(self, h=None, smoothing_level=None, smoothing_slope=None,
                  smoothing_seasonal=None, initial_level=None, initial_slope=None,
                  damping_slope=None, initial_seasons=None, use_boxcox=None, lamda=None, remove_bias=None):
@@ -887,3 +740,427 @@ class Holt(ExponentialSmoothing):
         return super(Holt, self).fit(smoothing_level=smoothing_level,
                                      smoothing_slope=smoothing_slope, damping_slope=damping_slope,
                                      optimized=optimized)
+
+
+class BatchExponentialSmoothing(object):
+    """
+    The same Holt Winter's Exponential Smoothing model for many series
+
+    Parameters
+    ----------
+    endogs : list, dict, DataFrame or 2-dim ndarray
+        The observed time series, all of the same length. A list or dict of
+        one dimensional series, or a DataFrame or array with one column for
+        each series.
+    trend : {"add", "mul", "additive", "multiplicative", None}, optional
+        Type of trend component.
+    damped : bool, optional
+        Should the trend component be damped.
+    seasonal : {"add", "mul", "additive", "multiplicative", None}, optional
+        Type of seasonal component.
+    seasonal_periods : int, optional
+        The number of seasons to consider for the holt winters.
+
+    Notes
+    -----
+    The parameters of each series are estimated as in
+    `ExponentialSmoothing.fit`, but the grid search for the starting values
+    and the final smoothing pass are vectorized over the series.
+    """
+
+    def __init__(self, endogs, trend=None, damped=False, seasonal=None,
+                 seasonal_periods=None):
+        self.endog, start, self.series_names = _stack_series(endogs)
+        if np.any(start != 0):
+            raise ValueError('All series must have the same number of '
+                             'observations.')
+        if np.isnan(self.endog).any():
+            raise ValueError('The series cannot contain missing values.')
+        self.n_series, self.nobs = self.endog.shape
+
+        # template model with the first series, checks the specification
+        template = ExponentialSmoothing(self.endog[0], trend=trend,
+                                        damped=damped, seasonal=seasonal,
+                                        seasonal_periods=seasonal_periods)
+        if ((template.trend == 'mul' or template.seasonal == 'mul') and
+                (self.endog <= 0.0).any()):
+            raise NotImplementedError(
+                'Unable to correct for negative or zero values')
+        self.trend = template.trend
+        self.damped = template.damped
+        self.seasonal = template.seasonal
+        self.trending = template.trending
+        self.seasoning = template.seasoning
+        self.seasonal_periods = template.seasonal_periods
+        m = self.seasonal_periods
+        self.param_names = (['smoothing_level', 'smoothing_slope',
+                             'smoothing_seasonal', 'damping_slope',
+                             'initial_level', 'initial_slope'] +
+                            ['initial_seasons.%d' % i for i in range(m)])
+
+    def _initial_values(self):
+        """initial level, slope and seasons of each series, as in `fit`"""
+        y = self.endog
+        m = self.seasonal_periods
+        nan = np.full(self.n_series, np.nan)
+        if self.seasoning:
+            # row by row, so that the rounding is the same as in `fit` (the
+            # optimization of some models is sensitive to the start values)
+            mask = np.arange(self.nobs) % m == 0
+            l0 = np.array([row[mask].mean() for row in y])
+            b0 = nan
+            if self.trending:
+                b0 = np.array([((row[m:m + m] - row[:m]) / m).mean()
+                               for row in y])
+            if self.seasonal == 'mul':
+                s0 = y[:, :m] / l0[:, None]
+            else:
+                s0 = y[:, :m] - l0[:, None]
+        elif self.trending:
+            l0 = y[:, 0]
+            b0 = y[:, 1] / y[:, 0] if self.trend == 'mul' else y[:, 1] - y[:, 0]
+            s0 = np.zeros((self.n_series, 0))
+        else:
+            l0 = y[:, 0]
+            b0 = nan
+            s0 = np.zeros((self.n_series, 0))
+        return l0, b0, s0
+
+    def sse(self, params, index=None):
+        """
+        Sum of squared one-step errors of each series
+
+        Parameters
+        ----------
+        params : array
+            Parameters with shape (n, 6 + seasonal_periods), one row for each
+            series in `index`, in the order smoothing level, slope and
+            seasonal, initial level and slope, damping slope and the initial
+            seasons. Unused entries are ignored.
+        index : None or array of int
+            The series for which the errors are computed. Default is all
+            series.
+
+        Returns
+        -------
+        sse : ndarray
+            Sum of squared errors of each series. Parameters that are not
+            admissible give the largest double.
+        """
+        if index is None:
+            index = np.arange(self.n_series)
+        index = np.asarray(index, dtype=np.int64)
+        params = np.ascontiguousarray(np.atleast_2d(params), dtype=np.double)
+        out = np.zeros(len(index))
+        max_seen = np.full(self.n_series, np.finfo(np.double).max)
+        _exponential_smoothers.sse_batch(
+            params, index, self.endog, self.seasonal_periods,
+            _exponential_smoothers.COMPONENTS[self.trend],
+            _exponential_smoothers.COMPONENTS[self.seasonal], max_seen, out)
+        return out
+
+    def fit(self, smoothing_level=None, smoothing_slope=None,
+            smoothing_seasonal=None, damping_slope=None, optimized=True):
+        """
+        fit Holt Winter's Exponential Smoothing to all series
+
+        Parameters
+        ----------
+        smoothing_level : float, optional
+            The alpha value of the simple exponential smoothing, if the value is
+            set then this value will be used as the value.
+        smoothing_slope :  float, optional
+            The beta value of the holts trend method, if the value is
+            set then this value will be used as the value.
+        smoothing_seasonal : float, optional
+            The gamma value of the holt winters seasonal method, if the value is
+            set then this value will be used as the value.
+        damping_slope : float, optional
+            The phi value of the damped method, if the value is
+            set then this value will be used as the value.
+        optimized : bool, optional
+            Should the values that have not been set above be optimized
+            automatically?
+
+        Returns
+        -------
+        results : BatchHoltWintersResults
+        """
+        alpha = smoothing_level
+        beta = smoothing_slope
+        gamma = smoothing_seasonal
+        phi = damping_slope if self.damped else 1.0
+        m = self.seasonal_periods
+        trending = self.trending
+        seasoning = self.seasoning
+
+        l0, b0, s0 = self._initial_values()
+        p = np.zeros((self.n_series, 6 + m))
+        p[:, 3] = l0
+        p[:, 4] = b0
+        p[:, 6:] = s0
+        mle_retvals = None
+        if not optimized:
+            p[:, :3] = [alpha, beta if trending else np.nan,
+                        gamma if seasoning else np.nan]
+            p[:, 5] = phi
+        else:
+            init_alpha = alpha if alpha is not None else 0.5 / max(m, 1)
+            init_beta = (beta if beta is not None else
+                         0.1 * init_alpha if trending else np.nan)
+            init_gamma = np.nan
+            if seasoning:
+                init_gamma = (gamma if gamma is not None else
+                              0.05 * (1 - init_alpha))
+            init_phi = phi if phi is not None else 0.99
+            p[:, :3] = [init_alpha, init_beta, init_gamma]
+            p[:, 5] = init_phi
+            xi = np.array([alpha is None, trending and beta is None,
+                           seasoning and gamma is None, True, trending,
+                           phi is None and self.damped] + [seasoning] * m)
+            txi = xi & np.array(
+                [True, True, True, False, False, True] + [False] * m)
+            bounds = np.array([(0.0, 1.0), (0.0, 1.0), (0.0, 1.0),
+                               (0.0, None), (0.0, None), (0.0, 1.0)] +
+                              [(None, None), ] * m)
+
+            trend = _exponential_smoothers.COMPONENTS[self.trend]
+            seasonal = _exponential_smoothers.COMPONENTS[self.seasonal]
+            max_seen = np.full(self.n_series, np.finfo(np.double).max)
+            if txi.any():
+                # the same grid of starting values as `scipy.optimize.brute`
+                # with Ns=20, searched for all series in one call
+                positions = np.nonzero(txi)[0]
+                axes = np.meshgrid(*[np.linspace(0., 1., 20)] * len(positions),
+                                   indexing='ij')
+                grid = np.column_stack([axis.ravel() for axis in axes])
+                argmin = np.zeros(self.n_series, dtype=np.int64)
+                _exponential_smoothers.brute_batch(
+                    p, positions.astype(np.int64), grid, self.endog, m, trend,
+                    seasonal, max_seen.copy(), argmin, max_seen)
+                p[:, txi] = grid[argmin]
+
+            # local refinement of each series
+            func = _MINIMIZATION_FUNCS[(self.seasonal, self.trend)]
+            xi_u8 = xi.astype(np.uint8)
+            l = np.zeros(self.nobs)
+            b = np.zeros(self.nobs)
+            s = np.zeros(self.nobs + m)
+            mle_retvals = []
+            for i in range(self.n_series):
+                res = minimize(func, p[i, xi],
+                               args=(xi_u8, p[i], self.endog[i], l, b, s, m,
+                                     self.nobs, max_seen[i]),
+                               bounds=bounds[xi])
+                p[i, xi] = res.x
+                mle_retvals.append(res)
+
+        return BatchHoltWintersResults(self, p, mle_retvals=mle_retvals)
+
+    def _smooth(self, p, h=0):
+        """
+        Level, slope and seasonal components and the fitted and forecast
+        values of all series, vectorized over the series as in
+        `ExponentialSmoothing._predict`
+        """
+        y = self.endog
+        n, nobs = y.shape
+        m = self.seasonal_periods
+        alpha, beta, gamma, l0, b0, phi = p[:, :6].T
+        trend = self.trend
+
+        l = np.zeros((n, nobs + h + 1))
+        b = np.zeros((n, nobs + h + 1))
+        s = np.zeros((n, nobs + h + m + 1))
+        l[:, 0] = l0
+        b[:, 0] = b0
+        s[:, :m] = p[:, 6:]
+
+        def trended(l, b):
+            if trend == 'mul':
+                return l * b
+            elif trend == 'add':
+                return l + b
+            return l
+
+        def dampen(b, phi):
+            if trend == 'mul':
+                return b ** phi
+            return b * phi
+
+        for i in range(1, nobs + 1):
+            previous = trended(l[:, i - 1], dampen(b[:, i - 1], phi))
+            if self.seasonal == 'mul':
+                l[:, i] = (alpha * y[:, i - 1] / s[:, i - 1] +
+                           (1 - alpha) * previous)
+                s[:, i + m - 1] = (gamma * y[:, i - 1] / previous +
+                                   (1 - gamma) * s[:, i - 1])
+            elif self.seasonal == 'add':
+                l[:, i] = (alpha * y[:, i - 1] - alpha * s[:, i - 1] +
+                           (1 - alpha) * previous)
+                s[:, i + m - 1] = (gamma * y[:, i - 1] - gamma * previous +
+                                   (1 - gamma) * s[:, i - 1])
+            else:
+                l[:, i] = alpha * y[:, i - 1] + (1 - alpha) * previous
+            if trend == 'mul':
+                b[:, i] = (beta * (l[:, i] / l[:, i - 1]) +
+                           (1 - beta) * dampen(b[:, i - 1], phi))
+            elif trend == 'add':
+                b[:, i] = (beta * (l[:, i] - l[:, i - 1]) +
+                           (1 - beta) * dampen(b[:, i - 1], phi))
+
+        level = l[:, 1:nobs + 1].copy()
+        slope = b[:, 1:nobs + 1].copy()
+        season = s[:, m:nobs + m].copy()
+        l[:, nobs:] = l[:, nobs:nobs + 1]
+        if self.trending:
+            steps = np.arange(1, h + 2)
+            if self.damped:
+                phi_h = np.cumsum(phi[:, None] ** steps, axis=1)
+            else:
+                phi_h = np.repeat(steps[None, :], n, axis=0)
+            b[:, :nobs] = dampen(b[:, :nobs], phi[:, None])
+            b[:, nobs:] = dampen(b[:, nobs:nobs + 1], phi_h)
+        fitted = trended(l, b)
+        if self.seasoning:
+            s[:, nobs + m - 1:] = s[:, nobs - 1 + np.arange(h + 2) % m]
+            if self.seasonal == 'mul':
+                fitted = fitted * s[:, :-m]
+            else:
+                fitted = fitted + s[:, :-m]
+        return fitted, level, slope, season
+
+
+class BatchHoltWintersResults(object):
+    """
+    Results of Holt Winter's Exponential Smoothing for many series
+
+    Parameters
+    ----------
+    model : BatchExponentialSmoothing instance
+        The model containing all series.
+    params : ndarray
+        Parameters of each series, shape (n_series, 6 + seasonal_periods),
+        in the internal order of the minimization functions.
+    **kwds
+        Optimization details, attached as attributes.
+
+    Attributes
+    ----------
+    params : ndarray or DataFrame
+        Parameter estimates, one row for each series. Parameters that are
+        not part of the model are NaN.
+    fittedvalues, resid, level, slope, season : ndarray or DataFrame
+        Arrays with shape (n_series, nobs).
+    sse, aic, aicc, bic : ndarray or Series
+        Statistics with one element for each series.
+    k : int
+        the k parameter used to remove the bias in AIC, BIC etc.
+    mle_retvals : list
+        The optimization results of each series, None if the parameters
+        were not optimized.
+
+    Notes
+    -----
+    If the series were provided with labels, in a dict or in the columns of
+    a DataFrame, then the results are returned as pandas objects indexed by
+    the series labels.
+    """
+
+    def __init__(self, model, params, **kwds):
+        self.model = model
+        self._params = params
+        self.__dict__.update(kwds)
+        self.n_series = model.n_series
+        self.nobs = model.nobs
+
+        fitted, level, slope, season = model._smooth(params)
+        nobs = self.nobs
+        self._fittedvalues = fitted[:, :nobs]
+        self._level = level
+        self._slope = slope
+        self._season = season
+        self._resid = model.endog - self._fittedvalues
+        self._sse = (self._resid ** 2).sum(1)
+
+        m = model.seasonal_periods
+        self.k = k = (m * model.seasoning + 2 * model.trending + 2 +
+                      1 * model.damped)
+        self._aic = nobs * np.log(self._sse / nobs) + k * 2
+        self._aicc = self._aic + (2 * (k + 2) * (k + 3)) / (nobs - k - 3)
+        self._bic = nobs * np.log(self._sse / nobs) + k * np.log(nobs)
+
+    def __len__(self):
+        return self.n_series
+
+    def _wrap(self, arr, columns=None):
+        names = self.model.series_names
+        if names is None:
+            return arr
+        if arr.ndim == 1:
+            return pd.Series(arr, index=names)
+        return pd.DataFrame(arr, index=names, columns=columns)
+
+    @cache_readonly
+    def params(self):
+        p = self._params
+        params = np.column_stack([p[:, 0], p[:, 1], p[:, 2], p[:, 5],
+                                  p[:, 3], p[:, 4], p[:, 6:]])
+        if not self.model.damped:
+            params[:, 3] = np.nan
+        return self._wrap(params, columns=self.model.param_names)
+
+    @cache_readonly
+    def fittedvalues(self):
+        return self._wrap(self._fittedvalues)
+
+    @cache_readonly
+    def resid(self):
+        return self._wrap(self._resid)
+
+    @cache_readonly
+    def level(self):
+        return self._wrap(self._level)
+
+    @cache_readonly
+    def slope(self):
+        return self._wrap(self._slope)
+
+    @cache_readonly
+    def season(self):
+        return self._wrap(self._season)
+
+    @cache_readonly
+    def sse(self):
+        return self._wrap(self._sse)
+
+    @cache_readonly
+    def aic(self):
+        return self._wrap(self._aic)
+
+    @cache_readonly
+    def aicc(self):
+        return self._wrap(self._aicc)
+
+    @cache_readonly
+    def bic(self):
+        return self._wrap(self._bic)
+
+    def forecast(self, steps=1):
+        """
+        Out-of-sample forecasts of all series
+
+        Parameters
+        ----------
+        steps : int
+            The number of out of sample forecasts from the end of the
+            sample.
+
+        Returns
+        -------
+        forecast : ndarray or DataFrame
+            Forecasts with shape (n_series, steps).
+        """
+        fitted = self.model._smooth(self._params, h=steps)[0]
+        forecasts = fitted[:, self.nobs:self.nobs + steps]
+        return self._wrap(forecasts, columns=np.arange(1, steps + 1))
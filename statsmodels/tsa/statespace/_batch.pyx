@@ -0,0 +1,522 @@
+#cython: boundscheck=False
+#cython: wraparound=False
+#cython: cdivision=False
+"""
+State Space Model - Batched Kalman filter
+
+Kalman filter for many independent univariate time series that share the
+dimension of the state vector. Each series has its own time-invariant system
+matrices, so that the same model with series-specific parameters can be
+evaluated for all series in one call.
+
+License: Simplified-BSD
+"""
+
+# Typical imports
+cimport numpy as np
+cimport cython
+import numpy as np
+
+np.import_array()
+
+from statsmodels.src.math cimport *
+
+def sbatch_filter(np.float64_t [:, :] endog,
+                           np.int64_t [:] index,
+                           np.int64_t [:] start,
+                           np.int64_t [:] loglikelihood_burn,
+                           np.float32_t [:, :] design,
+                           np.float32_t [:] obs_intercept,
+                           np.float32_t [:] obs_cov,
+                           np.float32_t [:, :, :] transition,
+                           np.float32_t [:, :] state_intercept,
+                           np.float32_t [:, :, :] selected_state_cov,
+                           np.float32_t [:, :] state,
+                           np.float32_t [:, :, :] state_cov,
+                           np.float32_t [:] loglikelihood):
+    """
+    Kalman filter loglikelihood for a batch of univariate series
+
+    Parameters
+    ----------
+    endog : array
+        Observations with shape (n_endog_series, nobs). Missing values are
+        nan.
+    index : array
+        Rows of `endog` that are filtered, with shape (n_series,). All other
+        arrays refer to these series in the same order.
+    start : array
+        First period of each series that is filtered, shape (n_series,).
+    loglikelihood_burn : array
+        Number of periods after `start` that are not included in the
+        loglikelihood, shape (n_series,).
+    design, obs_intercept, obs_cov : array
+        Time-invariant observation equation, with shapes (n_series, k_states)
+        and (n_series,).
+    transition, state_intercept, selected_state_cov : array
+        Time-invariant state equation with shapes
+        (n_series, k_states, k_states), (n_series, k_states) and
+        (n_series, k_states, k_states). `selected_state_cov` is
+        :math:`R Q R'`.
+    state, state_cov : array
+        Initial state and state covariance matrix with shapes
+        (n_series, k_states) and (n_series, k_states, k_states). On return
+        they contain the predicted state and state covariance matrix for the
+        period following the last observation.
+    loglikelihood : array
+        Output array with shape (n_series,) for the loglikelihood of each
+        series.
+    """
+    cdef:
+        int i, j, k, l, t, row
+        int n_series = index.shape[0]
+        int k_states = design.shape[1]
+        int nobs = endog.shape[1]
+        np.float64_t y
+        np.float32_t forecast, forecast_error, forecast_error_cov, llf
+        np.float32_t value
+        np.float32_t [:] pz, filtered_state
+        np.float32_t [:, :] filtered_state_cov, tmp
+
+    pz = np.zeros(k_states, dtype=np.float32)
+    filtered_state = np.zeros(k_states, dtype=np.float32)
+    filtered_state_cov = np.zeros((k_states, k_states), dtype=np.float32)
+    tmp = np.zeros((k_states, k_states), dtype=np.float32)
+
+    for i in range(n_series):
+        row = index[i]
+        llf = 0
+        for t in range(start[i], nobs):
+            y = endog[row, t]
+            if y == y:
+                # Forecast and forecast error covariance
+                forecast = obs_intercept[i]
+                forecast_error_cov = obs_cov[i]
+                for j in range(k_states):
+                    value = 0
+                    for k in range(k_states):
+                        value = value + state_cov[i, j, k] * design[i, k]
+                    pz[j] = value
+                    forecast = forecast + design[i, j] * state[i, j]
+                for j in range(k_states):
+                    forecast_error_cov = (forecast_error_cov +
+                                          design[i, j] * pz[j])
+                forecast_error = y - forecast
+
+                if t - start[i] >= loglikelihood_burn[i]:
+                    llf = llf - 0.5 * (
+                        dlog(2 * NPY_PI) +
+                        dlog(forecast_error_cov) +
+                        forecast_error**2 / forecast_error_cov)
+
+                # Updating step
+                for j in range(k_states):
+                    filtered_state[j] = (state[i, j] + pz[j] *
+                                         forecast_error / forecast_error_cov)
+                    for k in range(k_states):
+                        filtered_state_cov[j, k] = (
+                            state_cov[i, j, k] -
+                            pz[j] * pz[k] / forecast_error_cov)
+            else:
+                for j in range(k_states):
+                    filtered_state[j] = state[i, j]
+                    for k in range(k_states):
+                        filtered_state_cov[j, k] = state_cov[i, j, k]
+
+            # Prediction step
+            for j in range(k_states):
+                value = state_intercept[i, j]
+                for k in range(k_states):
+                    value = value + transition[i, j, k] * filtered_state[k]
+                state[i, j] = value
+                for k in range(k_states):
+                    value = 0
+                    for l in range(k_states):
+                        value = (value + transition[i, j, l] *
+                                 filtered_state_cov[l, k])
+                    tmp[j, k] = value
+            # The predicted state covariance matrix is kept symmetric
+            for j in range(k_states):
+                for k in range(j, k_states):
+                    value = selected_state_cov[i, j, k]
+                    for l in range(k_states):
+                        value = value + tmp[j, l] * transition[i, k, l]
+                    state_cov[i, j, k] = value
+                    state_cov[i, k, j] = value
+
+        loglikelihood[i] = llf
+
+def dbatch_filter(np.float64_t [:, :] endog,
+                           np.int64_t [:] index,
+                           np.int64_t [:] start,
+                           np.int64_t [:] loglikelihood_burn,
+                           np.float64_t [:, :] design,
+                           np.float64_t [:] obs_intercept,
+                           np.float64_t [:] obs_cov,
+                           np.float64_t [:, :, :] transition,
+                           np.float64_t [:, :] state_intercept,
+                           np.float64_t [:, :, :] selected_state_cov,
+                           np.float64_t [:, :] state,
+                           np.float64_t [:, :, :] state_cov,
+                           np.float64_t [:] loglikelihood):
+    """
+    Kalman filter loglikelihood for a batch of univariate series
+
+    Parameters
+    ----------
+    endog : array
+        Observations with shape (n_endog_series, nobs). Missing values are
+        nan.
+    index : array
+        Rows of `endog` that are filtered, with shape (n_series,). All other
+        arrays refer to these series in the same order.
+    start : array
+        First period of each series that is filtered, shape (n_series,).
+    loglikelihood_burn : array
+        Number of periods after `start` that are not included in the
+        loglikelihood, shape (n_series,).
+    design, obs_intercept, obs_cov : array
+        Time-invariant observation equation, with shapes (n_series, k_states)
+        and (n_series,).
+    transition, state_intercept, selected_state_cov : array
+        Time-invariant state equation with shapes
+        (n_series, k_states, k_states), (n_series, k_states) and
+        (n_series, k_states, k_states). `selected_state_cov` is
+        :math:`R Q R'`.
+    state, state_cov : array
+        Initial state and state covariance matrix with shapes
+        (n_series, k_states) and (n_series, k_states, k_states). On return
+        they contain the predicted state and state covariance matrix for the
+        period following the last observation.
+    loglikelihood : array
+        Output array with shape (n_series,) for the loglikelihood of each
+        series.
+    """
+    cdef:
+        int i, j, k, l, t, row
+        int n_series = index.shape[0]
+        int k_states = design.shape[1]
+        int nobs = endog.shape[1]
+        np.float64_t y
+        np.float64_t forecast, forecast_error, forecast_error_cov, llf
+        np.float64_t value
+        np.float64_t [:] pz, filtered_state
+        np.float64_t [:, :] filtered_state_cov, tmp
+
+    pz = np.zeros(k_states, dtype=float)
+    filtered_state = np.zeros(k_states, dtype=float)
+    filtered_state_cov = np.zeros((k_states, k_states), dtype=float)
+    tmp = np.zeros((k_states, k_states), dtype=float)
+
+    for i in range(n_series):
+        row = index[i]
+        llf = 0
+        for t in range(start[i], nobs):
+            y = endog[row, t]
+            if y == y:
+                # Forecast and forecast error covariance
+                forecast = obs_intercept[i]
+                forecast_error_cov = obs_cov[i]
+                for j in range(k_states):
+                    value = 0
+                    for k in range(k_states):
+                        value = value + state_cov[i, j, k] * design[i, k]
+                    pz[j] = value
+                    forecast = forecast + design[i, j] * state[i, j]
+                for j in range(k_states):
+                    forecast_error_cov = (forecast_error_cov +
+                                          design[i, j] * pz[j])
+                forecast_error = y - forecast
+
+                if t - start[i] >= loglikelihood_burn[i]:
+                    llf = llf - 0.5 * (
+                        dlog(2 * NPY_PI) +
+                        dlog(forecast_error_cov) +
+                        forecast_error**2 / forecast_error_cov)
+
+                # Updating step
+                for j in range(k_states):
+                    filtered_state[j] = (state[i, j] + pz[j] *
+                                         forecast_error / forecast_error_cov)
+                    for k in range(k_states):
+                        filtered_state_cov[j, k] = (
+                            state_cov[i, j, k] -
+                            pz[j] * pz[k] / forecast_error_cov)
+            else:
+                for j in range(k_states):
+                    filtered_state[j] = state[i, j]
+                    for k in range(k_states):
+                        filtered_state_cov[j, k] = state_cov[i, j, k]
+
+            # Prediction step
+            for j in range(k_states):
+                value = state_intercept[i, j]
+                for k in range(k_states):
+                    value = value + transition[i, j, k] * filtered_state[k]
+                state[i, j] = value
+                for k in range(k_states):
+                    value = 0
+                    for l in range(k_states):
+                        value = (value + transition[i, j, l] *
+                                 filtered_state_cov[l, k])
+                    tmp[j, k] = value
+            # The predicted state covariance matrix is kept symmetric
+            for j in range(k_states):
+                for k in range(j, k_states):
+                    value = selected_state_cov[i, j, k]
+                    for l in range(k_states):
+                        value = value + tmp[j, l] * transition[i, k, l]
+                    state_cov[i, j, k] = value
+                    state_cov[i, k, j] = value
+
+        loglikelihood[i] = llf
+
+def cbatch_filter(np.float64_t [:, :] endog,
+                           np.int64_t [:] index,
+                           np.int64_t [:] start,
+                           np.int64_t [:] loglikelihood_burn,
+                           np.complex64_t [:, :] design,
+                           np.complex64_t [:] obs_intercept,
+                           np.complex64_t [:] obs_cov,
+                           np.complex64_t [:, :, :] transition,
+                           np.complex64_t [:, :] state_intercept,
+                           np.complex64_t [:, :, :] selected_state_cov,
+                           np.complex64_t [:, :] state,
+                           np.complex64_t [:, :, :] state_cov,
+                           np.complex64_t [:] loglikelihood):
+    """
+    Kalman filter loglikelihood for a batch of univariate series
+
+    Parameters
+    ----------
+    endog : array
+        Observations with shape (n_endog_series, nobs). Missing values are
+        nan.
+    index : array
+        Rows of `endog` that are filtered, with shape (n_series,). All other
+        arrays refer to these series in the same order.
+    start : array
+        First period of each series that is filtered, shape (n_series,).
+    loglikelihood_burn : array
+        Number of periods after `start` that are not included in the
+        loglikelihood, shape (n_series,).
+    design, obs_intercept, obs_cov : array
+        Time-invariant observation equation, with shapes (n_series, k_states)
+        and (n_series,).
+    transition, state_intercept, selected_state_cov : array
+        Time-invariant state equation with shapes
+        (n_series, k_states, k_states), (n_series, k_states) and
+        (n_series, k_states, k_states). `selected_state_cov` is
+        :math:`R Q R'`.
+    state, state_cov : array
+        Initial state and state covariance matrix with shapes
+        (n_series, k_states) and (n_series, k_states, k_states). On return
+        they contain the predicted state and state covariance matrix for the
+        period following the last observation.
+    loglikelihood : array
+        Output array with shape (n_series,) for the loglikelihood of each
+        series.
+    """
+    cdef:
+        int i, j, k, l, t, row
+        int n_series = index.shape[0]
+        int k_states = design.shape[1]
+        int nobs = endog.shape[1]
+        np.float64_t y
+        np.complex64_t forecast, forecast_error, forecast_error_cov, llf
+        np.complex64_t value
+        np.complex64_t [:] pz, filtered_state
+        np.complex64_t [:, :] filtered_state_cov, tmp
+
+    pz = np.zeros(k_states, dtype=np.complex64)
+    filtered_state = np.zeros(k_states, dtype=np.complex64)
+    filtered_state_cov = np.zeros((k_states, k_states), dtype=np.complex64)
+    tmp = np.zeros((k_states, k_states), dtype=np.complex64)
+
+    for i in range(n_series):
+        row = index[i]
+        llf = 0
+        for t in range(start[i], nobs):
+            y = endog[row, t]
+            if y == y:
+                # Forecast and forecast error covariance
+                forecast = obs_intercept[i]
+                forecast_error_cov = obs_cov[i]
+                for j in range(k_states):
+                    value = 0
+                    for k in range(k_states):
+                        value = value + state_cov[i, j, k] * design[i, k]
+                    pz[j] = value
+                    forecast = forecast + design[i, j] * state[i, j]
+                for j in range(k_states):
+                    forecast_error_cov = (forecast_error_cov +
+                                          design[i, j] * pz[j])
+                forecast_error = y - forecast
+
+                if t - start[i] >= loglikelihood_burn[i]:
+                    llf = llf - 0.5 * (
+                        zlog(2 * NPY_PI) +
+                        zlog(forecast_error_cov) +
+                        forecast_error**2 / forecast_error_cov)
+
+                # Updating step
+                for j in range(k_states):
+                    filtered_state[j] = (state[i, j] + pz[j] *
+                                         forecast_error / forecast_error_cov)
+                    for k in range(k_states):
+                        filtered_state_cov[j, k] = (
+                            state_cov[i, j, k] -
+                            pz[j] * pz[k] / forecast_error_cov)
+            else:
+                for j in range(k_states):
+                    filtered_state[j] = state[i, j]
+                    for k in range(k_states):
+                        filtered_state_cov[j, k] = state_cov[i, j, k]
+
+            # Prediction step
+            for j in range(k_states):
+                value = state_intercept[i, j]
+                for k in range(k_states):
+                    value = value + transition[i, j, k] * filtered_state[k]
+                state[i, j] = value
+                for k in range(k_states):
+                    value = 0
+                    for l in range(k_states):
+                        value = (value + transition[i, j, l] *
+                                 filtered_state_cov[l, k])
+                    tmp[j, k] = value
+            # The predicted state covariance matrix is kept symmetric
+            for j in range(k_states):
+                for k in range(j, k_states):
+                    value = selected_state_cov[i, j, k]
+                    for l in range(k_states):
+                        value = value + tmp[j, l] * transition[i, k, l]
+                    state_cov[i, j, k] = value
+                    state_cov[i, k, j] = value
+
+        loglikelihood[i] = llf
+
+def zbatch_filter(np.float64_t [:, :] endog,
+                           np.int64_t [:] index,
+                           np.int64_t [:] start,
+                           np.int64_t [:] loglikelihood_burn,
+                           np.complex128_t [:, :] design,
+                           np.complex128_t [:] obs_intercept,
+                           np.complex128_t [:] obs_cov,
+                           np.complex128_t [:, :, :] transition,
+                           np.complex128_t [:, :] state_intercept,
+                           np.complex128_t [:, :, :] selected_state_cov,
+                           np.complex128_t [:, :] state,
+                           np.complex128_t [:, :, :] state_cov,
+                           np.complex128_t [:] loglikelihood):
+    """
+    Kalman filter loglikelihood for a batch of univariate series
+
+    Parameters
+    ----------
+    endog : array
+        Observations with shape (n_endog_series, nobs). Missing values are
+        nan.
+    index : array
+        Rows of `endog` that are filtered, with shape (n_series,). All other
+        arrays refer to these series in the same order.
+    start : array
+        First period of each series that is filtered, shape (n_series,).
+    loglikelihood_burn : array
+        Number of periods after `start` that are not included in the
+        loglikelihood, shape (n_series,).
+    design, obs_intercept, obs_cov : array
+        Time-invariant observation equation, with shapes (n_series, k_states)
+        and (n_series,).
+    transition, state_intercept, selected_state_cov : array
+        Time-invariant state equation with shapes
+        (n_series, k_states, k_states), (n_series, k_states) and
+        (n_series, k_states, k_states). `selected_state_cov` is
+        :math:`R Q R'`.
+    state, state_cov : array
+        Initial state and state covariance matrix with shapes
+        (n_series, k_states) and (n_series, k_states, k_states). On return
+        they contain the predicted state and state covariance matrix for the
+        period following the last observation.
+    loglikelihood : array
+        Output array with shape (n_series,) for the loglikelihood of each
+        series.
+    """
+    cdef:
+        int i, j, k, l, t, row
+        int n_series = index.shape[0]
+        int k_states = design.shape[1]
+        int nobs = endog.shape[1]
+        np.float64_t y
+        np.complex128_t forecast, forecast_error, forecast_error_cov, llf
+        np.complex128_t value
+        np.complex128_t [:] pz, filtered_state
+        np.complex128_t [:, :] filtered_state_cov, tmp
+
+    pz = np.zeros(k_states, dtype=complex)
+    filtered_state = np.zeros(k_states, dtype=complex)
+    filtered_state_cov = np.zeros((k_states, k_states), dtype=complex)
+    tmp = np.zeros((k_states, k_states), dtype=complex)
+
+    for i in range(n_series):
+        row = index[i]
+        llf = 0
+        for t in range(start[i], nobs):
+            y = endog[row, t]
+            if y == y:
+                # Forecast and forecast error covariance
+                forecast = obs_intercept[i]
+                forecast_error_cov = obs_cov[i]
+                for j in range(k_states):
+                    value = 0
+                    for k in range(k_states):
+                        value = value + state_cov[i, j, k] * design[i, k]
+                    pz[j] = value
+                    forecast = forecast + design[i, j] * state[i, j]
+                for j in range(k_states):
+                    forecast_error_cov = (forecast_error_cov +
+                                          design[i, j] * pz[j])
+                forecast_error = y - forecast
+
+                if t - start[i] >= loglikelihood_burn[i]:
+                    llf = llf - 0.5 * (
+                        zlog(2 * NPY_PI) +
+                        zlog(forecast_error_cov) +
+                        forecast_error**2 / forecast_error_cov)
+
+                # Updating step
+                for j in range(k_states):
+                    filtered_state[j] = (state[i, j] + pz[j] *
+                                         forecast_error / forecast_error_cov)
+                    for k in range(k_states):
+                        filtered_state_cov[j, k] = (
+                            state_cov[i, j, k] -
+                            pz[j] * pz[k] / forecast_error_cov)
+            else:
+                for j in range(k_states):
+                    filtered_state[j] = state[i, j]
+                    for k in range(k_states):
+                        filtered_state_cov[j, k] = state_cov[i, j, k]
+
+            # Prediction step
+            for j in range(k_states):
+                value = state_intercept[i, j]
+                for k in range(k_states):
+                    value = value + transition[i, j, k] * filtered_state[k]
+                state[i, j] = value
+                for k in range(k_states):
+                    value = 0
+                    for l in range(k_states):
+                        value = (value + transition[i, j, l] *
+                                 filtered_state_cov[l, k])
+                    tmp[j, k] = value
+            # The predicted state covariance matrix is kept symmetric
+            for j in range(k_states):
+                for k in range(j, k_states):
+                    value = selected_state_cov[i, j, k]
+                    for l in range(k_states):
+                        value = value + tmp[j, l] * transition[i, k, l]
+                    state_cov[i, j, k] = value
+                    state_cov[i, k, j] = value
+
+        loglikelihood[i] = llf
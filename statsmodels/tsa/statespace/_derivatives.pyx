@@ -0,0 +1,1306 @@
+#cython: boundscheck=False
+#cython: wraparound=False
+#cython: cdivision=False
+"""
+State Space Model - Loglikelihood derivatives
+
+Analytic derivatives of the Gaussian loglikelihood of a univariate state
+space model, computed by running the derivative Kalman filter recursions
+alongside the Kalman filter in a single forward pass.
+
+License: Simplified-BSD
+"""
+
+# Typical imports
+cimport numpy as np
+cimport cython
+import numpy as np
+
+np.import_array()
+
+from libc.math cimport fabs
+from statsmodels.src.math cimport *
+
+def sloglikelihood_derivatives(np.float32_t [:] endog,
+                                        int loglikelihood_burn,
+                                        np.float32_t [:] design,
+                                        np.float32_t [:] obs_intercept,
+                                        np.float32_t obs_cov,
+                                        np.float32_t [:, :] transition,
+                                        np.float32_t [:, :] state_intercept,
+                                        np.float32_t [:, :] selected_state_cov,
+                                        np.float32_t [:] initial_state,
+                                        np.float32_t [:, :] initial_state_cov,
+                                        np.float32_t [:, :] partials_design,
+                                        np.float32_t [:, :] partials_obs_intercept,
+                                        np.float32_t [:] partials_obs_cov,
+                                        np.float32_t [:, :, :] partials_transition,
+                                        np.float32_t [:, :, :] partials_state_intercept,
+                                        np.float32_t [:, :, :] partials_selected_state_cov,
+                                        np.float32_t [:, :] partials_initial_state,
+                                        np.float32_t [:, :, :] partials_initial_state_cov,
+                                        np.float32_t [:, :] score_obs,
+                                        np.float32_t [:, :] information_matrix,
+                                        np.float64_t tolerance=0):
+    """
+    Loglikelihood, score and information matrix of a univariate model
+
+    Parameters
+    ----------
+    endog : array
+        Observations with shape (nobs,). Missing values are nan.
+    loglikelihood_burn : int
+        Number of initial periods not included in the loglikelihood.
+    design, obs_intercept, obs_cov : array
+        Observation equation, with shapes (k_states,), (n_obs_intercept,) and
+        a scalar. The observation intercept is time-varying if
+        `n_obs_intercept` is equal to `nobs`.
+    transition, state_intercept, selected_state_cov : array
+        State equation, with shapes (k_states, k_states),
+        (k_states, n_state_intercept) and (k_states, k_states). The state
+        intercept is time-varying if `n_state_intercept` is equal to `nobs`.
+        `selected_state_cov` is :math:`R Q R'`.
+    initial_state, initial_state_cov : array
+        Initial state and state covariance matrix.
+    partials_* : array
+        Partial derivatives of each of the above with respect to each of
+        the `k_params` parameters, with the parameter as the first dimension.
+    score_obs : array
+        Output array with shape (nobs, k_params) for the score of each
+        observation.
+    information_matrix : array
+        Output array with shape (k_params, k_params) for the (summed)
+        information matrix of Harvey (1989), section 3.4.6.
+    tolerance : float, optional
+        Once the summed squared change in the predicted state covariance
+        matrix and its derivatives falls below the tolerance, they are held
+        fixed at their steady-state values. Default is 0, so that the
+        recursions are always used.
+
+    Returns
+    -------
+    loglikelihood : scalar
+        The loglikelihood, summed over all periods after the burn.
+
+    Notes
+    -----
+    For each parameter, the recursions differentiate the forecast error
+    :math:`v_t`, its variance :math:`F_t`, and the predicted state and state
+    covariance matrix; see Harvey (1989), section 3.4.5.
+    The cost is that of running `k_params` filters for the state covariance
+    derivatives, but all in a single pass without any Python overhead.
+    """
+    cdef:
+        int i, j, k, l, t
+        int nobs = endog.shape[0]
+        int k_states = design.shape[0]
+        int k_params = partials_design.shape[0]
+        int obs_intercept_t, state_intercept_t, converged = 0
+        np.float64_t change
+        np.float32_t y, forecast_error, forecast_error_cov, value, llf = 0
+        np.float32_t [:] pz, filtered_state, partials_forecast_error
+        np.float32_t [:] partials_forecast_error_cov
+        np.float32_t [:, :] filtered_state_cov, tmp, tmp2, partials_tmp, dpz
+        np.float32_t [:, :] partials_state, partials_filtered_state
+        np.float32_t [:, :, :] partials_state_cov
+        np.float32_t [:, :, :] partials_filtered_state_cov
+        np.float32_t [:] state
+        np.float32_t [:, :] state_cov
+
+    state = np.array(initial_state, dtype=np.float32)
+    state_cov = np.array(initial_state_cov, dtype=np.float32)
+    partials_state = np.array(partials_initial_state, dtype=np.float32)
+    partials_state_cov = np.array(partials_initial_state_cov, dtype=np.float32)
+
+    pz = np.zeros(k_states, dtype=np.float32)
+    filtered_state = np.zeros(k_states, dtype=np.float32)
+    filtered_state_cov = np.zeros((k_states, k_states), dtype=np.float32)
+    tmp = np.zeros((k_states, k_states), dtype=np.float32)
+    tmp2 = np.zeros((k_states, k_states), dtype=np.float32)
+    partials_tmp = np.zeros((k_states, k_states), dtype=np.float32)
+    dpz = np.zeros((k_params, k_states), dtype=np.float32)
+    partials_forecast_error = np.zeros(k_params, dtype=np.float32)
+    partials_forecast_error_cov = np.zeros(k_params, dtype=np.float32)
+    partials_filtered_state = np.zeros((k_params, k_states), dtype=np.float32)
+    partials_filtered_state_cov = np.zeros((k_params, k_states, k_states),
+                                           dtype=np.float32)
+
+    score_obs[:, :] = 0
+    information_matrix[:, :] = 0
+
+    for t in range(nobs):
+        obs_intercept_t = t if obs_intercept.shape[0] == nobs else 0
+        state_intercept_t = t if state_intercept.shape[1] == nobs else 0
+
+        y = endog[t]
+        if y == y:
+            # Forecast error and its variance
+            forecast_error = y - obs_intercept[obs_intercept_t]
+            for j in range(k_states):
+                forecast_error = forecast_error - design[j] * state[j]
+            if not converged:
+                forecast_error_cov = obs_cov
+                for j in range(k_states):
+                    value = 0
+                    for k in range(k_states):
+                        value = value + state_cov[j, k] * design[k]
+                    pz[j] = value
+                for j in range(k_states):
+                    forecast_error_cov = forecast_error_cov + design[j] * pz[j]
+
+            # Derivatives of the forecast error and its variance
+            for i in range(k_params):
+                value = -partials_obs_intercept[i, obs_intercept_t]
+                for j in range(k_states):
+                    value = value - (partials_design[i, j] * state[j] +
+                                     design[j] * partials_state[i, j])
+                partials_forecast_error[i] = value
+
+                if converged:
+                    continue
+
+                # d(P Z') = dP Z' + P dZ'
+                for j in range(k_states):
+                    value = 0
+                    for k in range(k_states):
+                        value = value + (
+                            partials_state_cov[i, j, k] * design[k] +
+                            state_cov[j, k] * partials_design[i, k])
+                    dpz[i, j] = value
+
+                # dF = dZ P Z' + Z d(P Z') + dH
+                value = partials_obs_cov[i]
+                for j in range(k_states):
+                    value = value + (partials_design[i, j] * pz[j] +
+                                     design[j] * dpz[i, j])
+                partials_forecast_error_cov[i] = value
+
+            if t >= loglikelihood_burn:
+                llf = llf - 0.5 * (
+                    dlog(2 * NPY_PI) +
+                    dlog(forecast_error_cov) +
+                    forecast_error**2 / forecast_error_cov)
+
+                for i in range(k_params):
+                    score_obs[t, i] = -0.5 * (
+                        partials_forecast_error_cov[i] / forecast_error_cov +
+                        2 * partials_forecast_error[i] * forecast_error /
+                        forecast_error_cov -
+                        partials_forecast_error_cov[i] * forecast_error**2 /
+                        forecast_error_cov**2)
+                    for j in range(i + 1):
+                        value = (
+                            0.5 * partials_forecast_error_cov[i] *
+                            partials_forecast_error_cov[j] /
+                            forecast_error_cov**2 +
+                            partials_forecast_error[i] *
+                            partials_forecast_error[j] / forecast_error_cov)
+                        information_matrix[i, j] = (
+                            information_matrix[i, j] + value)
+                        if j < i:
+                            information_matrix[j, i] = (
+                                information_matrix[j, i] + value)
+
+            # Updating step
+            for j in range(k_states):
+                filtered_state[j] = (state[j] + pz[j] * forecast_error /
+                                     forecast_error_cov)
+                if not converged:
+                    for k in range(k_states):
+                        filtered_state_cov[j, k] = (
+                            state_cov[j, k] -
+                            pz[j] * pz[k] / forecast_error_cov)
+
+            # Derivatives of the updating step, using the derivative of the
+            # Kalman gain K = P Z' / F:
+            # dK = d(P Z') / F - P Z' dF / F^2
+            for i in range(k_params):
+                for j in range(k_states):
+                    value = (dpz[i, j] / forecast_error_cov -
+                             pz[j] * partials_forecast_error_cov[i] /
+                             forecast_error_cov**2)
+                    partials_filtered_state[i, j] = (
+                        partials_state[i, j] + value * forecast_error +
+                        pz[j] * partials_forecast_error[i] /
+                        forecast_error_cov)
+                    if converged:
+                        continue
+                    for k in range(j, k_states):
+                        value = (
+                            partials_state_cov[i, j, k] -
+                            (dpz[i, j] * pz[k] + pz[j] * dpz[i, k]) /
+                            forecast_error_cov +
+                            pz[j] * pz[k] * partials_forecast_error_cov[i] /
+                            forecast_error_cov**2)
+                        partials_filtered_state_cov[i, j, k] = value
+                        partials_filtered_state_cov[i, k, j] = value
+        else:
+            # The covariance matrices are no longer in the steady state
+            converged = 0
+            for j in range(k_states):
+                filtered_state[j] = state[j]
+                for k in range(k_states):
+                    filtered_state_cov[j, k] = state_cov[j, k]
+            for i in range(k_params):
+                for j in range(k_states):
+                    partials_filtered_state[i, j] = partials_state[i, j]
+                    for k in range(k_states):
+                        partials_filtered_state_cov[i, j, k] = (
+                            partials_state_cov[i, j, k])
+
+        # Prediction step
+        for j in range(k_states):
+            value = state_intercept[j, state_intercept_t]
+            for k in range(k_states):
+                value = value + transition[j, k] * filtered_state[k]
+            state[j] = value
+        for i in range(k_params):
+            for j in range(k_states):
+                value = partials_state_intercept[i, j, state_intercept_t]
+                for k in range(k_states):
+                    if transition[j, k] != 0:
+                        value = value + (transition[j, k] *
+                                         partials_filtered_state[i, k])
+                    if partials_transition[i, j, k] != 0:
+                        value = value + (partials_transition[i, j, k] *
+                                         filtered_state[k])
+                partials_state[i, j] = value
+
+        # Once the state covariance matrix and its derivatives have converged
+        # to the steady state, they are no longer updated
+        if converged:
+            continue
+        change = 0
+
+        # T P_{t|t}, skipping the zero elements of the (usually sparse)
+        # transition matrix
+        tmp[:, :] = 0
+        for j in range(k_states):
+            for l in range(k_states):
+                if transition[j, l] == 0:
+                    continue
+                for k in range(k_states):
+                    tmp[j, k] = (tmp[j, k] +
+                                 transition[j, l] * filtered_state_cov[l, k])
+        # T P_{t|t} T' + R Q R'
+        tmp2[:, :] = selected_state_cov
+        for k in range(k_states):
+            for l in range(k_states):
+                if transition[k, l] == 0:
+                    continue
+                for j in range(k_states):
+                    tmp2[j, k] = tmp2[j, k] + tmp[j, l] * transition[k, l]
+        # The predicted state covariance matrix is kept symmetric
+        for j in range(k_states):
+            for k in range(j, k_states):
+                value = tmp2[j, k]
+                change = change + fabs(value - state_cov[j, k])**2
+                state_cov[j, k] = value
+                state_cov[k, j] = value
+
+        # Derivatives of the prediction step, where tmp = T P_{t|t}:
+        # dP_{t+1} = dT P_{t|t} T' + T P_{t|t} dT' + T dP_{t|t} T' + dRQR'
+        for i in range(k_params):
+            # T dP_{t|t}
+            partials_tmp[:, :] = 0
+            for j in range(k_states):
+                for l in range(k_states):
+                    if transition[j, l] == 0:
+                        continue
+                    for k in range(k_states):
+                        partials_tmp[j, k] = (
+                            partials_tmp[j, k] + transition[j, l] *
+                            partials_filtered_state_cov[i, l, k])
+            # T dP_{t|t} T' + dRQR'
+            tmp2[:, :] = partials_selected_state_cov[i]
+            for k in range(k_states):
+                for l in range(k_states):
+                    if transition[k, l] == 0:
+                        continue
+                    for j in range(k_states):
+                        tmp2[j, k] = (tmp2[j, k] +
+                                      partials_tmp[j, l] * transition[k, l])
+            # dT P_{t|t} T' and its transpose
+            for j in range(k_states):
+                for l in range(k_states):
+                    if partials_transition[i, j, l] == 0:
+                        continue
+                    for k in range(k_states):
+                        value = partials_transition[i, j, l] * tmp[k, l]
+                        tmp2[j, k] = tmp2[j, k] + value
+                        tmp2[k, j] = tmp2[k, j] + value
+            for j in range(k_states):
+                for k in range(j, k_states):
+                    value = tmp2[j, k]
+                    change = change + fabs(
+                        value - partials_state_cov[i, j, k])**2
+                    partials_state_cov[i, j, k] = value
+                    partials_state_cov[i, k, j] = value
+
+        if y == y and t > 0 and change < tolerance:
+            converged = 1
+
+    return llf
+
+def dloglikelihood_derivatives(np.float64_t [:] endog,
+                                        int loglikelihood_burn,
+                                        np.float64_t [:] design,
+                                        np.float64_t [:] obs_intercept,
+                                        np.float64_t obs_cov,
+                                        np.float64_t [:, :] transition,
+                                        np.float64_t [:, :] state_intercept,
+                                        np.float64_t [:, :] selected_state_cov,
+                                        np.float64_t [:] initial_state,
+                                        np.float64_t [:, :] initial_state_cov,
+                                        np.float64_t [:, :] partials_design,
+                                        np.float64_t [:, :] partials_obs_intercept,
+                                        np.float64_t [:] partials_obs_cov,
+                                        np.float64_t [:, :, :] partials_transition,
+                                        np.float64_t [:, :, :] partials_state_intercept,
+                                        np.float64_t [:, :, :] partials_selected_state_cov,
+                                        np.float64_t [:, :] partials_initial_state,
+                                        np.float64_t [:, :, :] partials_initial_state_cov,
+                                        np.float64_t [:, :] score_obs,
+                                        np.float64_t [:, :] information_matrix,
+                                        np.float64_t tolerance=0):
+    """
+    Loglikelihood, score and information matrix of a univariate model
+
+    Parameters
+    ----------
+    endog : array
+        Observations with shape (nobs,). Missing values are nan.
+    loglikelihood_burn : int
+        Number of initial periods not included in the loglikelihood.
+    design, obs_intercept, obs_cov : array
+        Observation equation, with shapes (k_states,), (n_obs_intercept,) and
+        a scalar. The observation intercept is time-varying if
+        `n_obs_intercept` is equal to `nobs`.
+    transition, state_intercept, selected_state_cov : array
+        State equation, with shapes (k_states, k_states),
+        (k_states, n_state_intercept) and (k_states, k_states). The state
+        intercept is time-varying if `n_state_intercept` is equal to `nobs`.
+        `selected_state_cov` is :math:`R Q R'`.
+    initial_state, initial_state_cov : array
+        Initial state and state covariance matrix.
+    partials_* : array
+        Partial derivatives of each of the above with respect to each of
+        the `k_params` parameters, with the parameter as the first dimension.
+    score_obs : array
+        Output array with shape (nobs, k_params) for the score of each
+        observation.
+    information_matrix : array
+        Output array with shape (k_params, k_params) for the (summed)
+        information matrix of Harvey (1989), section 3.4.6.
+    tolerance : float, optional
+        Once the summed squared change in the predicted state covariance
+        matrix and its derivatives falls below the tolerance, they are held
+        fixed at their steady-state values. Default is 0, so that the
+        recursions are always used.
+
+    Returns
+    -------
+    loglikelihood : scalar
+        The loglikelihood, summed over all periods after the burn.
+
+    Notes
+    -----
+    For each parameter, the recursions differentiate the forecast error
+    :math:`v_t`, its variance :math:`F_t`, and the predicted state and state
+    covariance matrix; see Harvey (1989), section 3.4.5.
+    The cost is that of running `k_params` filters for the state covariance
+    derivatives, but all in a single pass without any Python overhead.
+    """
+    cdef:
+        int i, j, k, l, t
+        int nobs = endog.shape[0]
+        int k_states = design.shape[0]
+        int k_params = partials_design.shape[0]
+        int obs_intercept_t, state_intercept_t, converged = 0
+        np.float64_t change
+        np.float64_t y, forecast_error, forecast_error_cov, value, llf = 0
+        np.float64_t [:] pz, filtered_state, partials_forecast_error
+        np.float64_t [:] partials_forecast_error_cov
+        np.float64_t [:, :] filtered_state_cov, tmp, tmp2, partials_tmp, dpz
+        np.float64_t [:, :] partials_state, partials_filtered_state
+        np.float64_t [:, :, :] partials_state_cov
+        np.float64_t [:, :, :] partials_filtered_state_cov
+        np.float64_t [:] state
+        np.float64_t [:, :] state_cov
+
+    state = np.array(initial_state, dtype=float)
+    state_cov = np.array(initial_state_cov, dtype=float)
+    partials_state = np.array(partials_initial_state, dtype=float)
+    partials_state_cov = np.array(partials_initial_state_cov, dtype=float)
+
+    pz = np.zeros(k_states, dtype=float)
+    filtered_state = np.zeros(k_states, dtype=float)
+    filtered_state_cov = np.zeros((k_states, k_states), dtype=float)
+    tmp = np.zeros((k_states, k_states), dtype=float)
+    tmp2 = np.zeros((k_states, k_states), dtype=float)
+    partials_tmp = np.zeros((k_states, k_states), dtype=float)
+    dpz = np.zeros((k_params, k_states), dtype=float)
+    partials_forecast_error = np.zeros(k_params, dtype=float)
+    partials_forecast_error_cov = np.zeros(k_params, dtype=float)
+    partials_filtered_state = np.zeros((k_params, k_states), dtype=float)
+    partials_filtered_state_cov = np.zeros((k_params, k_states, k_states),
+                                           dtype=float)
+
+    score_obs[:, :] = 0
+    information_matrix[:, :] = 0
+
+    for t in range(nobs):
+        obs_intercept_t = t if obs_intercept.shape[0] == nobs else 0
+        state_intercept_t = t if state_intercept.shape[1] == nobs else 0
+
+        y = endog[t]
+        if y == y:
+            # Forecast error and its variance
+            forecast_error = y - obs_intercept[obs_intercept_t]
+            for j in range(k_states):
+                forecast_error = forecast_error - design[j] * state[j]
+            if not converged:
+                forecast_error_cov = obs_cov
+                for j in range(k_states):
+                    value = 0
+                    for k in range(k_states):
+                        value = value + state_cov[j, k] * design[k]
+                    pz[j] = value
+                for j in range(k_states):
+                    forecast_error_cov = forecast_error_cov + design[j] * pz[j]
+
+            # Derivatives of the forecast error and its variance
+            for i in range(k_params):
+                value = -partials_obs_intercept[i, obs_intercept_t]
+                for j in range(k_states):
+                    value = value - (partials_design[i, j] * state[j] +
+                                     design[j] * partials_state[i, j])
+                partials_forecast_error[i] = value
+
+                if converged:
+                    continue
+
+                # d(P Z') = dP Z' + P dZ'
+                for j in range(k_states):
+                    value = 0
+                    for k in range(k_states):
+                        value = value + (
+                            partials_state_cov[i, j, k] * design[k] +
+                            state_cov[j, k] * partials_design[i, k])
+                    dpz[i, j] = value
+
+                # dF = dZ P Z' + Z d(P Z') + dH
+                value = partials_obs_cov[i]
+                for j in range(k_states):
+                    value = value + (partials_design[i, j] * pz[j] +
+                                     design[j] * dpz[i, j])
+                partials_forecast_error_cov[i] = value
+
+            if t >= loglikelihood_burn:
+                llf = llf - 0.5 * (
+                    dlog(2 * NPY_PI) +
+                    dlog(forecast_error_cov) +
+                    forecast_error**2 / forecast_error_cov)
+
+                for i in range(k_params):
+                    score_obs[t, i] = -0.5 * (
+                        partials_forecast_error_cov[i] / forecast_error_cov +
+                        2 * partials_forecast_error[i] * forecast_error /
+                        forecast_error_cov -
+                        partials_forecast_error_cov[i] * forecast_error**2 /
+                        forecast_error_cov**2)
+                    for j in range(i + 1):
+                        value = (
+                            0.5 * partials_forecast_error_cov[i] *
+                            partials_forecast_error_cov[j] /
+                            forecast_error_cov**2 +
+                            partials_forecast_error[i] *
+                            partials_forecast_error[j] / forecast_error_cov)
+                        information_matrix[i, j] = (
+                            information_matrix[i, j] + value)
+                        if j < i:
+                            information_matrix[j, i] = (
+                                information_matrix[j, i] + value)
+
+            # Updating step
+            for j in range(k_states):
+                filtered_state[j] = (state[j] + pz[j] * forecast_error /
+                                     forecast_error_cov)
+                if not converged:
+                    for k in range(k_states):
+                        filtered_state_cov[j, k] = (
+                            state_cov[j, k] -
+                            pz[j] * pz[k] / forecast_error_cov)
+
+            # Derivatives of the updating step, using the derivative of the
+            # Kalman gain K = P Z' / F:
+            # dK = d(P Z') / F - P Z' dF / F^2
+            for i in range(k_params):
+                for j in range(k_states):
+                    value = (dpz[i, j] / forecast_error_cov -
+                             pz[j] * partials_forecast_error_cov[i] /
+                             forecast_error_cov**2)
+                    partials_filtered_state[i, j] = (
+                        partials_state[i, j] + value * forecast_error +
+                        pz[j] * partials_forecast_error[i] /
+                        forecast_error_cov)
+                    if converged:
+                        continue
+                    for k in range(j, k_states):
+                        value = (
+                            partials_state_cov[i, j, k] -
+                            (dpz[i, j] * pz[k] + pz[j] * dpz[i, k]) /
+                            forecast_error_cov +
+                            pz[j] * pz[k] * partials_forecast_error_cov[i] /
+                            forecast_error_cov**2)
+                        partials_filtered_state_cov[i, j, k] = value
+                        partials_filtered_state_cov[i, k, j] = value
+        else:
+            # The covariance matrices are no longer in the steady state
+            converged = 0
+            for j in range(k_states):
+                filtered_state[j] = state[j]
+                for k in range(k_states):
+                    filtered_state_cov[j, k] = state_cov[j, k]
+            for i in range(k_params):
+                for j in range(k_states):
+                    partials_filtered_state[i, j] = partials_state[i, j]
+                    for k in range(k_states):
+                        partials_filtered_state_cov[i, j, k] = (
+                            partials_state_cov[i, j, k])
+
+        # Prediction step
+        for j in range(k_states):
+            value = state_intercept[j, state_intercept_t]
+            for k in range(k_states):
+                value = value + transition[j, k] * filtered_state[k]
+            state[j] = value
+        for i in range(k_params):
+            for j in range(k_states):
+                value = partials_state_intercept[i, j, state_intercept_t]
+                for k in range(k_states):
+                    if transition[j, k] != 0:
+                        value = value + (transition[j, k] *
+                                         partials_filtered_state[i, k])
+                    if partials_transition[i, j, k] != 0:
+                        value = value + (partials_transition[i, j, k] *
+                                         filtered_state[k])
+                partials_state[i, j] = value
+
+        # Once the state covariance matrix and its derivatives have converged
+        # to the steady state, they are no longer updated
+        if converged:
+            continue
+        change = 0
+
+        # T P_{t|t}, skipping the zero elements of the (usually sparse)
+        # transition matrix
+        tmp[:, :] = 0
+        for j in range(k_states):
+            for l in range(k_states):
+                if transition[j, l] == 0:
+                    continue
+                for k in range(k_states):
+                    tmp[j, k] = (tmp[j, k] +
+                                 transition[j, l] * filtered_state_cov[l, k])
+        # T P_{t|t} T' + R Q R'
+        tmp2[:, :] = selected_state_cov
+        for k in range(k_states):
+            for l in range(k_states):
+                if transition[k, l] == 0:
+                    continue
+                for j in range(k_states):
+                    tmp2[j, k] = tmp2[j, k] + tmp[j, l] * transition[k, l]
+        # The predicted state covariance matrix is kept symmetric
+        for j in range(k_states):
+            for k in range(j, k_states):
+                value = tmp2[j, k]
+                change = change + fabs(value - state_cov[j, k])**2
+                state_cov[j, k] = value
+                state_cov[k, j] = value
+
+        # Derivatives of the prediction step, where tmp = T P_{t|t}:
+        # dP_{t+1} = dT P_{t|t} T' + T P_{t|t} dT' + T dP_{t|t} T' + dRQR'
+        for i in range(k_params):
+            # T dP_{t|t}
+            partials_tmp[:, :] = 0
+            for j in range(k_states):
+                for l in range(k_states):
+                    if transition[j, l] == 0:
+                        continue
+                    for k in range(k_states):
+                        partials_tmp[j, k] = (
+                            partials_tmp[j, k] + transition[j, l] *
+                            partials_filtered_state_cov[i, l, k])
+            # T dP_{t|t} T' + dRQR'
+            tmp2[:, :] = partials_selected_state_cov[i]
+            for k in range(k_states):
+                for l in range(k_states):
+                    if transition[k, l] == 0:
+                        continue
+                    for j in range(k_states):
+                        tmp2[j, k] = (tmp2[j, k] +
+                                      partials_tmp[j, l] * transition[k, l])
+            # dT P_{t|t} T' and its transpose
+            for j in range(k_states):
+                for l in range(k_states):
+                    if partials_transition[i, j, l] == 0:
+                        continue
+                    for k in range(k_states):
+                        value = partials_transition[i, j, l] * tmp[k, l]
+                        tmp2[j, k] = tmp2[j, k] + value
+                        tmp2[k, j] = tmp2[k, j] + value
+            for j in range(k_states):
+                for k in range(j, k_states):
+                    value = tmp2[j, k]
+                    change = change + fabs(
+                        value - partials_state_cov[i, j, k])**2
+                    partials_state_cov[i, j, k] = value
+                    partials_state_cov[i, k, j] = value
+
+        if y == y and t > 0 and change < tolerance:
+            converged = 1
+
+    return llf
+
+def cloglikelihood_derivatives(np.complex64_t [:] endog,
+                                        int loglikelihood_burn,
+                                        np.complex64_t [:] design,
+                                        np.complex64_t [:] obs_intercept,
+                                        np.complex64_t obs_cov,
+                                        np.complex64_t [:, :] transition,
+                                        np.complex64_t [:, :] state_intercept,
+                                        np.complex64_t [:, :] selected_state_cov,
+                                        np.complex64_t [:] initial_state,
+                                        np.complex64_t [:, :] initial_state_cov,
+                                        np.complex64_t [:, :] partials_design,
+                                        np.complex64_t [:, :] partials_obs_intercept,
+                                        np.complex64_t [:] partials_obs_cov,
+                                        np.complex64_t [:, :, :] partials_transition,
+                                        np.complex64_t [:, :, :] partials_state_intercept,
+                                        np.complex64_t [:, :, :] partials_selected_state_cov,
+                                        np.complex64_t [:, :] partials_initial_state,
+                                        np.complex64_t [:, :, :] partials_initial_state_cov,
+                                        np.complex64_t [:, :] score_obs,
+                                        np.complex64_t [:, :] information_matrix,
+                                        np.float64_t tolerance=0):
+    """
+    Loglikelihood, score and information matrix of a univariate model
+
+    Parameters
+    ----------
+    endog : array
+        Observations with shape (nobs,). Missing values are nan.
+    loglikelihood_burn : int
+        Number of initial periods not included in the loglikelihood.
+    design, obs_intercept, obs_cov : array
+        Observation equation, with shapes (k_states,), (n_obs_intercept,) and
+        a scalar. The observation intercept is time-varying if
+        `n_obs_intercept` is equal to `nobs`.
+    transition, state_intercept, selected_state_cov : array
+        State equation, with shapes (k_states, k_states),
+        (k_states, n_state_intercept) and (k_states, k_states). The state
+        intercept is time-varying if `n_state_intercept` is equal to `nobs`.
+        `selected_state_cov` is :math:`R Q R'`.
+    initial_state, initial_state_cov : array
+        Initial state and state covariance matrix.
+    partials_* : array
+        Partial derivatives of each of the above with respect to each of
+        the `k_params` parameters, with the parameter as the first dimension.
+    score_obs : array
+        Output array with shape (nobs, k_params) for the score of each
+        observation.
+    information_matrix : array
+        Output array with shape (k_params, k_params) for the (summed)
+        information matrix of Harvey (1989), section 3.4.6.
+    tolerance : float, optional
+        Once the summed squared change in the predicted state covariance
+        matrix and its derivatives falls below the tolerance, they are held
+        fixed at their steady-state values. Default is 0, so that the
+        recursions are always used.
+
+    Returns
+    -------
+    loglikelihood : scalar
+        The loglikelihood, summed over all periods after the burn.
+
+    Notes
+    -----
+    For each parameter, the recursions differentiate the forecast error
+    :math:`v_t`, its variance :math:`F_t`, and the predicted state and state
+    covariance matrix; see Harvey (1989), section 3.4.5.
+    The cost is that of running `k_params` filters for the state covariance
+    derivatives, but all in a single pass without any Python overhead.
+    """
+    cdef:
+        int i, j, k, l, t
+        int nobs = endog.shape[0]
+        int k_states = design.shape[0]
+        int k_params = partials_design.shape[0]
+        int obs_intercept_t, state_intercept_t, converged = 0
+        np.float64_t change
+        np.complex64_t y, forecast_error, forecast_error_cov, value, llf = 0
+        np.complex64_t [:] pz, filtered_state, partials_forecast_error
+        np.complex64_t [:] partials_forecast_error_cov
+        np.complex64_t [:, :] filtered_state_cov, tmp, tmp2, partials_tmp, dpz
+        np.complex64_t [:, :] partials_state, partials_filtered_state
+        np.complex64_t [:, :, :] partials_state_cov
+        np.complex64_t [:, :, :] partials_filtered_state_cov
+        np.complex64_t [:] state
+        np.complex64_t [:, :] state_cov
+
+    state = np.array(initial_state, dtype=np.complex64)
+    state_cov = np.array(initial_state_cov, dtype=np.complex64)
+    partials_state = np.array(partials_initial_state, dtype=np.complex64)
+    partials_state_cov = np.array(partials_initial_state_cov, dtype=np.complex64)
+
+    pz = np.zeros(k_states, dtype=np.complex64)
+    filtered_state = np.zeros(k_states, dtype=np.complex64)
+    filtered_state_cov = np.zeros((k_states, k_states), dtype=np.complex64)
+    tmp = np.zeros((k_states, k_states), dtype=np.complex64)
+    tmp2 = np.zeros((k_states, k_states), dtype=np.complex64)
+    partials_tmp = np.zeros((k_states, k_states), dtype=np.complex64)
+    dpz = np.zeros((k_params, k_states), dtype=np.complex64)
+    partials_forecast_error = np.zeros(k_params, dtype=np.complex64)
+    partials_forecast_error_cov = np.zeros(k_params, dtype=np.complex64)
+    partials_filtered_state = np.zeros((k_params, k_states), dtype=np.complex64)
+    partials_filtered_state_cov = np.zeros((k_params, k_states, k_states),
+                                           dtype=np.complex64)
+
+    score_obs[:, :] = 0
+    information_matrix[:, :] = 0
+
+    for t in range(nobs):
+        obs_intercept_t = t if obs_intercept.shape[0] == nobs else 0
+        state_intercept_t = t if state_intercept.shape[1] == nobs else 0
+
+        y = endog[t]
+        if y == y:
+            # Forecast error and its variance
+            forecast_error = y - obs_intercept[obs_intercept_t]
+            for j in range(k_states):
+                forecast_error = forecast_error - design[j] * state[j]
+            if not converged:
+                forecast_error_cov = obs_cov
+                for j in range(k_states):
+                    value = 0
+                    for k in range(k_states):
+                        value = value + state_cov[j, k] * design[k]
+                    pz[j] = value
+                for j in range(k_states):
+                    forecast_error_cov = forecast_error_cov + design[j] * pz[j]
+
+            # Derivatives of the forecast error and its variance
+            for i in range(k_params):
+                value = -partials_obs_intercept[i, obs_intercept_t]
+                for j in range(k_states):
+                    value = value - (partials_design[i, j] * state[j] +
+                                     design[j] * partials_state[i, j])
+                partials_forecast_error[i] = value
+
+                if converged:
+                    continue
+
+                # d(P Z') = dP Z' + P dZ'
+                for j in range(k_states):
+                    value = 0
+                    for k in range(k_states):
+                        value = value + (
+                            partials_state_cov[i, j, k] * design[k] +
+                            state_cov[j, k] * partials_design[i, k])
+                    dpz[i, j] = value
+
+                # dF = dZ P Z' + Z d(P Z') + dH
+                value = partials_obs_cov[i]
+                for j in range(k_states):
+                    value = value + (partials_design[i, j] * pz[j] +
+                                     design[j] * dpz[i, j])
+                partials_forecast_error_cov[i] = value
+
+            if t >= loglikelihood_burn:
+                llf = llf - 0.5 * (
+                    zlog(2 * NPY_PI) +
+                    zlog(forecast_error_cov) +
+                    forecast_error**2 / forecast_error_cov)
+
+                for i in range(k_params):
+                    score_obs[t, i] = -0.5 * (
+                        partials_forecast_error_cov[i] / forecast_error_cov +
+                        2 * partials_forecast_error[i] * forecast_error /
+                        forecast_error_cov -
+                        partials_forecast_error_cov[i] * forecast_error**2 /
+                        forecast_error_cov**2)
+                    for j in range(i + 1):
+                        value = (
+                            0.5 * partials_forecast_error_cov[i] *
+                            partials_forecast_error_cov[j] /
+                            forecast_error_cov**2 +
+                            partials_forecast_error[i] *
+                            partials_forecast_error[j] / forecast_error_cov)
+                        information_matrix[i, j] = (
+                            information_matrix[i, j] + value)
+                        if j < i:
+                            information_matrix[j, i] = (
+                                information_matrix[j, i] + value)
+
+            # Updating step
+            for j in range(k_states):
+                filtered_state[j] = (state[j] + pz[j] * forecast_error /
+                                     forecast_error_cov)
+                if not converged:
+                    for k in range(k_states):
+                        filtered_state_cov[j, k] = (
+                            state_cov[j, k] -
+                            pz[j] * pz[k] / forecast_error_cov)
+
+            # Derivatives of the updating step, using the derivative of the
+            # Kalman gain K = P Z' / F:
+            # dK = d(P Z') / F - P Z' dF / F^2
+            for i in range(k_params):
+                for j in range(k_states):
+                    value = (dpz[i, j] / forecast_error_cov -
+                             pz[j] * partials_forecast_error_cov[i] /
+                             forecast_error_cov**2)
+                    partials_filtered_state[i, j] = (
+                        partials_state[i, j] + value * forecast_error +
+                        pz[j] * partials_forecast_error[i] /
+                        forecast_error_cov)
+                    if converged:
+                        continue
+                    for k in range(j, k_states):
+                        value = (
+                            partials_state_cov[i, j, k] -
+                            (dpz[i, j] * pz[k] + pz[j] * dpz[i, k]) /
+                            forecast_error_cov +
+                            pz[j] * pz[k] * partials_forecast_error_cov[i] /
+                            forecast_error_cov**2)
+                        partials_filtered_state_cov[i, j, k] = value
+                        partials_filtered_state_cov[i, k, j] = value
+        else:
+            # The covariance matrices are no longer in the steady state
+            converged = 0
+            for j in range(k_states):
+                filtered_state[j] = state[j]
+                for k in range(k_states):
+                    filtered_state_cov[j, k] = state_cov[j, k]
+            for i in range(k_params):
+                for j in range(k_states):
+                    partials_filtered_state[i, j] = partials_state[i, j]
+                    for k in range(k_states):
+                        partials_filtered_state_cov[i, j, k] = (
+                            partials_state_cov[i, j, k])
+
+        # Prediction step
+        for j in range(k_states):
+            value = state_intercept[j, state_intercept_t]
+            for k in range(k_states):
+                value = value + transition[j, k] * filtered_state[k]
+            state[j] = value
+        for i in range(k_params):
+            for j in range(k_states):
+                value = partials_state_intercept[i, j, state_intercept_t]
+                for k in range(k_states):
+                    if transition[j, k] != 0:
+                        value = value + (transition[j, k] *
+                                         partials_filtered_state[i, k])
+                    if partials_transition[i, j, k] != 0:
+                        value = value + (partials_transition[i, j, k] *
+                                         filtered_state[k])
+                partials_state[i, j] = value
+
+        # Once the state covariance matrix and its derivatives have converged
+        # to the steady state, they are no longer updated
+        if converged:
+            continue
+        change = 0
+
+        # T P_{t|t}, skipping the zero elements of the (usually sparse)
+        # transition matrix
+        tmp[:, :] = 0
+        for j in range(k_states):
+            for l in range(k_states):
+                if transition[j, l] == 0:
+                    continue
+                for k in range(k_states):
+                    tmp[j, k] = (tmp[j, k] +
+                                 transition[j, l] * filtered_state_cov[l, k])
+        # T P_{t|t} T' + R Q R'
+        tmp2[:, :] = selected_state_cov
+        for k in range(k_states):
+            for l in range(k_states):
+                if transition[k, l] == 0:
+                    continue
+                for j in range(k_states):
+                    tmp2[j, k] = tmp2[j, k] + tmp[j, l] * transition[k, l]
+        # The predicted state covariance matrix is kept symmetric
+        for j in range(k_states):
+            for k in range(j, k_states):
+                value = tmp2[j, k]
+                change = change + zabs(value - state_cov[j, k])**2
+                state_cov[j, k] = value
+                state_cov[k, j] = value
+
+        # Derivatives of the prediction step, where tmp = T P_{t|t}:
+        # dP_{t+1} = dT P_{t|t} T' + T P_{t|t} dT' + T dP_{t|t} T' + dRQR'
+        for i in range(k_params):
+            # T dP_{t|t}
+            partials_tmp[:, :] = 0
+            for j in range(k_states):
+                for l in range(k_states):
+                    if transition[j, l] == 0:
+                        continue
+                    for k in range(k_states):
+                        partials_tmp[j, k] = (
+                            partials_tmp[j, k] + transition[j, l] *
+                            partials_filtered_state_cov[i, l, k])
+            # T dP_{t|t} T' + dRQR'
+            tmp2[:, :] = partials_selected_state_cov[i]
+            for k in range(k_states):
+                for l in range(k_states):
+                    if transition[k, l] == 0:
+                        continue
+                    for j in range(k_states):
+                        tmp2[j, k] = (tmp2[j, k] +
+                                      partials_tmp[j, l] * transition[k, l])
+            # dT P_{t|t} T' and its transpose
+            for j in range(k_states):
+                for l in range(k_states):
+                    if partials_transition[i, j, l] == 0:
+                        continue
+                    for k in range(k_states):
+                        value = partials_transition[i, j, l] * tmp[k, l]
+                        tmp2[j, k] = tmp2[j, k] + value
+                        tmp2[k, j] = tmp2[k, j] + value
+            for j in range(k_states):
+                for k in range(j, k_states):
+                    value = tmp2[j, k]
+                    change = change + zabs(
+                        value - partials_state_cov[i, j, k])**2
+                    partials_state_cov[i, j, k] = value
+                    partials_state_cov[i, k, j] = value
+
+        if y == y and t > 0 and change < tolerance:
+            converged = 1
+
+    return llf
+
+def zloglikelihood_derivatives(np.complex128_t [:] endog,
+                                        int loglikelihood_burn,
+                                        np.complex128_t [:] design,
+                                        np.complex128_t [:] obs_intercept,
+                                        np.complex128_t obs_cov,
+                                        np.complex128_t [:, :] transition,
+                                        np.complex128_t [:, :] state_intercept,
+                                        np.complex128_t [:, :] selected_state_cov,
+                                        np.complex128_t [:] initial_state,
+                                        np.complex128_t [:, :] initial_state_cov,
+                                        np.complex128_t [:, :] partials_design,
+                                        np.complex128_t [:, :] partials_obs_intercept,
+                                        np.complex128_t [:] partials_obs_cov,
+                                        np.complex128_t [:, :, :] partials_transition,
+                                        np.complex128_t [:, :, :] partials_state_intercept,
+                                        np.complex128_t [:, :, :] partials_selected_state_cov,
+                                        np.complex128_t [:, :] partials_initial_state,
+                                        np.complex128_t [:, :, :] partials_initial_state_cov,
+                                        np.complex128_t [:, :] score_obs,
+                                        np.complex128_t [:, :] information_matrix,
+                                        np.float64_t tolerance=0):
+    """
+    Loglikelihood, score and information matrix of a univariate model
+
+    Parameters
+    ----------
+    endog : array
+        Observations with shape (nobs,). Missing values are nan.
+    loglikelihood_burn : int
+        Number of initial periods not included in the loglikelihood.
+    design, obs_intercept, obs_cov : array
+        Observation equation, with shapes (k_states,), (n_obs_intercept,) and
+        a scalar. The observation intercept is time-varying if
+        `n_obs_intercept` is equal to `nobs`.
+    transition, state_intercept, selected_state_cov : array
+        State equation, with shapes (k_states, k_states),
+        (k_states, n_state_intercept) and (k_states, k_states). The state
+        intercept is time-varying if `n_state_intercept` is equal to `nobs`.
+        `selected_state_cov` is :math:`R Q R'`.
+    initial_state, initial_state_cov : array
+        Initial state and state covariance matrix.
+    partials_* : array
+        Partial derivatives of each of the above with respect to each of
+        the `k_params` parameters, with the parameter as the first dimension.
+    score_obs : array
+        Output array with shape (nobs, k_params) for the score of each
+        observation.
+    information_matrix : array
+        Output array with shape (k_params, k_params) for the (summed)
+        information matrix of Harvey (1989), section 3.4.6.
+    tolerance : float, optional
+        Once the summed squared change in the predicted state covariance
+        matrix and its derivatives falls below the tolerance, they are held
+        fixed at their steady-state values. Default is 0, so that the
+        recursions are always used.
+
+    Returns
+    -------
+    loglikelihood : scalar
+        The loglikelihood, summed over all periods after the burn.
+
+    Notes
+    -----
+    For each parameter, the recursions differentiate the forecast error
+    :math:`v_t`, its variance :math:`F_t`, and the predicted state and state
+    covariance matrix; see Harvey (1989), section 3.4.5.
+    The cost is that of running `k_params` filters for the state covariance
+    derivatives, but all in a single pass without any Python overhead.
+    """
+    cdef:
+        int i, j, k, l, t
+        int nobs = endog.shape[0]
+        int k_states = design.shape[0]
+        int k_params = partials_design.shape[0]
+        int obs_intercept_t, state_intercept_t, converged = 0
+        np.float64_t change
+        np.complex128_t y, forecast_error, forecast_error_cov, value, llf = 0
+        np.complex128_t [:] pz, filtered_state, partials_forecast_error
+        np.complex128_t [:] partials_forecast_error_cov
+        np.complex128_t [:, :] filtered_state_cov, tmp, tmp2, partials_tmp, dpz
+        np.complex128_t [:, :] partials_state, partials_filtered_state
+        np.complex128_t [:, :, :] partials_state_cov
+        np.complex128_t [:, :, :] partials_filtered_state_cov
+        np.complex128_t [:] state
+        np.complex128_t [:, :] state_cov
+
+    state = np.array(initial_state, dtype=complex)
+    state_cov = np.array(initial_state_cov, dtype=complex)
+    partials_state = np.array(partials_initial_state, dtype=complex)
+    partials_state_cov = np.array(partials_initial_state_cov, dtype=complex)
+
+    pz = np.zeros(k_states, dtype=complex)
+    filtered_state = np.zeros(k_states, dtype=complex)
+    filtered_state_cov = np.zeros((k_states, k_states), dtype=complex)
+    tmp = np.zeros((k_states, k_states), dtype=complex)
+    tmp2 = np.zeros((k_states, k_states), dtype=complex)
+    partials_tmp = np.zeros((k_states, k_states), dtype=complex)
+    dpz = np.zeros((k_params, k_states), dtype=complex)
+    partials_forecast_error = np.zeros(k_params, dtype=complex)
+    partials_forecast_error_cov = np.zeros(k_params, dtype=complex)
+    partials_filtered_state = np.zeros((k_params, k_states), dtype=complex)
+    partials_filtered_state_cov = np.zeros((k_params, k_states, k_states),
+                                           dtype=complex)
+
+    score_obs[:, :] = 0
+    information_matrix[:, :] = 0
+
+    for t in range(nobs):
+        obs_intercept_t = t if obs_intercept.shape[0] == nobs else 0
+        state_intercept_t = t if state_intercept.shape[1] == nobs else 0
+
+        y = endog[t]
+        if y == y:
+            # Forecast error and its variance
+            forecast_error = y - obs_intercept[obs_intercept_t]
+            for j in range(k_states):
+                forecast_error = forecast_error - design[j] * state[j]
+            if not converged:
+                forecast_error_cov = obs_cov
+                for j in range(k_states):
+                    value = 0
+                    for k in range(k_states):
+                        value = value + state_cov[j, k] * design[k]
+                    pz[j] = value
+                for j in range(k_states):
+                    forecast_error_cov = forecast_error_cov + design[j] * pz[j]
+
+            # Derivatives of the forecast error and its variance
+            for i in range(k_params):
+                value = -partials_obs_intercept[i, obs_intercept_t]
+                for j in range(k_states):
+                    value = value - (partials_design[i, j] * state[j] +
+                                     design[j] * partials_state[i, j])
+                partials_forecast_error[i] = value
+
+                if converged:
+                    continue
+
+                # d(P Z') = dP Z' + P dZ'
+                for j in range(k_states):
+                    value = 0
+                    for k in range(k_states):
+                        value = value + (
+                            partials_state_cov[i, j, k] * design[k] +
+                            state_cov[j, k] * partials_design[i, k])
+                    dpz[i, j] = value
+
+                # dF = dZ P Z' + Z d(P Z') + dH
+                value = partials_obs_cov[i]
+                for j in range(k_states):
+                    value = value + (partials_design[i, j] * pz[j] +
+                                     design[j] * dpz[i, j])
+                partials_forecast_error_cov[i] = value
+
+            if t >= loglikelihood_burn:
+                llf = llf - 0.5 * (
+                    zlog(2 * NPY_PI) +
+                    zlog(forecast_error_cov) +
+                    forecast_error**2 / forecast_error_cov)
+
+                for i in range(k_params):
+                    score_obs[t, i] = -0.5 * (
+                        partials_forecast_error_cov[i] / forecast_error_cov +
+                        2 * partials_forecast_error[i] * forecast_error /
+                        forecast_error_cov -
+                        partials_forecast_error_cov[i] * forecast_error**2 /
+                        forecast_error_cov**2)
+                    for j in range(i + 1):
+                        value = (
+                            0.5 * partials_forecast_error_cov[i] *
+                            partials_forecast_error_cov[j] /
+                            forecast_error_cov**2 +
+                            partials_forecast_error[i] *
+                            partials_forecast_error[j] / forecast_error_cov)
+                        information_matrix[i, j] = (
+                            information_matrix[i, j] + value)
+                        if j < i:
+                            information_matrix[j, i] = (
+                                information_matrix[j, i] + value)
+
+            # Updating step
+            for j in range(k_states):
+                filtered_state[j] = (state[j] + pz[j] * forecast_error /
+                                     forecast_error_cov)
+                if not converged:
+                    for k in range(k_states):
+                        filtered_state_cov[j, k] = (
+                            state_cov[j, k] -
+                            pz[j] * pz[k] / forecast_error_cov)
+
+            # Derivatives of the updating step, using the derivative of the
+            # Kalman gain K = P Z' / F:
+            # dK = d(P Z') / F - P Z' dF / F^2
+            for i in range(k_params):
+                for j in range(k_states):
+                    value = (dpz[i, j] / forecast_error_cov -
+                             pz[j] * partials_forecast_error_cov[i] /
+                             forecast_error_cov**2)
+                    partials_filtered_state[i, j] = (
+                        partials_state[i, j] + value * forecast_error +
+                        pz[j] * partials_forecast_error[i] /
+                        forecast_error_cov)
+                    if converged:
+                        continue
+                    for k in range(j, k_states):
+                        value = (
+                            partials_state_cov[i, j, k] -
+                            (dpz[i, j] * pz[k] + pz[j] * dpz[i, k]) /
+                            forecast_error_cov +
+                            pz[j] * pz[k] * partials_forecast_error_cov[i] /
+                            forecast_error_cov**2)
+                        partials_filtered_state_cov[i, j, k] = value
+                        partials_filtered_state_cov[i, k, j] = value
+        else:
+            # The covariance matrices are no longer in the steady state
+            converged = 0
+            for j in range(k_states):
+                filtered_state[j] = state[j]
+                for k in range(k_states):
+                    filtered_state_cov[j, k] = state_cov[j, k]
+            for i in range(k_params):
+                for j in range(k_states):
+                    partials_filtered_state[i, j] = partials_state[i, j]
+                    for k in range(k_states):
+                        partials_filtered_state_cov[i, j, k] = (
+                            partials_state_cov[i, j, k])
+
+        # Prediction step
+        for j in range(k_states):
+            value = state_intercept[j, state_intercept_t]
+            for k in range(k_states):
+                value = value + transition[j, k] * filtered_state[k]
+            state[j] = value
+        for i in range(k_params):
+            for j in range(k_states):
+                value = partials_state_intercept[i, j, state_intercept_t]
+                for k in range(k_states):
+                    if transition[j, k] != 0:
+                        value = value + (transition[j, k] *
+                                         partials_filtered_state[i, k])
+                    if partials_transition[i, j, k] != 0:
+                        value = value + (partials_transition[i, j, k] *
+                                         filtered_state[k])
+                partials_state[i, j] = value
+
+        # Once the state covariance matrix and its derivatives have converged
+        # to the steady state, they are no longer updated
+        if converged:
+            continue
+        change = 0
+
+        # T P_{t|t}, skipping the zero elements of the (usually sparse)
+        # transition matrix
+        tmp[:, :] = 0
+        for j in range(k_states):
+            for l in range(k_states):
+                if transition[j, l] == 0:
+                    continue
+                for k in range(k_states):
+                    tmp[j, k] = (tmp[j, k] +
+                                 transition[j, l] * filtered_state_cov[l, k])
+        # T P_{t|t} T' + R Q R'
+        tmp2[:, :] = selected_state_cov
+        for k in range(k_states):
+            for l in range(k_states):
+                if transition[k, l] == 0:
+                    continue
+                for j in range(k_states):
+                    tmp2[j, k] = tmp2[j, k] + tmp[j, l] * transition[k, l]
+        # The predicted state covariance matrix is kept symmetric
+        for j in range(k_states):
+            for k in range(j, k_states):
+                value = tmp2[j, k]
+                change = change + zabs(value - state_cov[j, k])**2
+                state_cov[j, k] = value
+                state_cov[k, j] = value
+
+        # Derivatives of the prediction step, where tmp = T P_{t|t}:
+        # dP_{t+1} = dT P_{t|t} T' + T P_{t|t} dT' + T dP_{t|t} T' + dRQR'
+        for i in range(k_params):
+            # T dP_{t|t}
+            partials_tmp[:, :] = 0
+            for j in range(k_states):
+                for l in range(k_states):
+                    if transition[j, l] == 0:
+                        continue
+                    for k in range(k_states):
+                        partials_tmp[j, k] = (
+                            partials_tmp[j, k] + transition[j, l] *
+                            partials_filtered_state_cov[i, l, k])
+            # T dP_{t|t} T' + dRQR'
+            tmp2[:, :] = partials_selected_state_cov[i]
+            for k in range(k_states):
+                for l in range(k_states):
+                    if transition[k, l] == 0:
+                        continue
+                    for j in range(k_states):
+                        tmp2[j, k] = (tmp2[j, k] +
+                                      partials_tmp[j, l] * transition[k, l])
+            # dT P_{t|t} T' and its transpose
+            for j in range(k_states):
+                for l in range(k_states):
+                    if partials_transition[i, j, l] == 0:
+                        continue
+                    for k in range(k_states):
+                        value = partials_transition[i, j, l] * tmp[k, l]
+                        tmp2[j, k] = tmp2[j, k] + value
+                        tmp2[k, j] = tmp2[k, j] + value
+            for j in range(k_states):
+                for k in range(j, k_states):
+                    value = tmp2[j, k]
+                    change = change + zabs(
+                        value - partials_state_cov[i, j, k])**2
+                    partials_state_cov[i, j, k] = value
+                    partials_state_cov[i, k, j] = value
+
+        if y == y and t > 0 and change < tolerance:
+            converged = 1
+
+    return llf
@@ -25,6 +25,10 @@ cdef np.float32_t sloglikelihood_missing_conventional(sKalmanFilter kfilter, sSt
 cdef int sforecast_conventional(sKalmanFilter kfilter, sStatespace model)
 cdef int supdating_conventional(sKalmanFilter kfilter, sStatespace model)
 cdef int sprediction_conventional(sKalmanFilter kfilter, sStatespace model)
+cdef int supdating_chandrasekhar(sKalmanFilter kfilter, sStatespace model)
+cdef int schandrasekhar_initialize(sKalmanFilter kfilter, sStatespace model)
+cdef int schandrasekhar_store(sKalmanFilter kfilter, sStatespace model)
+cdef int schandrasekhar_recursion(sKalmanFilter kfilter, sStatespace model)
 cdef np.float32_t sloglikelihood_conventional(sKalmanFilter kfilter, sStatespace model, np.float32_t determinant)
 
 # Double precision
@@ -36,6 +40,10 @@ cdef np.float64_t dloglikelihood_missing_conventional(dKalmanFilter kfilter, dSt
 cdef int dforecast_conventional(dKalmanFilter kfilter, dStatespace model)
 cdef int dupdating_conventional(dKalmanFilter kfilter, dStatespace model)
 cdef int dprediction_conventional(dKalmanFilter kfilter, dStatespace model)
+cdef int dupdating_chandrasekhar(dKalmanFilter kfilter, dStatespace model)
+cdef int dchandrasekhar_initialize(dKalmanFilter kfilter, dStatespace model)
+cdef int dchandrasekhar_store(dKalmanFilter kfilter, dStatespace model)
+cdef int dchandrasekhar_recursion(dKalmanFilter kfilter, dStatespace model)
 cdef np.float64_t dloglikelihood_conventional(dKalmanFilter kfilter, dStatespace model, np.float64_t determinant)
 
 # Single precision complex
@@ -47,6 +55,10 @@ cdef np.complex64_t cloglikelihood_missing_conventional(cKalmanFilter kfilter, c
 cdef int cforecast_conventional(cKalmanFilter kfilter, cStatespace model)
 cdef int cupdating_conventional(cKalmanFilter kfilter, cStatespace model)
 cdef int cprediction_conventional(cKalmanFilter kfilter, cStatespace model)
+cdef int cupdating_chandrasekhar(cKalmanFilter kfilter, cStatespace model)
+cdef int cchandrasekhar_initialize(cKalmanFilter kfilter, cStatespace model)
+cdef int cchandrasekhar_store(cKalmanFilter kfilter, cStatespace model)
+cdef int cchandrasekhar_recursion(cKalmanFilter kfilter, cStatespace model)
 cdef np.complex64_t cloglikelihood_conventional(cKalmanFilter kfilter, cStatespace model, np.complex64_t determinant)
 
 # Double precision complex
@@ -58,4 +70,8 @@ cdef np.complex128_t zloglikelihood_missing_conventional(zKalmanFilter kfilter,
 cdef int zforecast_conventional(zKalmanFilter kfilter, zStatespace model)
 cdef int zupdating_conventional(zKalmanFilter kfilter, zStatespace model)
 cdef int zprediction_conventional(zKalmanFilter kfilter, zStatespace model)
+cdef int zupdating_chandrasekhar(zKalmanFilter kfilter, zStatespace model)
+cdef int zchandrasekhar_initialize(zKalmanFilter kfilter, zStatespace model)
+cdef int zchandrasekhar_store(zKalmanFilter kfilter, zStatespace model)
+cdef int zchandrasekhar_recursion(zKalmanFilter kfilter, zStatespace model)
 cdef np.complex128_t zloglikelihood_conventional(zKalmanFilter kfilter, zStatespace model, np.complex128_t determinant)
@@ -0,0 +1,1834 @@
+#cython: boundscheck=False
+#cython: wraparound=False
+#cython: cdivision=False
+"""
+State Space Models
+
+Author: Chad Fulton  
+License: Simplified-BSD
+"""
+
+# Typical imports
+cimport numpy as np
+from statsmodels.src.math cimport *
+cimport scipy.linalg.cython_blas as blas
+cimport scipy.linalg.cython_lapack as lapack
+
+from statsmodels.tsa.statespace._kalman_filter cimport FILTER_CHANDRASEKHAR
+
+
+# ### Missing Observation Conventional Kalman filter
+#
+# See Durbin and Koopman (2012) Chapter 4.10
+#
+# Here k_endog is the same as usual, but the design matrix and observation
+# covariance matrix are enforced to be zero matrices, and the loglikelihood
+# is defined to be zero.
+
+cdef int sforecast_missing_conventional(sKalmanFilter kfilter, sStatespace model):
+    cdef int i, j
+    cdef int inc = 1, design_t = 0
+    cdef np.float32_t alpha = 1
+
+    # #### Forecast for time t  
+    # `forecast` $= Z_t a_t + d_t$
+    # Just set to zeros, see below (this means if forecasts are required for
+    # this part, they must be done in the wrappe)
+
+    # #### Forecast error for time t  
+    # It is undefined here, since obs is nan
+    # Note: use kfilter dimensions since we just want to set the whole array
+    # to zero
+    for i in range(kfilter.k_endog):
+        kfilter._forecast[i] = 0
+        kfilter._forecast_error[i] = 0
+
+    # #### Forecast error covariance matrix for time t  
+    # $F_t \equiv 0$
+    # Note: use kfilter dimensions since we just want to set the whole array
+    # to zeros
+    for i in range(kfilter.k_endog): # columns
+        for j in range(kfilter.k_endog): # rows
+            kfilter._forecast_error_cov[j + i*kfilter.k_endog] = 0
+
+cdef int supdating_missing_conventional(sKalmanFilter kfilter, sStatespace model):
+    cdef int inc = 1
+
+    # Simply copy over the input arrays ($a_t, P_t$) to the filtered arrays
+    # ($a_{t|t}, P_{t|t}$)
+    # Note: use kfilter dimensions since we just want to copy whole arrays;
+    blas.scopy(&kfilter.k_states, kfilter._input_state, &inc, kfilter._filtered_state, &inc)
+    blas.scopy(&kfilter.k_states2, kfilter._input_state_cov, &inc, kfilter._filtered_state_cov, &inc)
+
+cdef np.float32_t sinverse_missing_conventional(sKalmanFilter kfilter, sStatespace model, np.float32_t determinant)  except *:
+    # Since the inverse of the forecast error covariance matrix is not
+    # stored, we don't need to fill it (e.g. with NPY_NAN values). Instead,
+    # just do a noop here and return a zero determinant ($|0|$).
+    return 0.0
+
+cdef np.float32_t sloglikelihood_missing_conventional(sKalmanFilter kfilter, sStatespace model, np.float32_t determinant):
+    return 0.0
+
+# ### Conventional Kalman filter
+#
+# The following are the above routines as defined in the conventional Kalman
+# filter.
+#
+# See Durbin and Koopman (2012) Chapter 4
+
+cdef int sforecast_conventional(sKalmanFilter kfilter, sStatespace model):
+
+    # Constants
+    cdef:
+        int inc = 1, ld, i, j
+        np.float32_t alpha = 1.0
+        np.float32_t beta = 0.0
+        np.float32_t gamma = -1.0
+
+    # #### Forecast for time t  
+    # `forecast` $= Z_t a_t + d_t$
+    # 
+    # *Note*: $a_t$ is given from the initialization (for $t = 0$) or
+    # from the previous iteration of the filter (for $t > 0$).
+
+    # $\\# = d_t$
+    blas.scopy(&model._k_endog, model._obs_intercept, &inc, kfilter._forecast, &inc)
+    # `forecast` $= 1.0 * Z_t a_t + 1.0 * \\#$  
+    # $(p \times 1) = (p \times m) (m \times 1) + (p \times 1)$
+    blas.sgemv("N", &model._k_endog, &model._k_states,
+          &alpha, model._design, &model._k_endog,
+                  kfilter._input_state, &inc,
+          &alpha, kfilter._forecast, &inc)
+
+    # #### Forecast error for time t  
+    # `forecast_error` $\equiv v_t = y_t -$ `forecast`
+
+    # $\\# = y_t$
+    blas.scopy(&model._k_endog, model._obs, &inc, kfilter._forecast_error, &inc)
+    # $v_t = -1.0 * $ `forecast` $ + \\#$
+    # $(p \times 1) = (p \times 1) + (p \times 1)$
+    blas.saxpy(&model._k_endog, &gamma, kfilter._forecast, &inc, kfilter._forecast_error, &inc)
+
+    # *Intermediate calculation* (used just below and then once more)  
+    # `tmp1` array used here, dimension $(m \times p)$  
+    # $\\#_1 = P_t Z_t'$  
+    # $(m \times p) = (m \times m) (p \times m)'$
+    blas.sgemm("N", "T", &model._k_states, &model._k_endog, &model._k_states,
+          &alpha, kfilter._input_state_cov, &kfilter.k_states,
+                  model._design, &model._k_endog,
+          &beta, kfilter._tmp1, &kfilter.k_states)
+
+    # #### Forecast error covariance matrix for time t  
+    # $F_t \equiv Z_t P_t Z_t' + H_t$
+    # 
+    # *Note*: this and does nothing at all to `forecast_error_cov` if
+    # converged == True
+    # TODO make sure when converged, the copies are made correctly
+    if not kfilter.converged:
+        # $\\# = H_t$
+        # blas.scopy(&kfilter.k_endog2, kfilter._obs_cov, &inc, kfilter._forecast_error_cov, &inc)
+        for i in range(model._k_endog): # columns
+            for j in range(model._k_endog): # rows
+                kfilter._forecast_error_cov[j + i*kfilter.k_endog] = model._obs_cov[j + i*model._k_endog]
+
+        # $F_t = 1.0 * Z_t \\#_1 + 1.0 * \\#$
+        blas.sgemm("N", "N", &model._k_endog, &model._k_endog, &model._k_states,
+              &alpha, model._design, &model._k_endog,
+                     kfilter._tmp1, &kfilter.k_states,
+              &alpha, kfilter._forecast_error_cov, &kfilter.k_endog)
+
+    return 0
+
+cdef int supdating_conventional(sKalmanFilter kfilter, sStatespace model):
+    # Constants
+    cdef:
+        int inc = 1
+        np.float32_t alpha = 1.0
+        np.float32_t beta = 0.0
+        np.float32_t gamma = -1.0
+    
+    # #### Filtered state for time t
+    # $a_{t|t} = a_t + P_t Z_t' F_t^{-1} v_t$  
+    # $a_{t|t} = 1.0 * \\#_1 \\#_2 + 1.0 a_t$
+    blas.scopy(&kfilter.k_states, kfilter._input_state, &inc, kfilter._filtered_state, &inc)
+    blas.sgemv("N", &model._k_states, &model._k_endog,
+          &alpha, kfilter._tmp1, &kfilter.k_states,
+                  kfilter._tmp2, &inc,
+          &alpha, kfilter._filtered_state, &inc)
+
+    # #### Filtered state covariance for time t
+    # $P_{t|t} = P_t - P_t Z_t' F_t^{-1} Z_t P_t$  
+    # $P_{t|t} = P_t - \\#_1 \\#_3 P_t$  
+    # 
+    # *Note*: this and does nothing at all to `filtered_state_cov` if
+    # converged == True
+    # *Note*: with the Chandrasekhar recursions, the products are ordered
+    # so that no $(m \times m) (m \times m)$ product is required.
+    if not kfilter.converged and kfilter.filter_method & FILTER_CHANDRASEKHAR:
+        supdating_chandrasekhar(kfilter, model)
+        return 0
+
+    if not kfilter.converged:
+        blas.scopy(&kfilter.k_states2, kfilter._input_state_cov, &inc, kfilter._filtered_state_cov, &inc)
+
+        # `tmp0` array used here, dimension $(m \times m)$  
+        # $\\#_0 = 1.0 * \\#_1 \\#_3$  
+        # $(m \times m) = (m \times p) (p \times m)$
+        blas.sgemm("N", "N", &model._k_states, &model._k_states, &model._k_endog,
+              &alpha, kfilter._tmp1, &kfilter.k_states,
+                      kfilter._tmp3, &kfilter.k_endog,
+              &beta, kfilter._tmp0, &kfilter.k_states)
+
+        # $P_{t|t} = - 1.0 * \\# P_t + 1.0 * P_t$  
+        # $(m \times m) = (m \times m) (m \times m) + (m \times m)$
+        blas.sgemm("N", "N", &model._k_states, &model._k_states, &model._k_states,
+              &gamma, kfilter._tmp0, &kfilter.k_states,
+                      kfilter._input_state_cov, &kfilter.k_states,
+              &alpha, kfilter._filtered_state_cov, &kfilter.k_states)
+
+    # #### Kalman gain for time t
+    # $K_t = T_t P_t Z_t' F_t^{-1}$
+    #
+    # *Note*: this and does nothing at all to `kalman_gain` if
+    # converged == True
+    # *Note*: Kim and Nelson (1999) have a different version of the Kalman
+    # gain, defined as $P_t Z_t' F_t^{-1}$. That is not adopted here.
+    if not kfilter.converged:
+        # `tmp00` array used here, dimension $(m \times m)$  
+        # $\\#_{00} = 1.0 * T_t P_t$  
+        # $(m \times m) = (m \times m) (m \times m)$
+        blas.sgemm("N", "N", &model._k_states, &model._k_states, &model._k_states,
+              &alpha, model._transition, &model._k_states,
+                      kfilter._input_state_cov, &kfilter.k_states,
+              &beta, kfilter._tmp00, &kfilter.k_states)
+
+        # K_t = 1.0 * \\#_{00} \\#_3'
+        # $(m \times p) = (m \times m) (m \times p)$
+        blas.sgemm("N", "T", &model._k_states, &model._k_endog, &model._k_states,
+              &alpha, kfilter._tmp00, &kfilter.k_states,
+                      kfilter._tmp3, &kfilter.k_endog,
+              &beta, kfilter._kalman_gain, &kfilter.k_states)
+
+    return 0
+
+cdef int sprediction_conventional(sKalmanFilter kfilter, sStatespace model):
+
+    # Constants
+    cdef:
+        int inc = 1
+        np.float32_t alpha = 1.0
+        np.float32_t beta = 0.0
+        np.float32_t gamma = -1.0
+
+    # #### Predicted state for time t+1
+    # $a_{t+1} = T_t a_{t|t} + c_t$
+    blas.scopy(&model._k_states, model._state_intercept, &inc, kfilter._predicted_state, &inc)
+    blas.sgemv("N", &model._k_states, &model._k_states,
+          &alpha, model._transition, &model._k_states,
+                  kfilter._filtered_state, &inc,
+          &alpha, kfilter._predicted_state, &inc)
+
+    # #### Predicted state covariance matrix for time t+1
+    # $P_{t+1} = T_t P_{t|t} T_t' + Q_t^*$
+    #
+    # *Note*: this and does nothing at all to `predicted_state_cov` if
+    # converged == True
+    if (not kfilter.converged and
+            kfilter.filter_method & FILTER_CHANDRASEKHAR and kfilter.t > 0):
+        schandrasekhar_recursion(kfilter, model)
+    elif not kfilter.converged:
+        blas.scopy(&model._k_states2, model._selected_state_cov, &inc, kfilter._predicted_state_cov, &inc)
+        # `tmp0` array used here, dimension $(m \times m)$  
+
+        # $\\#_0 = T_t P_{t|t} $
+
+        # $(m \times m) = (m \times m) (m \times m)$
+        blas.sgemm("N", "N", &model._k_states, &model._k_states, &model._k_states,
+              &alpha, model._transition, &model._k_states,
+                      kfilter._filtered_state_cov, &kfilter.k_states,
+              &beta, kfilter._tmp0, &kfilter.k_states)
+        # $P_{t+1} = 1.0 \\#_0 T_t' + 1.0 \\#$  
+        # $(m \times m) = (m \times m) (m \times m) + (m \times m)$
+        blas.sgemm("N", "T", &model._k_states, &model._k_states, &model._k_states,
+              &alpha, kfilter._tmp0, &kfilter.k_states,
+                      model._transition, &model._k_states,
+              &alpha, kfilter._predicted_state_cov, &kfilter.k_states)
+
+        if kfilter.filter_method & FILTER_CHANDRASEKHAR:
+            schandrasekhar_initialize(kfilter, model)
+
+    return 0
+
+# ### Chandrasekhar recursions
+#
+# For time-invariant models without missing data, the change in the
+# predicted state covariance matrix can be factored as
+# $P_{t+1} - P_t = W_t M_t W_t'$, where $W_t$ is $(m \times r)$, $M_t$ is
+# $(r \times r)$ and
+#
+# $$
+# \begin{aligned}
+# W_t & = (T - K_t Z) W_{t-1} \\
+# M_t & = M_{t-1} + M_{t-1} W_{t-1}' Z' F_{t-1}^{-1} Z W_{t-1} M_{t-1}
+# \end{aligned}
+# $$
+#
+# so that each iteration only requires $O(m^2 r)$ operations instead of the
+# $O(m^3)$ of the Riccati equation. If the initial state covariance matrix is
+# the unconditional covariance matrix of the state, then
+# $P_1 - P_0 = - K_0 F_0 K_0'$ and $r = p$. Otherwise the recursions are
+# initialized with $W_0 = I$ and $M_0 = P_1 - P_0$.
+#
+# See Herbst (2015), "Using the 'Chandrasekhar Recursions' for Likelihood
+# Evaluation of DSGE Models", Computational Economics.
+
+cdef int supdating_chandrasekhar(sKalmanFilter kfilter, sStatespace model):
+    # Constants
+    cdef:
+        int inc = 1
+        np.float32_t alpha = 1.0
+        np.float32_t beta = 0.0
+        np.float32_t gamma = -1.0
+
+    # `CtmpW` array used here, dimension $(m \times p)$
+    # $\\#_W = P_t Z_t' F_t^{-1} = P_t \\#_3'$
+    blas.sgemm("N", "T", &model._k_states, &model._k_endog, &model._k_states,
+          &alpha, kfilter._input_state_cov, &kfilter.k_states,
+                  kfilter._tmp3, &kfilter.k_endog,
+          &beta, &kfilter.CtmpW[0, 0], &kfilter.k_states)
+
+    # $P_{t|t} = P_t - \\#_1 \\#_W'$
+    blas.scopy(&kfilter.k_states2, kfilter._input_state_cov, &inc, kfilter._filtered_state_cov, &inc)
+    blas.sgemm("N", "T", &model._k_states, &model._k_states, &model._k_endog,
+          &gamma, kfilter._tmp1, &kfilter.k_states,
+                  &kfilter.CtmpW[0, 0], &kfilter.k_states,
+          &alpha, kfilter._filtered_state_cov, &kfilter.k_states)
+
+    # $K_t = T_t \\#_W$
+    blas.sgemm("N", "N", &model._k_states, &model._k_endog, &model._k_states,
+          &alpha, model._transition, &model._k_states,
+                  &kfilter.CtmpW[0, 0], &kfilter.k_states,
+          &beta, kfilter._kalman_gain, &kfilter.k_states)
+
+    return 0
+
+cdef int schandrasekhar_initialize(sKalmanFilter kfilter, sStatespace model):
+    # Constants
+    cdef:
+        int inc = 1
+        int i, j, k
+        np.float32_t alpha = 1.0
+        np.float32_t beta = 0.0
+        np.float32_t value
+        np.float64_t scale = 0, residual = 0
+        np.float64_t scale_imag = 0, residual_imag = 0
+
+    # `tmp0` array used here, dimension $(m \times m)$
+    # $\\#_0 = P_1 - P_0$
+    for i in range(model._k_states2):
+        kfilter._tmp0[i] = (kfilter._predicted_state_cov[i] -
+                            kfilter._input_state_cov[i])
+
+    # `CtmpW` array used here, dimension $(m \times p)$
+    # $\\#_W = K_0 F_0$
+    blas.sgemm("N", "N", &model._k_states, &model._k_endog, &model._k_endog,
+          &alpha, kfilter._kalman_gain, &kfilter.k_states,
+                  kfilter._forecast_error_cov, &kfilter.k_endog,
+          &beta, &kfilter.CtmpW[0, 0], &kfilter.k_states)
+
+    # Check whether $P_1 - P_0 + K_0 F_0 K_0' = 0$
+    # *Note*: for complex step differentiation, the imaginary parts are
+    # checked separately, since they are of a much smaller magnitude.
+    for i in range(model._k_states):
+        for j in range(model._k_states):
+            value = kfilter._tmp0[i + j*kfilter.k_states]
+            for k in range(model._k_endog):
+                value = value + (kfilter.CtmpW[i, k] *
+                                 kfilter._kalman_gain[j + k*kfilter.k_states])
+            residual = max(residual, dabs(value))
+            scale = max(scale, dabs(kfilter._input_state_cov[i + j*kfilter.k_states]))
+
+    if (model._k_endog < model._k_states and
+            residual <= 1e-10 * max(scale, 1.0) and
+            residual_imag <= 1e-10 * scale_imag):
+        # $W_0 = K_0$, $M_0 = -F_0$
+        kfilter.chandrasekhar_rank = model._k_endog
+        for j in range(model._k_endog):
+            for i in range(model._k_states):
+                kfilter.CW[i, j] = kfilter._kalman_gain[i + j*kfilter.k_states]
+            for i in range(model._k_endog):
+                kfilter.CM[i, j] = -kfilter._forecast_error_cov[i + j*kfilter.k_endog]
+    else:
+        # $W_0 = I$, $M_0 = P_1 - P_0$
+        kfilter.chandrasekhar_rank = model._k_states
+        for j in range(model._k_states):
+            for i in range(model._k_states):
+                kfilter.CW[i, j] = 1.0 if i == j else 0.0
+                kfilter.CM[i, j] = kfilter._tmp0[i + j*kfilter.k_states]
+
+    schandrasekhar_store(kfilter, model)
+
+    return 0
+
+cdef int schandrasekhar_store(sKalmanFilter kfilter, sStatespace model):
+    # Constants
+    cdef:
+        int rank = kfilter.chandrasekhar_rank
+        np.float32_t alpha = 1.0
+        np.float32_t beta = 0.0
+
+    # $Z W_t$
+    # $(p \times r) = (p \times m) (m \times r)$
+    blas.sgemm("N", "N", &model._k_endog, &rank, &model._k_states,
+          &alpha, model._design, &model._k_endog,
+                  &kfilter.CW[0, 0], &kfilter.k_states,
+          &beta, &kfilter.CZW[0, 0], &kfilter.k_endog)
+
+    # $F_t^{-1} Z W_t = \\#_3 W_t$
+    # $(p \times r) = (p \times m) (m \times r)$
+    blas.sgemm("N", "N", &model._k_endog, &rank, &model._k_states,
+          &alpha, kfilter._tmp3, &kfilter.k_endog,
+                  &kfilter.CW[0, 0], &kfilter.k_states,
+          &beta, &kfilter.CFZW[0, 0], &kfilter.k_endog)
+
+    return 0
+
+cdef int schandrasekhar_recursion(sKalmanFilter kfilter, sStatespace model):
+    # Constants
+    cdef:
+        int inc = 1
+        int rank = kfilter.chandrasekhar_rank
+        int kr = kfilter.k_states * kfilter.chandrasekhar_rank
+        np.float32_t alpha = 1.0
+        np.float32_t beta = 0.0
+        np.float32_t gamma = -1.0
+
+    # #### Update $M_t$
+    # `CtmpM` array used here, dimension $(p \times r)$
+    # $\\#_M = Z W_{t-1} M_{t-1}$
+    blas.sgemm("N", "N", &model._k_endog, &rank, &rank,
+          &alpha, &kfilter.CZW[0, 0], &kfilter.k_endog,
+                  &kfilter.CM[0, 0], &kfilter.k_states,
+          &beta, &kfilter.CtmpM[0, 0], &kfilter.k_endog)
+    # `tmp0` array used here, dimension $(r \times r)$
+    # $\\#_0 = \\#_M' F_{t-1}^{-1} Z W_{t-1}$
+    blas.sgemm("T", "N", &rank, &rank, &model._k_endog,
+          &alpha, &kfilter.CtmpM[0, 0], &kfilter.k_endog,
+                  &kfilter.CFZW[0, 0], &kfilter.k_endog,
+          &beta, kfilter._tmp0, &kfilter.k_states)
+    # `tmp00` array used here, dimension $(r \times r)$
+    # $M_t = M_{t-1} + \\#_0 M_{t-1}$
+    blas.scopy(&kfilter.k_states2, &kfilter.CM[0, 0], &inc, kfilter._tmp00, &inc)
+    blas.sgemm("N", "N", &rank, &rank, &rank,
+          &alpha, kfilter._tmp0, &kfilter.k_states,
+                  &kfilter.CM[0, 0], &kfilter.k_states,
+          &alpha, kfilter._tmp00, &kfilter.k_states)
+    blas.scopy(&kfilter.k_states2, kfilter._tmp00, &inc, &kfilter.CM[0, 0], &inc)
+
+    # #### Update $W_t$
+    # $W_t = T W_{t-1} - K_t Z W_{t-1}$
+    blas.sgemm("N", "N", &model._k_states, &rank, &model._k_states,
+          &alpha, model._transition, &model._k_states,
+                  &kfilter.CW[0, 0], &kfilter.k_states,
+          &beta, &kfilter.CtmpW[0, 0], &kfilter.k_states)
+    blas.sgemm("N", "N", &model._k_states, &rank, &model._k_endog,
+          &gamma, kfilter._kalman_gain, &kfilter.k_states,
+                  &kfilter.CZW[0, 0], &kfilter.k_endog,
+          &alpha, &kfilter.CtmpW[0, 0], &kfilter.k_states)
+    blas.scopy(&kr, &kfilter.CtmpW[0, 0], &inc, &kfilter.CW[0, 0], &inc)
+
+    # #### Predicted state covariance matrix for time t+1
+    # $P_{t+1} = P_t + W_t M_t W_t'$
+    # `tmp0` array used here, dimension $(m \times r)$
+    blas.sgemm("N", "N", &model._k_states, &rank, &rank,
+          &alpha, &kfilter.CW[0, 0], &kfilter.k_states,
+                  &kfilter.CM[0, 0], &kfilter.k_states,
+          &beta, kfilter._tmp0, &kfilter.k_states)
+    blas.scopy(&kfilter.k_states2, kfilter._input_state_cov, &inc, kfilter._predicted_state_cov, &inc)
+    blas.sgemm("N", "T", &model._k_states, &model._k_states, &rank,
+          &alpha, kfilter._tmp0, &kfilter.k_states,
+                  &kfilter.CW[0, 0], &kfilter.k_states,
+          &alpha, kfilter._predicted_state_cov, &kfilter.k_states)
+
+    schandrasekhar_store(kfilter, model)
+
+    return 0
+
+cdef np.float32_t sloglikelihood_conventional(sKalmanFilter kfilter, sStatespace model, np.float32_t determinant):
+    # Constants
+    cdef:
+        np.float32_t loglikelihood
+        int inc = 1
+        np.float32_t alpha = 1.0
+        np.float32_t beta = 0.0
+
+    loglikelihood = -0.5*(model._k_endog*dlog(2*NPY_PI) + dlog(determinant))
+
+    loglikelihood = loglikelihood - 0.5*blas.sdot(&model._k_endog, kfilter._forecast_error, &inc, kfilter._tmp2, &inc)
+
+    return loglikelihood
+
+# ### Missing Observation Conventional Kalman filter
+#
+# See Durbin and Koopman (2012) Chapter 4.10
+#
+# Here k_endog is the same as usual, but the design matrix and observation
+# covariance matrix are enforced to be zero matrices, and the loglikelihood
+# is defined to be zero.
+
+cdef int dforecast_missing_conventional(dKalmanFilter kfilter, dStatespace model):
+    cdef int i, j
+    cdef int inc = 1, design_t = 0
+    cdef np.float64_t alpha = 1
+
+    # #### Forecast for time t  
+    # `forecast` $= Z_t a_t + d_t$
+    # Just set to zeros, see below (this means if forecasts are required for
+    # this part, they must be done in the wrappe)
+
+    # #### Forecast error for time t  
+    # It is undefined here, since obs is nan
+    # Note: use kfilter dimensions since we just want to set the whole array
+    # to zero
+    for i in range(kfilter.k_endog):
+        kfilter._forecast[i] = 0
+        kfilter._forecast_error[i] = 0
+
+    # #### Forecast error covariance matrix for time t  
+    # $F_t \equiv 0$
+    # Note: use kfilter dimensions since we just want to set the whole array
+    # to zeros
+    for i in range(kfilter.k_endog): # columns
+        for j in range(kfilter.k_endog): # rows
+            kfilter._forecast_error_cov[j + i*kfilter.k_endog] = 0
+
+cdef int dupdating_missing_conventional(dKalmanFilter kfilter, dStatespace model):
+    cdef int inc = 1
+
+    # Simply copy over the input arrays ($a_t, P_t$) to the filtered arrays
+    # ($a_{t|t}, P_{t|t}$)
+    # Note: use kfilter dimensions since we just want to copy whole arrays;
+    blas.dcopy(&kfilter.k_states, kfilter._input_state, &inc, kfilter._filtered_state, &inc)
+    blas.dcopy(&kfilter.k_states2, kfilter._input_state_cov, &inc, kfilter._filtered_state_cov, &inc)
+
+cdef np.float64_t dinverse_missing_conventional(dKalmanFilter kfilter, dStatespace model, np.float64_t determinant)  except *:
+    # Since the inverse of the forecast error covariance matrix is not
+    # stored, we don't need to fill it (e.g. with NPY_NAN values). Instead,
+    # just do a noop here and return a zero determinant ($|0|$).
+    return 0.0
+
+cdef np.float64_t dloglikelihood_missing_conventional(dKalmanFilter kfilter, dStatespace model, np.float64_t determinant):
+    return 0.0
+
+# ### Conventional Kalman filter
+#
+# The following are the above routines as defined in the conventional Kalman
+# filter.
+#
+# See Durbin and Koopman (2012) Chapter 4
+
+cdef int dforecast_conventional(dKalmanFilter kfilter, dStatespace model):
+
+    # Constants
+    cdef:
+        int inc = 1, ld, i, j
+        np.float64_t alpha = 1.0
+        np.float64_t beta = 0.0
+        np.float64_t gamma = -1.0
+
+    # #### Forecast for time t  
+    # `forecast` $= Z_t a_t + d_t$
+    # 
+    # *Note*: $a_t$ is given from the initialization (for $t = 0$) or
+    # from the previous iteration of the filter (for $t > 0$).
+
+    # $\\# = d_t$
+    blas.dcopy(&model._k_endog, model._obs_intercept, &inc, kfilter._forecast, &inc)
+    # `forecast` $= 1.0 * Z_t a_t + 1.0 * \\#$  
+    # $(p \times 1) = (p \times m) (m \times 1) + (p \times 1)$
+    blas.dgemv("N", &model._k_endog, &model._k_states,
+          &alpha, model._design, &model._k_endog,
+                  kfilter._input_state, &inc,
+          &alpha, kfilter._forecast, &inc)
+
+    # #### Forecast error for time t  
+    # `forecast_error` $\equiv v_t = y_t -$ `forecast`
+
+    # $\\# = y_t$
+    blas.dcopy(&model._k_endog, model._obs, &inc, kfilter._forecast_error, &inc)
+    # $v_t = -1.0 * $ `forecast` $ + \\#$
+    # $(p \times 1) = (p \times 1) + (p \times 1)$
+    blas.daxpy(&model._k_endog, &gamma, kfilter._forecast, &inc, kfilter._forecast_error, &inc)
+
+    # *Intermediate calculation* (used just below and then once more)  
+    # `tmp1` array used here, dimension $(m \times p)$  
+    # $\\#_1 = P_t Z_t'$  
+    # $(m \times p) = (m \times m) (p \times m)'$
+    blas.dgemm("N", "T", &model._k_states, &model._k_endog, &model._k_states,
+          &alpha, kfilter._input_state_cov, &kfilter.k_states,
+                  model._design, &model._k_endog,
+          &beta, kfilter._tmp1, &kfilter.k_states)
+
+    # #### Forecast error covariance matrix for time t  
+    # $F_t \equiv Z_t P_t Z_t' + H_t$
+    # 
+    # *Note*: this and does nothing at all to `forecast_error_cov` if
+    # converged == True
+    # TODO make sure when converged, the copies are made correctly
+    if not kfilter.converged:
+        # $\\# = H_t$
+        # blas.dcopy(&kfilter.k_endog2, kfilter._obs_cov, &inc, kfilter._forecast_error_cov, &inc)
+        for i in range(model._k_endog): # columns
+            for j in range(model._k_endog): # rows
+                kfilter._forecast_error_cov[j + i*kfilter.k_endog] = model._obs_cov[j + i*model._k_endog]
+
+        # $F_t = 1.0 * Z_t \\#_1 + 1.0 * \\#$
+        blas.dgemm("N", "N", &model._k_endog, &model._k_endog, &model._k_states,
+              &alpha, model._design, &model._k_endog,
+                     kfilter._tmp1, &kfilter.k_states,
+              &alpha, kfilter._forecast_error_cov, &kfilter.k_endog)
+
+    return 0
+
+cdef int dupdating_conventional(dKalmanFilter kfilter, dStatespace model):
+    # Constants
+    cdef:
+        int inc = 1
+        np.float64_t alpha = 1.0
+        np.float64_t beta = 0.0
+        np.float64_t gamma = -1.0
+    
+    # #### Filtered state for time t
+    # $a_{t|t} = a_t + P_t Z_t' F_t^{-1} v_t$  
+    # $a_{t|t} = 1.0 * \\#_1 \\#_2 + 1.0 a_t$
+    blas.dcopy(&kfilter.k_states, kfilter._input_state, &inc, kfilter._filtered_state, &inc)
+    blas.dgemv("N", &model._k_states, &model._k_endog,
+          &alpha, kfilter._tmp1, &kfilter.k_states,
+                  kfilter._tmp2, &inc,
+          &alpha, kfilter._filtered_state, &inc)
+
+    # #### Filtered state covariance for time t
+    # $P_{t|t} = P_t - P_t Z_t' F_t^{-1} Z_t P_t$  
+    # $P_{t|t} = P_t - \\#_1 \\#_3 P_t$  
+    # 
+    # *Note*: this and does nothing at all to `filtered_state_cov` if
+    # converged == True
+    # *Note*: with the Chandrasekhar recursions, the products are ordered
+    # so that no $(m \times m) (m \times m)$ product is required.
+    if not kfilter.converged and kfilter.filter_method & FILTER_CHANDRASEKHAR:
+        dupdating_chandrasekhar(kfilter, model)
+        return 0
+
+    if not kfilter.converged:
+        blas.dcopy(&kfilter.k_states2, kfilter._input_state_cov, &inc, kfilter._filtered_state_cov, &inc)
+
+        # `tmp0` array used here, dimension $(m \times m)$  
+        # $\\#_0 = 1.0 * \\#_1 \\#_3$  
+        # $(m \times m) = (m \times p) (p \times m)$
+        blas.dgemm("N", "N", &model._k_states, &model._k_states, &model._k_endog,
+              &alpha, kfilter._tmp1, &kfilter.k_states,
+                      kfilter._tmp3, &kfilter.k_endog,
+              &beta, kfilter._tmp0, &kfilter.k_states)
+
+        # $P_{t|t} = - 1.0 * \\# P_t + 1.0 * P_t$  
+        # $(m \times m) = (m \times m) (m \times m) + (m \times m)$
+        blas.dgemm("N", "N", &model._k_states, &model._k_states, &model._k_states,
+              &gamma, kfilter._tmp0, &kfilter.k_states,
+                      kfilter._input_state_cov, &kfilter.k_states,
+              &alpha, kfilter._filtered_state_cov, &kfilter.k_states)
+
+    # #### Kalman gain for time t
+    # $K_t = T_t P_t Z_t' F_t^{-1}$
+    #
+    # *Note*: this and does nothing at all to `kalman_gain` if
+    # converged == True
+    # *Note*: Kim and Nelson (1999) have a different version of the Kalman
+    # gain, defined as $P_t Z_t' F_t^{-1}$. That is not adopted here.
+    if not kfilter.converged:
+        # `tmp00` array used here, dimension $(m \times m)$  
+        # $\\#_{00} = 1.0 * T_t P_t$  
+        # $(m \times m) = (m \times m) (m \times m)$
+        blas.dgemm("N", "N", &model._k_states, &model._k_states, &model._k_states,
+              &alpha, model._transition, &model._k_states,
+                      kfilter._input_state_cov, &kfilter.k_states,
+              &beta, kfilter._tmp00, &kfilter.k_states)
+
+        # K_t = 1.0 * \\#_{00} \\#_3'
+        # $(m \times p) = (m \times m) (m \times p)$
+        blas.dgemm("N", "T", &model._k_states, &model._k_endog, &model._k_states,
+              &alpha, kfilter._tmp00, &kfilter.k_states,
+                      kfilter._tmp3, &kfilter.k_endog,
+              &beta, kfilter._kalman_gain, &kfilter.k_states)
+
+    return 0
+
+cdef int dprediction_conventional(dKalmanFilter kfilter, dStatespace model):
+
+    # Constants
+    cdef:
+        int inc = 1
+        np.float64_t alpha = 1.0
+        np.float64_t beta = 0.0
+        np.float64_t gamma = -1.0
+
+    # #### Predicted state for time t+1
+    # $a_{t+1} = T_t a_{t|t} + c_t$
+    blas.dcopy(&model._k_states, model._state_intercept, &inc, kfilter._predicted_state, &inc)
+    blas.dgemv("N", &model._k_states, &model._k_states,
+          &alpha, model._transition, &model._k_states,
+                  kfilter._filtered_state, &inc,
+          &alpha, kfilter._predicted_state, &inc)
+
+    # #### Predicted state covariance matrix for time t+1
+    # $P_{t+1} = T_t P_{t|t} T_t' + Q_t^*$
+    #
+    # *Note*: this and does nothing at all to `predicted_state_cov` if
+    # converged == True
+    if (not kfilter.converged and
+            kfilter.filter_method & FILTER_CHANDRASEKHAR and kfilter.t > 0):
+        dchandrasekhar_recursion(kfilter, model)
+    elif not kfilter.converged:
+        blas.dcopy(&model._k_states2, model._selected_state_cov, &inc, kfilter._predicted_state_cov, &inc)
+        # `tmp0` array used here, dimension $(m \times m)$  
+
+        # $\\#_0 = T_t P_{t|t} $
+
+        # $(m \times m) = (m \times m) (m \times m)$
+        blas.dgemm("N", "N", &model._k_states, &model._k_states, &model._k_states,
+              &alpha, model._transition, &model._k_states,
+                      kfilter._filtered_state_cov, &kfilter.k_states,
+              &beta, kfilter._tmp0, &kfilter.k_states)
+        # $P_{t+1} = 1.0 \\#_0 T_t' + 1.0 \\#$  
+        # $(m \times m) = (m \times m) (m \times m) + (m \times m)$
+        blas.dgemm("N", "T", &model._k_states, &model._k_states, &model._k_states,
+              &alpha, kfilter._tmp0, &kfilter.k_states,
+                      model._transition, &model._k_states,
+              &alpha, kfilter._predicted_state_cov, &kfilter.k_states)
+
+        if kfilter.filter_method & FILTER_CHANDRASEKHAR:
+            dchandrasekhar_initialize(kfilter, model)
+
+    return 0
+
+# ### Chandrasekhar recursions
+#
+# For time-invariant models without missing data, the change in the
+# predicted state covariance matrix can be factored as
+# $P_{t+1} - P_t = W_t M_t W_t'$, where $W_t$ is $(m \times r)$, $M_t$ is
+# $(r \times r)$ and
+#
+# $$
+# \begin{aligned}
+# W_t & = (T - K_t Z) W_{t-1} \\
+# M_t & = M_{t-1} + M_{t-1} W_{t-1}' Z' F_{t-1}^{-1} Z W_{t-1} M_{t-1}
+# \end{aligned}
+# $$
+#
+# so that each iteration only requires $O(m^2 r)$ operations instead of the
+# $O(m^3)$ of the Riccati equation. If the initial state covariance matrix is
+# the unconditional covariance matrix of the state, then
+# $P_1 - P_0 = - K_0 F_0 K_0'$ and $r = p$. Otherwise the recursions are
+# initialized with $W_0 = I$ and $M_0 = P_1 - P_0$.
+#
+# See Herbst (2015), "Using the 'Chandrasekhar Recursions' for Likelihood
+# Evaluation of DSGE Models", Computational Economics.
+
+cdef int dupdating_chandrasekhar(dKalmanFilter kfilter, dStatespace model):
+    # Constants
+    cdef:
+        int inc = 1
+        np.float64_t alpha = 1.0
+        np.float64_t beta = 0.0
+        np.float64_t gamma = -1.0
+
+    # `CtmpW` array used here, dimension $(m \times p)$
+    # $\\#_W = P_t Z_t' F_t^{-1} = P_t \\#_3'$
+    blas.dgemm("N", "T", &model._k_states, &model._k_endog, &model._k_states,
+          &alpha, kfilter._input_state_cov, &kfilter.k_states,
+                  kfilter._tmp3, &kfilter.k_endog,
+          &beta, &kfilter.CtmpW[0, 0], &kfilter.k_states)
+
+    # $P_{t|t} = P_t - \\#_1 \\#_W'$
+    blas.dcopy(&kfilter.k_states2, kfilter._input_state_cov, &inc, kfilter._filtered_state_cov, &inc)
+    blas.dgemm("N", "T", &model._k_states, &model._k_states, &model._k_endog,
+          &gamma, kfilter._tmp1, &kfilter.k_states,
+                  &kfilter.CtmpW[0, 0], &kfilter.k_states,
+          &alpha, kfilter._filtered_state_cov, &kfilter.k_states)
+
+    # $K_t = T_t \\#_W$
+    blas.dgemm("N", "N", &model._k_states, &model._k_endog, &model._k_states,
+          &alpha, model._transition, &model._k_states,
+                  &kfilter.CtmpW[0, 0], &kfilter.k_states,
+          &beta, kfilter._kalman_gain, &kfilter.k_states)
+
+    return 0
+
+cdef int dchandrasekhar_initialize(dKalmanFilter kfilter, dStatespace model):
+    # Constants
+    cdef:
+        int inc = 1
+        int i, j, k
+        np.float64_t alpha = 1.0
+        np.float64_t beta = 0.0
+        np.float64_t value
+        np.float64_t scale = 0, residual = 0
+        np.float64_t scale_imag = 0, residual_imag = 0
+
+    # `tmp0` array used here, dimension $(m \times m)$
+    # $\\#_0 = P_1 - P_0$
+    for i in range(model._k_states2):
+        kfilter._tmp0[i] = (kfilter._predicted_state_cov[i] -
+                            kfilter._input_state_cov[i])
+
+    # `CtmpW` array used here, dimension $(m \times p)$
+    # $\\#_W = K_0 F_0$
+    blas.dgemm("N", "N", &model._k_states, &model._k_endog, &model._k_endog,
+          &alpha, kfilter._kalman_gain, &kfilter.k_states,
+                  kfilter._forecast_error_cov, &kfilter.k_endog,
+          &beta, &kfilter.CtmpW[0, 0], &kfilter.k_states)
+
+    # Check whether $P_1 - P_0 + K_0 F_0 K_0' = 0$
+    # *Note*: for complex step differentiation, the imaginary parts are
+    # checked separately, since they are of a much smaller magnitude.
+    for i in range(model._k_states):
+        for j in range(model._k_states):
+            value = kfilter._tmp0[i + j*kfilter.k_states]
+            for k in range(model._k_endog):
+                value = value + (kfilter.CtmpW[i, k] *
+                                 kfilter._kalman_gain[j + k*kfilter.k_states])
+            residual = max(residual, dabs(value))
+            scale = max(scale, dabs(kfilter._input_state_cov[i + j*kfilter.k_states]))
+
+    if (model._k_endog < model._k_states and
+            residual <= 1e-10 * max(scale, 1.0) and
+            residual_imag <= 1e-10 * scale_imag):
+        # $W_0 = K_0$, $M_0 = -F_0$
+        kfilter.chandrasekhar_rank = model._k_endog
+        for j in range(model._k_endog):
+            for i in range(model._k_states):
+                kfilter.CW[i, j] = kfilter._kalman_gain[i + j*kfilter.k_states]
+            for i in range(model._k_endog):
+                kfilter.CM[i, j] = -kfilter._forecast_error_cov[i + j*kfilter.k_endog]
+    else:
+        # $W_0 = I$, $M_0 = P_1 - P_0$
+        kfilter.chandrasekhar_rank = model._k_states
+        for j in range(model._k_states):
+            for i in range(model._k_states):
+                kfilter.CW[i, j] = 1.0 if i == j else 0.0
+                kfilter.CM[i, j] = kfilter._tmp0[i + j*kfilter.k_states]
+
+    dchandrasekhar_store(kfilter, model)
+
+    return 0
+
+cdef int dchandrasekhar_store(dKalmanFilter kfilter, dStatespace model):
+    # Constants
+    cdef:
+        int rank = kfilter.chandrasekhar_rank
+        np.float64_t alpha = 1.0
+        np.float64_t beta = 0.0
+
+    # $Z W_t$
+    # $(p \times r) = (p \times m) (m \times r)$
+    blas.dgemm("N", "N", &model._k_endog, &rank, &model._k_states,
+          &alpha, model._design, &model._k_endog,
+                  &kfilter.CW[0, 0], &kfilter.k_states,
+          &beta, &kfilter.CZW[0, 0], &kfilter.k_endog)
+
+    # $F_t^{-1} Z W_t = \\#_3 W_t$
+    # $(p \times r) = (p \times m) (m \times r)$
+    blas.dgemm("N", "N", &model._k_endog, &rank, &model._k_states,
+          &alpha, kfilter._tmp3, &kfilter.k_endog,
+                  &kfilter.CW[0, 0], &kfilter.k_states,
+          &beta, &kfilter.CFZW[0, 0], &kfilter.k_endog)
+
+    return 0
+
+cdef int dchandrasekhar_recursion(dKalmanFilter kfilter, dStatespace model):
+    # Constants
+    cdef:
+        int inc = 1
+        int rank = kfilter.chandrasekhar_rank
+        int kr = kfilter.k_states * kfilter.chandrasekhar_rank
+        np.float64_t alpha = 1.0
+        np.float64_t beta = 0.0
+        np.float64_t gamma = -1.0
+
+    # #### Update $M_t$
+    # `CtmpM` array used here, dimension $(p \times r)$
+    # $\\#_M = Z W_{t-1} M_{t-1}$
+    blas.dgemm("N", "N", &model._k_endog, &rank, &rank,
+          &alpha, &kfilter.CZW[0, 0], &kfilter.k_endog,
+                  &kfilter.CM[0, 0], &kfilter.k_states,
+          &beta, &kfilter.CtmpM[0, 0], &kfilter.k_endog)
+    # `tmp0` array used here, dimension $(r \times r)$
+    # $\\#_0 = \\#_M' F_{t-1}^{-1} Z W_{t-1}$
+    blas.dgemm("T", "N", &rank, &rank, &model._k_endog,
+          &alpha, &kfilter.CtmpM[0, 0], &kfilter.k_endog,
+                  &kfilter.CFZW[0, 0], &kfilter.k_endog,
+          &beta, kfilter._tmp0, &kfilter.k_states)
+    # `tmp00` array used here, dimension $(r \times r)$
+    # $M_t = M_{t-1} + \\#_0 M_{t-1}$
+    blas.dcopy(&kfilter.k_states2, &kfilter.CM[0, 0], &inc, kfilter._tmp00, &inc)
+    blas.dgemm("N", "N", &rank, &rank, &rank,
+          &alpha, kfilter._tmp0, &kfilter.k_states,
+                  &kfilter.CM[0, 0], &kfilter.k_states,
+          &alpha, kfilter._tmp00, &kfilter.k_states)
+    blas.dcopy(&kfilter.k_states2, kfilter._tmp00, &inc, &kfilter.CM[0, 0], &inc)
+
+    # #### Update $W_t$
+    # $W_t = T W_{t-1} - K_t Z W_{t-1}$
+    blas.dgemm("N", "N", &model._k_states, &rank, &model._k_states,
+          &alpha, model._transition, &model._k_states,
+                  &kfilter.CW[0, 0], &kfilter.k_states,
+          &beta, &kfilter.CtmpW[0, 0], &kfilter.k_states)
+    blas.dgemm("N", "N", &model._k_states, &rank, &model._k_endog,
+          &gamma, kfilter._kalman_gain, &kfilter.k_states,
+                  &kfilter.CZW[0, 0], &kfilter.k_endog,
+          &alpha, &kfilter.CtmpW[0, 0], &kfilter.k_states)
+    blas.dcopy(&kr, &kfilter.CtmpW[0, 0], &inc, &kfilter.CW[0, 0], &inc)
+
+    # #### Predicted state covariance matrix for time t+1
+    # $P_{t+1} = P_t + W_t M_t W_t'$
+    # `tmp0` array used here, dimension $(m \times r)$
+    blas.dgemm("N", "N", &model._k_states, &rank, &rank,
+          &alpha, &kfilter.CW[0, 0], &kfilter.k_states,
+                  &kfilter.CM[0, 0], &kfilter.k_states,
+          &beta, kfilter._tmp0, &kfilter.k_states)
+    blas.dcopy(&kfilter.k_states2, kfilter._input_state_cov, &inc, kfilter._predicted_state_cov, &inc)
+    blas.dgemm("N", "T", &model._k_states, &model._k_states, &rank,
+          &alpha, kfilter._tmp0, &kfilter.k_states,
+                  &kfilter.CW[0, 0], &kfilter.k_states,
+          &alpha, kfilter._predicted_state_cov, &kfilter.k_states)
+
+    dchandrasekhar_store(kfilter, model)
+
+    return 0
+
+cdef np.float64_t dloglikelihood_conventional(dKalmanFilter kfilter, dStatespace model, np.float64_t determinant):
+    # Constants
+    cdef:
+        np.float64_t loglikelihood
+        int inc = 1
+        np.float64_t alpha = 1.0
+        np.float64_t beta = 0.0
+
+    loglikelihood = -0.5*(model._k_endog*dlog(2*NPY_PI) + dlog(determinant))
+
+    loglikelihood = loglikelihood - 0.5*blas.ddot(&model._k_endog, kfilter._forecast_error, &inc, kfilter._tmp2, &inc)
+
+    return loglikelihood
+
+# ### Missing Observation Conventional Kalman filter
+#
+# See Durbin and Koopman (2012) Chapter 4.10
+#
+# Here k_endog is the same as usual, but the design matrix and observation
+# covariance matrix are enforced to be zero matrices, and the loglikelihood
+# is defined to be zero.
+
+cdef int cforecast_missing_conventional(cKalmanFilter kfilter, cStatespace model):
+    cdef int i, j
+    cdef int inc = 1, design_t = 0
+    cdef np.complex64_t alpha = 1
+
+    # #### Forecast for time t  
+    # `forecast` $= Z_t a_t + d_t$
+    # Just set to zeros, see below (this means if forecasts are required for
+    # this part, they must be done in the wrappe)
+
+    # #### Forecast error for time t  
+    # It is undefined here, since obs is nan
+    # Note: use kfilter dimensions since we just want to set the whole array
+    # to zero
+    for i in range(kfilter.k_endog):
+        kfilter._forecast[i] = 0
+        kfilter._forecast_error[i] = 0
+
+    # #### Forecast error covariance matrix for time t  
+    # $F_t \equiv 0$
+    # Note: use kfilter dimensions since we just want to set the whole array
+    # to zeros
+    for i in range(kfilter.k_endog): # columns
+        for j in range(kfilter.k_endog): # rows
+            kfilter._forecast_error_cov[j + i*kfilter.k_endog] = 0
+
+cdef int cupdating_missing_conventional(cKalmanFilter kfilter, cStatespace model):
+    cdef int inc = 1
+
+    # Simply copy over the input arrays ($a_t, P_t$) to the filtered arrays
+    # ($a_{t|t}, P_{t|t}$)
+    # Note: use kfilter dimensions since we just want to copy whole arrays;
+    blas.ccopy(&kfilter.k_states, kfilter._input_state, &inc, kfilter._filtered_state, &inc)
+    blas.ccopy(&kfilter.k_states2, kfilter._input_state_cov, &inc, kfilter._filtered_state_cov, &inc)
+
+cdef np.complex64_t cinverse_missing_conventional(cKalmanFilter kfilter, cStatespace model, np.complex64_t determinant)  except *:
+    # Since the inverse of the forecast error covariance matrix is not
+    # stored, we don't need to fill it (e.g. with NPY_NAN values). Instead,
+    # just do a noop here and return a zero determinant ($|0|$).
+    return 0.0
+
+cdef np.complex64_t cloglikelihood_missing_conventional(cKalmanFilter kfilter, cStatespace model, np.complex64_t determinant):
+    return 0.0
+
+# ### Conventional Kalman filter
+#
+# The following are the above routines as defined in the conventional Kalman
+# filter.
+#
+# See Durbin and Koopman (2012) Chapter 4
+
+cdef int cforecast_conventional(cKalmanFilter kfilter, cStatespace model):
+
+    # Constants
+    cdef:
+        int inc = 1, ld, i, j
+        np.complex64_t alpha = 1.0
+        np.complex64_t beta = 0.0
+        np.complex64_t gamma = -1.0
+
+    # #### Forecast for time t  
+    # `forecast` $= Z_t a_t + d_t$
+    # 
+    # *Note*: $a_t$ is given from the initialization (for $t = 0$) or
+    # from the previous iteration of the filter (for $t > 0$).
+
+    # $\\# = d_t$
+    blas.ccopy(&model._k_endog, model._obs_intercept, &inc, kfilter._forecast, &inc)
+    # `forecast` $= 1.0 * Z_t a_t + 1.0 * \\#$  
+    # $(p \times 1) = (p \times m) (m \times 1) + (p \times 1)$
+    blas.cgemv("N", &model._k_endog, &model._k_states,
+          &alpha, model._design, &model._k_endog,
+                  kfilter._input_state, &inc,
+          &alpha, kfilter._forecast, &inc)
+
+    # #### Forecast error for time t  
+    # `forecast_error` $\equiv v_t = y_t -$ `forecast`
+
+    # $\\# = y_t$
+    blas.ccopy(&model._k_endog, model._obs, &inc, kfilter._forecast_error, &inc)
+    # $v_t = -1.0 * $ `forecast` $ + \\#$
+    # $(p \times 1) = (p \times 1) + (p \times 1)$
+    blas.caxpy(&model._k_endog, &gamma, kfilter._forecast, &inc, kfilter._forecast_error, &inc)
+
+    # *Intermediate calculation* (used just below and then once more)  
+    # `tmp1` array used here, dimension $(m \times p)$  
+    # $\\#_1 = P_t Z_t'$  
+    # $(m \times p) = (m \times m) (p \times m)'$
+    blas.cgemm("N", "T", &model._k_states, &model._k_endog, &model._k_states,
+          &alpha, kfilter._input_state_cov, &kfilter.k_states,
+                  model._design, &model._k_endog,
+          &beta, kfilter._tmp1, &kfilter.k_states)
+
+    # #### Forecast error covariance matrix for time t  
+    # $F_t \equiv Z_t P_t Z_t' + H_t$
+    # 
+    # *Note*: this and does nothing at all to `forecast_error_cov` if
+    # converged == True
+    # TODO make sure when converged, the copies are made correctly
+    if not kfilter.converged:
+        # $\\# = H_t$
+        # blas.ccopy(&kfilter.k_endog2, kfilter._obs_cov, &inc, kfilter._forecast_error_cov, &inc)
+        for i in range(model._k_endog): # columns
+            for j in range(model._k_endog): # rows
+                kfilter._forecast_error_cov[j + i*kfilter.k_endog] = model._obs_cov[j + i*model._k_endog]
+
+        # $F_t = 1.0 * Z_t \\#_1 + 1.0 * \\#$
+        blas.cgemm("N", "N", &model._k_endog, &model._k_endog, &model._k_states,
+              &alpha, model._design, &model._k_endog,
+                     kfilter._tmp1, &kfilter.k_states,
+              &alpha, kfilter._forecast_error_cov, &kfilter.k_endog)
+
+    return 0
+
+cdef int cupdating_conventional(cKalmanFilter kfilter, cStatespace model):
+    # Constants
+    cdef:
+        int inc = 1
+        np.complex64_t alpha = 1.0
+        np.complex64_t beta = 0.0
+        np.complex64_t gamma = -1.0
+    
+    # #### Filtered state for time t
+    # $a_{t|t} = a_t + P_t Z_t' F_t^{-1} v_t$  
+    # $a_{t|t} = 1.0 * \\#_1 \\#_2 + 1.0 a_t$
+    blas.ccopy(&kfilter.k_states, kfilter._input_state, &inc, kfilter._filtered_state, &inc)
+    blas.cgemv("N", &model._k_states, &model._k_endog,
+          &alpha, kfilter._tmp1, &kfilter.k_states,
+                  kfilter._tmp2, &inc,
+          &alpha, kfilter._filtered_state, &inc)
+
+    # #### Filtered state covariance for time t
+    # $P_{t|t} = P_t - P_t Z_t' F_t^{-1} Z_t P_t$  
+    # $P_{t|t} = P_t - \\#_1 \\#_3 P_t$  
+    # 
+    # *Note*: this and does nothing at all to `filtered_state_cov` if
+    # converged == True
+    # *Note*: with the Chandrasekhar recursions, the products are ordered
+    # so that no $(m \times m) (m \times m)$ product is required.
+    if not kfilter.converged and kfilter.filter_method & FILTER_CHANDRASEKHAR:
+        cupdating_chandrasekhar(kfilter, model)
+        return 0
+
+    if not kfilter.converged:
+        blas.ccopy(&kfilter.k_states2, kfilter._input_state_cov, &inc, kfilter._filtered_state_cov, &inc)
+
+        # `tmp0` array used here, dimension $(m \times m)$  
+        # $\\#_0 = 1.0 * \\#_1 \\#_3$  
+        # $(m \times m) = (m \times p) (p \times m)$
+        blas.cgemm("N", "N", &model._k_states, &model._k_states, &model._k_endog,
+              &alpha, kfilter._tmp1, &kfilter.k_states,
+                      kfilter._tmp3, &kfilter.k_endog,
+              &beta, kfilter._tmp0, &kfilter.k_states)
+
+        # $P_{t|t} = - 1.0 * \\# P_t + 1.0 * P_t$  
+        # $(m \times m) = (m \times m) (m \times m) + (m \times m)$
+        blas.cgemm("N", "N", &model._k_states, &model._k_states, &model._k_states,
+              &gamma, kfilter._tmp0, &kfilter.k_states,
+                      kfilter._input_state_cov, &kfilter.k_states,
+              &alpha, kfilter._filtered_state_cov, &kfilter.k_states)
+
+    # #### Kalman gain for time t
+    # $K_t = T_t P_t Z_t' F_t^{-1}$
+    #
+    # *Note*: this and does nothing at all to `kalman_gain` if
+    # converged == True
+    # *Note*: Kim and Nelson (1999) have a different version of the Kalman
+    # gain, defined as $P_t Z_t' F_t^{-1}$. That is not adopted here.
+    if not kfilter.converged:
+        # `tmp00` array used here, dimension $(m \times m)$  
+        # $\\#_{00} = 1.0 * T_t P_t$  
+        # $(m \times m) = (m \times m) (m \times m)$
+        blas.cgemm("N", "N", &model._k_states, &model._k_states, &model._k_states,
+              &alpha, model._transition, &model._k_states,
+                      kfilter._input_state_cov, &kfilter.k_states,
+              &beta, kfilter._tmp00, &kfilter.k_states)
+
+        # K_t = 1.0 * \\#_{00} \\#_3'
+        # $(m \times p) = (m \times m) (m \times p)$
+        blas.cgemm("N", "T", &model._k_states, &model._k_endog, &model._k_states,
+              &alpha, kfilter._tmp00, &kfilter.k_states,
+                      kfilter._tmp3, &kfilter.k_endog,
+              &beta, kfilter._kalman_gain, &kfilter.k_states)
+
+    return 0
+
+cdef int cprediction_conventional(cKalmanFilter kfilter, cStatespace model):
+
+    # Constants
+    cdef:
+        int inc = 1
+        np.complex64_t alpha = 1.0
+        np.complex64_t beta = 0.0
+        np.complex64_t gamma = -1.0
+
+    # #### Predicted state for time t+1
+    # $a_{t+1} = T_t a_{t|t} + c_t$
+    blas.ccopy(&model._k_states, model._state_intercept, &inc, kfilter._predicted_state, &inc)
+    blas.cgemv("N", &model._k_states, &model._k_states,
+          &alpha, model._transition, &model._k_states,
+                  kfilter._filtered_state, &inc,
+          &alpha, kfilter._predicted_state, &inc)
+
+    # #### Predicted state covariance matrix for time t+1
+    # $P_{t+1} = T_t P_{t|t} T_t' + Q_t^*$
+    #
+    # *Note*: this and does nothing at all to `predicted_state_cov` if
+    # converged == True
+    if (not kfilter.converged and
+            kfilter.filter_method & FILTER_CHANDRASEKHAR and kfilter.t > 0):
+        cchandrasekhar_recursion(kfilter, model)
+    elif not kfilter.converged:
+        blas.ccopy(&model._k_states2, model._selected_state_cov, &inc, kfilter._predicted_state_cov, &inc)
+        # `tmp0` array used here, dimension $(m \times m)$  
+
+        # $\\#_0 = T_t P_{t|t} $
+
+        # $(m \times m) = (m \times m) (m \times m)$
+        blas.cgemm("N", "N", &model._k_states, &model._k_states, &model._k_states,
+              &alpha, model._transition, &model._k_states,
+                      kfilter._filtered_state_cov, &kfilter.k_states,
+              &beta, kfilter._tmp0, &kfilter.k_states)
+        # $P_{t+1} = 1.0 \\#_0 T_t' + 1.0 \\#$  
+        # $(m \times m) = (m \times m) (m \times m) + (m \times m)$
+        blas.cgemm("N", "T", &model._k_states, &model._k_states, &model._k_states,
+              &alpha, kfilter._tmp0, &kfilter.k_states,
+                      model._transition, &model._k_states,
+              &alpha, kfilter._predicted_state_cov, &kfilter.k_states)
+
+        if kfilter.filter_method & FILTER_CHANDRASEKHAR:
+            cchandrasekhar_initialize(kfilter, model)
+
+    return 0
+
+# ### Chandrasekhar recursions
+#
+# For time-invariant models without missing data, the change in the
+# predicted state covariance matrix can be factored as
+# $P_{t+1} - P_t = W_t M_t W_t'$, where $W_t$ is $(m \times r)$, $M_t$ is
+# $(r \times r)$ and
+#
+# $$
+# \begin{aligned}
+# W_t & = (T - K_t Z) W_{t-1} \\
+# M_t & = M_{t-1} + M_{t-1} W_{t-1}' Z' F_{t-1}^{-1} Z W_{t-1} M_{t-1}
+# \end{aligned}
+# $$
+#
+# so that each iteration only requires $O(m^2 r)$ operations instead of the
+# $O(m^3)$ of the Riccati equation. If the initial state covariance matrix is
+# the unconditional covariance matrix of the state, then
+# $P_1 - P_0 = - K_0 F_0 K_0'$ and $r = p$. Otherwise the recursions are
+# initialized with $W_0 = I$ and $M_0 = P_1 - P_0$.
+#
+# See Herbst (2015), "Using the 'Chandrasekhar Recursions' for Likelihood
+# Evaluation of DSGE Models", Computational Economics.
+
+cdef int cupdating_chandrasekhar(cKalmanFilter kfilter, cStatespace model):
+    # Constants
+    cdef:
+        int inc = 1
+        np.complex64_t alpha = 1.0
+        np.complex64_t beta = 0.0
+        np.complex64_t gamma = -1.0
+
+    # `CtmpW` array used here, dimension $(m \times p)$
+    # $\\#_W = P_t Z_t' F_t^{-1} = P_t \\#_3'$
+    blas.cgemm("N", "T", &model._k_states, &model._k_endog, &model._k_states,
+          &alpha, kfilter._input_state_cov, &kfilter.k_states,
+                  kfilter._tmp3, &kfilter.k_endog,
+          &beta, &kfilter.CtmpW[0, 0], &kfilter.k_states)
+
+    # $P_{t|t} = P_t - \\#_1 \\#_W'$
+    blas.ccopy(&kfilter.k_states2, kfilter._input_state_cov, &inc, kfilter._filtered_state_cov, &inc)
+    blas.cgemm("N", "T", &model._k_states, &model._k_states, &model._k_endog,
+          &gamma, kfilter._tmp1, &kfilter.k_states,
+                  &kfilter.CtmpW[0, 0], &kfilter.k_states,
+          &alpha, kfilter._filtered_state_cov, &kfilter.k_states)
+
+    # $K_t = T_t \\#_W$
+    blas.cgemm("N", "N", &model._k_states, &model._k_endog, &model._k_states,
+          &alpha, model._transition, &model._k_states,
+                  &kfilter.CtmpW[0, 0], &kfilter.k_states,
+          &beta, kfilter._kalman_gain, &kfilter.k_states)
+
+    return 0
+
+cdef int cchandrasekhar_initialize(cKalmanFilter kfilter, cStatespace model):
+    # Constants
+    cdef:
+        int inc = 1
+        int i, j, k
+        np.complex64_t alpha = 1.0
+        np.complex64_t beta = 0.0
+        np.complex64_t value
+        np.float64_t scale = 0, residual = 0
+        np.float64_t scale_imag = 0, residual_imag = 0
+
+    # `tmp0` array used here, dimension $(m \times m)$
+    # $\\#_0 = P_1 - P_0$
+    for i in range(model._k_states2):
+        kfilter._tmp0[i] = (kfilter._predicted_state_cov[i] -
+                            kfilter._input_state_cov[i])
+
+    # `CtmpW` array used here, dimension $(m \times p)$
+    # $\\#_W = K_0 F_0$
+    blas.cgemm("N", "N", &model._k_states, &model._k_endog, &model._k_endog,
+          &alpha, kfilter._kalman_gain, &kfilter.k_states,
+                  kfilter._forecast_error_cov, &kfilter.k_endog,
+          &beta, &kfilter.CtmpW[0, 0], &kfilter.k_states)
+
+    # Check whether $P_1 - P_0 + K_0 F_0 K_0' = 0$
+    # *Note*: for complex step differentiation, the imaginary parts are
+    # checked separately, since they are of a much smaller magnitude.
+    for i in range(model._k_states):
+        for j in range(model._k_states):
+            value = kfilter._tmp0[i + j*kfilter.k_states]
+            for k in range(model._k_endog):
+                value = value + (kfilter.CtmpW[i, k] *
+                                 kfilter._kalman_gain[j + k*kfilter.k_states])
+            residual = max(residual, dabs(value.real))
+            residual_imag = max(residual_imag, dabs(value.imag))
+            scale = max(scale, dabs(kfilter._input_state_cov[i + j*kfilter.k_states].real))
+            scale_imag = max(scale_imag, dabs(kfilter._input_state_cov[i + j*kfilter.k_states].imag))
+
+    if (model._k_endog < model._k_states and
+            residual <= 1e-10 * max(scale, 1.0) and
+            residual_imag <= 1e-10 * scale_imag):
+        # $W_0 = K_0$, $M_0 = -F_0$
+        kfilter.chandrasekhar_rank = model._k_endog
+        for j in range(model._k_endog):
+            for i in range(model._k_states):
+                kfilter.CW[i, j] = kfilter._kalman_gain[i + j*kfilter.k_states]
+            for i in range(model._k_endog):
+                kfilter.CM[i, j] = -kfilter._forecast_error_cov[i + j*kfilter.k_endog]
+    else:
+        # $W_0 = I$, $M_0 = P_1 - P_0$
+        kfilter.chandrasekhar_rank = model._k_states
+        for j in range(model._k_states):
+            for i in range(model._k_states):
+                kfilter.CW[i, j] = 1.0 if i == j else 0.0
+                kfilter.CM[i, j] = kfilter._tmp0[i + j*kfilter.k_states]
+
+    cchandrasekhar_store(kfilter, model)
+
+    return 0
+
+cdef int cchandrasekhar_store(cKalmanFilter kfilter, cStatespace model):
+    # Constants
+    cdef:
+        int rank = kfilter.chandrasekhar_rank
+        np.complex64_t alpha = 1.0
+        np.complex64_t beta = 0.0
+
+    # $Z W_t$
+    # $(p \times r) = (p \times m) (m \times r)$
+    blas.cgemm("N", "N", &model._k_endog, &rank, &model._k_states,
+          &alpha, model._design, &model._k_endog,
+                  &kfilter.CW[0, 0], &kfilter.k_states,
+          &beta, &kfilter.CZW[0, 0], &kfilter.k_endog)
+
+    # $F_t^{-1} Z W_t = \\#_3 W_t$
+    # $(p \times r) = (p \times m) (m \times r)$
+    blas.cgemm("N", "N", &model._k_endog, &rank, &model._k_states,
+          &alpha, kfilter._tmp3, &kfilter.k_endog,
+                  &kfilter.CW[0, 0], &kfilter.k_states,
+          &beta, &kfilter.CFZW[0, 0], &kfilter.k_endog)
+
+    return 0
+
+cdef int cchandrasekhar_recursion(cKalmanFilter kfilter, cStatespace model):
+    # Constants
+    cdef:
+        int inc = 1
+        int rank = kfilter.chandrasekhar_rank
+        int kr = kfilter.k_states * kfilter.chandrasekhar_rank
+        np.complex64_t alpha = 1.0
+        np.complex64_t beta = 0.0
+        np.complex64_t gamma = -1.0
+
+    # #### Update $M_t$
+    # `CtmpM` array used here, dimension $(p \times r)$
+    # $\\#_M = Z W_{t-1} M_{t-1}$
+    blas.cgemm("N", "N", &model._k_endog, &rank, &rank,
+          &alpha, &kfilter.CZW[0, 0], &kfilter.k_endog,
+                  &kfilter.CM[0, 0], &kfilter.k_states,
+          &beta, &kfilter.CtmpM[0, 0], &kfilter.k_endog)
+    # `tmp0` array used here, dimension $(r \times r)$
+    # $\\#_0 = \\#_M' F_{t-1}^{-1} Z W_{t-1}$
+    blas.cgemm("T", "N", &rank, &rank, &model._k_endog,
+          &alpha, &kfilter.CtmpM[0, 0], &kfilter.k_endog,
+                  &kfilter.CFZW[0, 0], &kfilter.k_endog,
+          &beta, kfilter._tmp0, &kfilter.k_states)
+    # `tmp00` array used here, dimension $(r \times r)$
+    # $M_t = M_{t-1} + \\#_0 M_{t-1}$
+    blas.ccopy(&kfilter.k_states2, &kfilter.CM[0, 0], &inc, kfilter._tmp00, &inc)
+    blas.cgemm("N", "N", &rank, &rank, &rank,
+          &alpha, kfilter._tmp0, &kfilter.k_states,
+                  &kfilter.CM[0, 0], &kfilter.k_states,
+          &alpha, kfilter._tmp00, &kfilter.k_states)
+    blas.ccopy(&kfilter.k_states2, kfilter._tmp00, &inc, &kfilter.CM[0, 0], &inc)
+
+    # #### Update $W_t$
+    # $W_t = T W_{t-1} - K_t Z W_{t-1}$
+    blas.cgemm("N", "N", &model._k_states, &rank, &model._k_states,
+          &alpha, model._transition, &model._k_states,
+                  &kfilter.CW[0, 0], &kfilter.k_states,
+          &beta, &kfilter.CtmpW[0, 0], &kfilter.k_states)
+    blas.cgemm("N", "N", &model._k_states, &rank, &model._k_endog,
+          &gamma, kfilter._kalman_gain, &kfilter.k_states,
+                  &kfilter.CZW[0, 0], &kfilter.k_endog,
+          &alpha, &kfilter.CtmpW[0, 0], &kfilter.k_states)
+    blas.ccopy(&kr, &kfilter.CtmpW[0, 0], &inc, &kfilter.CW[0, 0], &inc)
+
+    # #### Predicted state covariance matrix for time t+1
+    # $P_{t+1} = P_t + W_t M_t W_t'$
+    # `tmp0` array used here, dimension $(m \times r)$
+    blas.cgemm("N", "N", &model._k_states, &rank, &rank,
+          &alpha, &kfilter.CW[0, 0], &kfilter.k_states,
+                  &kfilter.CM[0, 0], &kfilter.k_states,
+          &beta, kfilter._tmp0, &kfilter.k_states)
+    blas.ccopy(&kfilter.k_states2, kfilter._input_state_cov, &inc, kfilter._predicted_state_cov, &inc)
+    blas.cgemm("N", "T", &model._k_states, &model._k_states, &rank,
+          &alpha, kfilter._tmp0, &kfilter.k_states,
+                  &kfilter.CW[0, 0], &kfilter.k_states,
+          &alpha, kfilter._predicted_state_cov, &kfilter.k_states)
+
+    cchandrasekhar_store(kfilter, model)
+
+    return 0
+
+cdef np.complex64_t cloglikelihood_conventional(cKalmanFilter kfilter, cStatespace model, np.complex64_t determinant):
+    # Constants
+    cdef:
+        np.complex64_t loglikelihood
+        int inc = 1
+        np.complex64_t alpha = 1.0
+        np.complex64_t beta = 0.0
+
+    loglikelihood = -0.5*(model._k_endog*zlog(2*NPY_PI) + zlog(determinant))
+
+    blas.cgemv("N", &inc, &model._k_endog,
+                   &alpha, kfilter._forecast_error, &inc,
+                           kfilter._tmp2, &inc,
+                   &beta, kfilter._tmp0, &inc)
+    loglikelihood = loglikelihood - 0.5 * kfilter._tmp0[0]
+
+    return loglikelihood
+
+# ### Missing Observation Conventional Kalman filter
+#
+# See Durbin and Koopman (2012) Chapter 4.10
+#
+# Here k_endog is the same as usual, but the design matrix and observation
+# covariance matrix are enforced to be zero matrices, and the loglikelihood
+# is defined to be zero.
+
+cdef int zforecast_missing_conventional(zKalmanFilter kfilter, zStatespace model):
+    cdef int i, j
+    cdef int inc = 1, design_t = 0
+    cdef np.complex128_t alpha = 1
+
+    # #### Forecast for time t  
+    # `forecast` $= Z_t a_t + d_t$
+    # Just set to zeros, see below (this means if forecasts are required for
+    # this part, they must be done in the wrappe)
+
+    # #### Forecast error for time t  
+    # It is undefined here, since obs is nan
+    # Note: use kfilter dimensions since we just want to set the whole array
+    # to zero
+    for i in range(kfilter.k_endog):
+        kfilter._forecast[i] = 0
+        kfilter._forecast_error[i] = 0
+
+    # #### Forecast error covariance matrix for time t  
+    # $F_t \equiv 0$
+    # Note: use kfilter dimensions since we just want to set the whole array
+    # to zeros
+    for i in range(kfilter.k_endog): # columns
+        for j in range(kfilter.k_endog): # rows
+            kfilter._forecast_error_cov[j + i*kfilter.k_endog] = 0
+
+cdef int zupdating_missing_conventional(zKalmanFilter kfilter, zStatespace model):
+    cdef int inc = 1
+
+    # Simply copy over the input arrays ($a_t, P_t$) to the filtered arrays
+    # ($a_{t|t}, P_{t|t}$)
+    # Note: use kfilter dimensions since we just want to copy whole arrays;
+    blas.zcopy(&kfilter.k_states, kfilter._input_state, &inc, kfilter._filtered_state, &inc)
+    blas.zcopy(&kfilter.k_states2, kfilter._input_state_cov, &inc, kfilter._filtered_state_cov, &inc)
+
+cdef np.complex128_t zinverse_missing_conventional(zKalmanFilter kfilter, zStatespace model, np.complex128_t determinant)  except *:
+    # Since the inverse of the forecast error covariance matrix is not
+    # stored, we don't need to fill it (e.g. with NPY_NAN values). Instead,
+    # just do a noop here and return a zero determinant ($|0|$).
+    return 0.0
+
+cdef np.complex128_t zloglikelihood_missing_conventional(zKalmanFilter kfilter, zStatespace model, np.complex128_t determinant):
+    return 0.0
+
+# ### Conventional Kalman filter
+#
+# The following are the above routines as defined in the conventional Kalman
+# filter.
+#
+# See Durbin and Koopman (2012) Chapter 4
+
+cdef int zforecast_conventional(zKalmanFilter kfilter, zStatespace model):
+
+    # Constants
+    cdef:
+        int inc = 1, ld, i, j
+        np.complex128_t alpha = 1.0
+        np.complex128_t beta = 0.0
+        np.complex128_t gamma = -1.0
+
+    # #### Forecast for time t  
+    # `forecast` $= Z_t a_t + d_t$
+    # 
+    # *Note*: $a_t$ is given from the initialization (for $t = 0$) or
+    # from the previous iteration of the filter (for $t > 0$).
+
+    # $\\# = d_t$
+    blas.zcopy(&model._k_endog, model._obs_intercept, &inc, kfilter._forecast, &inc)
+    # `forecast` $= 1.0 * Z_t a_t + 1.0 * \\#$  
+    # $(p \times 1) = (p \times m) (m \times 1) + (p \times 1)$
+    blas.zgemv("N", &model._k_endog, &model._k_states,
+          &alpha, model._design, &model._k_endog,
+                  kfilter._input_state, &inc,
+          &alpha, kfilter._forecast, &inc)
+
+    # #### Forecast error for time t  
+    # `forecast_error` $\equiv v_t = y_t -$ `forecast`
+
+    # $\\# = y_t$
+    blas.zcopy(&model._k_endog, model._obs, &inc, kfilter._forecast_error, &inc)
+    # $v_t = -1.0 * $ `forecast` $ + \\#$
+    # $(p \times 1) = (p \times 1) + (p \times 1)$
+    blas.zaxpy(&model._k_endog, &gamma, kfilter._forecast, &inc, kfilter._forecast_error, &inc)
+
+    # *Intermediate calculation* (used just below and then once more)  
+    # `tmp1` array used here, dimension $(m \times p)$  
+    # $\\#_1 = P_t Z_t'$  
+    # $(m \times p) = (m \times m) (p \times m)'$
+    blas.zgemm("N", "T", &model._k_states, &model._k_endog, &model._k_states,
+          &alpha, kfilter._input_state_cov, &kfilter.k_states,
+                  model._design, &model._k_endog,
+          &beta, kfilter._tmp1, &kfilter.k_states)
+
+    # #### Forecast error covariance matrix for time t  
+    # $F_t \equiv Z_t P_t Z_t' + H_t$
+    # 
+    # *Note*: this and does nothing at all to `forecast_error_cov` if
+    # converged == True
+    # TODO make sure when converged, the copies are made correctly
+    if not kfilter.converged:
+        # $\\# = H_t$
+        # blas.zcopy(&kfilter.k_endog2, kfilter._obs_cov, &inc, kfilter._forecast_error_cov, &inc)
+        for i in range(model._k_endog): # columns
+            for j in range(model._k_endog): # rows
+                kfilter._forecast_error_cov[j + i*kfilter.k_endog] = model._obs_cov[j + i*model._k_endog]
+
+        # $F_t = 1.0 * Z_t \\#_1 + 1.0 * \\#$
+        blas.zgemm("N", "N", &model._k_endog, &model._k_endog, &model._k_states,
+              &alpha, model._design, &model._k_endog,
+                     kfilter._tmp1, &kfilter.k_states,
+              &alpha, kfilter._forecast_error_cov, &kfilter.k_endog)
+
+    return 0
+
+cdef int zupdating_conventional(zKalmanFilter kfilter, zStatespace model):
+    # Constants
+    cdef:
+        int inc = 1
+        np.complex128_t alpha = 1.0
+        np.complex128_t beta = 0.0
+        np.complex128_t gamma = -1.0
+    
+    # #### Filtered state for time t
+    # $a_{t|t} = a_t + P_t Z_t' F_t^{-1} v_t$  
+    # $a_{t|t} = 1.0 * \\#_1 \\#_2 + 1.0 a_t$
+    blas.zcopy(&kfilter.k_states, kfilter._input_state, &inc, kfilter._filtered_state, &inc)
+    blas.zgemv("N", &model._k_states, &model._k_endog,
+          &alpha, kfilter._tmp1, &kfilter.k_states,
+                  kfilter._tmp2, &inc,
+          &alpha, kfilter._filtered_state, &inc)
+
+    # #### Filtered state covariance for time t
+    # $P_{t|t} = P_t - P_t Z_t' F_t^{-1} Z_t P_t$  
+    # $P_{t|t} = P_t - \\#_1 \\#_3 P_t$  
+    # 
+    # *Note*: this and does nothing at all to `filtered_state_cov` if
+    # converged == True
+    # *Note*: with the Chandrasekhar recursions, the products are ordered
+    # so that no $(m \times m) (m \times m)$ product is required.
+    if not kfilter.converged and kfilter.filter_method & FILTER_CHANDRASEKHAR:
+        zupdating_chandrasekhar(kfilter, model)
+        return 0
+
+    if not kfilter.converged:
+        blas.zcopy(&kfilter.k_states2, kfilter._input_state_cov, &inc, kfilter._filtered_state_cov, &inc)
+
+        # `tmp0` array used here, dimension $(m \times m)$  
+        # $\\#_0 = 1.0 * \\#_1 \\#_3$  
+        # $(m \times m) = (m \times p) (p \times m)$
+        blas.zgemm("N", "N", &model._k_states, &model._k_states, &model._k_endog,
+              &alpha, kfilter._tmp1, &kfilter.k_states,
+                      kfilter._tmp3, &kfilter.k_endog,
+              &beta, kfilter._tmp0, &kfilter.k_states)
+
+        # $P_{t|t} = - 1.0 * \\# P_t + 1.0 * P_t$  
+        # $(m \times m) = (m \times m) (m \times m) + (m \times m)$
+        blas.zgemm("N", "N", &model._k_states, &model._k_states, &model._k_states,
+              &gamma, kfilter._tmp0, &kfilter.k_states,
+                      kfilter._input_state_cov, &kfilter.k_states,
+              &alpha, kfilter._filtered_state_cov, &kfilter.k_states)
+
+    # #### Kalman gain for time t
+    # $K_t = T_t P_t Z_t' F_t^{-1}$
+    #
+    # *Note*: this and does nothing at all to `kalman_gain` if
+    # converged == True
+    # *Note*: Kim and Nelson (1999) have a different version of the Kalman
+    # gain, defined as $P_t Z_t' F_t^{-1}$. That is not adopted here.
+    if not kfilter.converged:
+        # `tmp00` array used here, dimension $(m \times m)$  
+        # $\\#_{00} = 1.0 * T_t P_t$  
+        # $(m \times m) = (m \times m) (m \times m)$
+        blas.zgemm("N", "N", &model._k_states, &model._k_states, &model._k_states,
+              &alpha, model._transition, &model._k_states,
+                      kfilter._input_state_cov, &kfilter.k_states,
+              &beta, kfilter._tmp00, &kfilter.k_states)
+
+        # K_t = 1.0 * \\#_{00} \\#_3'
+        # $(m \times p) = (m \times m) (m \times p)$
+        blas.zgemm("N", "T", &model._k_states, &model._k_endog, &model._k_states,
+              &alpha, kfilter._tmp00, &kfilter.k_states,
+                      kfilter._tmp3, &kfilter.k_endog,
+              &beta, kfilter._kalman_gain, &kfilter.k_states)
+
+    return 0
+
+cdef int zprediction_conventional(zKalmanFilter kfilter, zStatespace model):
+
+    # Constants
+    cdef:
+        int inc = 1
+        np.complex128_t alpha = 1.0
+        np.complex128_t beta = 0.0
+        np.complex128_t gamma = -1.0
+
+    # #### Predicted state for time t+1
+    # $a_{t+1} = T_t a_{t|t} + c_t$
+    blas.zcopy(&model._k_states, model._state_intercept, &inc, kfilter._predicted_state, &inc)
+    blas.zgemv("N", &model._k_states, &model._k_states,
+          &alpha, model._transition, &model._k_states,
+                  kfilter._filtered_state, &inc,
+          &alpha, kfilter._predicted_state, &inc)
+
+    # #### Predicted state covariance matrix for time t+1
+    # $P_{t+1} = T_t P_{t|t} T_t' + Q_t^*$
+    #
+    # *Note*: this and does nothing at all to `predicted_state_cov` if
+    # converged == True
+    if (not kfilter.converged and
+            kfilter.filter_method & FILTER_CHANDRASEKHAR and kfilter.t > 0):
+        zchandrasekhar_recursion(kfilter, model)
+    elif not kfilter.converged:
+        blas.zcopy(&model._k_states2, model._selected_state_cov, &inc, kfilter._predicted_state_cov, &inc)
+        # `tmp0` array used here, dimension $(m \times m)$  
+
+        # $\\#_0 = T_t P_{t|t} $
+
+        # $(m \times m) = (m \times m) (m \times m)$
+        blas.zgemm("N", "N", &model._k_states, &model._k_states, &model._k_states,
+              &alpha, model._transition, &model._k_states,
+                      kfilter._filtered_state_cov, &kfilter.k_states,
+              &beta, kfilter._tmp0, &kfilter.k_states)
+        # $P_{t+1} = 1.0 \\#_0 T_t' + 1.0 \\#$  
+        # $(m \times m) = (m \times m) (m \times m) + (m \times m)$
+        blas.zgemm("N", "T", &model._k_states, &model._k_states, &model._k_states,
+              &alpha, kfilter._tmp0, &kfilter.k_states,
+                      model._transition, &model._k_states,
+              &alpha, kfilter._predicted_state_cov, &kfilter.k_states)
+
+        if kfilter.filter_method & FILTER_CHANDRASEKHAR:
+            zchandrasekhar_initialize(kfilter, model)
+
+    return 0
+
+# ### Chandrasekhar recursions
+#
+# For time-invariant models without missing data, the change in the
+# predicted state covariance matrix can be factored as
+# $P_{t+1} - P_t = W_t M_t W_t'$, where $W_t$ is $(m \times r)$, $M_t$ is
+# $(r \times r)$ and
+#
+# $$
+# \begin{aligned}
+# W_t & = (T - K_t Z) W_{t-1} \\
+# M_t & = M_{t-1} + M_{t-1} W_{t-1}' Z' F_{t-1}^{-1} Z W_{t-1} M_{t-1}
+# \end{aligned}
+# $$
+#
+# so that each iteration only requires $O(m^2 r)$ operations instead of the
+# $O(m^3)$ of the Riccati equation. If the initial state covariance matrix is
+# the unconditional covariance matrix of the state, then
+# $P_1 - P_0 = - K_0 F_0 K_0'$ and $r = p$. Otherwise the recursions are
+# initialized with $W_0 = I$ and $M_0 = P_1 - P_0$.
+#
+# See Herbst (2015), "Using the 'Chandrasekhar Recursions' for Likelihood
+# Evaluation of DSGE Models", Computational Economics.
+
+cdef int zupdating_chandrasekhar(zKalmanFilter kfilter, zStatespace model):
+    # Constants
+    cdef:
+        int inc = 1
+        np.complex128_t alpha = 1.0
+        np.complex128_t beta = 0.0
+        np.complex128_t gamma = -1.0
+
+    # `CtmpW` array used here, dimension $(m \times p)$
+    # $\\#_W = P_t Z_t' F_t^{-1} = P_t \\#_3'$
+    blas.zgemm("N", "T", &model._k_states, &model._k_endog, &model._k_states,
+          &alpha, kfilter._input_state_cov, &kfilter.k_states,
+                  kfilter._tmp3, &kfilter.k_endog,
+          &beta, &kfilter.CtmpW[0, 0], &kfilter.k_states)
+
+    # $P_{t|t} = P_t - \\#_1 \\#_W'$
+    blas.zcopy(&kfilter.k_states2, kfilter._input_state_cov, &inc, kfilter._filtered_state_cov, &inc)
+    blas.zgemm("N", "T", &model._k_states, &model._k_states, &model._k_endog,
+          &gamma, kfilter._tmp1, &kfilter.k_states,
+                  &kfilter.CtmpW[0, 0], &kfilter.k_states,
+          &alpha, kfilter._filtered_state_cov, &kfilter.k_states)
+
+    # $K_t = T_t \\#_W$
+    blas.zgemm("N", "N", &model._k_states, &model._k_endog, &model._k_states,
+          &alpha, model._transition, &model._k_states,
+                  &kfilter.CtmpW[0, 0], &kfilter.k_states,
+          &beta, kfilter._kalman_gain, &kfilter.k_states)
+
+    return 0
+
+cdef int zchandrasekhar_initialize(zKalmanFilter kfilter, zStatespace model):
+    # Constants
+    cdef:
+        int inc = 1
+        int i, j, k
+        np.complex128_t alpha = 1.0
+        np.complex128_t beta = 0.0
+        np.complex128_t value
+        np.float64_t scale = 0, residual = 0
+        np.float64_t scale_imag = 0, residual_imag = 0
+
+    # `tmp0` array used here, dimension $(m \times m)$
+    # $\\#_0 = P_1 - P_0$
+    for i in range(model._k_states2):
+        kfilter._tmp0[i] = (kfilter._predicted_state_cov[i] -
+                            kfilter._input_state_cov[i])
+
+    # `CtmpW` array used here, dimension $(m \times p)$
+    # $\\#_W = K_0 F_0$
+    blas.zgemm("N", "N", &model._k_states, &model._k_endog, &model._k_endog,
+          &alpha, kfilter._kalman_gain, &kfilter.k_states,
+                  kfilter._forecast_error_cov, &kfilter.k_endog,
+          &beta, &kfilter.CtmpW[0, 0], &kfilter.k_states)
+
+    # Check whether $P_1 - P_0 + K_0 F_0 K_0' = 0$
+    # *Note*: for complex step differentiation, the imaginary parts are
+    # checked separately, since they are of a much smaller magnitude.
+    for i in range(model._k_states):
+        for j in range(model._k_states):
+            value = kfilter._tmp0[i + j*kfilter.k_states]
+            for k in range(model._k_endog):
+                value = value + (kfilter.CtmpW[i, k] *
+                                 kfilter._kalman_gain[j + k*kfilter.k_states])
+            residual = max(residual, dabs(value.real))
+            residual_imag = max(residual_imag, dabs(value.imag))
+            scale = max(scale, dabs(kfilter._input_state_cov[i + j*kfilter.k_states].real))
+            scale_imag = max(scale_imag, dabs(kfilter._input_state_cov[i + j*kfilter.k_states].imag))
+
+    if (model._k_endog < model._k_states and
+            residual <= 1e-10 * max(scale, 1.0) and
+            residual_imag <= 1e-10 * scale_imag):
+        # $W_0 = K_0$, $M_0 = -F_0$
+        kfilter.chandrasekhar_rank = model._k_endog
+        for j in range(model._k_endog):
+            for i in range(model._k_states):
+                kfilter.CW[i, j] = kfilter._kalman_gain[i + j*kfilter.k_states]
+            for i in range(model._k_endog):
+                kfilter.CM[i, j] = -kfilter._forecast_error_cov[i + j*kfilter.k_endog]
+    else:
+        # $W_0 = I$, $M_0 = P_1 - P_0$
+        kfilter.chandrasekhar_rank = model._k_states
+        for j in range(model._k_states):
+            for i in range(model._k_states):
+                kfilter.CW[i, j] = 1.0 if i == j else 0.0
+                kfilter.CM[i, j] = kfilter._tmp0[i + j*kfilter.k_states]
+
+    zchandrasekhar_store(kfilter, model)
+
+    return 0
+
+cdef int zchandrasekhar_store(zKalmanFilter kfilter, zStatespace model):
+    # Constants
+    cdef:
+        int rank = kfilter.chandrasekhar_rank
+        np.complex128_t alpha = 1.0
+        np.complex128_t beta = 0.0
+
+    # $Z W_t$
+    # $(p \times r) = (p \times m) (m \times r)$
+    blas.zgemm("N", "N", &model._k_endog, &rank, &model._k_states,
+          &alpha, model._design, &model._k_endog,
+                  &kfilter.CW[0, 0], &kfilter.k_states,
+          &beta, &kfilter.CZW[0, 0], &kfilter.k_endog)
+
+    # $F_t^{-1} Z W_t = \\#_3 W_t$
+    # $(p \times r) = (p \times m) (m \times r)$
+    blas.zgemm("N", "N", &model._k_endog, &rank, &model._k_states,
+          &alpha, kfilter._tmp3, &kfilter.k_endog,
+                  &kfilter.CW[0, 0], &kfilter.k_states,
+          &beta, &kfilter.CFZW[0, 0], &kfilter.k_endog)
+
+    return 0
+
+cdef int zchandrasekhar_recursion(zKalmanFilter kfilter, zStatespace model):
+    # Constants
+    cdef:
+        int inc = 1
+        int rank = kfilter.chandrasekhar_rank
+        int kr = kfilter.k_states * kfilter.chandrasekhar_rank
+        np.complex128_t alpha = 1.0
+        np.complex128_t beta = 0.0
+        np.complex128_t gamma = -1.0
+
+    # #### Update $M_t$
+    # `CtmpM` array used here, dimension $(p \times r)$
+    # $\\#_M = Z W_{t-1} M_{t-1}$
+    blas.zgemm("N", "N", &model._k_endog, &rank, &rank,
+          &alpha, &kfilter.CZW[0, 0], &kfilter.k_endog,
+                  &kfilter.CM[0, 0], &kfilter.k_states,
+          &beta, &kfilter.CtmpM[0, 0], &kfilter.k_endog)
+    # `tmp0` array used here, dimension $(r \times r)$
+    # $\\#_0 = \\#_M' F_{t-1}^{-1} Z W_{t-1}$
+    blas.zgemm("T", "N", &rank, &rank, &model._k_endog,
+          &alpha, &kfilter.CtmpM[0, 0], &kfilter.k_endog,
+                  &kfilter.CFZW[0, 0], &kfilter.k_endog,
+          &beta, kfilter._tmp0, &kfilter.k_states)
+    # `tmp00` array used here, dimension $(r \times r)$
+    # $M_t = M_{t-1} + \\#_0 M_{t-1}$
+    blas.zcopy(&kfilter.k_states2, &kfilter.CM[0, 0], &inc, kfilter._tmp00, &inc)
+    blas.zgemm("N", "N", &rank, &rank, &rank,
+          &alpha, kfilter._tmp0, &kfilter.k_states,
+                  &kfilter.CM[0, 0], &kfilter.k_states,
+          &alpha, kfilter._tmp00, &kfilter.k_states)
+    blas.zcopy(&kfilter.k_states2, kfilter._tmp00, &inc, &kfilter.CM[0, 0], &inc)
+
+    # #### Update $W_t$
+    # $W_t = T W_{t-1} - K_t Z W_{t-1}$
+    blas.zgemm("N", "N", &model._k_states, &rank, &model._k_states,
+          &alpha, model._transition, &model._k_states,
+                  &kfilter.CW[0, 0], &kfilter.k_states,
+          &beta, &kfilter.CtmpW[0, 0], &kfilter.k_states)
+    blas.zgemm("N", "N", &model._k_states, &rank, &model._k_endog,
+          &gamma, kfilter._kalman_gain, &kfilter.k_states,
+                  &kfilter.CZW[0, 0], &kfilter.k_endog,
+          &alpha, &kfilter.CtmpW[0, 0], &kfilter.k_states)
+    blas.zcopy(&kr, &kfilter.CtmpW[0, 0], &inc, &kfilter.CW[0, 0], &inc)
+
+    # #### Predicted state covariance matrix for time t+1
+    # $P_{t+1} = P_t + W_t M_t W_t'$
+    # `tmp0` array used here, dimension $(m \times r)$
+    blas.zgemm("N", "N", &model._k_states, &rank, &rank,
+          &alpha, &kfilter.CW[0, 0], &kfilter.k_states,
+                  &kfilter.CM[0, 0], &kfilter.k_states,
+          &beta, kfilter._tmp0, &kfilter.k_states)
+    blas.zcopy(&kfilter.k_states2, kfilter._input_state_cov, &inc, kfilter._predicted_state_cov, &inc)
+    blas.zgemm("N", "T", &model._k_states, &model._k_states, &rank,
+          &alpha, kfilter._tmp0, &kfilter.k_states,
+                  &kfilter.CW[0, 0], &kfilter.k_states,
+          &alpha, kfilter._predicted_state_cov, &kfilter.k_states)
+
+    zchandrasekhar_store(kfilter, model)
+
+    return 0
+
+cdef np.complex128_t zloglikelihood_conventional(zKalmanFilter kfilter, zStatespace model, np.complex128_t determinant):
+    # Constants
+    cdef:
+        np.complex128_t loglikelihood
+        int inc = 1
+        np.complex128_t alpha = 1.0
+        np.complex128_t beta = 0.0
+
+    loglikelihood = -0.5*(model._k_endog*zlog(2*NPY_PI) + zlog(determinant))
+
+    blas.zgemv("N", &inc, &model._k_endog,
+                   &alpha, kfilter._forecast_error, &inc,
+                           kfilter._tmp2, &inc,
+                   &beta, kfilter._tmp0, &inc)
+    loglikelihood = loglikelihood - 0.5 * kfilter._tmp0[0]
+
+    return loglikelihood
@@ -19,6 +19,7 @@ cdef int FILTER_UNIVARIATE       # ibid., Chapter 6.4
 cdef int FILTER_COLLAPSED        # ibid., Chapter 6.5
 cdef int FILTER_EXTENDED         # ibid., Chapter 10.2
 cdef int FILTER_UNSCENTED        # ibid., Chapter 10.3
+cdef int FILTER_CHANDRASEKHAR    # Herbst (2015)
 cdef int SMOOTHER_CLASSICAL      # ibid., Chapter 4.6.1
 cdef int SMOOTHER_ALTERNATIVE    # 
 
@@ -96,6 +97,10 @@ cdef class sKalmanFilter(object):
     cdef readonly np.float32_t [::1,:] tmp2
     cdef readonly np.float32_t [::1,:,:] tmp1, tmp3, tmp4
 
+    # ### Chandrasekhar recursions
+    cdef readonly int chandrasekhar_rank
+    cdef readonly np.float32_t [::1,:] CW, CM, CZW, CFZW, CtmpW, CtmpM
+
     cdef readonly np.float32_t determinant
 
     # ### Pointers to current-iteration arrays
@@ -222,6 +227,10 @@ cdef class dKalmanFilter(object):
     cdef readonly np.float64_t [::1,:] tmp2
     cdef readonly np.float64_t [::1,:,:] tmp1, tmp3, tmp4
 
+    # ### Chandrasekhar recursions
+    cdef readonly int chandrasekhar_rank
+    cdef readonly np.float64_t [::1,:] CW, CM, CZW, CFZW, CtmpW, CtmpM
+
     cdef readonly np.float64_t determinant
 
     # ### Pointers to current-iteration arrays
@@ -348,6 +357,10 @@ cdef class cKalmanFilter(object):
     cdef readonly np.complex64_t [::1,:] tmp2
     cdef readonly np.complex64_t [::1,:,:] tmp1, tmp3, tmp4
 
+    # ### Chandrasekhar recursions
+    cdef readonly int chandrasekhar_rank
+    cdef readonly np.complex64_t [::1,:] CW, CM, CZW, CFZW, CtmpW, CtmpM
+
     cdef readonly np.complex64_t determinant
 
     # ### Pointers to current-iteration arrays
@@ -474,6 +487,10 @@ cdef class zKalmanFilter(object):
     cdef readonly np.complex128_t [::1,:] tmp2
     cdef readonly np.complex128_t [::1,:,:] tmp1, tmp3, tmp4
 
+    # ### Chandrasekhar recursions
+    cdef readonly int chandrasekhar_rank
+    cdef readonly np.complex128_t [::1,:] CW, CM, CZW, CFZW, CtmpW, CtmpM
+
     cdef readonly np.complex128_t determinant
 
     # ### Pointers to current-iteration arrays
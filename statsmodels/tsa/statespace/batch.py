@@ -0,0 +1,719 @@
+"""
+Batched estimation of SARIMAX models for many independent series
+
+The same SARIMAX specification is estimated separately for each series. The
+representation matrices of all series are stacked and the loglikelihood of
+all series is evaluated in a single call of the batched Kalman filter in
+`_batch`, so that the per-series overhead of creating and updating a model
+instance is avoided.
+
+License: Simplified-BSD
+"""
+from __future__ import division, absolute_import, print_function
+
+import numpy as np
+import pandas as pd
+
+from statsmodels.tools.decorators import cache_readonly, resettable_cache
+from statsmodels.tools.eval_measures import aic, bic, hqic
+from statsmodels.tsa.statespace import _batch
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+from statsmodels.tsa.statespace.tools import diff, is_invertible
+from statsmodels.tsa.tsatools import _stack_series
+
+
+def constrain_stationary_univariate_batch(unconstrained):
+    """
+    Vectorized `constrain_stationary_univariate` for several series
+
+    Parameters
+    ----------
+    unconstrained : array
+        Unconstrained parameters with shape (n_series, k), one row for each
+        series.
+
+    Returns
+    -------
+    constrained : array
+        Stationary coefficients with shape (n_series, k).
+    """
+    n = unconstrained.shape[1]
+    y = np.zeros((n, n) + unconstrained.shape[:1], dtype=unconstrained.dtype)
+    r = unconstrained / ((1 + unconstrained**2)**0.5)
+    for k in range(n):
+        for i in range(k):
+            y[k, i] = y[k - 1, i] + r[:, k] * y[k - 1, k - i - 1]
+        y[k, k] = r[:, k]
+    return -y[n - 1].T
+
+
+def unconstrain_stationary_univariate_batch(constrained):
+    """
+    Vectorized `unconstrain_stationary_univariate` for several series
+
+    Parameters
+    ----------
+    constrained : array
+        Stationary coefficients with shape (n_series, k).
+
+    Returns
+    -------
+    unconstrained : array
+        Unconstrained parameters with shape (n_series, k).
+    """
+    n = constrained.shape[1]
+    y = np.zeros((n, n) + constrained.shape[:1], dtype=constrained.dtype)
+    y[n - 1] = -constrained.T
+    for k in range(n - 1, 0, -1):
+        for i in range(k):
+            y[k - 1, i] = ((y[k, i] - y[k, k] * y[k, k - i - 1]) /
+                           (1 - y[k, k]**2))
+    r = y.diagonal()
+    return r / ((1 - r**2)**0.5)
+
+
+def solve_discrete_lyapunov_batch(a, q, maxiter=100):
+    r"""
+    Solve the discrete Lyapunov equation for a stack of matrices
+
+    Solves :math:`X_i = A_i X_i A_i' + Q_i` for each i with the doubling
+    algorithm, which only requires matrix products and therefore also passes
+    through complex numbers for complex step differentiation.
+
+    Parameters
+    ----------
+    a : array
+        Stable matrices with shape (n, k, k).
+    q : array
+        Symmetric matrices with shape (n, k, k).
+    maxiter : int
+        Maximum number of doubling steps.
+
+    Returns
+    -------
+    x : array
+        Solutions with shape (n, k, k).
+    """
+    x = q.copy()
+    a = a.copy()
+    for _ in range(maxiter):
+        x = x + np.matmul(np.matmul(a, x), np.swapaxes(a, 1, 2))
+        a = np.matmul(a, a)
+        if np.all(np.abs(a) < 1e-16):
+            break
+    return x
+
+
+def _polymul_batch(a, b):
+    """product of the polynomials in the rows of a and b"""
+    out = np.zeros((a.shape[0], a.shape[1] + b.shape[1] - 1),
+                   dtype=np.result_type(a, b))
+    for j in range(b.shape[1]):
+        out[:, j:j + a.shape[1]] += a * b[:, j:j + 1]
+    return out
+
+
+class BatchSARIMAX(object):
+    """
+    The same SARIMAX model for a batch of independent univariate series
+
+    Parameters
+    ----------
+    endogs : list, dict, DataFrame or 2-dim ndarray
+        The observed time series. A list or dict of one dimensional series,
+        or a DataFrame or array with one column for each series. Series can
+        have different lengths, they are aligned at the end.
+    **kwargs
+        Keyword arguments for `SARIMAX`, for example `order`,
+        `seasonal_order`, `trend` and `measurement_error`.
+
+    Notes
+    -----
+    Models with exogenous regressors, time trends, the Hamilton
+    representation, simple differencing or a user-specified initialization
+    are not supported.
+
+    The loglikelihood of each series is the same as the loglikelihood of a
+    SARIMAX model of that series alone.
+    """
+
+    def __init__(self, endogs, **kwargs):
+        self.endog, self.start, self.series_names = _stack_series(endogs)
+        self.n_series, self.nobs_max = self.endog.shape
+        self.nobs = self.nobs_max - self.start
+
+        # template model with the first series, used for the specification
+        template = SARIMAX(self.endog[0, self.start[0]:], **kwargs)
+        self.model = template
+        if template.k_exog > 0:
+            raise ValueError('exog is not supported in batches')
+        if template.k_trend > 0 and len(template.polynomial_trend) > 1:
+            raise ValueError('only a constant trend is supported in'
+                             ' batches')
+        if template.hamilton_representation or template.simple_differencing:
+            raise ValueError('the Hamilton representation and simple'
+                             ' differencing are not supported in batches')
+        if (template._manual_initialization and
+                template.ssm.initialization != 'stationary'):
+            raise ValueError('user-specified initialization is not'
+                             ' supported in batches')
+
+        self.k_params = len(template.param_names)
+        self.param_names = template.param_names
+        self.k_states = template.k_states
+        self.loglikelihood_burn = np.full(self.n_series,
+                                          template.ssm.loglikelihood_burn,
+                                          dtype=np.int64)
+
+        # fixed parts of the representation
+        self._design = template.ssm['design', 0, :, 0].real.copy()
+        self._transition = template.ssm['transition', :, :, 0].real.copy()
+        self._selection = template.ssm['selection', :, 0, 0].real.copy()
+
+    def _split_params(self, params):
+        """split params, shape (n_series, k_params), by model component"""
+        mod = self.model
+        sizes = [('trend', mod.k_trend), ('ar', mod.k_ar_params),
+                 ('ma', mod.k_ma_params),
+                 ('seasonal_ar', mod.k_seasonal_ar_params),
+                 ('seasonal_ma', mod.k_seasonal_ma_params),
+                 ('measurement_variance', int(mod.measurement_error)),
+                 ('variance', int(mod.state_error))]
+        out = {}
+        start = 0
+        for name, k in sizes:
+            out[name] = params[:, start:start + k]
+            start += k
+        return out
+
+    def transform_params(self, unconstrained):
+        """
+        Transform unconstrained parameters of all series
+
+        Parameters
+        ----------
+        unconstrained : array
+            Unconstrained parameters with shape (n_series, k_params).
+
+        Returns
+        -------
+        constrained : array
+            Constrained parameters used in likelihood evaluation.
+
+        See Also
+        --------
+        SARIMAX.transform_params
+        """
+        mod = self.model
+        unconstrained = np.asarray(unconstrained)
+        constrained = unconstrained.copy()
+        parts = self._split_params(unconstrained)
+        out = self._split_params(constrained)
+        for name in ['ar', 'seasonal_ar']:
+            if parts[name].shape[1] > 0 and mod.enforce_stationarity:
+                out[name][:] = constrain_stationary_univariate_batch(
+                    parts[name])
+        for name in ['ma', 'seasonal_ma']:
+            if parts[name].shape[1] > 0 and mod.enforce_invertibility:
+                out[name][:] = -constrain_stationary_univariate_batch(
+                    parts[name])
+        for name in ['measurement_variance', 'variance']:
+            out[name][:] = parts[name]**2
+        return constrained
+
+    def untransform_params(self, constrained):
+        """
+        Transform constrained parameters of all series to unconstrained
+
+        Parameters
+        ----------
+        constrained : array
+            Constrained parameters with shape (n_series, k_params).
+
+        Returns
+        -------
+        unconstrained : array
+            Unconstrained parameters used by the optimizer.
+
+        See Also
+        --------
+        SARIMAX.untransform_params
+        """
+        mod = self.model
+        constrained = np.asarray(constrained)
+        unconstrained = constrained.copy()
+        parts = self._split_params(constrained)
+        out = self._split_params(unconstrained)
+        for name in ['ar', 'seasonal_ar']:
+            if parts[name].shape[1] > 0 and mod.enforce_stationarity:
+                out[name][:] = unconstrain_stationary_univariate_batch(
+                    parts[name])
+        for name in ['ma', 'seasonal_ma']:
+            if parts[name].shape[1] > 0 and mod.enforce_invertibility:
+                out[name][:] = unconstrain_stationary_univariate_batch(
+                    -parts[name])
+        for name in ['measurement_variance', 'variance']:
+            out[name][:] = parts[name]**0.5
+        return unconstrained
+
+    def representation(self, params):
+        """
+        Stacked state space representation for constrained params
+
+        Parameters
+        ----------
+        params : array
+            Constrained parameters with shape (n, k_params).
+
+        Returns
+        -------
+        rep : dict
+            Time-invariant representation arrays, stacked along the first
+            axis, and the initial state and state covariance.
+        """
+        mod = self.model
+        params = np.asarray(params)
+        dtype = np.result_type(params.dtype, np.float64)
+        n = params.shape[0]
+        m = self.k_states
+        parts = self._split_params(params)
+
+        # lag polynomials, as in SARIMAX.update
+        polys = {}
+        for name, sign in [('ar', -1), ('ma', 1), ('seasonal_ar', -1),
+                           ('seasonal_ma', 1)]:
+            poly = getattr(mod, 'polynomial_' + name).real.astype(dtype)
+            poly = np.repeat(poly[None, :], n, axis=0)
+            if parts[name].shape[1] > 0:
+                poly[:, getattr(mod, '_polynomial_%s_idx' % name)] = (
+                    sign * parts[name])
+            polys[name] = poly
+        if mod.k_seasonal_ar > 0:
+            reduced_ar = -_polymul_batch(polys['ar'], polys['seasonal_ar'])
+        else:
+            reduced_ar = -polys['ar']
+        if mod.k_seasonal_ma > 0:
+            reduced_ma = _polymul_batch(polys['ma'], polys['seasonal_ma'])
+        else:
+            reduced_ma = polys['ma']
+
+        design = np.repeat(self._design[None, :].astype(dtype), n, axis=0)
+        transition = np.repeat(self._transition[None, :, :].astype(dtype),
+                               n, axis=0)
+        selection = np.repeat(self._selection[None, :].astype(dtype), n,
+                              axis=0)
+        if mod.k_ar > 0 or mod.k_seasonal_ar > 0:
+            idx = mod.transition_ar_params_idx[1:]
+            transition[(slice(None),) + idx] = reduced_ar[:, 1:]
+        if mod.k_ma > 0 or mod.k_seasonal_ma > 0:
+            idx = mod.selection_ma_params_idx[1:-1]
+            selection[(slice(None),) + idx] = reduced_ma[:, 1:]
+
+        state_intercept = np.zeros((n, m), dtype=dtype)
+        if mod.k_trend > 0:
+            state_intercept[:, mod._k_states_diff] = parts['trend'][:, 0]
+        obs_intercept = np.zeros(n, dtype=dtype)
+        obs_cov = np.zeros(n, dtype=dtype)
+        if mod.measurement_error:
+            obs_cov[:] = parts['measurement_variance'][:, 0]
+        variance = parts['variance'][:, 0]
+        selected_state_cov = (variance[:, None, None] *
+                              selection[:, :, None] * selection[:, None, :])
+
+        state, state_cov = self._initialize(transition, state_intercept,
+                                            selection, selected_state_cov)
+        return dict(design=design, obs_intercept=obs_intercept,
+                    obs_cov=obs_cov, transition=transition,
+                    state_intercept=state_intercept,
+                    selected_state_cov=selected_state_cov,
+                    state=state, state_cov=state_cov)
+
+    def _initialize(self, transition, state_intercept, selection,
+                    selected_state_cov):
+        """initial state and covariance, as in SARIMAX.initialize_state"""
+        mod = self.model
+        n, m = state_intercept.shape
+        dtype = transition.dtype
+        variance = mod.ssm.initial_variance
+
+        if mod._manual_initialization:
+            # stationary initialization of the complete state vector
+            state = np.zeros((n, m), dtype=dtype)
+            nonzero = np.abs(state_intercept).sum(1) > 1e-9
+            if nonzero.any():
+                state[nonzero] = np.linalg.solve(
+                    np.eye(m) - transition[nonzero],
+                    state_intercept[nonzero][:, :, None])[:, :, 0]
+            state_cov = solve_discrete_lyapunov_batch(transition,
+                                                      selected_state_cov)
+            return state, state_cov
+
+        state = np.zeros((n, m), dtype=dtype)
+        state_cov = np.repeat(np.eye(m, dtype=dtype)[None, :, :] * variance,
+                              n, axis=0)
+        if not mod.enforce_stationarity or mod._k_order == 0:
+            return state, state_cov
+
+        sl = slice(m - mod._k_order, m)
+        block = transition[:, sl, sl]
+        if mod.k_trend > 0:
+            initial_mean = (state_intercept[:, mod._k_states_diff] /
+                            (1 - block[:, :, 0].sum(1)))
+            state[:, mod._k_states_diff] = initial_mean
+            start = mod._k_states_diff + 1
+            end = start + block.shape[1] - 1
+            state[:, start:end] = block[:, 1:, 0] * initial_mean[:, None]
+        cov_block = selected_state_cov[:, sl, sl]
+        state_cov[:, sl, sl] = solve_discrete_lyapunov_batch(block, cov_block)
+        return state, state_cov
+
+    def _filter(self, params, index=None):
+        """run the batched filter, returns loglike and representation"""
+        if index is None:
+            index = np.arange(self.n_series)
+        index = np.asarray(index, dtype=np.int64)
+        rep = self.representation(params)
+        dtype = rep['transition'].dtype
+        prefix = 'z' if np.issubdtype(dtype, np.complexfloating) else 'd'
+        llf = np.zeros(len(index), dtype=dtype)
+        func = getattr(_batch, prefix + 'batch_filter')
+        func(self.endog, index, self.start[index],
+             self.loglikelihood_burn[index], rep['design'],
+             rep['obs_intercept'], rep['obs_cov'], rep['transition'],
+             rep['state_intercept'], rep['selected_state_cov'],
+             rep['state'], rep['state_cov'], llf)
+        return llf, rep
+
+    def loglike(self, params, transformed=True, index=None):
+        """
+        Loglikelihood of each series
+
+        Parameters
+        ----------
+        params : array
+            Parameters with shape (n, k_params), one row for each series in
+            `index`.
+        transformed : bool
+            Whether or not `params` are already transformed.
+        index : None or array of int
+            The series for which the loglikelihood is computed. Default is
+            all series.
+
+        Returns
+        -------
+        llf : ndarray
+            Loglikelihood of each series.
+        """
+        params = np.atleast_2d(params)
+        if not transformed:
+            params = self.transform_params(params)
+        return self._filter(params, index=index)[0]
+
+    def _objective(self, unconstrained, index):
+        """negative average loglikelihood for the optimizer"""
+        params = self.transform_params(unconstrained)
+        return -self.loglike(params, index=index) / self.nobs[index]
+
+    def _objective_grad(self, unconstrained, index, epsilon=1e-20):
+        """gradient of the objective by complex step differentiation"""
+        n, k = unconstrained.shape
+        grad = np.zeros((n, k))
+        for j in range(k):
+            x = unconstrained.astype(complex)
+            x[:, j] += epsilon * 1j
+            grad[:, j] = self._objective(x, index).imag / epsilon
+        return grad
+
+    @property
+    def start_params(self):
+        """
+        Starting parameters of all series, shape (n_series, k_params)
+
+        These are the SARIMAX starting parameters computed separately for
+        each series. Invalid starting values for AR or MA parameters of a
+        series are replaced by zeros instead of raising an exception.
+        """
+        return np.array([self._start_params_series(i)
+                         for i in range(self.n_series)])
+
+    def _start_params_series(self, i):
+        mod = self.model
+        endog = self.endog[i, self.start[i]:]
+        if mod._k_diff > 0 or mod._k_seasonal_diff > 0:
+            endog = diff(endog, mod._k_diff, mod._k_seasonal_diff,
+                         mod.seasonal_periods)
+        endog = endog[~np.isnan(endog)]
+        trend_data = np.ones((len(endog), mod.k_trend))
+
+        (params_trend, params_ar, params_ma,
+         params_variance) = mod._conditional_sum_squares(
+            endog, mod.k_ar, mod.polynomial_ar, mod.k_ma, mod.polynomial_ma,
+            mod.k_trend, trend_data)
+        _, params_seasonal_ar, params_seasonal_ma, params_seasonal_variance = (
+            mod._conditional_sum_squares(
+                endog, mod.k_seasonal_ar, mod.polynomial_seasonal_ar,
+                mod.k_seasonal_ma, mod.polynomial_seasonal_ma))
+
+        if (mod.k_ar > 0 and mod.enforce_stationarity and
+                not is_invertible(np.r_[1, -params_ar])):
+            params_ar = np.zeros(mod.k_ar_params)
+        if (mod.k_ma > 0 and mod.enforce_invertibility and
+                not is_invertible(np.r_[1, params_ma])):
+            params_ma = np.zeros(mod.k_ma_params)
+        if (mod.k_seasonal_ar > 0 and mod.enforce_stationarity and
+                not is_invertible(np.r_[1, -params_seasonal_ar])):
+            params_seasonal_ar = np.zeros(mod.k_seasonal_ar_params)
+        if (mod.k_seasonal_ma > 0 and mod.enforce_invertibility and
+                not is_invertible(np.r_[1, params_seasonal_ma])):
+            params_seasonal_ma = np.zeros(mod.k_seasonal_ma_params)
+
+        if mod.state_error and np.size(params_variance) == 0:
+            if np.size(params_seasonal_variance) > 0:
+                params_variance = params_seasonal_variance
+            else:
+                params_variance = np.inner(endog, endog) / self.nobs[i]
+        params_measurement_variance = 1 if mod.measurement_error else []
+
+        return np.r_[params_trend, params_ar, params_ma, params_seasonal_ar,
+                     params_seasonal_ma, params_measurement_variance,
+                     params_variance]
+
+    def fit(self, start_params=None, transformed=True, maxiter=50,
+            gtol=1e-5, ftol=2.2e-9, max_linesearch=30):
+        """
+        Fit the model to all series by maximum likelihood
+
+        Each series is estimated with its own BFGS iterations. The iterations
+        are vectorized over the series that have not converged yet, so that
+        each function or gradient evaluation is one call of the batched
+        Kalman filter.
+
+        Parameters
+        ----------
+        start_params : array, optional
+            Starting parameters with shape (n_series, k_params). Default are
+            the SARIMAX starting parameters of each series.
+        transformed : bool, optional
+            Whether or not `start_params` is already transformed.
+        maxiter : int, optional
+            Maximum number of iterations.
+        gtol : float, optional
+            A series has converged if the largest absolute value of the
+            gradient of the average loglikelihood is below `gtol`.
+        ftol : float, optional
+            A series has also converged if the relative change in the
+            average loglikelihood is below `ftol`.
+        max_linesearch : int, optional
+            Maximum number of step halvings in the backtracking line search.
+
+        Returns
+        -------
+        BatchSARIMAXResults
+        """
+        if start_params is None:
+            start_params = self.start_params
+            transformed = True
+        start_params = np.atleast_2d(np.asarray(start_params, dtype=float))
+        if transformed:
+            x = self.untransform_params(start_params)
+        else:
+            x = start_params.copy()
+
+        n, k = x.shape
+        index = np.arange(n)
+        f = self._objective(x, index)
+        g = self._objective_grad(x, index)
+        hess_inv = np.repeat(np.eye(k)[None, :, :], n, axis=0)
+        converged = np.abs(g).max(1) < gtol
+        failed = ~np.isfinite(f)
+        n_iter = np.zeros(n, dtype=int)
+        eye = np.eye(k)
+
+        for it in range(maxiter):
+            active = np.nonzero(~(converged | failed))[0]
+            if len(active) == 0:
+                break
+            n_iter[active] += 1
+            xa, fa, ga, ha = x[active], f[active], g[active], hess_inv[active]
+            direction = -np.einsum('nij,nj->ni', ha, ga)
+            slope = (direction * ga).sum(1)
+            # reset to steepest descent if the direction is not downhill
+            reset = ~(slope < 0)
+            if reset.any():
+                ha[reset] = eye
+                direction[reset] = -ga[reset]
+                slope[reset] = -(ga[reset]**2).sum(1)
+
+            # backtracking line search with Armijo condition
+            alpha = np.ones(len(active))
+            x_new = xa.copy()
+            f_new = fa.copy()
+            pending = np.arange(len(active))
+            for _ in range(max_linesearch):
+                x_try = xa[pending] + alpha[pending, None] * direction[pending]
+                f_try = self._objective(x_try, active[pending])
+                ok = (np.isfinite(f_try) &
+                      (f_try <= fa[pending] +
+                       1e-4 * alpha[pending] * slope[pending]))
+                x_new[pending[ok]] = x_try[ok]
+                f_new[pending[ok]] = f_try[ok]
+                pending = pending[~ok]
+                if len(pending) == 0:
+                    break
+                alpha[pending] *= 0.5
+            # series without an acceptable step cannot improve further
+            no_step = np.zeros(len(active), dtype=bool)
+            no_step[pending] = True
+
+            g_new = self._objective_grad(x_new, active)
+            s = x_new - xa
+            y = g_new - ga
+            sy = (s * y).sum(1)
+            update = sy > 1e-12
+            if it == 0:
+                # scale the initial inverse Hessian approximation
+                scale = np.where(update, sy / np.maximum((y * y).sum(1),
+                                                         1e-300), 1)
+                ha = ha * scale[:, None, None]
+            rho = np.where(update, 1. / np.where(update, sy, 1), 0)
+            a = eye - rho[:, None, None] * s[:, :, None] * y[:, None, :]
+            ha_new = (np.matmul(np.matmul(a, ha), np.swapaxes(a, 1, 2)) +
+                      rho[:, None, None] * s[:, :, None] * s[:, None, :])
+            ha = np.where(update[:, None, None], ha_new, ha)
+
+            small_change = ((fa - f_new) <=
+                            ftol * np.maximum(np.maximum(np.abs(fa),
+                                                         np.abs(f_new)), 1))
+            conv = (np.abs(g_new).max(1) < gtol) | (small_change & ~no_step)
+            x[active], f[active], g[active] = x_new, f_new, g_new
+            hess_inv[active] = ha
+            converged[active] = conv
+            failed[active] = no_step & ~conv
+
+        params = self.transform_params(x)
+        llf, rep = self._filter(params)
+        return BatchSARIMAXResults(self, params, llf.real, converged=converged,
+                                   n_iter=n_iter,
+                                   predicted_state=rep['state'],
+                                   predicted_state_cov=rep['state_cov'],
+                                   representation=rep)
+
+
+class BatchSARIMAXResults(object):
+    """
+    Results for the separate estimation of SARIMAX models of many series
+
+    Parameters
+    ----------
+    model : BatchSARIMAX instance
+        The model containing all series.
+    params : ndarray
+        Parameter estimates with shape (n_series, k_params).
+    llf : ndarray
+        Loglikelihood of each series at the estimated parameters.
+    **kwds
+        Convergence details and the filter output for the last period,
+        attached as attributes.
+
+    Attributes
+    ----------
+    params : ndarray or DataFrame
+        Parameter estimates, one row for each series.
+    llf, aic, bic, hqic : ndarray or Series
+        Statistics with one element for each series.
+    converged : ndarray of bool
+        Whether the BFGS iterations have converged for the series.
+    n_iter : ndarray of int
+        Number of BFGS iterations for each series.
+    predicted_state, predicted_state_cov : ndarray
+        Predicted state and state covariance matrix for the period after the
+        last observation, shape (n_series, k_states) and
+        (n_series, k_states, k_states).
+
+    Notes
+    -----
+    If the series were provided with labels, in a dict or in the columns of
+    a DataFrame, then the statistics are returned as pandas objects indexed
+    by the series labels.
+    """
+
+    def __init__(self, model, params, llf, **kwds):
+        self.model = model
+        self._params = params
+        self._llf = llf
+        self.__dict__.update(kwds)
+        self.n_series = model.n_series
+        self.nobs = model.nobs
+        self.nobs_effective = model.nobs - model.loglikelihood_burn
+        self.df_model = model.k_params
+        self._cache = resettable_cache()
+
+    def __len__(self):
+        return self.n_series
+
+    def _wrap(self, arr, columns=None):
+        names = self.model.series_names
+        if names is None:
+            return arr
+        if arr.ndim == 1:
+            return pd.Series(arr, index=names)
+        return pd.DataFrame(arr, index=names, columns=columns)
+
+    @cache_readonly
+    def params(self):
+        return self._wrap(self._params, columns=self.model.param_names)
+
+    @cache_readonly
+    def llf(self):
+        return self._wrap(self._llf)
+
+    @cache_readonly
+    def aic(self):
+        return self._wrap(aic(self._llf, self.nobs_effective, self.df_model))
+
+    @cache_readonly
+    def bic(self):
+        return self._wrap(bic(self._llf, self.nobs_effective, self.df_model))
+
+    @cache_readonly
+    def hqic(self):
+        return self._wrap(hqic(self._llf, self.nobs_effective,
+                               self.df_model))
+
+    def forecast(self, steps=1):
+        """
+        Out-of-sample forecasts of all series
+
+        Parameters
+        ----------
+        steps : int, optional
+            The number of periods to forecast after the end of the series.
+
+        Returns
+        -------
+        forecast : ndarray or DataFrame
+            Forecasts with shape (n_series, steps).
+        """
+        rep = self.representation
+        state = self.predicted_state.real.copy()
+        forecasts = np.zeros((self.n_series, steps))
+        for h in range(steps):
+            forecasts[:, h] = (rep['obs_intercept'].real +
+                               (rep['design'].real * state).sum(1))
+            state = (rep['state_intercept'].real +
+                     np.einsum('nij,nj->ni', rep['transition'].real, state))
+        return self._wrap(forecasts, columns=np.arange(1, steps + 1))
+
+    def summary_frame(self):
+        """
+        DataFrame with parameters and fit statistics of all series
+        """
+        index = self.model.series_names
+        frame = pd.DataFrame(self._params, index=index,
+                             columns=self.model.param_names)
+        frame['llf'] = self._llf
+        frame['aic'] = np.asarray(self.aic)
+        frame['bic'] = np.asarray(self.bic)
+        frame['converged'] = self.converged
+        frame['n_iter'] = self.n_iter
+        return frame
@@ -24,6 +24,7 @@ FILTER_UNIVARIATE = 0x10       # ibid., Chapter 6.4
 FILTER_COLLAPSED = 0x20        # ibid., Chapter 6.5
 FILTER_EXTENDED = 0x40         # ibid., Chapter 10.2
 FILTER_UNSCENTED = 0x80        # ibid., Chapter 10.3
+FILTER_CHANDRASEKHAR = 0x100   # Herbst (2015)
 
 INVERT_UNIVARIATE = 0x01
 SOLVE_LU = 0x02
@@ -134,7 +135,7 @@ class KalmanFilter(Representation):
     filter_methods = [
         'filter_conventional', 'filter_exact_initial', 'filter_augmented',
         'filter_square_root', 'filter_univariate', 'filter_collapsed',
-        'filter_extended', 'filter_unscented'
+        'filter_extended', 'filter_unscented', 'filter_chandrasekhar'
     ]
 
     filter_conventional = OptionWrapper('filter_method', FILTER_CONVENTIONAL)
@@ -169,6 +170,10 @@ class KalmanFilter(Representation):
     """
     (bool) Flag for unscented Kalman filtering. Not implemented.
     """
+    filter_chandrasekhar = OptionWrapper('filter_method', FILTER_CHANDRASEKHAR)
+    """
+    (bool) Flag for filtering with Chandrasekhar recursions.
+    """
 
     inversion_methods = [
         'invert_univariate', 'solve_lu', 'invert_lu', 'solve_cholesky',
@@ -414,6 +419,10 @@ class KalmanFilter(Representation):
         FILTER_COLLAPSED = 0x20
             Collapsed approach to Kalman filtering. Will be used *in addition*
             to conventional or univariate filtering.
+        FILTER_CHANDRASEKHAR = 0x100
+            Filtering with Chandrasekhar recursions. Will be used *in
+            addition* to conventional filtering, and is ignored by the
+            univariate filter.
 
         Note that only the first method is available if using a Scipy version
         older than 0.16.
@@ -431,6 +440,20 @@ class KalmanFilter(Representation):
 
         The default filtering method is FILTER_CONVENTIONAL.
 
+        The Chandrasekhar recursions update the predicted state covariance
+        matrix through a low-rank factorization of its change between
+        periods, which requires :math:`O(m^2 p)` instead of :math:`O(m^3)`
+        operations per period, where `m` is the dimension of the state and
+        `p` the dimension of the observation vector. They can be used for
+        time-invariant models without missing data and with the default
+        filter timing. The reduction is only achieved if the initial state
+        covariance matrix is the unconditional (stationary) covariance
+        matrix; otherwise they remain exact but cost :math:`O(m^3)`.
+
+        In time-invariant models the filter also switches to the steady state
+        once the predicted state covariance matrix has converged, see
+        `tolerance`. After that, no covariance matrices are updated.
+
         Examples
         --------
         >>> mod = sm.tsa.statespace.SARIMAX(range(10))
@@ -105,6 +105,10 @@ class MLEModel(tsbase.TimeSeriesModel):
     statsmodels.tsa.statespace.representation.Representation
     """
 
+    # Score method used by `fit` if none is given (None uses the built-in
+    # gradient approximation of the optimizer)
+    _default_optim_score = None
+
     def __init__(self, endog, k_states, exog=None, dates=None, freq=None,
                  **kwargs):
         # Initialize the model base
@@ -125,6 +129,42 @@ class MLEModel(tsbase.TimeSeriesModel):
         # Initialize the state-space representation
         self.initialize_statespace(**kwargs)
 
+    def _clone_from_init_kwds(self, endog, exog=None, **kwargs):
+        """
+        Create a new model of the same class from the `__init__` keywords
+        """
+        use_kwargs = self._get_init_kwds()
+        use_kwargs.update(kwargs)
+
+        # The new dataset must have the same regressors
+        if getattr(self, 'k_exog', 0) > 0 and exog is None:
+            raise ValueError('Cloned models must have `exog` when the'
+                             ' original model has `exog`.')
+        use_kwargs['exog'] = exog
+
+        return self.__class__(endog, **use_kwargs)
+
+    def clone(self, endog, exog=None, **kwargs):
+        """
+        Clone state space model with new data and optionally new specification
+
+        Parameters
+        ----------
+        endog : array_like
+            The observed time-series process :math:`y`
+        exog : array_like, optional
+            Array of exogenous regressors. Required if the original model
+            includes `exog`.
+        **kwargs
+            Keyword arguments to pass to the new model class to change the
+            model specification.
+
+        Returns
+        -------
+        model : MLEModel subclass
+        """
+        raise NotImplementedError('This model does not support cloning.')
+
     def prepare_data(self):
         """
         Prepare data for use in the state space representation
@@ -398,22 +438,26 @@ class MLEModel(tsbase.TimeSeriesModel):
         return_params : boolean, optional
             Whether or not to return only the array of maximizing parameters.
             Default is False.
-        optim_score : {'harvey', 'approx'} or None, optional
+        optim_score : {'harvey', 'approx', 'analytic'} or None, optional
             The method by which the score vector is calculated. 'harvey' uses
             the method from Harvey (1989), 'approx' uses either finite
             difference or complex step differentiation depending upon the
-            value of `optim_complex_step`, and None uses the built-in gradient
-            approximation of the optimizer. Default is None. This keyword is
-            only relevant if the optimization method uses the score.
+            value of `optim_complex_step`, 'analytic' uses the derivative
+            Kalman filter recursions (see `loglike_derivatives`), and None
+            uses the built-in gradient approximation of the optimizer. Default
+            is None, except for models that set a default score method (such as
+            SARIMAX, which uses 'analytic' when it is available). This keyword
+            is only relevant if the optimization method uses the score.
         optim_complex_step : bool, optional
             Whether or not to use complex step differentiation when
             approximating the score; if False, finite difference approximation
             is used. Default is True. This keyword is only relevant if
             `optim_score` is set to 'harvey' or 'approx'.
-        optim_hessian : {'opg','oim','approx'}, optional
+        optim_hessian : {'opg','oim','analytic','approx'}, optional
             The method by which the Hessian is numerically approximated. 'opg'
             uses outer product of gradients, 'oim' uses the information
-            matrix formula from Harvey (1989), and 'approx' uses numerical
+            matrix formula from Harvey (1989), 'analytic' uses the same
+            formula with analytic derivatives, and 'approx' uses numerical
             approximation. This keyword is only relevant if the
             optimization method uses the Hessian matrix.
         **kwargs
@@ -433,6 +477,10 @@ class MLEModel(tsbase.TimeSeriesModel):
             transformed = True
 
         # Update the score method
+        if (optim_score is None and self._default_optim_score is not None and
+                not kwargs.get('approx_grad', False) and
+                'epsilon' not in kwargs and self._analytic_derivatives):
+            optim_score = self._default_optim_score
         if optim_score is None and method == 'lbfgs':
             kwargs.setdefault('approx_grad', True)
             kwargs.setdefault('epsilon', 1e-5)
@@ -934,6 +982,180 @@ class MLEModel(tsbase.TimeSeriesModel):
             (self.nobs - self.ssm.loglikelihood_burn)
         )
 
+    @property
+    def _analytic_derivatives(self):
+        """
+        (bool) Whether or not the analytic score can be computed for the model
+        """
+        ssm = self.ssm
+        time_invariant = all([
+            getattr(ssm, '_' + name).shape[-1] == 1
+            for name in ['design', 'obs_cov', 'transition', 'selection',
+                         'state_cov']])
+        return (
+            self.k_endog == 1 and time_invariant and
+            not ssm._complex_endog and not ssm.filter_collapsed and
+            not ssm.timing_init_filtered and
+            # models may only be initialized in `update`
+            ssm.initialization in [None, 'known', 'approximate_diffuse',
+                                   'stationary'])
+
+    def _analytic_system_matrices(self):
+        ssm = self.ssm
+        selection = ssm._selection[:, :, 0]
+        matrices = {
+            'design': ssm._design[0, :, 0],
+            'obs_intercept': ssm._obs_intercept[0],
+            'obs_cov': ssm._obs_cov[0, 0, 0],
+            'transition': ssm._transition[:, :, 0],
+            'state_intercept': ssm._state_intercept,
+            'selected_state_cov': np.dot(
+                np.dot(selection, ssm._state_cov[:, :, 0]), selection.T)
+        }
+        if ssm.initialization == 'known':
+            matrices['initial_state'] = ssm._initial_state
+            matrices['initial_state_cov'] = ssm._initial_state_cov
+        return matrices
+
+    def loglike_derivatives(self, params, transformed=True):
+        """
+        Loglikelihood, score per observation and information matrix
+
+        Parameters
+        ----------
+        params : array_like
+            Array of parameters at which to evaluate the derivatives.
+        transformed : boolean, optional
+            Whether or not `params` is already transformed. Default is True.
+
+        Returns
+        -------
+        llf : float
+            The loglikelihood.
+        score_obs : array
+            Score of each observation, with shape (nobs, k_params).
+        information_matrix : array
+            Information matrix of Harvey (1989), summed over observations,
+            with shape (k_params, k_params).
+
+        Notes
+        -----
+        The derivatives of the loglikelihood are computed in a single pass of
+        the derivative Kalman filter recursions of Harvey (1989), section
+        3.4.5. Only the (cheap) derivatives of the state space system matrices
+        with respect to the parameters are computed numerically, using
+        complex step differentiation of the `update` method.
+
+        This is only available for univariate models with time-invariant
+        design, observation covariance, transition, selection and state
+        covariance matrices (the intercepts may be time-varying). Derivatives
+        are computed with respect to the transformed parameters.
+
+        References
+        ----------
+        Harvey, Andrew C. 1990.
+        Forecasting, Structural Time Series Models and the Kalman Filter.
+        Cambridge University Press.
+        """
+        from ._derivatives import dloglikelihood_derivatives
+
+        params = np.array(params, ndmin=1)
+        if not transformed:
+            params = self.transform_params(params)
+        n = len(params)
+
+        self.update(params, transformed=True)
+        if not self._analytic_derivatives or self.ssm.initialization is None:
+            raise ValueError('Analytic derivatives are only available for'
+                             ' univariate models with time-invariant system'
+                             ' matrices.')
+
+        # Partial derivatives of the system matrices
+        epsilon = _get_epsilon(params, 2., None, n)
+        increments = np.identity(n) * 1j * epsilon
+        partials = {}
+        for i, ih in enumerate(increments):
+            self.update(params + ih, transformed=True, complex_step=True)
+            for name, value in self._analytic_system_matrices().items():
+                if name not in partials:
+                    partials[name] = np.zeros((n,) + np.shape(value))
+                partials[name][i] = np.imag(value) / epsilon[i]
+
+        self.update(params, transformed=True)
+        matrices = dict([
+            (name, np.real(value))
+            for name, value in self._analytic_system_matrices().items()])
+
+        # Initialization
+        initialization = self.ssm.initialization
+        k_states = self.k_states
+        if initialization == 'approximate_diffuse':
+            matrices['initial_state'] = np.zeros(k_states)
+            matrices['initial_state_cov'] = (
+                np.eye(k_states) * self.ssm._initial_variance)
+            partials['initial_state'] = np.zeros((n, k_states))
+            partials['initial_state_cov'] = np.zeros((n, k_states, k_states))
+        elif initialization == 'stationary':
+            from .tools import solve_discrete_lyapunov
+            transition = matrices['transition']
+            state_intercept = matrices['state_intercept'][:, 0]
+            initial_state = np.zeros(k_states)
+            partials_initial_state = np.zeros((n, k_states))
+            if np.sum(np.abs(state_intercept)) > 1e-9:
+                inv = np.linalg.inv(np.eye(k_states) - transition)
+                initial_state = np.dot(inv, state_intercept)
+                partials_initial_state = np.dot(
+                    np.dot(partials['transition'], initial_state) +
+                    partials['state_intercept'][:, :, 0], inv.T)
+            initial_state_cov = solve_discrete_lyapunov(
+                transition, matrices['selected_state_cov'])
+            # Differentiate P = T P T' + R Q R'
+            partials_initial_state_cov = np.zeros((n, k_states, k_states))
+            for i in range(n):
+                tmp = np.dot(partials['transition'][i],
+                             np.dot(initial_state_cov, transition.T))
+                partials_initial_state_cov[i] = solve_discrete_lyapunov(
+                    transition,
+                    tmp + tmp.T + partials['selected_state_cov'][i])
+            matrices['initial_state'] = initial_state
+            matrices['initial_state_cov'] = initial_state_cov
+            partials['initial_state'] = partials_initial_state
+            partials['initial_state_cov'] = partials_initial_state_cov
+
+        score_obs = np.zeros((self.nobs, n))
+        information_matrix = np.zeros((n, n))
+        llf = dloglikelihood_derivatives(
+            np.asarray(self.ssm.endog[0], dtype=float),
+            self.ssm.loglikelihood_burn,
+            matrices['design'], matrices['obs_intercept'],
+            matrices['obs_cov'], matrices['transition'],
+            matrices['state_intercept'], matrices['selected_state_cov'],
+            matrices['initial_state'], matrices['initial_state_cov'],
+            partials['design'], partials['obs_intercept'],
+            partials['obs_cov'], partials['transition'],
+            partials['state_intercept'], partials['selected_state_cov'],
+            partials['initial_state'], partials['initial_state_cov'],
+            score_obs, information_matrix, self.ssm.tolerance)
+
+        return llf, score_obs, information_matrix
+
+    def _score_analytic(self, params, **kwargs):
+        return self.loglike_derivatives(params)[1].sum(axis=0)
+
+    def _hessian_analytic(self, params, transformed=True, **kwargs):
+        """
+        Hessian matrix computed using the Harvey (1989) information matrix,
+        with analytic derivatives
+        """
+        information_matrix = self.loglike_derivatives(
+            params, transformed=transformed)[2]
+        if not transformed:
+            transform_score = self.transform_jacobian(params)
+            information_matrix = np.dot(
+                np.dot(transform_score.T, information_matrix),
+                transform_score)
+        return -information_matrix / (self.nobs - self.ssm.loglikelihood_burn)
+
     def _score_complex_step(self, params, **kwargs):
         # the default epsilon can be too small
         # inversion_method = INVERT_UNIVARIATE | SOLVE_LU
@@ -1073,6 +1295,8 @@ class MLEModel(tsbase.TimeSeriesModel):
         if method == 'harvey':
             score = self._score_harvey(
                 params, approx_complex_step=approx_complex_step, **kwargs)
+        elif method == 'analytic':
+            score = self._score_analytic(params, **kwargs)
         elif method == 'approx' and approx_complex_step:
             score = self._score_complex_step(params, **kwargs)
         elif method == 'approx':
@@ -1082,7 +1306,7 @@ class MLEModel(tsbase.TimeSeriesModel):
             raise NotImplementedError('Invalid score method.')
 
         if not transformed:
-            score = np.dot(transform_score, score)
+            score = np.dot(transform_score.T, score)
 
         return score
 
@@ -1125,6 +1349,13 @@ class MLEModel(tsbase.TimeSeriesModel):
             score = self._score_obs_harvey(
                 params, transformed=transformed,
                 approx_complex_step=approx_complex_step, **kwargs)
+        elif method == 'analytic' and transformed:
+            score = self.loglike_derivatives(params)[1]
+        elif method == 'analytic':
+            transform_score = self.transform_jacobian(params)
+            score = self.loglike_derivatives(
+                params, transformed=False)[1]
+            score = np.dot(score, transform_score)
         elif method == 'approx' and approx_complex_step:
             # the default epsilon can be too small
             epsilon = _get_epsilon(params, 2., None, len(params))
@@ -1203,6 +1434,9 @@ class MLEModel(tsbase.TimeSeriesModel):
                 params, transformed=transformed,
                 approx_complex_step=approx_complex_step,
                 approx_centered=approx_centered, **kwargs)
+        elif method == 'analytic':
+            hessian = self._hessian_analytic(
+                params, transformed=transformed, **kwargs)
         elif method == 'approx' and approx_complex_step:
             hessian = self._hessian_complex_step(
                 params, transformed=transformed, **kwargs)
@@ -2502,6 +2736,139 @@ class MLEResults(tsbase.TimeSeriesModelResults):
                                    measurement_shocks, state_shocks,
                                    initial_state)
 
+    def _get_appended_data(self, endog, exog=None):
+        """
+        Concatenate new observations to the end of the model's dataset
+        """
+        def concatenate(orig, new, name):
+            if isinstance(orig, (pd.Series, pd.DataFrame)):
+                if not isinstance(new, (pd.Series, pd.DataFrame)):
+                    raise ValueError('Given `%s` must be a Pandas object'
+                                     ' since the original data was.' % name)
+                return pd.concat([orig, new])
+            orig = np.asarray(orig)
+            new = np.asarray(new)
+            if orig.ndim > 1:
+                new = new.reshape((-1,) + orig.shape[1:])
+            return np.concatenate([orig, new], axis=0)
+
+        data = self.model.data
+        endog = concatenate(data.orig_endog, endog, 'endog')
+        if data.orig_exog is not None:
+            if exog is None:
+                raise ValueError('New observations of `exog` are required'
+                                 ' since the model includes `exog`.')
+            exog = concatenate(data.orig_exog, exog, 'exog')
+        elif exog is not None:
+            raise ValueError('Cannot give `exog` for a model that does not'
+                             ' include `exog`.')
+        return endog, exog
+
+    def append(self, endog, exog=None, refit=False, fit_kwargs=None,
+               **kwargs):
+        """
+        Recreate the results object with new data appended to the original data
+
+        Parameters
+        ----------
+        endog : array_like
+            New observations from the modeled time-series process, which
+            follow the end of the original sample. If the original data was a
+            Pandas object, this must be as well.
+        exog : array_like, optional
+            New observations of exogenous regressors, if applicable.
+        refit : bool, optional
+            Whether to re-fit the parameters, using the new dataset. The
+            optimizer is warm-started from the current parameters, so that
+            typically only a few iterations are needed. Default is False (so
+            parameters from the current results object are used to create
+            the new results object).
+        fit_kwargs : dict, optional
+            Keyword arguments to pass to `fit` (if `refit=True`) or `smooth`.
+        **kwargs
+            Keyword arguments to pass to the `clone` method of the model, for
+            example to change the model specification.
+
+        Returns
+        -------
+        results : MLEResults
+            Updated results object containing results for the entire dataset.
+
+        Notes
+        -----
+        The model is re-created for the combined dataset, so the Kalman filter
+        and smoother are run over the entire sample. To only filter the new
+        observations, see `extend`.
+
+        See Also
+        --------
+        extend
+        """
+        endog, exog = self._get_appended_data(endog, exog)
+        mod = self.model.clone(endog, exog=exog, **kwargs)
+        if fit_kwargs is None:
+            fit_kwargs = {}
+        else:
+            fit_kwargs = dict(fit_kwargs)
+
+        if refit:
+            fit_kwargs.setdefault('start_params', self.params)
+            fit_kwargs.setdefault('disp', False)
+            res = mod.fit(**fit_kwargs)
+        else:
+            fit_kwargs.setdefault('cov_type', self.cov_type)
+            res = mod.smooth(self.params, **fit_kwargs)
+        return res
+
+    def extend(self, endog, exog=None, fit_kwargs=None, **kwargs):
+        """
+        Recreate the results object for new data that extends the original data
+
+        Parameters
+        ----------
+        endog : array_like
+            New observations from the modeled time-series process, which
+            follow the end of the original sample.
+        exog : array_like, optional
+            New observations of exogenous regressors, if applicable.
+        fit_kwargs : dict, optional
+            Keyword arguments to pass to `smooth`.
+        **kwargs
+            Keyword arguments to pass to the `clone` method of the model.
+
+        Returns
+        -------
+        results : MLEResults
+            Results object containing results only for the new observations.
+
+        Notes
+        -----
+        The model is created for the new observations only and initialized
+        with the predicted state and state covariance matrix for the first
+        period after the end of the original sample, so that the cost does
+        not depend on the length of the original sample. The loglikelihood of
+        the returned results is the loglikelihood of the new observations
+        conditional on the original data, and the parameters are not
+        re-estimated. The covariance matrix of the parameters is not computed
+        by default, since it would only be based on the new observations.
+
+        See Also
+        --------
+        append
+        """
+        mod = self.model.clone(endog, exog=exog, **kwargs)
+        mod.initialize_known(self.predicted_state[..., -1],
+                             self.predicted_state_cov[..., -1])
+        mod.loglikelihood_burn = max(
+            0, self.loglikelihood_burn - self.nobs)
+
+        if fit_kwargs is None:
+            fit_kwargs = {}
+        else:
+            fit_kwargs = dict(fit_kwargs)
+        fit_kwargs.setdefault('cov_type', 'none')
+        return mod.smooth(self.params, **fit_kwargs)
+
     def impulse_responses(self, steps=1, impulse=0, orthogonalized=False,
                           cumulative=False, **kwargs):
         """
@@ -91,6 +91,10 @@ class SARIMAX(MLEModel):
     hamilton_representation : boolean, optional
         Whether or not to use the Hamilton representation of an ARMA process
         (if True) or the Harvey representation (if False). Default is False.
+    trend_offset : int, optional
+        The offset at which to start time trend values. Default is 1, so that
+        if `trend='t'` the trend is equal to 1, 2, ..., nobs. Typically is only
+        set when the model is created by extending a previous dataset.
     **kwargs
         Keyword arguments may be used to provide default values for state space
         matrices or for Kalman filtering options. See `Representation`, and
@@ -277,12 +281,15 @@ class SARIMAX(MLEModel):
        Oxford University Press.
     """
 
+    # Use the derivative Kalman filter for the score when fitting
+    _default_optim_score = 'analytic'
+
     def __init__(self, endog, exog=None, order=(1, 0, 0),
                  seasonal_order=(0, 0, 0, 0), trend=None,
                  measurement_error=False, time_varying_regression=False,
                  mle_regression=True, simple_differencing=False,
                  enforce_stationarity=True, enforce_invertibility=True,
-                 hamilton_representation=False, **kwargs):
+                 hamilton_representation=False, trend_offset=1, **kwargs):
 
         # Model parameters
         self.seasonal_periods = seasonal_order[3]
@@ -293,6 +300,7 @@ class SARIMAX(MLEModel):
         self.enforce_stationarity = enforce_stationarity
         self.enforce_invertibility = enforce_invertibility
         self.hamilton_representation = hamilton_representation
+        self.trend_offset = trend_offset
 
         # Save given orders
         self.order = order
@@ -523,7 +531,8 @@ class SARIMAX(MLEModel):
                             'measurement_error', 'time_varying_regression',
                             'mle_regression', 'simple_differencing',
                             'enforce_stationarity', 'enforce_invertibility',
-                            'hamilton_representation'] + list(kwargs.keys())
+                            'hamilton_representation',
+                            'trend_offset'] + list(kwargs.keys())
         # TODO: I think the kwargs or not attached, need to recover from ???
 
     def _get_init_kwds(self):
@@ -535,6 +544,10 @@ class SARIMAX(MLEModel):
 
         return kwds
 
+    def clone(self, endog, exog=None, **kwargs):
+        return self._clone_from_init_kwds(endog, exog=exog, **kwargs)
+    clone.__doc__ = MLEModel.clone.__doc__
+
     def prepare_data(self):
         endog, exog = super(SARIMAX, self).prepare_data()
 
@@ -570,7 +583,8 @@ class SARIMAX(MLEModel):
 
         # Cache the arrays for calculating the intercept from the trend
         # components
-        time_trend = np.arange(1, self.nobs + 1)
+        time_trend = np.arange(self.trend_offset,
+                               self.nobs + self.trend_offset)
         self._trend_data = np.zeros((self.nobs, self.k_trend))
         i = 0
         for k in self.polynomial_trend.nonzero()[0]:
@@ -1677,6 +1691,54 @@ class SARIMAX(MLEModel):
 
         return params
 
+    @classmethod
+    def fit_batch(cls, endogs, start_params=None, transformed=True,
+                  maxiter=50, gtol=1e-5, **kwargs):
+        """
+        Fit the same model separately to each of many series
+
+        The loglikelihood of all series is evaluated with a batched Kalman
+        filter, which is much faster than fitting a model instance for each
+        series when the series are short.
+
+        Parameters
+        ----------
+        endogs : list, dict, DataFrame or 2-dim ndarray
+            The observed time series. A list or dict of one dimensional
+            series, or a DataFrame or array with one column for each series.
+            Series can have different lengths, they are aligned at the end.
+        start_params : array, optional
+            Starting parameters with shape (n_series, k_params). Default are
+            the starting parameters of each series as in `start_params`.
+        transformed : bool, optional
+            Whether or not `start_params` is already transformed.
+        maxiter : int, optional
+            Maximum number of BFGS iterations.
+        gtol : float, optional
+            Convergence tolerance for the gradient.
+        **kwargs
+            Keyword arguments for the model specification, for example
+            `order`, `seasonal_order`, `trend` and `measurement_error`.
+
+        Returns
+        -------
+        BatchSARIMAXResults
+
+        Notes
+        -----
+        Models with exogenous regressors, time trends, the Hamilton
+        representation, simple differencing or a user-specified
+        initialization are not supported.
+
+        See Also
+        --------
+        statsmodels.tsa.statespace.batch.BatchSARIMAX
+        """
+        from statsmodels.tsa.statespace.batch import BatchSARIMAX
+        mod = BatchSARIMAX(endogs, **kwargs)
+        return mod.fit(start_params=start_params, transformed=transformed,
+                       maxiter=maxiter, gtol=gtol)
+
 
 class SARIMAXResults(MLEResults):
     """
@@ -1801,6 +1863,18 @@ class SARIMAXResults(MLEResults):
         # Handle removing data
         self._data_attr_model.extend(['orig_endog', 'orig_exog'])
 
+    def extend(self, endog, exog=None, **kwargs):
+        # The new observations would be differenced separately from the
+        # original sample, which loses the first `d + D * s` of them
+        if self.model.simple_differencing:
+            raise NotImplementedError('Cannot extend a model that uses simple'
+                                      ' differencing.')
+        # The time trend continues from the end of the original sample
+        kwargs.setdefault('trend_offset',
+                          self.model.trend_offset + self.nobs)
+        return super(SARIMAXResults, self).extend(endog, exog=exog, **kwargs)
+    extend.__doc__ = MLEResults.extend.__doc__
+
     @cache_readonly
     def arroots(self):
         """
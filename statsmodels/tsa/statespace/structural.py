@@ -475,6 +475,9 @@ class UnobservedComponents(MLEModel):
         super(UnobservedComponents, self).__init__(
             endog, k_states, k_posdef=k_posdef, exog=exog, **kwargs
         )
+        # Whether or not the default initialization has been overridden with
+        # a user-supplied initialization
+        self._manual_initialization = False
         self.setup()
 
         # Set as time-varying model if we have exog
@@ -630,6 +633,22 @@ class UnobservedComponents(MLEModel):
         idx = np.diag_indices(self.ssm.k_posdef)
         self._idx_state_cov = ('state_cov', idx[0], idx[1])
 
+    def clone(self, endog, exog=None, **kwargs):
+        return self._clone_from_init_kwds(endog, exog=exog, **kwargs)
+    clone.__doc__ = MLEModel.clone.__doc__
+
+    def initialize_known(self, initial_state, initial_state_cov):
+        self._manual_initialization = True
+        self.ssm.initialize_known(initial_state, initial_state_cov)
+
+    def initialize_approximate_diffuse(self, variance=None):
+        self._manual_initialization = True
+        self.ssm.initialize_approximate_diffuse(variance)
+
+    def initialize_stationary(self):
+        self._manual_initialization = True
+        self.ssm.initialize_stationary()
+
     def initialize_state(self):
         # Initialize the AR component as stationary, the rest as approximately
         # diffuse
@@ -944,7 +963,8 @@ class UnobservedComponents(MLEModel):
             offset += self.k_exog
 
         # Initialize the state
-        self.initialize_state()
+        if not self._manual_initialization:
+            self.initialize_state()
 
 
 class UnobservedComponentsResults(MLEResults):
@@ -0,0 +1,154 @@
+"""
+Tests for appending new observations to state space results
+
+License: Simplified-BSD
+"""
+from __future__ import division, absolute_import, print_function
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.testing import assert_allclose, assert_equal
+
+from statsmodels.tsa.arima_process import arma_generate_sample
+from statsmodels.tsa.statespace import sarimax, structural
+
+
+def _endog(nobs=100):
+    np.random.seed(1234)
+    return arma_generate_sample([1, -.5], [1, .3], nobs) + 1
+
+
+def _fit(mod, **kwargs):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return mod.fit(disp=False, **kwargs)
+
+
+specifications = [
+    dict(order=(1, 0, 1)),
+    dict(order=(1, 0, 0), trend='ct'),
+    dict(order=(1, 1, 1), trend='c'),
+    dict(order=(1, 0, 0), seasonal_order=(1, 0, 0, 4)),
+    dict(order=(1, 0, 0), exog=True),
+]
+
+
+@pytest.mark.parametrize('kwargs', specifications)
+def test_sarimax(kwargs):
+    endog = _endog()
+    if kwargs['order'][1] > 0:
+        endog = np.cumsum(endog)
+    kwargs = kwargs.copy()
+    exog = None
+    if kwargs.pop('exog', False):
+        exog = np.sin(np.arange(100.))[:, None]
+    nobs = 80
+
+    mod_full = sarimax.SARIMAX(endog, exog=exog, **kwargs)
+    res_full = _fit(mod_full)
+    params = res_full.params
+
+    mod = sarimax.SARIMAX(endog[:nobs], exog=exog[:nobs] if exog is not None
+                          else None, **kwargs)
+    res = mod.smooth(params)
+    new_exog = exog[nobs:] if exog is not None else None
+    res_full = mod_full.smooth(params)
+
+    # Appending refilters (and smooths) the full dataset
+    res_append = res.append(endog[nobs:], exog=new_exog)
+    assert_equal(res_append.nobs, 100)
+    assert_allclose(res_append.llf, res_full.llf)
+    assert_allclose(res_append.smoothed_state, res_full.smoothed_state)
+    assert_allclose(res_append.forecast(3, exog=new_exog[:3]
+                                        if exog is not None else None),
+                    res_full.forecast(3, exog=new_exog[:3]
+                                      if exog is not None else None))
+
+    # Extending only filters the new observations
+    res_extend = res.extend(endog[nobs:], exog=new_exog)
+    assert_equal(res_extend.nobs, 100 - nobs)
+    assert_allclose(res.llf + res_extend.llf, res_full.llf)
+    assert_allclose(res_extend.llf_obs, res_full.llf_obs[nobs:], atol=1e-12)
+    assert_allclose(res_extend.filtered_state,
+                    res_full.filtered_state[:, nobs:])
+    assert_allclose(res_extend.filtered_state_cov,
+                    res_full.filtered_state_cov[:, :, nobs:], atol=1e-12)
+
+
+def test_refit():
+    endog = _endog()
+    mod = sarimax.SARIMAX(endog[:80], order=(1, 0, 1), trend='c')
+    res = _fit(mod)
+    res_full = _fit(sarimax.SARIMAX(endog, order=(1, 0, 1), trend='c'))
+
+    res_append = res.append(endog[80:], refit=True)
+    assert_allclose(res_append.llf, res_full.llf, rtol=1e-7)
+    assert_allclose(res_append.params, res_full.params, atol=1e-3)
+    # The optimizer is warm-started from the previous parameters
+    assert res_append.mle_retvals['iterations'] <= (
+        res_full.mle_retvals['iterations'])
+
+    res_append = res.append(endog[80:], refit=True,
+                            fit_kwargs=dict(start_params=res_full.params,
+                                            cov_type='none'))
+    assert_allclose(res_append.params, res_full.params, atol=1e-3)
+    assert_equal(res_append.cov_type, 'none')
+
+
+def test_unobserved_components():
+    endog = _endog()
+    kwargs = dict(level='llevel', autoregressive=1)
+    mod_full = structural.UnobservedComponents(endog, **kwargs)
+    params = _fit(mod_full).params
+    res_full = mod_full.smooth(params)
+
+    mod = structural.UnobservedComponents(endog[:80], **kwargs)
+    res = mod.smooth(params)
+    res_append = res.append(endog[80:])
+    assert_allclose(res_append.llf, res_full.llf)
+
+    res_extend = res.extend(endog[80:])
+    assert_allclose(res_extend.loglikelihood_burn, 0)
+    assert_allclose(res.llf + res_extend.llf, res_full.llf)
+    assert_allclose(res_extend.filtered_state,
+                    res_full.filtered_state[:, 80:])
+
+
+def test_pandas():
+    index = pd.date_range(start='2000-01', periods=100, freq='M')
+    endog = pd.Series(_endog(), index=index)
+    mod = sarimax.SARIMAX(endog[:80], order=(1, 0, 0))
+    res = mod.smooth([0.5, 1.])
+
+    res_append = res.append(endog[80:])
+    assert_equal(res_append.model._index.equals(index), True)
+    assert_equal(res_append.forecast(1).index[0],
+                 pd.Timestamp('2008-05-31'))
+
+    res_extend = res.extend(endog[80:])
+    assert_equal(res_extend.model._index.equals(index[80:]), True)
+    assert_allclose(res_extend.forecast(1), res_append.forecast(1))
+
+    with pytest.raises(ValueError):
+        res.append(endog[80:].values)
+
+
+def test_invalid():
+    endog = _endog()
+    exog = np.arange(100.)
+    res = sarimax.SARIMAX(endog[:80], exog=exog[:80],
+                          order=(1, 0, 0)).smooth([0., 0.5, 1.])
+    with pytest.raises(ValueError):
+        res.append(endog[80:])
+
+    res = sarimax.SARIMAX(endog[:80], order=(1, 0, 0)).smooth([0.5, 1.])
+    with pytest.raises(ValueError):
+        res.append(endog[80:], exog=exog[80:])
+
+    res = sarimax.SARIMAX(endog[:80], order=(1, 1, 0),
+                          simple_differencing=True).smooth([0.5, 1.])
+    with pytest.raises(NotImplementedError):
+        res.extend(endog[80:])
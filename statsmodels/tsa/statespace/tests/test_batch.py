@@ -0,0 +1,118 @@
+"""
+Tests for batched estimation of SARIMAX models
+
+License: Simplified-BSD
+"""
+from __future__ import division, absolute_import, print_function
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.testing import assert_allclose, assert_equal
+
+from statsmodels.tsa.arima_process import arma_generate_sample
+from statsmodels.tsa.statespace import tools
+from statsmodels.tsa.statespace.batch import (
+    BatchSARIMAX, constrain_stationary_univariate_batch,
+    unconstrain_stationary_univariate_batch)
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+
+def _series(n_series=4, nobs=80, integrated=False):
+    np.random.seed(1234)
+    series = [arma_generate_sample([1, -.5], [1, .3], nobs + i) + i
+              for i in range(n_series)]
+    if integrated:
+        series = [np.cumsum(y) for y in series]
+    return series
+
+
+specifications = [
+    dict(order=(1, 0, 1)),
+    dict(order=(1, 0, 1), trend='c'),
+    dict(order=(2, 0, 0), measurement_error=True),
+    dict(order=(1, 1, 1), trend='c'),
+    dict(order=(1, 1, 0), seasonal_order=(1, 0, 1, 4)),
+    dict(order=(1, 0, 1), enforce_stationarity=False),
+]
+
+
+@pytest.mark.parametrize('kwargs', specifications)
+def test_loglike(kwargs):
+    series = _series(integrated=kwargs['order'][1] > 0)
+    mod = BatchSARIMAX(series, **kwargs)
+    params = mod.start_params
+    llf = mod.loglike(params)
+    for i, endog in enumerate(series):
+        res_mod = SARIMAX(endog, **kwargs)
+        # the filter in SARIMAX switches to the steady state
+        res_mod.ssm.tolerance = 0
+        assert_allclose(params[i], res_mod.start_params)
+        assert_allclose(llf[i], res_mod.loglike(params[i]), rtol=1e-10)
+
+    # subsets of series
+    index = np.array([2, 0])
+    assert_allclose(mod.loglike(params[index], index=index), llf[index],
+                    rtol=1e-12)
+
+
+@pytest.mark.parametrize('kwargs', specifications[:5])
+def test_fit(kwargs):
+    series = _series(integrated=kwargs['order'][1] > 0)
+    res = SARIMAX.fit_batch(series, **kwargs)
+    assert_equal(len(res), len(series))
+    assert_equal(res.converged.all(), True)
+    for i, endog in enumerate(series):
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            res_single = SARIMAX(endog, **kwargs).fit(disp=False)
+        assert_allclose(res.llf[i], res_single.llf, rtol=1e-7)
+        assert_allclose(res.params[i], res_single.params, atol=5e-3)
+        assert_allclose(res.aic[i], res_single.aic, rtol=1e-7)
+        assert_allclose(res.bic[i], res_single.bic, rtol=1e-7)
+        assert_allclose(res.forecast(3)[i], res_single.forecast(3),
+                        rtol=1e-2, atol=1e-2)
+
+
+def test_transform_params():
+    np.random.seed(0)
+    unconstrained = np.random.randn(5, 3)
+    constrained = constrain_stationary_univariate_batch(unconstrained)
+    for i in range(5):
+        assert_allclose(constrained[i], tools.constrain_stationary_univariate(
+            unconstrained[i]))
+    assert_allclose(unconstrain_stationary_univariate_batch(constrained),
+                    unconstrained)
+
+    mod = BatchSARIMAX(_series(), order=(2, 0, 1),
+                       seasonal_order=(1, 0, 0, 4))
+    unconstrained = np.random.randn(len(_series()), len(mod.param_names))
+    constrained = mod.transform_params(unconstrained)
+    for i in range(len(constrained)):
+        assert_allclose(constrained[i],
+                        mod.model.transform_params(unconstrained[i]))
+    assert_allclose(mod.transform_params(mod.untransform_params(constrained)),
+                    constrained)
+
+
+def test_pandas():
+    series = _series()
+    data = pd.DataFrame({'y%d' % i: y[:80] for i, y in enumerate(series)})
+    res = SARIMAX.fit_batch(data, order=(1, 0, 0))
+    assert_equal(list(res.params.index), list(data.columns))
+    assert_equal(list(res.params.columns), ['ar.L1', 'sigma2'])
+    assert isinstance(res.llf, pd.Series)
+    res2 = SARIMAX.fit_batch(data.values, order=(1, 0, 0))
+    assert_allclose(res.params.values, res2.params)
+    frame = res.summary_frame()
+    assert_allclose(frame['llf'], res2.llf)
+
+
+def test_unsupported():
+    series = _series()
+    with pytest.raises(ValueError):
+        BatchSARIMAX(series, order=(1, 0, 0), trend='ct')
+    with pytest.raises(ValueError):
+        BatchSARIMAX(series, order=(1, 1, 0), simple_differencing=True)
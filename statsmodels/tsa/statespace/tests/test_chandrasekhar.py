@@ -0,0 +1,93 @@
+"""
+Tests for the Chandrasekhar recursions
+
+License: Simplified-BSD
+"""
+from __future__ import division, absolute_import, print_function
+
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose, assert_equal
+
+from statsmodels.tsa.arima_process import arma_generate_sample
+from statsmodels.tsa.statespace import sarimax, dynamic_factor
+
+
+def check_filter_output(mod, params, rtol=1e-7, atol=1e-10):
+    # Disable the switch to the steady state, so that the recursions are
+    # used in all periods
+    mod.ssm.tolerance = 0
+    mod.ssm.filter_chandrasekhar = False
+    res_conv = mod.ssm.filter()
+    llf_conv = mod.loglike(params)
+    mod.ssm.filter_chandrasekhar = True
+    res_chand = mod.ssm.filter()
+    llf_chand = mod.loglike(params)
+    rank = mod.ssm._kalman_filter.chandrasekhar_rank
+
+    assert_allclose(llf_chand, llf_conv, rtol=1e-10)
+    for name in ['forecasts_error_cov', 'predicted_state_cov',
+                 'filtered_state_cov', 'kalman_gain', 'predicted_state',
+                 'filtered_state']:
+        assert_allclose(getattr(res_chand, name), getattr(res_conv, name),
+                        rtol=rtol, atol=atol)
+
+    # complex step differentiation through the recursions
+    mod.ssm.filter_chandrasekhar = False
+    score_conv = mod.score(params, approx_complex_step=True)
+    mod.ssm.filter_chandrasekhar = True
+    score_chand = mod.score(params, approx_complex_step=True)
+    assert_allclose(score_chand, score_conv, rtol=1e-5)
+    return rank
+
+
+def _endog(nobs=200):
+    np.random.seed(1234)
+    return arma_generate_sample([1, -.5, .2], [1, .3], nobs)
+
+
+@pytest.mark.parametrize('kwargs', [
+    dict(order=(2, 0, 1)),
+    dict(order=(1, 0, 0), trend='c', measurement_error=True),
+    dict(order=(1, 0, 1), seasonal_order=(1, 0, 1, 4))])
+def test_sarimax_stationary(kwargs):
+    mod = sarimax.SARIMAX(_endog(), **kwargs)
+    mod.update(mod.start_params)
+    rank = check_filter_output(mod, mod.start_params)
+    # the stationary initialization gives the low-rank factorization
+    assert_equal(rank, 1)
+
+
+def test_sarimax_diffuse():
+    mod = sarimax.SARIMAX(np.cumsum(_endog()), order=(2, 1, 1))
+    mod.update(mod.start_params)
+    rank = check_filter_output(mod, mod.start_params, rtol=1e-6, atol=1e-6)
+    assert_equal(rank, mod.k_states)
+
+
+def test_dynamic_factor():
+    np.random.seed(1234)
+    endog = np.random.randn(200, 2) + np.random.randn(200, 1)
+    mod = dynamic_factor.DynamicFactor(endog, k_factors=1, factor_order=4)
+    mod.update(mod.start_params)
+    rank = check_filter_output(mod, mod.start_params)
+    assert_equal(rank, 2)
+
+
+def test_invalid():
+    endog = _endog()
+    endog[10] = np.nan
+    mod = sarimax.SARIMAX(endog, order=(1, 0, 0), filter_chandrasekhar=True)
+    assert_equal(mod.ssm.filter_chandrasekhar, True)
+    with pytest.raises(RuntimeError):
+        mod.loglike(mod.start_params)
+
+    mod = sarimax.SARIMAX(_endog(), order=(1, 0, 0), trend='ct',
+                          filter_chandrasekhar=True)
+    res = mod.loglike(mod.start_params)
+    assert np.isfinite(res)
+
+    mod = sarimax.SARIMAX(_endog(), exog=np.arange(200), order=(1, 0, 0),
+                          mle_regression=False, filter_chandrasekhar=True)
+    with pytest.raises(RuntimeError):
+        mod.loglike(mod.start_params)
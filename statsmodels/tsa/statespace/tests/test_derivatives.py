@@ -0,0 +1,139 @@
+"""
+Tests for analytic loglikelihood derivatives
+
+License: Simplified-BSD
+"""
+from __future__ import division, absolute_import, print_function
+
+import warnings
+
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose, assert_equal
+
+from statsmodels.tools.numdiff import approx_fprime
+from statsmodels.tsa.arima_process import arma_generate_sample
+from statsmodels.tsa.statespace import sarimax, varmax
+
+
+def _endog(nobs=200):
+    np.random.seed(1234)
+    return arma_generate_sample([1, -.5, .2], [1, .3], nobs)
+
+
+def check_derivatives(mod, params, rtol=1e-5):
+    # Disable the switch to the steady state, so that the complex step
+    # derivatives are computed in the same way
+    mod.ssm.tolerance = 0
+    llf, score_obs, information_matrix = mod.loglike_derivatives(params)
+
+    assert_allclose(llf, mod.loglike(params), rtol=1e-10)
+    assert_allclose(score_obs, mod.score_obs(params, approx_complex_step=True),
+                    rtol=rtol, atol=1e-7)
+    assert_allclose(mod.score(params, method='analytic'),
+                    mod.score(params, approx_complex_step=True), rtol=rtol)
+    assert_equal(information_matrix.shape, (len(params), len(params)))
+    assert_allclose(information_matrix, information_matrix.T)
+    assert np.all(np.linalg.eigvalsh(information_matrix) > 0)
+
+
+specifications = [
+    (dict(order=(2, 0, 1)), False),
+    (dict(order=(1, 0, 0), trend='c', measurement_error=True), False),
+    (dict(order=(1, 1, 1), trend='c'), True),
+    (dict(order=(1, 0, 1), seasonal_order=(1, 0, 1, 4)), False),
+    (dict(order=(1, 0, 1), enforce_stationarity=False), False),
+    (dict(order=(1, 0, 0), exog=np.arange(200.)), False)]
+
+
+@pytest.mark.parametrize('kwargs, integrated', specifications)
+def test_sarimax(kwargs, integrated):
+    endog = np.cumsum(_endog()) if integrated else _endog()
+    if 'trend' in kwargs:
+        endog = endog + 2
+    mod = sarimax.SARIMAX(endog, **kwargs)
+    check_derivatives(mod, mod.start_params)
+
+
+def test_initialization():
+    mod = sarimax.SARIMAX(_endog() + 2, order=(2, 0, 1), trend='c')
+    mod.initialize_stationary()
+    check_derivatives(mod, mod.start_params)
+
+    mod = sarimax.SARIMAX(_endog(), order=(1, 0, 1))
+    mod.initialize_approximate_diffuse(1e4)
+    check_derivatives(mod, mod.start_params)
+
+
+def test_missing():
+    endog = _endog()
+    endog[[0, 10, 11, 100]] = np.nan
+    mod = sarimax.SARIMAX(endog, order=(1, 0, 1))
+    check_derivatives(mod, mod.start_params)
+
+
+def test_steady_state():
+    mod = sarimax.SARIMAX(_endog(), order=(1, 0, 1),
+                          seasonal_order=(1, 0, 0, 4))
+    params = mod.start_params
+    mod.ssm.tolerance = 0
+    llf, score_obs, information_matrix = mod.loglike_derivatives(params)
+    mod.ssm.tolerance = 1e-19
+    llf_ss, score_obs_ss, information_matrix_ss = (
+        mod.loglike_derivatives(params))
+    assert_allclose(llf_ss, llf)
+    assert_allclose(score_obs_ss, score_obs, atol=1e-7)
+    assert_allclose(information_matrix_ss, information_matrix, rtol=1e-7)
+
+
+def test_untransformed():
+    mod = sarimax.SARIMAX(_endog(), order=(2, 0, 1))
+    unconstrained = mod.untransform_params(mod.start_params)
+
+    def loglike(params):
+        return mod.loglike(params, transformed=False)
+    desired = approx_fprime(unconstrained, loglike, centered=True)
+    assert_allclose(mod.score(unconstrained, transformed=False,
+                              method='analytic'), desired, rtol=1e-5)
+    assert_allclose(mod.score(unconstrained, transformed=False), desired,
+                    rtol=1e-5)
+    score_obs = mod.score_obs(unconstrained, transformed=False,
+                              method='analytic')
+    assert_allclose(score_obs.sum(axis=0), desired, rtol=1e-5)
+
+
+def test_hessian():
+    mod = sarimax.SARIMAX(_endog(), order=(2, 0, 1))
+    mod.ssm.tolerance = 0
+    params = mod.start_params
+    assert_allclose(mod.hessian(params, method='analytic'),
+                    mod.hessian(params, method='oim'), rtol=1e-5)
+
+
+def test_fit():
+    endog = _endog()
+    mod = sarimax.SARIMAX(endog, order=(2, 0, 1))
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        res = mod.fit(disp=False)
+        res_approx = mod.fit(disp=False, approx_grad=True)
+    assert_equal(res.mle_retvals['converged'], True)
+    assert_allclose(res.llf, res_approx.llf, rtol=1e-7)
+    assert_allclose(res.params, res_approx.params, atol=1e-3)
+    # The score is zero at the maximum
+    assert_allclose(mod.score(res.params, method='analytic'), 0, atol=1e-2)
+
+
+def test_not_implemented():
+    endog = _endog()
+    mod = sarimax.SARIMAX(endog, exog=np.arange(200.), order=(1, 0, 0),
+                          mle_regression=False)
+    assert_equal(mod._analytic_derivatives, False)
+    with pytest.raises(ValueError):
+        mod.loglike_derivatives(mod.start_params)
+
+    endog = np.c_[endog, np.random.randn(200)]
+    mod = varmax.VARMAX(endog, order=(1, 0))
+    assert_equal(mod._analytic_derivatives, False)
+    with pytest.raises(ValueError):
+        mod.score(mod.start_params, method='analytic')
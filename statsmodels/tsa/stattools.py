@@ -294,7 +294,33 @@ def adfuller(x, maxlag=None, regression="c", autolag='AIC',
             return adfstat, pvalue, usedlag, nobs, critvalues, icbest
 
 
-def acovf(x, unbiased=False, demean=True, fft=False, missing='none'):
+def _lagged_products(x, nlag, fft):
+    """
+    Sums of x[t] * x[t - k] for the lags k = 0, ..., nlag
+
+    With fft True an FFT convolution is used, otherwise direct products,
+    np.dot for a few lags and np.correlate for many.
+    """
+    nobs = len(x)
+    if fft:
+        n = _next_regular(2 * nobs + 1)
+        Frf = np.fft.fft(x, n=n)
+        return np.fft.ifft(Frf * np.conjugate(Frf))[:nlag + 1].real
+    elif nlag < nobs // 10:
+        return np.array([np.dot(x[k:], x[:nobs - k])
+                         for k in range(nlag + 1)])
+    else:
+        return np.correlate(x, x, 'full')[nobs - 1:nobs + nlag]
+
+
+def _use_fft(nobs, nlag):
+    # np.correlate is O(n**2), direct products for the first nlag lags
+    # O(n * nlag) and the FFT O(n log n)
+    return nobs > 250 and nlag + 1 > 4 * np.log2(nobs)
+
+
+def acovf(x, unbiased=False, demean=True, fft=None, missing='none',
+          nlag=None):
     """
     Autocovariance for 1D
 
@@ -306,12 +332,17 @@ def acovf(x, unbiased=False, demean=True, fft=False, missing='none'):
         If True, then denominators is n-k, otherwise n
     demean : bool
         If True, then subtract the mean x from each element of x
-    fft : bool
+    fft : bool or None
         If True, use FFT convolution.  This method should be preferred
-        for long time series.
+        for long time series. If False, the products are computed directly.
+        If None, the faster method is chosen based on the length of x and
+        `nlag`.
     missing : str
         A string in ['none', 'raise', 'conservative', 'drop'] specifying how the NaNs
         are to be treated.
+    nlag : int, optional
+        Largest lag for which the autocovariance is returned. The default
+        is all lags. Direct computation for a few lags is O(n * nlag).
 
     Returns
     -------
@@ -356,24 +387,21 @@ def acovf(x, unbiased=False, demean=True, fft=False, missing='none'):
         xo = x
 
     n = len(x)
+    lag_len = n - 1 if nlag is None else min(int(nlag), n - 1)
+    if fft is None:
+        fft = _use_fft(n, lag_len)
+    lags = np.arange(lag_len + 1)
     if unbiased and deal_with_masked and missing=='conservative':
-        d = np.correlate(notmask_int, notmask_int, 'full')
+        d = _lagged_products(notmask_int.astype(np.float64), lag_len, fft)
+        d = np.round(d)
     elif unbiased:
-        xi = np.arange(1, n + 1)
-        d = np.hstack((xi, xi[:-1][::-1]))
+        d = n - lags
     elif deal_with_masked: #biased and NaNs given and ('drop' or 'conservative')
-        d = notmask_int.sum() * np.ones(2*n-1)
+        d = notmask_int.sum() * np.ones(lag_len + 1)
     else: #biased and no NaNs or missing=='none'
-        d = n * np.ones(2 * n - 1)
+        d = n * np.ones(lag_len + 1)
 
-    if fft:
-        nobs = len(xo)
-        n = _next_regular(2 * nobs + 1)
-        Frf = np.fft.fft(xo, n=n)
-        acov = np.fft.ifft(Frf * np.conjugate(Frf))[:nobs] / d[nobs - 1:]
-        acov = acov.real
-    else:
-        acov = (np.correlate(xo, xo, 'full') / d)[n - 1:]
+    acov = _lagged_products(xo, lag_len, fft) / d
 
     if deal_with_masked and missing=='conservative':
         # restore data for the user
@@ -382,7 +410,6 @@ def acovf(x, unbiased=False, demean=True, fft=False, missing='none'):
     return acov
 
 
-
 def q_stat(x, nobs, type="ljungbox"):
     """
     Return's Ljung-Box Q Statistic
@@ -415,7 +442,7 @@ def q_stat(x, nobs, type="ljungbox"):
 #NOTE: Changed unbiased to False
 #see for example
 # http://www.itl.nist.gov/div898/handbook/eda/section3/autocopl.htm
-def acf(x, unbiased=False, nlags=40, qstat=False, fft=False, alpha=None,
+def acf(x, unbiased=False, nlags=40, qstat=False, fft=None, alpha=None,
         missing='none'):
     """
     Autocorrelation function for 1d arrays.
@@ -431,8 +458,9 @@ def acf(x, unbiased=False, nlags=40, qstat=False, fft=False, alpha=None,
     qstat : bool, optional
         If True, returns the Ljung-Box q statistic for each autocorrelation
         coefficient.  See q_stat for more information.
-    fft : bool, optional
-        If True, computes the ACF via FFT.
+    fft : bool or None, optional
+        If True, computes the ACF via FFT. If None, FFT is used if it is
+        faster than computing the products for the `nlags` lags directly.
     alpha : scalar, optional
         If a number is given, the confidence intervals for the given level are
         returned. For instance if alpha=.05, 95 % confidence intervals are
@@ -458,12 +486,15 @@ def acf(x, unbiased=False, nlags=40, qstat=False, fft=False, alpha=None,
     -----
     The acf at lag 0 (ie., 1) is returned.
 
-    This is based np.correlate which does full convolution. For very long time
-    series it is recommended to use fft convolution instead.
+    Only the autocovariances up to lag `nlags` are computed. For long time
+    series with many lags, fft convolution is used by default.
 
     If unbiased is true, the denominator for the autocovariance is adjusted
     but the autocorrelation is not an unbiased estimtor.
 
+    See `StreamingACF` in `statsmodels.tsa.streaming` for series that are
+    too long to be held in memory.
+
     References
     ----------
     .. [*] Parzen, E., 1963. On spectral analysis with missing observations
@@ -472,7 +503,8 @@ def acf(x, unbiased=False, nlags=40, qstat=False, fft=False, alpha=None,
 
     """
     nobs = len(x)  # should this shrink for missing='drop' and NaNs in x?
-    avf = acovf(x, unbiased=unbiased, demean=True, fft=fft, missing=missing)
+    avf = acovf(x, unbiased=unbiased, demean=True, fft=fft, missing=missing,
+                nlag=nlags)
     acf = avf[:nlags + 1] / avf[0]
     if not (qstat or alpha):
         return acf
@@ -494,7 +526,7 @@ def acf(x, unbiased=False, nlags=40, qstat=False, fft=False, alpha=None,
 
 
 def pacf_yw(x, nlags=40, method='unbiased'):
-    '''Partial autocorrelation estimated with non-recursive yule_walker
+    '''Partial autocorrelation estimated with the Yule-Walker equations
 
     Parameters
     ----------
@@ -512,13 +544,18 @@ def pacf_yw(x, nlags=40, method='unbiased'):
 
     Notes
     -----
-    This solves yule_walker for each desired lag and contains
-    currently duplicate calculations.
+    The partial autocorrelations are the last coefficients of the
+    yule_walker estimates for each lag. They are computed from a single
+    autocovariance function with the Levinson-Durbin recursion.
     '''
-    pacf = [1.]
-    for k in range(1, nlags + 1):
-        pacf.append(yule_walker(x, k, method=method)[0][-1])
-    return np.array(pacf)
+    method = str(method).lower()
+    if method not in ('unbiased', 'mle'):
+        raise ValueError("ACF estimation method must be 'unbiased' or 'MLE'")
+    if nlags == 0:
+        return np.array([1.])
+    x = np.asarray(x, dtype=np.float64)
+    acv = acovf(x, unbiased=(method == 'unbiased'), nlag=nlags)
+    return levinson_durbin(acv, nlags=nlags, isacov=True)[2]
 
 
 #NOTE: this is incorrect.
@@ -602,13 +639,13 @@ def pacf(x, nlags=40, method='ywunbiased', alpha=None):
     elif method in ['ywm', 'ywmle', 'yw_mle']:
         ret = pacf_yw(x, nlags=nlags, method='mle')
     elif method in ['ld', 'ldu', 'ldunbiase', 'ld_unbiased']:
-        acv = acovf(x, unbiased=True)
+        acv = acovf(x, unbiased=True, nlag=nlags)
         ld_ = levinson_durbin(acv, nlags=nlags, isacov=True)
         #print 'ld', ld_
         ret = ld_[2]
     # inconsistent naming with ywmle
     elif method in ['ldb', 'ldbiased', 'ld_biased']:
-        acv = acovf(x, unbiased=False)
+        acv = acovf(x, unbiased=False, nlag=nlags)
         ld_ = levinson_durbin(acv, nlags=nlags, isacov=True)
         ret = ld_[2]
     else:
@@ -765,7 +802,7 @@ def levinson_durbin(s, nlags=10, isacov=False):
     if isacov:
         sxx_m = s
     else:
-        sxx_m = acovf(s)[:order + 1]  # not tested
+        sxx_m = acovf(s, nlag=order)  # not tested
 
     phi = np.zeros((order + 1, order + 1), 'd')
     sig = np.zeros(order + 1)
@@ -1075,8 +1112,102 @@ def _safe_arma_fit(y, order, model_kw, trend, fit_kw, start_params=None):
         return
 
 
+def _arma_fit_ic(order, y, model_kw, trend, fit_kw, ic):
+    """
+    Fit an ARMA model and return the requested information criteria
+    """
+    if order == (0, 0) and trend == 'nc':
+        return None
+    mod = _safe_arma_fit(y, order, model_kw, trend, fit_kw)
+    if mod is None:
+        return [np.nan] * len(ic)
+    return [getattr(mod, criteria) for criteria in ic]
+
+
+def _order_select_grid(func, orders, args=(), n_jobs=1, prune=None):
+    """
+    Evaluate information criteria over a grid of model orders
+
+    Parameters
+    ----------
+    func : callable
+        Called as ``func(order, *args)``. Returns a sequence of information
+        criteria (NaN if the model could not be estimated), or None if the
+        order is not a valid model. The first criterion is used for pruning.
+    orders : list of tuple
+        Candidate orders.
+    args : tuple
+        Additional arguments passed to `func`.
+    n_jobs : int
+        Number of parallel jobs. If not 1, the candidates of each wave are
+        fit using `statsmodels.tools.parallel.parallel_func`.
+    prune : float, optional
+        If given, an order is only evaluated if at least one of its
+        predecessors (the orders with one fewer lag in a single dimension)
+        was evaluated and came within `prune` of the best criterion found so
+        far.
+
+    Returns
+    -------
+    values : dict
+        Maps each evaluated order to the return value of `func`.
+    pruned : set
+        The orders that were not evaluated.
+
+    Notes
+    -----
+    Orders are fit in waves of equal total lag length, so that the models of
+    each wave can be fit in parallel and the pruning decisions do not depend
+    on `n_jobs`.
+    """
+    if n_jobs != 1:
+        from statsmodels.tools.parallel import parallel_func
+        parallel, p_func, n_jobs = parallel_func(func, n_jobs, verbose=0)
+
+    waves = {}
+    for order in orders:
+        waves.setdefault(sum(order), []).append(tuple(order))
+
+    values = {}
+    pruned = set()
+    best = np.inf
+    for total in sorted(waves):
+        wave = []
+        for order in waves[total]:
+            if prune is None:
+                wave.append(order)
+                continue
+            parents = []
+            for i in range(len(order)):
+                if order[i] > 0:
+                    parent = order[:i] + (order[i] - 1,) + order[i + 1:]
+                    if parent in values or parent in pruned:
+                        parents.append(parent)
+            # failed fits (NaN) do not count against their successors
+            promising = [parent for parent in parents
+                         if parent not in pruned and
+                         (values[parent] is None or
+                          not values[parent][0] > best + prune)]
+            if not parents or promising:
+                wave.append(order)
+            else:
+                pruned.add(order)
+
+        if n_jobs == 1:
+            res = [func(order, *args) for order in wave]
+        else:
+            res = parallel(p_func(order, *args) for order in wave)
+        for order, value in zip(wave, res):
+            values[order] = value
+            if value is not None and np.isfinite(value[0]):
+                best = min(best, value[0])
+
+    return values, pruned
+
+
 def arma_order_select_ic(y, max_ar=4, max_ma=2, ic='bic', trend='c',
-                         model_kw={}, fit_kw={}):
+                         model_kw={}, fit_kw={}, n_jobs=1, prune=None,
+                         fit_best=False):
     """
     Returns information criteria for many ARMA models
 
@@ -1097,13 +1228,25 @@ def arma_order_select_ic(y, max_ar=4, max_ma=2, ic='bic', trend='c',
         Keyword arguments to be passed to the ``ARMA`` model
     fit_kw : dict
         Keyword arguments to be passed to ``ARMA.fit``.
+    n_jobs : int
+        Number of processes used to fit the candidate models. -1 uses all
+        available cores. Requires joblib. Default is 1, no parallelism.
+    prune : float, optional
+        If given, the orders are searched in increasing total number of lags
+        and a model is not fit if each of the models with one lag less has a
+        criterion (the first one in `ic`) that is more than `prune` above the
+        best criterion found so far. Pruned entries are NaN.
+    fit_best : bool
+        If True, the models with the minimum information criteria are
+        returned as ``<ic>_min_results``. Default is False.
 
     Returns
     -------
     obj : Results object
         Each ic is an attribute with a DataFrame for the results. The AR order
         used is the row index. The ma order used is the column index. The
-        minimum orders are available as ``ic_min_order``.
+        minimum orders are available as ``ic_min_order``, and the pruned
+        orders as ``pruned``.
 
     Examples
     --------
@@ -1130,7 +1273,12 @@ def arma_order_select_ic(y, max_ar=4, max_ma=2, ic='bic', trend='c',
     function computes the full exact MLE estimate of each model and can be,
     therefore a little slow. An implementation using approximate estimates
     will be provided in the future. In the meantime, consider passing
-    {method : 'css'} to fit_kw.
+    {method : 'css'} to fit_kw, fitting the models in parallel with `n_jobs`
+    or skipping unpromising orders with `prune`.
+
+    When fitting in parallel, the data is converted to an ndarray once, so
+    that joblib can share it between the worker processes as a memory map
+    instead of sending a copy with each model.
     """
     from pandas import DataFrame
 
@@ -1141,21 +1289,15 @@ def arma_order_select_ic(y, max_ar=4, max_ma=2, ic='bic', trend='c',
     elif not isinstance(ic, (list, tuple)):
         raise ValueError("Need a list or a tuple for ic if not a string.")
 
-    results = np.zeros((len(ic), max_ar + 1, max_ma + 1))
-
-    for ar in ar_range:
-        for ma in ma_range:
-            if ar == 0 and ma == 0 and trend == 'nc':
-                results[:, ar, ma] = np.nan
-                continue
-
-            mod = _safe_arma_fit(y, (ar, ma), model_kw, trend, fit_kw)
-            if mod is None:
-                results[:, ar, ma] = np.nan
-                continue
+    orders = [(ar, ma) for ar in ar_range for ma in ma_range]
+    values, pruned = _order_select_grid(
+        _arma_fit_ic, orders, args=(np.asarray(y), model_kw, trend, fit_kw, ic),
+        n_jobs=n_jobs, prune=prune)
 
-            for i, criteria in enumerate(ic):
-                results[i, ar, ma] = getattr(mod, criteria)
+    results = np.zeros((len(ic), max_ar + 1, max_ma + 1)) * np.nan
+    for (ar, ma), value in iteritems(values):
+        if value is not None:
+            results[:, ar, ma] = value
 
     dfs = [DataFrame(res, columns=ma_range, index=ar_range) for res in results]
 
@@ -1167,6 +1309,16 @@ def arma_order_select_ic(y, max_ar=4, max_ma=2, ic='bic', trend='c',
         mins = np.where(result.min().min() == result)
         min_res.update({i + '_min_order' : (mins[0][0], mins[1][0])})
     res.update(min_res)
+    res['pruned'] = sorted(pruned)
+
+    if fit_best:
+        fitted = {}
+        for criteria in ic:
+            order = res[criteria + '_min_order']
+            if order not in fitted:
+                fitted[order] = _safe_arma_fit(y, order, model_kw, trend,
+                                               fit_kw)
+            res[criteria + '_min_results'] = fitted[order]
 
     return Bunch(**res)
 
@@ -0,0 +1,264 @@
+"""
+Online autocorrelation analysis of unbounded time series
+
+The accumulator in this module keeps the sums of the lagged products
+x[t] * x[t - k] for k = 0, ..., maxlag together with the first and the last
+maxlag observations. This is enough to compute the demeaned sample
+autocovariances at any time. Memory requirements are O(maxlag) and do not
+depend on the number of observations.
+
+License: BSD-3
+"""
+from __future__ import division
+
+import numpy as np
+
+from statsmodels.tools.sm_exceptions import MissingDataError
+from statsmodels.tsa.stattools import (_lagged_products, _use_fft,
+                                       levinson_durbin, q_stat)
+
+__all__ = ['StreamingACF']
+
+
+class StreamingACF(object):
+    """
+    Autocovariance, autocorrelation and Ljung-Box statistics from chunks
+
+    The observations of the series are passed in order, in chunks of any
+    length, with ``update``. The statistics are available after every
+    update and are identical to those of `acovf`, `acf`, `pacf` and
+    `q_stat` for the observations seen so far.
+
+    Parameters
+    ----------
+    maxlag : int
+        Largest lag for which the statistics are available.
+    demean : bool
+        If True, the autocovariances are computed for the series minus its
+        mean.
+
+    Attributes
+    ----------
+    nobs : int
+        Number of observations accumulated so far.
+
+    See Also
+    --------
+    statsmodels.tsa.stattools.acovf
+    statsmodels.tsa.stattools.acf
+    statsmodels.tsa.stattools.pacf
+
+    Notes
+    -----
+    The observations are shifted by the first observation before the
+    products are accumulated, which avoids the loss of precision in the
+    demeaning if the mean is large relative to the standard deviation.
+
+    Examples
+    --------
+    >>> acf_online = StreamingACF(maxlag=20)
+    >>> for chunk in chunks:
+    ...     acf_online.update(chunk)
+    ...     qstat, pvalues = acf_online.q_stat(10)
+    """
+
+    def __init__(self, maxlag=40, demean=True):
+        maxlag = int(maxlag)
+        if maxlag < 0:
+            raise ValueError('maxlag must be a non-negative integer')
+        self.maxlag = maxlag
+        self.demean = demean
+        self.nobs = 0
+        self._shift = None
+        self._sum = 0.
+        self._products = np.zeros(maxlag + 1)
+        self._head = np.zeros(0)
+        self._tail = np.zeros(0)
+
+    @classmethod
+    def from_chunks(cls, chunks, maxlag=40, demean=True):
+        """
+        Create the accumulator from an iterable of chunks
+
+        Parameters
+        ----------
+        chunks : iterable
+            Consecutive parts of the series as 1-d arrays.
+        maxlag : int
+            Largest lag for which the statistics are available.
+        demean : bool
+            If True, the autocovariances are computed for the demeaned
+            series.
+
+        Returns
+        -------
+        acf_online : StreamingACF
+        """
+        acf_online = cls(maxlag=maxlag, demean=demean)
+        for chunk in chunks:
+            acf_online.update(chunk)
+        return acf_online
+
+    def update(self, x):
+        """
+        Add the next observations of the series
+
+        Parameters
+        ----------
+        x : array_like
+            1-d array of consecutive observations.
+
+        Returns
+        -------
+        self : StreamingACF
+        """
+        x = np.asarray(x, dtype=np.float64)
+        if x.ndim == 0:
+            x = x[None]
+        if x.ndim != 1:
+            raise ValueError('x must be 1d. Got %d dims.' % x.ndim)
+        if not np.isfinite(x).all():
+            raise MissingDataError('x contains inf or nans')
+        if len(x) == 0:
+            return self
+        if self._shift is None:
+            self._shift = x[0] if self.demean else 0.
+
+        z = x - self._shift
+        tail = self._tail
+        buf = np.concatenate((tail, z))
+        # products x[t] * x[t - k] with t in the new chunk are the products
+        # of the buffer minus those within the previous tail
+        nlag = min(self.maxlag, len(buf) - 1)
+        products = _lagged_products(buf, nlag, _use_fft(len(buf), nlag))
+        if len(tail):
+            nlag_tail = min(nlag, len(tail) - 1)
+            products[:nlag_tail + 1] -= _lagged_products(
+                tail, nlag_tail, _use_fft(len(tail), nlag_tail))
+        self._products[:nlag + 1] += products
+
+        maxlag = self.maxlag
+        if len(self._head) < maxlag:
+            self._head = np.concatenate((self._head, z[:maxlag]))[:maxlag]
+        self._tail = buf[max(len(buf) - maxlag, 0):] if maxlag else buf[:0]
+        self._sum += z.sum()
+        self.nobs += len(z)
+        return self
+
+    def _check_nobs(self):
+        if self.nobs == 0:
+            raise ValueError('no data has been added, use `update` first')
+
+    def _nlag(self, nlag):
+        if nlag is None:
+            nlag = self.maxlag
+        elif nlag > self.maxlag:
+            raise ValueError('nlag cannot be larger than maxlag=%d'
+                             % self.maxlag)
+        return min(int(nlag), self.nobs - 1)
+
+    @property
+    def mean(self):
+        """Mean of the observations"""
+        self._check_nobs()
+        return self._shift + self._sum / self.nobs
+
+    def acovf(self, unbiased=False, nlag=None):
+        """
+        Autocovariance function
+
+        Parameters
+        ----------
+        unbiased : bool
+            If True, then denominators is n-k, otherwise n.
+        nlag : int, optional
+            Largest lag, the default is maxlag.
+
+        Returns
+        -------
+        acovf : ndarray
+            Autocovariances for the lags 0 to nlag.
+        """
+        self._check_nobs()
+        nobs = self.nobs
+        nlag = self._nlag(nlag)
+        lags = np.arange(nlag + 1)
+        acov = self._products[:nlag + 1].copy()
+        if self.demean:
+            # sum_t (z[t] - m) (z[t-k] - m) from the sums of products, using
+            # the sums of z[t] for t >= k and for t <= n - 1 - k
+            mean = self._sum / nobs
+            head = np.concatenate(([0.], np.cumsum(self._head[:nlag])))
+            tail = np.concatenate(([0.],
+                                   np.cumsum(self._tail[::-1][:nlag])))
+            sum_lead = self._sum - head
+            sum_lag = self._sum - tail
+            acov -= mean * (sum_lead + sum_lag)
+            acov += (nobs - lags) * mean**2
+        d = nobs - lags if unbiased else nobs
+        return acov / d
+
+    def acf(self, nlags=None, unbiased=False):
+        """
+        Autocorrelation function
+
+        Parameters
+        ----------
+        nlags : int, optional
+            Largest lag, the default is maxlag.
+        unbiased : bool
+            If True, then denominators for autocovariance are n-k,
+            otherwise n.
+
+        Returns
+        -------
+        acf : ndarray
+            Autocorrelations for the lags 0 to nlags.
+        """
+        acov = self.acovf(unbiased=unbiased, nlag=nlags)
+        return acov / acov[0]
+
+    def pacf(self, nlags=None, method='unbiased'):
+        """
+        Partial autocorrelation function
+
+        Parameters
+        ----------
+        nlags : int, optional
+            Largest lag, the default is maxlag.
+        method : {'unbiased', 'mle'}
+            Denominators n-k or n in the autocovariances, which correspond
+            to the methods 'ywunbiased' (or 'ld') and 'ywmle' (or 'ldb') of
+            `pacf`.
+
+        Returns
+        -------
+        pacf : ndarray
+            Partial autocorrelations for the lags 0 to nlags, computed with
+            the Levinson-Durbin recursion.
+        """
+        if method not in ('unbiased', 'mle'):
+            raise ValueError("method must be 'unbiased' or 'mle'")
+        acov = self.acovf(unbiased=(method == 'unbiased'), nlag=nlags)
+        if len(acov) == 1:
+            return np.array([1.])
+        return levinson_durbin(acov, nlags=len(acov) - 1, isacov=True)[2]
+
+    def q_stat(self, nlags=None):
+        """
+        Ljung-Box Q statistics
+
+        Parameters
+        ----------
+        nlags : int, optional
+            Largest lag, the default is maxlag.
+
+        Returns
+        -------
+        qstat : ndarray
+            Ljung-Box Q statistics for the lags 1 to nlags.
+        pvalues : ndarray
+            P-values of the Q statistics.
+        """
+        acf = self.acf(nlags=nlags)
+        return q_stat(acf[1:], nobs=self.nobs)
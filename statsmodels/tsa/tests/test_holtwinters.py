@@ -4,9 +4,12 @@ Created on Wed Jul 12 09:44:01 2017
 @author: tvzyl
 """
 
+import warnings
+
 import numpy as np
 import pandas as pd
-from numpy.testing import assert_almost_equal, assert_equal
+import pytest
+from numpy.testing import assert_almost_equal, assert_equal, assert_allclose
 from statsmodels.tsa.holtwinters import (ExponentialSmoothing,
                                          SimpleExpSmoothing, Holt)
 from pandas import DataFrame, DatetimeIndex
@@ -224,3 +227,94 @@ class TestHoltWinters(object):
 
     def test_raises(self):
         pass
+
+
+def _batch_series(n_series=4, nobs=36):
+    np.random.seed(1234)
+    season = np.tile([2., 0., -1., -1.], nobs // 4)
+    return np.array([50 + np.cumsum(np.random.rand(nobs)) + (i + 1) * season
+                     for i in range(n_series)])
+
+
+batch_specifications = [
+    dict(),
+    dict(trend='add'),
+    dict(trend='mul', damped=True),
+    dict(trend='add', seasonal='add', seasonal_periods=4),
+    dict(trend='add', damped=True, seasonal='mul', seasonal_periods=4),
+    dict(trend='mul', seasonal='mul', seasonal_periods=4),
+    dict(seasonal='add', seasonal_periods=4),
+]
+
+
+@pytest.mark.parametrize('kwargs', batch_specifications)
+def test_fit_batch(kwargs):
+    series = _batch_series()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        res = ExponentialSmoothing.fit_batch(series.T, **kwargs)
+        res_single = [ExponentialSmoothing(y, **kwargs).fit() for y in series]
+    assert_equal(len(res), len(series))
+    rtol = 1e-6
+    for i, fit in enumerate(res_single):
+        assert_allclose(res.sse[i], fit.sse, rtol=rtol)
+        assert_allclose(res.aic[i], fit.aic, rtol=rtol)
+        assert_allclose(res.fittedvalues[i], fit.fittedvalues, rtol=rtol)
+        assert_allclose(res.level[i], fit.level, rtol=rtol)
+        assert_allclose(res.params[i, 0], fit.params['smoothing_level'],
+                        rtol=rtol)
+        if not kwargs.get('damped', False):
+            assert_allclose(res.forecast(5)[i], fit.forecast(5), rtol=rtol)
+
+
+def test_fit_batch_fixed():
+    series = _batch_series()
+    res = ExponentialSmoothing.fit_batch(series.T, trend='add',
+                                         smoothing_level=0.8,
+                                         smoothing_slope=0.2,
+                                         optimized=False)
+    assert_equal(res.mle_retvals, None)
+    for i, y in enumerate(series):
+        fit = ExponentialSmoothing(y, trend='add').fit(
+            smoothing_level=0.8, smoothing_slope=0.2, optimized=False)
+        assert_allclose(res.sse[i], fit.sse)
+        assert_allclose(res.slope[i], fit.slope)
+        assert_allclose(res.forecast(3)[i], fit.forecast(3))
+
+    # the sum of squared errors of all series for given parameters
+    p = np.zeros((len(series), 6))
+    p[:, :2] = [0.8, 0.2]
+    p[:, 3] = series[:, 0]
+    p[:, 4] = series[:, 1] - series[:, 0]
+    p[:, 5] = 1.
+    from statsmodels.tsa.holtwinters import BatchExponentialSmoothing
+    mod = BatchExponentialSmoothing(series.T, trend='add')
+    assert_allclose(mod.sse(p), res.sse)
+    assert_allclose(mod.sse(p[[2, 0]], index=[2, 0]), res.sse[[2, 0]])
+
+
+def test_fit_batch_pandas():
+    series = _batch_series()
+    data = pd.DataFrame(series.T, columns=['a', 'b', 'c', 'd'])
+    res = ExponentialSmoothing.fit_batch(data, trend='add', seasonal='add',
+                                         seasonal_periods=4)
+    assert isinstance(res.sse, pd.Series)
+    assert_equal(list(res.params.index), ['a', 'b', 'c', 'd'])
+    assert_equal(list(res.params.columns[:4]),
+                 ['smoothing_level', 'smoothing_slope', 'smoothing_seasonal',
+                  'damping_slope'])
+    assert_equal(res.forecast(2).shape, (4, 2))
+    res2 = ExponentialSmoothing.fit_batch(series.T, trend='add',
+                                          seasonal='add', seasonal_periods=4)
+    assert_allclose(res.sse.values, res2.sse)
+
+
+def test_fit_batch_raises():
+    series = _batch_series()
+    with pytest.raises(ValueError):
+        ExponentialSmoothing.fit_batch([series[0], series[1, 1:]])
+    with pytest.raises(NotImplementedError):
+        ExponentialSmoothing.fit_batch(np.c_[series.T, -series[0]],
+                                       trend='mul')
+    with pytest.raises(NotImplementedError):
+        ExponentialSmoothing.fit_batch(series.T, seasonal='add')
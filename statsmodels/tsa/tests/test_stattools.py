@@ -498,6 +498,33 @@ def test_acovf_fft_vs_convolution():
             F2 = acovf(q, demean=demean, unbiased=unbiased, fft=False)
             assert_almost_equal(F1, F2, decimal=7)
 
+
+@pytest.mark.parametrize('missing', ['none', 'conservative', 'drop'])
+@pytest.mark.parametrize('unbiased', [True, False])
+def test_acovf_nlag(missing, unbiased):
+    np.random.seed(1)
+    q = np.random.normal(size=2000)
+    q[[10, 500]] = np.nan if missing != 'none' else q[[10, 500]]
+    full = acovf(q, unbiased=unbiased, missing=missing, fft=False)
+    for nlag, fft in [(5, False), (5, None), (300, True), (300, None)]:
+        res = acovf(q, unbiased=unbiased, missing=missing, fft=fft,
+                    nlag=nlag)
+        assert_equal(len(res), nlag + 1)
+        assert_allclose(res, full[:nlag + 1], rtol=1e-8, atol=1e-12)
+
+
+def test_pacf_yw_levinson_durbin():
+    np.random.seed(1)
+    x = np.cumsum(np.random.normal(size=300)) * 0.1
+    x += np.random.normal(size=300)
+    from statsmodels.regression.linear_model import yule_walker
+    for method in ['unbiased', 'mle']:
+        res = pacf_yw(x, nlags=10, method=method)
+        expected = [1.] + [yule_walker(x, k, method=method)[0][-1]
+                           for k in range(1, 11)]
+        assert_allclose(res, expected, rtol=1e-8)
+    assert_raises(ValueError, pacf_yw, x, 10, 'ols')
+
 @pytest.mark.slow
 def test_arma_order_select_ic():
     # smoke test, assumes info-criteria are right
@@ -540,6 +567,38 @@ def test_arma_order_select_ic():
     assert_(res.aic.columns.equals(aic.columns))
     assert_equal(res.aic_min_order, (1, 2))
 
+
+def test_arma_order_select_ic_prune():
+    from statsmodels.tsa.arima_process import arma_generate_sample
+    np.random.seed(2014)
+    y = arma_generate_sample(np.r_[1, -.75, .25], np.r_[1, .65, .35], 250)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        res = arma_order_select_ic(y, max_ar=3, max_ma=2, ic=['aic', 'bic'],
+                                   trend='nc')
+        # parallel fits give the same table
+        res_par = arma_order_select_ic(y, max_ar=3, max_ma=2, ic='aic',
+                                       trend='nc', n_jobs=2, prune=1e10)
+        res_prune = arma_order_select_ic(y, max_ar=3, max_ma=2,
+                                         ic=['aic', 'bic'], trend='nc',
+                                         prune=10, fit_best=True)
+
+    assert_equal(res.pruned, [])
+    assert_equal(res_par.pruned, [])
+    assert_almost_equal(res_par.aic.values, res.aic.values)
+
+    assert_(len(res_prune.pruned) > 0)
+    assert_equal(res_prune.aic_min_order, res.aic_min_order)
+    for ar, ma in res_prune.pruned:
+        assert_(np.isnan(res_prune.aic.loc[ar, ma]))
+        # pruned models are worse than the best model by more than 10
+        assert_(res.aic.loc[ar, ma] > res.aic.min().min() + 10)
+    mask = np.isnan(res_prune.aic.values)
+    assert_almost_equal(res_prune.aic.values[~mask], res.aic.values[~mask])
+    assert_almost_equal(res_prune.aic_min_results.aic, res.aic.min().min())
+    assert_almost_equal(res_prune.bic_min_results.bic, res.bic.min().min())
+
+
 def test_arma_order_select_ic_failure():
     # this should trigger an SVD convergence failure, smoke test that it
     # returns, likely platform dependent failure...
@@ -0,0 +1,77 @@
+"""
+Tests for the online autocorrelation accumulator
+"""
+import numpy as np
+from numpy.testing import assert_allclose, assert_equal
+import pytest
+
+from statsmodels.tools.sm_exceptions import MissingDataError
+from statsmodels.tsa.stattools import acf, acovf, pacf, q_stat
+from statsmodels.tsa.streaming import StreamingACF
+
+
+def _make_data(nobs=3000):
+    np.random.seed(98765)
+    # large mean relative to the variance and persistence
+    trend = np.cumsum(np.random.randn(nobs)) * 0.1
+    return 1000 + trend + np.random.randn(nobs)
+
+
+@pytest.mark.parametrize('unbiased', [True, False])
+def test_chunks(unbiased):
+    x = _make_data()
+    maxlag = 30
+    acf_online = StreamingACF(maxlag=maxlag)
+    pos = 0
+    for size in [2, 3, 10, 7, 1, 500, 2477]:
+        acf_online.update(x[pos:pos + size])
+        pos += size
+        nlag = min(maxlag, pos - 1)
+        res = acf_online.acovf(unbiased=unbiased)
+        expected = acovf(x[:pos], unbiased=unbiased, fft=False)
+        assert_equal(acf_online.nobs, pos)
+        assert_allclose(res, expected[:nlag + 1], rtol=1e-8, atol=1e-12)
+    assert_allclose(acf_online.mean, x.mean(), rtol=1e-12)
+
+
+def test_statistics():
+    x = _make_data()
+    acf_online = StreamingACF.from_chunks(np.array_split(x, 7), maxlag=100)
+
+    res1, qstat, pvalues = acf(x, nlags=100, qstat=True)
+    assert_allclose(acf_online.acf(), res1, rtol=1e-8)
+    assert_allclose(acf_online.acf(nlags=10), res1[:11], rtol=1e-8)
+    res = acf_online.q_stat(nlags=20)
+    assert_allclose(res[0], qstat[:20], rtol=1e-8)
+    assert_allclose(res[1], pvalues[:20], rtol=1e-7, atol=1e-300)
+    assert_allclose(acf_online.q_stat()[0], q_stat(res1[1:], len(x))[0],
+                    rtol=1e-8)
+
+    assert_allclose(acf_online.pacf(nlags=20), pacf(x, 20, method='ld'),
+                    rtol=1e-7)
+    assert_allclose(acf_online.pacf(nlags=20, method='mle'),
+                    pacf(x, 20, method='ldb'), rtol=1e-7)
+
+
+def test_no_demean():
+    x = _make_data(500)
+    acf_online = StreamingACF(maxlag=5, demean=False)
+    for chunk in np.array_split(x, 3):
+        acf_online.update(chunk)
+    assert_allclose(acf_online.acovf(), acovf(x, demean=False)[:6],
+                    rtol=1e-12)
+
+
+def test_raises():
+    acf_online = StreamingACF(maxlag=5)
+    with pytest.raises(ValueError):
+        acf_online.acf()
+    with pytest.raises(MissingDataError):
+        acf_online.update([1., np.nan])
+    acf_online.update(np.random.randn(20))
+    with pytest.raises(ValueError):
+        acf_online.acf(nlags=6)
+    with pytest.raises(ValueError):
+        acf_online.pacf(method='ols')
+    with pytest.raises(ValueError):
+        acf_online.update(np.ones((3, 2)))
@@ -777,6 +777,37 @@ def freq_to_period(freq):
                          "think this is in error.".format(freq))
 
 
+def _stack_series(endogs):
+    """
+    Stack series into an array padded with leading nans
+
+    Returns the (n_series, nobs) array, the index of the first observation
+    of each series and the series labels, or None if there are no labels.
+    """
+    names = None
+    if isinstance(endogs, pd.DataFrame):
+        names = endogs.columns
+        series = [endogs[col].values for col in endogs.columns]
+    elif isinstance(endogs, dict):
+        names = pd.Index(list(endogs.keys()))
+        series = [np.asarray(endogs[key]) for key in names]
+    elif isinstance(endogs, np.ndarray) and endogs.ndim == 2:
+        series = list(endogs.T)
+    else:
+        series = [np.asarray(endog) for endog in endogs]
+
+    series = [np.asarray(endog, dtype=np.float64).squeeze()
+              for endog in series]
+    if any(endog.ndim != 1 for endog in series):
+        raise ValueError('each series needs to be one dimensional')
+    nobs = max(len(endog) for endog in series)
+    start = np.array([nobs - len(endog) for endog in series], dtype=np.int64)
+    endog = np.full((len(series), nobs), np.nan)
+    for i, values in enumerate(series):
+        endog[i, start[i]:] = values
+    return endog, start, names
+
+
 __all__ = ['lagmat', 'lagmat2ds','add_trend', 'duplication_matrix',
            'elimination_matrix', 'commutation_matrix',
            'vec', 'vech', 'unvec', 'unvech']
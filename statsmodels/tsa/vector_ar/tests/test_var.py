@@ -386,6 +386,17 @@ class TestVARResults(CheckIRF, CheckFEVD):
         model = VAR(self.model.endog)
         model.select_order()
 
+    def test_select_order_parallel(self):
+        model = VAR(self.model.endog)
+        desired = model.select_order(4, trend='ct')
+        with warnings.catch_warnings():
+            # joblib may not be installed
+            warnings.simplefilter('ignore')
+            result = model.select_order(4, trend='ct', n_jobs=2)
+        assert_equal(result.selected_orders, desired.selected_orders)
+        for k in desired.ics:
+            assert_almost_equal(result.ics[k], desired.ics[k])
+
     def test_is_stable(self):
         # may not necessarily be true for other datasets
         assert(self.res.is_stable(verbose=True))
@@ -710,7 +710,7 @@ class VAR(tsbase.TimeSeriesModel):
                             dates=self.data.dates, model=self, exog=self.exog)
         return VARResultsWrapper(varfit)
 
-    def select_order(self, maxlags=None, trend="c"):
+    def select_order(self, maxlags=None, trend="c", n_jobs=1):
         """
         Compute lag order selections based on each of the available information
         criteria
@@ -724,6 +724,9 @@ class VAR(tsbase.TimeSeriesModel):
             * "c" - constant term
             * "ct" - constant and linear term
             * "ctt" - constant, linear, and quadratic term
+        n_jobs : int
+            Number of processes used to estimate the candidate models. -1
+            uses all available cores. Requires joblib. Default is 1.
 
         Returns
         -------
@@ -738,12 +741,13 @@ class VAR(tsbase.TimeSeriesModel):
 
         ics = defaultdict(list)
         p_min = 0 if self.exog is not None or trend != "nc" else 1
-        for p in range(p_min, maxlags + 1):
-            # exclude some periods to same amount of data used for each lag
-            # order
-            result = self._estimate_var(p, offset=maxlags-p, trend=trend)
-
-            for k, v in iteritems(result.info_criteria):
+        # exclude some periods to same amount of data used for each lag
+        # order
+        criteria = _select_order_criteria(self, range(p_min, maxlags + 1),
+                                          maxlags, trend, n_jobs)
+        self.k_trend = util.get_trendorder(trend)
+        for info_criteria in criteria:
+            for k, v in iteritems(info_criteria):
                 ics[k].append(v)
 
         selected_orders = dict((k, np.array(v).argmin() + p_min)
@@ -752,6 +756,26 @@ class VAR(tsbase.TimeSeriesModel):
         return LagOrderResults(ics, selected_orders, vecm=False)
 
 
+def _info_criteria(model, lags, offset, trend):
+    return model._estimate_var(lags, offset=offset, trend=trend).info_criteria
+
+
+def _select_order_criteria(model, lags, maxlags, trend, n_jobs=1):
+    """
+    Information criteria of the VAR models with the given lag orders
+
+    Each model is estimated on the observations after the first `maxlags`
+    periods. If `n_jobs` is not 1, the models are estimated in parallel.
+    """
+    if n_jobs == 1:
+        return [_info_criteria(model, p, maxlags - p, trend) for p in lags]
+
+    from statsmodels.tools.parallel import parallel_func
+    parallel, p_func, n_jobs = parallel_func(_info_criteria, n_jobs,
+                                             verbose=0)
+    return parallel(p_func(model, p, maxlags - p, trend) for p in lags)
+
+
 class VARProcess(object):
     """
     Class represents a known VAR(p) process
@@ -25,12 +25,13 @@ from statsmodels.tsa.vector_ar.hypothesis_test_results import \
     CausalityTestResults, NormalityTestResults, WhitenessTestResults
 from statsmodels.tsa.vector_ar.util import get_index, seasonal_dummies
 from statsmodels.tsa.vector_ar.var_model import forecast, forecast_interval, \
-    VAR, ma_rep, orth_ma_rep, test_normality, LagOrderResults, _compute_acov
+    VAR, ma_rep, orth_ma_rep, test_normality, LagOrderResults, _compute_acov, \
+    _select_order_criteria
 from statsmodels.tsa.coint_tables import c_sja, c_sjt
 
 
 def select_order(data, maxlags, deterministic="nc", seasons=0, exog=None,
-                 exog_coint=None):
+                 exog_coint=None, n_jobs=1):
     """
     Compute lag order selections based on each of the available information
     criteria.
@@ -58,31 +59,36 @@ def select_order(data, maxlags, deterministic="nc", seasons=0, exog=None,
         Deterministic terms outside the cointegration relation.
     exog_coint : ndarray (nobs_tot x neqs) or `None`, default: `None`
         Deterministic terms inside the cointegration relation.
+    n_jobs : int, default: 1
+        Number of processes used to estimate the candidate models. -1 uses
+        all available cores. Requires joblib.
 
     Returns
     -------
     selected_orders : :class:`statsmodels.tsa.vector_ar.var_model.LagOrderResults`
     """
     ic = defaultdict(list)
-    for p in range(1, maxlags + 2):  # +2 because k_ar_VECM == k_ar_VAR - 1
-        exogs = []
-        if "co" in deterministic or "ci" in deterministic:
-            exogs.append(np.ones(len(data)).reshape(-1, 1))
-        if "lo" in deterministic or "li" in deterministic:
-            exogs.append(1 + np.arange(len(data)).reshape(-1, 1))
-        if exog_coint is not None:
-            exogs.append(exog_coint)
-        if seasons > 0:
-            exogs.append(seasonal_dummies(seasons, len(data)
-                                          ).reshape(-1, seasons-1))
-        if exog is not None:
-            exogs.append(exog)
-        exogs = hstack(exogs) if exogs else None
-        var_model = VAR(data, exogs)
-        # exclude some periods ==> same amount of data used for each lag order
-        var_result = var_model._estimate_var(lags=p, offset=maxlags+1-p)
-
-        for k, v in iteritems(var_result.info_criteria):
+    exogs = []
+    if "co" in deterministic or "ci" in deterministic:
+        exogs.append(np.ones(len(data)).reshape(-1, 1))
+    if "lo" in deterministic or "li" in deterministic:
+        exogs.append(1 + np.arange(len(data)).reshape(-1, 1))
+    if exog_coint is not None:
+        exogs.append(exog_coint)
+    if seasons > 0:
+        exogs.append(seasonal_dummies(seasons, len(data)
+                                      ).reshape(-1, seasons-1))
+    if exog is not None:
+        exogs.append(exog)
+    exogs = hstack(exogs) if exogs else None
+    var_model = VAR(data, exogs)
+    # exclude some periods ==> same amount of data used for each lag order
+    # +2 because k_ar_VECM == k_ar_VAR - 1
+    criteria = _select_order_criteria(var_model, range(1, maxlags + 2),
+                                      maxlags + 1, "c", n_jobs)
+
+    for info_criteria in criteria:
+        for k, v in iteritems(info_criteria):
             ic[k].append(v)
     # -1+1 in the following line is only here for clarification.
     # -1 because k_ar_VECM == k_ar_VAR - 1
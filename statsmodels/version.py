@@ -0,0 +1,10 @@
+
+# THIS FILE IS GENERATED FROM SETUP.PY
+short_version = '0.8.0'
+version = '0.8.0'
+full_version = '0.8.0.dev0+6c68638'
+git_revision = '6c6863828d97fe402b7e4ec326360f25e40424e8'
+release = False
+
+if not release:
+    version = full_version
\ No newline at end of file
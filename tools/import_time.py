@@ -0,0 +1,67 @@
+"""
+Benchmark the time of ``import statsmodels.api`` in new interpreters
+
+Usage::
+
+    python tools/import_time.py [-n 10] [--max-time SECONDS] [module]
+
+Prints the minimum and median wall time over the runs and the slowest
+statsmodels modules from ``python -X importtime``. With ``--max-time`` the
+script fails if the median exceeds the limit, so that it can guard against
+regressions in CI.
+"""
+import argparse
+import subprocess
+import sys
+import timeit
+
+import numpy as np
+
+
+def import_time(module, n):
+    stmt = 'subprocess.check_call([sys.executable, "-W", "ignore", "-c", ' \
+           '"import {0}"])'.format(module)
+    # the first run warms up the file system cache
+    timeit.timeit(stmt, setup='import subprocess, sys', number=1)
+    return np.array(timeit.repeat(stmt, setup='import subprocess, sys',
+                                  repeat=n, number=1))
+
+
+def slowest_modules(module, n=10):
+    # -X importtime is available in python >= 3.7
+    out = subprocess.check_output([sys.executable, '-W', 'ignore', '-X',
+                                   'importtime', '-c',
+                                   'import {0}'.format(module)],
+                                  stderr=subprocess.STDOUT)
+    times = []
+    for line in out.decode().splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line.split('|')
+        name = name.strip()
+        if name.startswith('statsmodels') and cumulative.strip().isdigit():
+            times.append((int(cumulative), name))
+    return sorted(times, reverse=True)[:n]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('module', nargs='?', default='statsmodels.api')
+    parser.add_argument('-n', type=int, default=10)
+    parser.add_argument('--max-time', type=float, default=None)
+    args = parser.parse_args()
+
+    times = import_time(args.module, args.n)
+    print('import {0}: min {1:.3f}s, median {2:.3f}s ({3} runs)'.format(
+        args.module, times.min(), np.median(times), args.n))
+    if sys.version_info[:2] >= (3, 7):
+        print('\ncumulative time (us)  module')
+        for cumulative, name in slowest_modules(args.module):
+            print('{0:>20d}  {1}'.format(cumulative, name))
+    if args.max_time is not None and np.median(times) > args.max_time:
+        sys.exit('median import time {0:.3f}s exceeds {1:.3f}s'.format(
+            np.median(times), args.max_time))
+
+
+if __name__ == '__main__':
+    main()